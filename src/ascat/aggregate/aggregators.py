@@ -2,6 +2,8 @@
 # SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
 # SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
 
+import os
+import json
 import datetime
 import tempfile
 
@@ -11,6 +13,7 @@ import numpy as np
 import pandas as pd
 import xarray as xr
 
+from flox import groupby_reduce
 from flox.xarray import xarray_reduce
 from dask.array import unique as da_unique
 
@@ -18,6 +21,94 @@ from ascat.swath import SwathGridFiles
 from ascat.product_info import get_swath_product_id
 from ascat.utils import dtype_to_nan
 
+# statistics kept per (time step, location_id) and variable, which can be
+# merged with the statistics of later observations
+partial_stats = {
+    "count": ("count", 0),
+    "sum": ("nansum", 0.),
+    "sumsq": ("nansum", 0.),
+    "min": ("nanmin", np.nan),
+    "max": ("nanmax", np.nan),
+    "first": ("nanfirst", np.nan),
+    "last": ("nanlast", np.nan),
+    "first_time": ("nanfirst", np.nan),
+    "last_time": ("nanlast", np.nan),
+}
+
+
+def _partial_mean(stats):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return stats["sum"] / stats["count"]
+
+
+def _partial_std(stats):
+    mean = _partial_mean(stats)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.sqrt(np.maximum(stats["sumsq"] / stats["count"] - mean**2,
+                                  0))
+
+
+# aggregations computed from the partial statistics
+partial_aggs = {
+    "nanmean": _partial_mean,
+    "nanstd": _partial_std,
+    "nanmin": lambda stats: stats["min"],
+    "nanmax": lambda stats: stats["max"],
+    "nanfirst": lambda stats: stats["first"],
+    "nanlast": lambda stats: stats["last"],
+    "count": lambda stats: stats["count"],
+}
+
+
+def _expand_partial_stats(stats, idx, size):
+    """
+    Place partial statistics at the given positions of larger arrays, the
+    other positions hold the initial values of the statistics.
+    """
+    expanded = {}
+    for stat, values in stats.items():
+        expanded[stat] = np.full(size, partial_stats[stat][1],
+                                 dtype=values.dtype)
+        expanded[stat][idx] = values
+
+    return expanded
+
+
+def merge_partial_stats(stats, other):
+    """
+    Merge the partial statistics of the same groups.
+
+    Parameters
+    ----------
+    stats : dict of numpy.ndarray
+        Partial statistics.
+    other : dict of numpy.ndarray
+        Partial statistics of later observations.
+
+    Returns
+    -------
+    merged : dict of numpy.ndarray
+        Merged partial statistics.
+    """
+    take_first = ((other["first_time"] < stats["first_time"])
+                  | np.isnan(stats["first_time"]))
+    take_last = ((other["last_time"] >= stats["last_time"])
+                 | np.isnan(stats["last_time"]))
+
+    return {
+        "count": stats["count"] + other["count"],
+        "sum": stats["sum"] + other["sum"],
+        "sumsq": stats["sumsq"] + other["sumsq"],
+        "min": np.fmin(stats["min"], other["min"]),
+        "max": np.fmax(stats["max"], other["max"]),
+        "first": np.where(take_first, other["first"], stats["first"]),
+        "last": np.where(take_last, other["last"], stats["last"]),
+        "first_time": np.where(take_first, other["first_time"],
+                               stats["first_time"]),
+        "last_time": np.where(take_last, other["last_time"],
+                              stats["last_time"]),
+    }
+
 
 class TemporalSwathAggregator:
     """Class to aggregate ASCAT data its location ids over time."""
@@ -35,6 +126,9 @@ class TemporalSwathAggregator:
         ssm_sensitivity_mask=1,
         no_masking=False,
         sat=None,
+        product_id=None,
+        single_pass=False,
+        max_nbytes=2**30,
     ):
         """Initialize the class.
 
@@ -66,6 +160,16 @@ class TemporalSwathAggregator:
             Regex pattern indicating which METOP satellite(s) to use, e.g. A, [BC], or '*'.
             `None` will use the product's default satellite (usually all of them).
             (default: None)
+        product_id : str, optional
+            Product identifier (e.g. H129, H121). If not provided, it is
+            determined from the name of the first swath file (default: None).
+        single_pass : boolean, optional
+            Read every swath file only once and aggregate all time steps
+            with `get_aggregated_time_steps_single_pass` (default: False).
+        max_nbytes : int, optional
+            Size of the buffered observations in single pass mode at which the
+            completed time steps are aggregated, or at which the partial
+            aggregates are updated (default: 1 GB).
         """
         self.filepath = filepath
 
@@ -74,6 +178,8 @@ class TemporalSwathAggregator:
         self.end_dt = datetime.datetime.strptime(end_dt, fmt)
         self.timedelta = pd.Timedelta(t_delta)
         self.no_masking = no_masking
+        self.single_pass = single_pass
+        self.max_nbytes = max_nbytes
 
         agg_methods = [
             "mean", "median", "mode", "std", "min", "max", "argmin", "argmax",
@@ -85,9 +191,11 @@ class TemporalSwathAggregator:
 
         self.agg = agg
 
-        # assumes ONLY swath files are in the folder
-        first_fname = str(next(Path(filepath).rglob("*.nc")).name)
-        product = get_swath_product_id(first_fname)
+        if product_id is None:
+            # assumes ONLY swath files are in the folder
+            first_fname = str(next(Path(filepath).rglob("*.nc")).name)
+            product_id = get_swath_product_id(first_fname)
+        product = product_id
         self.product = product
 
         if sat is not None:
@@ -164,7 +272,7 @@ class TemporalSwathAggregator:
 
         return output_encoding
 
-    def write_time_steps(self, outpath):
+    def write_time_steps(self, outpath, state_path=None):
         """
         Loop through time steps and write them to file.
 
@@ -172,12 +280,23 @@ class TemporalSwathAggregator:
         ----------
         outpath : str
             Output path.
+        state_path : str or Path, optional
+            Directory of the partial aggregates. If given, the partial
+            aggregates are updated with new swath files and only the updated
+            time steps are written (default: None).
         """
         product_id = self.product.lower().replace("_", "-")
         grid_sampling = str(self.grid.res) + "km"
 
         if self.agg is not None:
-            datasets = self.get_aggregated_time_steps()
+            if state_path is not None:
+                steps = self.update_partial_aggregates(state_path)
+                datasets = self.get_aggregated_time_steps_from_partial(
+                    state_path, steps)
+            elif self.single_pass:
+                datasets = self.get_aggregated_time_steps_single_pass()
+            else:
+                datasets = self.get_aggregated_time_steps()
             agg_str = f"_{self.agg}"
         else:
             datasets = self.get_time_steps()
@@ -233,6 +352,44 @@ class TemporalSwathAggregator:
             yield ds_step
 
 
+    def _mask(self, ds):
+        """
+        Mask observations not over land and, unless masking is disabled,
+        soil moisture affected by snow, frozen soil, subsurface scattering or
+        low sensitivity.
+
+        Parameters
+        ----------
+        ds : xarray.Dataset
+            Swath data.
+
+        Returns
+        -------
+        ds : xarray.Dataset
+            Masked swath data.
+        """
+        global_mask = (ds.surface_flag != 0)
+
+        ds = ds.where(~global_mask, drop=False)
+
+        if not self.no_masking:
+            variable_masks = {
+                "surface_soil_moisture": (
+                    (ds["frozen_soil_probability"]
+                    > self.mask_probs["frozen_soil_probability"])
+                    | (ds["snow_cover_probability"]
+                    > self.mask_probs["snow_cover_probability"])
+                    | (ds["subsurface_scattering_probability"]
+                    > self.mask_probs["subsurface_scattering_probability"])
+                    | (ds["surface_soil_moisture_sensitivity"]
+                    < self.mask_probs["surface_soil_moisture_sensitivity"])),
+            }
+
+            for var, var_mask in variable_masks.items():
+                ds[var] = ds[var].where(~var_mask, drop=False)
+
+        return ds
+
     def get_aggregated_time_steps(self):
         """Loop through data in time steps, aggregating it over time."""
         for ds in self.get_time_steps():
@@ -242,25 +399,7 @@ class TemporalSwathAggregator:
 
 
             print("masking data...", end="\r")
-            global_mask = (ds.surface_flag != 0)
-
-            ds = ds.where(~global_mask, drop=False)
-
-            if not self.no_masking:
-                variable_masks = {
-                    "surface_soil_moisture": (
-                        (ds["frozen_soil_probability"]
-                        > self.mask_probs["frozen_soil_probability"])
-                        | (ds["snow_cover_probability"]
-                        > self.mask_probs["snow_cover_probability"])
-                        | (ds["subsurface_scattering_probability"]
-                        > self.mask_probs["subsurface_scattering_probability"])
-                        | (ds["surface_soil_moisture_sensitivity"]
-                        < self.mask_probs["surface_soil_moisture_sensitivity"])),
-                }
-
-                for var, var_mask in variable_masks.items():
-                    ds[var] = ds[var].where(~var_mask, drop=False)
+            ds = self._mask(ds)
 
             print("grouping data...           ")
             expected_location_ids = da_unique(ds["location_id"].data).compute()
@@ -288,3 +427,643 @@ class TemporalSwathAggregator:
             grouped_ds = self._set_metadata(grouped_ds)
 
             yield grouped_ds
+
+    def _time_step_edges(self):
+        """
+        Start times of all time steps followed by the end of the last one.
+
+        Returns
+        -------
+        edges : numpy.ndarray
+            Time step edges (datetime64[ns]).
+        """
+        time_steps = pd.date_range(
+            start=self.start_dt, end=self.end_dt, freq=self.timedelta)
+        time_steps = time_steps.append(
+            pd.DatetimeIndex([time_steps[-1] + self.timedelta]))
+
+        return time_steps.values.astype("datetime64[ns]")
+
+    def _file_date(self, filename):
+        """
+        Date of a swath file parsed from its filename.
+        """
+        return np.datetime64(self.collection._parse_date(
+            filename, "date", self.collection.date_field_fmt))
+
+    def _swath_filenames(self, edges):
+        """
+        Swath files of the period in chronological order.
+
+        Parameters
+        ----------
+        edges : numpy.ndarray
+            Time step edges.
+
+        Returns
+        -------
+        filenames : list of str
+            Swath filenames.
+        """
+        filenames = self.collection.swath_search(
+            pd.Timestamp(edges[0]).to_pydatetime(),
+            pd.Timestamp(edges[-1]).to_pydatetime(),
+            end_inclusive=False,
+            **self.fmt_kwargs)
+
+        return sorted(filenames, key=self._file_date)
+
+    def _iter_binned_swaths(self, edges, filenames=None):
+        """
+        Read every swath file of the period once, in chronological order,
+        and assign its observations to the time steps.
+
+        Parameters
+        ----------
+        edges : numpy.ndarray
+            Time step edges.
+        filenames : list of str, optional
+            Swath files to read instead of all files of the period
+            (default: None).
+
+        Yields
+        ------
+        file_date : numpy.datetime64
+            Date of the swath file parsed from its filename.
+        chunk : dict of numpy.ndarray
+            Time step index, location_id, time and aggregation variables of
+            the valid observations.
+        attrs : dict
+            Global attributes.
+        var_attrs : dict
+            Attributes of the aggregation variables.
+        """
+        if filenames is None:
+            filenames = self._swath_filenames(edges)
+
+        for filename in filenames:
+            print("reading data from file:", Path(filename).name, end="\r")
+            ds = self.collection.cls(filename).read(
+                preprocessor=self.collection.preprocessor)
+            present_agg_vars = [
+                var for var in self.agg_vars if var in ds.variables
+            ]
+            ds = self._mask(ds)
+
+            time_step = np.searchsorted(
+                edges, ds["time"].values, side="right") - 1
+            location_id = ds["location_id"].values
+            valid = ((time_step >= 0) & (time_step < edges.size - 1)
+                     & ~np.isnan(location_id))
+
+            chunk = {
+                "time_step": time_step[valid],
+                "location_id": location_id[valid].astype(np.int64),
+                "time": ds["time"].values[valid],
+            }
+            for var in present_agg_vars:
+                chunk[var] = ds[var].values[valid]
+
+            var_attrs = {var: ds[var].attrs for var in present_agg_vars}
+            yield self._file_date(filename), chunk, ds.attrs, var_attrs
+            ds.close()
+
+    def _reduce_time_steps(self, chunk, edges, attrs, var_attrs):
+        """
+        Aggregate the buffered observations of one or more time steps, with
+        one reduction per variable over all (time step, location_id) groups.
+
+        Parameters
+        ----------
+        chunk : dict of numpy.ndarray
+            Time step index, location_id and aggregation variables.
+        edges : numpy.ndarray
+            Time step edges.
+        attrs : list of dict
+            Global attributes of the swath files.
+        var_attrs : dict of list
+            Attributes of the aggregation variables of the swath files.
+
+        Yields
+        ------
+        grouped_ds : xarray.Dataset
+            Aggregated data of one time step.
+        """
+        if chunk["time_step"].size == 0:
+            return
+
+        combine_attrs = self.collection.cls.combine_attributes
+        global_attrs = combine_attrs([dict(a) for a in attrs], None)
+        var_attrs = {
+            var: combine_attrs([dict(a) for a in var_attrs[var]], None)
+            for var in var_attrs
+        }
+
+        group_idx, group_steps, group_location_ids = self._group(chunk)
+
+        reduced = {}
+        for var in var_attrs:
+            reduced[var], _ = groupby_reduce(
+                chunk[var],
+                group_idx,
+                func=self.agg,
+                expected_groups=np.arange(group_steps.size))
+
+        for step, obs in self._split_time_steps(group_steps):
+            yield self._time_step_dataset(
+                {var: (reduced[var][obs], var_attrs[var])
+                 for var in var_attrs},
+                group_location_ids[obs], edges, step, global_attrs)
+
+    @staticmethod
+    def _group(chunk):
+        """
+        Group observations by time step and location_id.
+
+        Parameters
+        ----------
+        chunk : dict of numpy.ndarray
+            Time step index and location_id of the observations.
+
+        Returns
+        -------
+        group_idx : numpy.ndarray
+            Group index of every observation.
+        group_steps : numpy.ndarray
+            Time step index of every group (sorted).
+        group_location_ids : numpy.ndarray
+            Location id of every group.
+        """
+        location_ids, location_idx = np.unique(
+            chunk["location_id"], return_inverse=True)
+        codes = chunk["time_step"] * location_ids.size + location_idx
+        groups, group_idx = np.unique(codes, return_inverse=True)
+
+        return (group_idx, groups // location_ids.size,
+                location_ids[groups % location_ids.size])
+
+    @staticmethod
+    def _split_time_steps(group_steps):
+        """
+        Split sorted groups into time steps.
+
+        Parameters
+        ----------
+        group_steps : numpy.ndarray
+            Time step index of every group (sorted).
+
+        Yields
+        ------
+        step : int
+            Time step index.
+        obs : slice
+            Groups of the time step.
+        """
+        steps, first = np.unique(group_steps, return_index=True)
+        bounds = np.append(first, group_steps.size)
+        for i, step in enumerate(steps):
+            yield step, slice(bounds[i], bounds[i + 1])
+
+    def _time_step_dataset(self, data_vars, location_ids, edges, step,
+                           attrs):
+        """
+        Create the aggregated dataset of a time step.
+
+        Parameters
+        ----------
+        data_vars : dict
+            Aggregated values and attributes per variable.
+        location_ids : numpy.ndarray
+            Location ids.
+        edges : numpy.ndarray
+            Time step edges.
+        step : int
+            Time step index.
+        attrs : dict
+            Global attributes.
+
+        Returns
+        -------
+        grouped_ds : xarray.Dataset
+            Aggregated data of the time step.
+        """
+        step_start = pd.Timestamp(edges[step])
+        step_end = pd.Timestamp(edges[step + 1]) - pd.Timedelta("1s")
+
+        grouped_ds = xr.Dataset(
+            {
+                var: ("location_id", values, var_attrs)
+                for var, (values, var_attrs) in data_vars.items()
+            },
+            coords={"location_id": location_ids},
+            attrs=dict(attrs,
+                       start_time=np.datetime64(step_start).astype(str),
+                       end_time=np.datetime64(step_end).astype(str)))
+        grouped_ds["time"] = np.datetime64(step_start, "ns")
+
+        lons, lats = self.grid.gpi2lonlat(grouped_ds.location_id.values)
+        grouped_ds["longitude"] = ("location_id", lons)
+        grouped_ds["latitude"] = ("location_id", lats)
+        grouped_ds = grouped_ds.set_coords(["longitude", "latitude"])
+
+        return self._set_metadata(grouped_ds)
+
+    def get_aggregated_time_steps_single_pass(self):
+        """
+        Aggregate the data of all time steps, reading every swath file once.
+
+        Unlike `get_aggregated_time_steps`, which reads the data of every time
+        step separately, the swath files of the whole period are streamed in
+        chronological order and their observations are assigned to the time
+        steps [start, start + t_delta) by their time stamp, so an observation
+        at the border of two steps only counts for the later one.
+
+        Observations are buffered until `max_nbytes` is reached. Then all
+        time steps ending before the date of the next swath file are
+        aggregated together and yielded.
+
+        Yields
+        ------
+        grouped_ds : xarray.Dataset
+            Aggregated data of one time step.
+        """
+        edges = self._time_step_edges()
+        chunks = []
+        nbytes = 0
+        # last time step and attributes of the buffered swath files
+        files = []
+        n_flushed = 0
+
+        def merge(chunks):
+            return {
+                key: np.concatenate([c[key] for c in chunks])
+                for key in chunks[0]
+            }
+
+        def file_attrs(files):
+            var_attrs = {}
+            for _, _, ds_var_attrs in files:
+                for var, a in ds_var_attrs.items():
+                    var_attrs.setdefault(var, []).append(a)
+            return [a for _, a, _ in files], var_attrs
+
+        for file_date, chunk, ds_attrs, ds_var_attrs in \
+                self._iter_binned_swaths(edges):
+            # no later swath file can add data to the time steps ending
+            # before the date of this file
+            n_complete = np.searchsorted(edges, file_date, side="right") - 1
+            if chunks and nbytes >= self.max_nbytes and n_complete > n_flushed:
+                buffered = merge(chunks)
+                complete = buffered["time_step"] < n_complete
+                yield from self._reduce_time_steps(
+                    {key: v[complete] for key, v in buffered.items()},
+                    edges, *file_attrs(files))
+                chunks = [{key: v[~complete] for key, v in buffered.items()}]
+                nbytes = sum(v.nbytes for v in chunks[0].values())
+                files = [f for f in files if f[0] >= n_complete]
+                n_flushed = n_complete
+
+            chunks.append(chunk)
+            nbytes += sum(v.nbytes for v in chunk.values())
+            last_step = (chunk["time_step"].max()
+                         if chunk["time_step"].size else -1)
+            files.append((last_step, ds_attrs, ds_var_attrs))
+
+        if chunks:
+            yield from self._reduce_time_steps(merge(chunks), edges,
+                                               *file_attrs(files))
+
+    def _partial_stats(self, chunk, var_names):
+        """
+        Compute the partial statistics of the buffered observations.
+
+        Parameters
+        ----------
+        chunk : dict of numpy.ndarray
+            Time step index, location_id, time and aggregation variables.
+        var_names : list of str
+            Aggregation variables.
+
+        Yields
+        ------
+        step : int
+            Time step index.
+        location_ids : numpy.ndarray
+            Location ids of the time step.
+        stats : dict
+            Partial statistics per variable.
+        """
+        if chunk["time_step"].size == 0:
+            return
+
+        # first and last values are taken in the order of time
+        order = np.argsort(chunk["time"], kind="stable")
+        chunk = {key: v[order] for key, v in chunk.items()}
+        group_idx, group_steps, group_location_ids = self._group(chunk)
+        time = ((chunk["time"] - np.datetime64(0, "s"))
+                / np.timedelta64(1, "s"))
+
+        stats = {}
+        for var in var_names:
+            values = chunk[var].astype(np.float64)
+            inputs = {
+                "count": values,
+                "sum": values,
+                "sumsq": values**2,
+                "min": values,
+                "max": values,
+                "first": values,
+                "last": values,
+                "first_time": np.where(np.isnan(values), np.nan, time),
+                "last_time": np.where(np.isnan(values), np.nan, time),
+            }
+            stats[var] = {}
+            for stat, (func, fill_value) in partial_stats.items():
+                stats[var][stat], _ = groupby_reduce(
+                    inputs[stat],
+                    group_idx,
+                    func=func,
+                    expected_groups=np.arange(group_steps.size),
+                    fill_value=fill_value)
+
+        for step, obs in self._split_time_steps(group_steps):
+            yield step, group_location_ids[obs], {
+                var: {stat: v[obs] for stat, v in var_stats.items()}
+                for var, var_stats in stats.items()
+            }
+
+    def _partial_filename(self, state_path, edges, step):
+        """
+        Filename of the partial aggregates of a time step.
+        """
+        fmt = "%Y%m%d%H%M%S"
+        step_start = pd.Timestamp(edges[step]).strftime(fmt)
+        step_end = pd.Timestamp(edges[step + 1]).strftime(fmt)
+
+        return Path(state_path) / f"partial_{step_start}_{step_end}.nc"
+
+    def _state_config(self):
+        """
+        Settings the partial aggregates depend on.
+        """
+        return {
+            "product_id": self.product,
+            "fmt_kwargs": self.fmt_kwargs,
+            "start_dt": self.start_dt.isoformat(),
+            "t_delta": str(self.timedelta),
+            "no_masking": self.no_masking,
+            "mask_probs": self.mask_probs,
+        }
+
+    def _read_partial(self, filename):
+        """
+        Read the partial aggregates of a time step.
+
+        Returns
+        -------
+        location_ids : numpy.ndarray
+            Location ids.
+        stats : dict
+            Partial statistics per variable.
+        attrs : dict
+            Global attributes.
+        var_attrs : dict
+            Attributes per variable.
+        """
+        with xr.open_dataset(filename) as ds:
+            ds = ds.load()
+
+        stats = {}
+        var_attrs = {}
+        for var in self.agg_vars:
+            if f"{var}_count" not in ds:
+                continue
+            stats[var] = {
+                stat: ds[f"{var}_{stat}"].values for stat in partial_stats
+            }
+            var_attrs[var] = ds[f"{var}_min"].attrs
+
+        attrs = {
+            key: value
+            for key, value in ds.attrs.items()
+            if key not in ["start_time", "end_time"]
+        }
+
+        return ds["location_id"].values, stats, attrs, var_attrs
+
+    def _write_partial(self, filename, location_ids, stats, attrs, var_attrs,
+                       edges, step):
+        """
+        Write the partial aggregates of a time step, replacing the file.
+        """
+        data_vars = {}
+        for var, var_stats in stats.items():
+            for stat, values in var_stats.items():
+                stat_attrs = {} if stat == "count" else var_attrs[var]
+                data_vars[f"{var}_{stat}"] = ("location_id", values,
+                                              stat_attrs)
+
+        step_start = pd.Timestamp(edges[step])
+        step_end = pd.Timestamp(edges[step + 1]) - pd.Timedelta("1s")
+        ds = xr.Dataset(
+            data_vars,
+            coords={"location_id": location_ids},
+            attrs=dict(attrs,
+                       start_time=np.datetime64(step_start).astype(str),
+                       end_time=np.datetime64(step_end).astype(str)))
+
+        encoding = {var: {"zlib": True, "complevel": 4} for var in data_vars}
+        tmp_filename = filename.with_name(filename.name + ".tmp")
+        ds.to_netcdf(tmp_filename, encoding=encoding)
+        os.replace(tmp_filename, filename)
+
+    def _update_partial_files(self, state_path, edges, chunk, attrs,
+                              var_attrs):
+        """
+        Merge the partial statistics of the buffered observations into the
+        partial aggregates of the affected time steps.
+
+        Returns
+        -------
+        steps : list of int
+            Updated time steps.
+        """
+        combine_attrs = self.collection.cls.combine_attributes
+        var_attrs = {
+            var: combine_attrs([dict(a) for a in var_attrs[var]], None)
+            for var in var_attrs
+        }
+
+        steps = []
+        for step, location_ids, stats in self._partial_stats(
+                chunk, list(var_attrs)):
+            filename = self._partial_filename(state_path, edges, step)
+            step_attrs = combine_attrs([dict(a) for a in attrs], None)
+            step_var_attrs = var_attrs
+
+            if filename.exists():
+                (old_location_ids, old_stats, old_attrs,
+                 old_var_attrs) = self._read_partial(filename)
+                step_attrs = combine_attrs([old_attrs, step_attrs], None)
+                step_var_attrs = {
+                    var: combine_attrs(
+                        [old_var_attrs.get(var, {}), var_attrs[var]], None)
+                    for var in var_attrs
+                }
+
+                all_location_ids = np.union1d(old_location_ids, location_ids)
+                old_idx = np.searchsorted(all_location_ids, old_location_ids)
+                new_idx = np.searchsorted(all_location_ids, location_ids)
+                stats = {
+                    var: merge_partial_stats(
+                        _expand_partial_stats(old_stats[var], old_idx,
+                                              all_location_ids.size),
+                        _expand_partial_stats(stats[var], new_idx,
+                                              all_location_ids.size))
+                    for var in stats
+                }
+                location_ids = all_location_ids
+
+            self._write_partial(filename, location_ids, stats, step_attrs,
+                                step_var_attrs, edges, step)
+            steps.append(step)
+
+        return steps
+
+    def update_partial_aggregates(self, state_path):
+        """
+        Update the partial aggregates with swath files not yet included.
+
+        For every time step and location_id the count, sum, sum of squares,
+        minimum, maximum, first and last value of each variable are stored in
+        one file per time step in `state_path`. Since these statistics can be
+        merged with those of later observations, only the new swath files
+        are read and only the time steps they touch are rewritten, so
+        an update costs O(new data) instead of O(period). As in single pass
+        mode, time steps are [start, start + t_delta).
+
+        Parameters
+        ----------
+        state_path : str or Path
+            Directory of the partial aggregates.
+
+        Returns
+        -------
+        steps : numpy.ndarray
+            Indices of the updated time steps.
+
+        Raises
+        ------
+        ValueError
+            If the aggregation cannot be computed from partial statistics
+            (e.g. median or quantiles) or the partial aggregates were created
+            with different settings.
+        """
+        if self.agg not in partial_aggs:
+            raise ValueError(
+                f"Aggregation {self.agg} cannot be updated incrementally, "
+                f"supported are: {', '.join(partial_aggs)}")
+
+        state_path = Path(state_path)
+        state_path.mkdir(parents=True, exist_ok=True)
+        state_filename = state_path / "state.json"
+        config = self._state_config()
+
+        processed = []
+        if state_filename.exists():
+            with open(state_filename) as f:
+                state = json.load(f)
+            if state["config"] != config:
+                raise ValueError(
+                    f"Partial aggregates in {state_path} were created with "
+                    f"different settings: {state['config']}")
+            processed = state["processed_files"]
+
+        edges = self._time_step_edges()
+        done = set(processed)
+        filenames = [
+            f for f in self._swath_filenames(edges)
+            if Path(f).name not in done
+        ]
+
+        steps = set()
+        chunks = []
+        chunk_files = []
+        nbytes = 0
+        attrs = []
+        var_attrs = {}
+
+        def flush():
+            chunk = {
+                key: np.concatenate([c[key] for c in chunks])
+                for key in chunks[0]
+            }
+            steps.update(
+                self._update_partial_files(state_path, edges, chunk, attrs,
+                                           var_attrs))
+            processed.extend(chunk_files)
+            tmp_filename = state_filename.with_name(state_filename.name
+                                                    + ".tmp")
+            with open(tmp_filename, "w") as f:
+                json.dump({"config": config, "processed_files": processed}, f)
+            os.replace(tmp_filename, state_filename)
+
+        for filename, (_, chunk, ds_attrs, ds_var_attrs) in zip(
+                filenames, self._iter_binned_swaths(edges, filenames)):
+            chunks.append(chunk)
+            chunk_files.append(Path(filename).name)
+            nbytes += sum(v.nbytes for v in chunk.values())
+            attrs.append(ds_attrs)
+            for var, a in ds_var_attrs.items():
+                var_attrs.setdefault(var, []).append(a)
+
+            if nbytes >= self.max_nbytes:
+                flush()
+                chunks, chunk_files, attrs, var_attrs = [], [], [], {}
+                nbytes = 0
+
+        if chunks:
+            flush()
+
+        return np.array(sorted(steps), dtype=int)
+
+    def get_aggregated_time_steps_from_partial(self, state_path, steps=None):
+        """
+        Compute the aggregation from the partial aggregates.
+
+        Parameters
+        ----------
+        state_path : str or Path
+            Directory of the partial aggregates.
+        steps : list of int, optional
+            Indices of the time steps (default: all time steps of the period
+            with partial aggregates).
+
+        Yields
+        ------
+        grouped_ds : xarray.Dataset
+            Aggregated data of one time step.
+        """
+        if self.agg not in partial_aggs:
+            raise ValueError(
+                f"Aggregation {self.agg} cannot be computed from partial "
+                f"aggregates, supported are: {', '.join(partial_aggs)}")
+
+        edges = self._time_step_edges()
+        if steps is None:
+            steps = range(edges.size - 1)
+
+        for step in steps:
+            filename = self._partial_filename(state_path, edges, step)
+            if not filename.exists():
+                continue
+
+            location_ids, stats, attrs, var_attrs = self._read_partial(
+                filename)
+            data_vars = {
+                var: (partial_aggs[self.agg](var_stats), var_attrs[var])
+                for var, var_stats in stats.items()
+            }
+
+            yield self._time_step_dataset(data_vars, location_ids, edges,
+                                          step, attrs)
@@ -74,6 +74,18 @@ def parse_args_temporal_swath_agg(args):
         const=True,
         default=False,
         help="Ignore all masks")
+    parser.add_argument(
+        "--single_pass",
+        action='store_const',
+        const=True,
+        default=False,
+        help=("Read each swath file once and aggregate all time steps "
+              "together instead of reading the files per time step"))
+    parser.add_argument(
+        "--state_path",
+        metavar="STATE_PATH",
+        help=("Directory of partial aggregates to update with new swath "
+              "files; only the updated time steps are written"))
     parser.add_argument(
         "--regrid",
         metavar="REGRID_DEG",
@@ -126,14 +138,14 @@ def temporal_swath_agg_main(cli_args):
         args.filepath, args.start_dt, args.end_dt, args.t_delta, args.agg,
         args.snow_cover_mask, args.frozen_soil_mask,
         args.subsurface_scattering_mask, args.ssm_sensitivity_mask,
-        args.no_masking, sat=args.sat)
+        args.no_masking, sat=args.sat, single_pass=args.single_pass)
 
     product_id = transf.product
 
     outpath = Path(args.outpath)
     outpath.mkdir(parents=True, exist_ok=True)
 
-    filenames = transf.write_time_steps(outpath)
+    filenames = transf.write_time_steps(outpath, args.state_path)
 
     if args.regrid is not None:
         for filename in filenames:
@@ -0,0 +1,3 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
+# SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
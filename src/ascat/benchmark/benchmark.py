@@ -0,0 +1,552 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
+# SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
+
+"""
+Benchmarks of the performance critical paths on synthetic data.
+
+Each benchmark case generates its input data with
+`ascat.read_native.generate_test_data` in a work directory (scaled by a
+common factor) and returns the operation to be timed. For every run the
+wall time, the peak resident set size and the number of bytes read are
+recorded. Peak RSS and bytes read are taken from ``/proc/self`` and only
+cover the benchmark process, not worker processes.
+"""
+
+import gc
+import json
+import platform
+import resource
+import time
+from collections import namedtuple
+from datetime import datetime
+from itertools import count
+from pathlib import Path
+
+import numpy as np
+
+import ascat.read_native.generate_test_data as gtd
+import ascat.accessors  # noqa: F401
+from ascat.cell import RaggedArrayTs
+from ascat.cf_conversions import contiguous_to_indexed
+from ascat.cf_conversions import contiguous_to_point
+from ascat.cf_conversions import indexed_to_contiguous
+from ascat.cf_conversions import point_to_contiguous
+from ascat.grids.grid_registry import GridRegistry
+from ascat.product_info import swath_io_catalog
+from ascat.ragged_array import ContiguousRaggedArray
+from ascat.ragged_array import IndexedRaggedArray
+from ascat.read_native.bufr import read_bufr_data
+from ascat.read_native.eps_native import read_eps
+from ascat.regrid.regrid import regrid_swath_files
+from ascat.regrid.regrid import retrieve_or_store_regrid_operator
+from ascat.resample.interface import inverse_distance_resampling
+from ascat.swath import SwathGridFiles
+
+Measurement = namedtuple("Measurement",
+                         ["wall_time", "peak_rss", "bytes_read"])
+
+
+def _read_proc(name, field):
+    """
+    Read a field of /proc/self/status or /proc/self/io.
+
+    Parameters
+    ----------
+    name : str
+        File in /proc/self.
+    field : str
+        Field name.
+
+    Returns
+    -------
+    value : int or None
+        Field value, None if not available.
+    """
+    try:
+        with open(f"/proc/self/{name}") as fid:
+            for line in fid:
+                key, value = line.split(":", 1)
+                if key == field:
+                    return int(value.split()[0])
+    except OSError:
+        pass
+
+
+def _reset_peak_rss():
+    """
+    Reset the peak resident set size of the process (Linux only).
+
+    Returns
+    -------
+    success : bool
+        True if the peak was reset.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as fid:
+            fid.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def _peak_rss():
+    """
+    Peak resident set size of the process in bytes.
+    """
+    peak = _read_proc("status", "VmHWM")
+    if peak is None:
+        # ru_maxrss is in kB on Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak * 1024
+
+
+def measure(func):
+    """
+    Run a function and measure wall time, peak RSS and bytes read.
+
+    Parameters
+    ----------
+    func : callable
+        Function without arguments.
+
+    Returns
+    -------
+    measurement : Measurement
+        Wall time in seconds, peak resident set size and bytes read. Bytes
+        read are None if /proc/self/io is not available.
+    """
+    gc.collect()
+    _reset_peak_rss()
+    rchar = _read_proc("io", "rchar")
+
+    start = time.perf_counter()
+    func()
+    wall_time = time.perf_counter() - start
+
+    bytes_read = _read_proc("io", "rchar")
+    if bytes_read is not None and rchar is not None:
+        bytes_read -= rchar
+
+    return Measurement(wall_time, _peak_rss(), bytes_read)
+
+
+def bench_stack_to_cell_files(workdir, scale):
+    """
+    Stack swath files to cell files with `SwathGridFiles`.
+    """
+    gtd.register_synthetic_grid()
+    grid_name = "synthetic_1.0"
+    swath_path = workdir / "swaths"
+    swath_path.mkdir()
+    gtd.write_synthetic_swath_files(swath_path, GridRegistry().get(grid_name),
+                                    max(int(8 * scale), 1),
+                                    max(int(5000 * scale), 500))
+
+    swath_files = SwathGridFiles(swath_path,
+                                 fn_templ="swath_{date}.nc",
+                                 sf_templ=None,
+                                 grid_name=grid_name,
+                                 date_field_fmt="%Y%m%d%H%M%S",
+                                 cell_fn_format="{:04d}.nc")
+    runs = count()
+
+    def run():
+        out_dir = workdir / f"cells_{next(runs)}"
+        out_dir.mkdir()
+        swath_files.stack_to_cell_files(out_dir, 2**30, print_progress=False,
+                                        parallel=False)
+
+    return run
+
+
+def bench_ragged_array_ts_read(workdir, scale):
+    """
+    Read a subset of locations and time from contiguous ragged array cell
+    files with `RaggedArrayTs`.
+    """
+    n_locations = max(int(5000 * scale), 1)
+    filenames = []
+    for i in range(4):
+        ds = gtd.synthetic_contiguous_ragged_ds(n_locations,
+                                                20 * n_locations, seed=i)
+        ds["location_id"] = ds["location_id"] + i * n_locations
+        filenames.append(workdir / f"{i:04d}.nc")
+        ds.to_netcdf(filenames[-1])
+
+    location_id = np.arange(0, 4 * n_locations, 3)
+    date_range = (np.datetime64("2020-01-01"), np.datetime64("2030-01-01"))
+
+    def run():
+        ds = RaggedArrayTs(filenames).read(location_id=location_id,
+                                           date_range=date_range)
+        ds.load()
+        ds.close()
+
+    return run
+
+
+def _bench_read_eps(workdir, scale, mmap):
+    filename = workdir / "ASCA_SZF_1B_M01.nat"
+    gtd.write_szf_file(filename, n_mdr=max(int(3000 * scale), 6))
+
+    def run():
+        prod = read_eps(str(filename), mmap=mmap)
+        # access the scaled fields the SZF reader uses
+        for name in ["LONGITUDE_FULL", "LATITUDE_FULL", "SIGMA0_FULL"]:
+            prod.scaled_mdr[name]
+
+    return run
+
+
+def bench_eps_product_read(workdir, scale):
+    """
+    Read an EPS Native SZF file with `EPSProduct.read`.
+    """
+    return _bench_read_eps(workdir, scale, mmap=False)
+
+
+def bench_eps_product_read_mmap(workdir, scale):
+    """
+    Read an EPS Native SZF file with `EPSProduct.read` using mmap.
+    """
+    return _bench_read_eps(workdir, scale, mmap=True)
+
+
+def bench_read_bufr_data(workdir, scale):
+    """
+    Decode a multi-message BUFR file with `read_bufr_data`.
+    """
+    filename = workdir / "test.bufr"
+    gtd.write_bufr_file(filename, [500] * max(int(100 * scale), 1))
+    key_lookup = {"t1": "#1#airTemperature", "t2": "#2#airTemperature"}
+
+    def run():
+        read_bufr_data(filename, key_lookup)
+
+    return run
+
+
+def _ragged_ds(scale):
+    n_locations = max(int(20000 * scale), 1)
+    ds = gtd.synthetic_contiguous_ragged_ds(n_locations, 50 * n_locations)
+    return ds.load()
+
+
+def bench_contiguous_to_indexed(workdir, scale):
+    """
+    Convert a contiguous to an indexed ragged array.
+    """
+    ds = _ragged_ds(scale)
+
+    def run():
+        contiguous_to_indexed(ds, "obs", "locations", "row_size",
+                              "locationIndex")
+
+    return run
+
+
+def bench_indexed_to_contiguous(workdir, scale):
+    """
+    Convert an indexed to a contiguous ragged array.
+    """
+    ds = contiguous_to_indexed(_ragged_ds(scale), "obs", "locations",
+                               "row_size", "locationIndex")
+
+    def run():
+        indexed_to_contiguous(ds, "obs", "locations", "row_size",
+                              "locationIndex", sort_vars=["time"])
+
+    return run
+
+
+def bench_contiguous_to_point(workdir, scale):
+    """
+    Convert a contiguous ragged array to a point array.
+    """
+    ds = _ragged_ds(scale)
+
+    def run():
+        contiguous_to_point(ds, "obs", "locations", "row_size")
+
+    return run
+
+
+def bench_point_to_contiguous(workdir, scale):
+    """
+    Convert a point array to a contiguous ragged array.
+    """
+    ds = contiguous_to_point(_ragged_ds(scale), "obs", "locations",
+                             "row_size")
+
+    def run():
+        point_to_contiguous(ds, "obs", "locations", "location_id",
+                            instance_vars=["lon", "lat"],
+                            sort_vars=["time"])
+
+    return run
+
+
+def _padded_ragged_ds(scale):
+    """
+    Contiguous ragged array cell with every tenth location a fill/padding
+    location, as in over-allocated cell files.
+    """
+    ds = _ragged_ds(scale)
+    padding = np.arange(ds.sizes["locations"]) % 10 == 9
+    row_size = ds["row_size"].values.copy()
+    ds = ds.isel(obs=np.repeat(~padding, row_size))
+    row_size[padding] = np.iinfo(np.int32).min
+    ds["row_size"].values = row_size
+    return ds
+
+
+def bench_contiguous_sel_instances(workdir, scale):
+    """
+    Trim a padded cell and select every third location with
+    `ContiguousRaggedArray.trim` and `ContiguousRaggedArray.sel_instances`.
+    """
+    ds = _padded_ragged_ds(scale)
+    location_id = ds["location_id"].values[::3]
+
+    def run():
+        data = ContiguousRaggedArray(ds, "row_size", "locations",
+                                     instance_id_var="location_id")
+        data.trim().sel_instances(location_id)
+
+    return run
+
+
+def bench_indexed_sel_instances(workdir, scale):
+    """
+    Select every third location with `IndexedRaggedArray.sel_instances`.
+    """
+    ds = contiguous_to_indexed(_ragged_ds(scale), "obs", "locations",
+                               "row_size", "locationIndex")
+    location_id = ds["location_id"].values[::3]
+    data = IndexedRaggedArray(ds, "locationIndex", "obs",
+                              instance_id_var="location_id")
+
+    def run():
+        data.sel_instances(location_id)
+
+    return run
+
+
+def bench_cf_geom_sel_instances(workdir, scale):
+    """
+    Select every third location of a contiguous ragged array with the
+    ``cf_geom`` accessor.
+    """
+    ds = _ragged_ds(scale)
+    location_id = ds["location_id"].values[::3]
+
+    def run():
+        ds.cf_geom.sel_instances(location_id)
+
+    return run
+
+
+def bench_inverse_distance_resampling(workdir, scale):
+    """
+    Resample swath files to a regular grid with
+    `inverse_distance_resampling`.
+    """
+    gtd.register_synthetic_grid()
+    swath_io_catalog.setdefault("SYNTHETIC", gtd.SyntheticSwathProduct)
+
+    swath_path = workdir / "swaths"
+    swath_path.mkdir()
+    gtd.write_synthetic_swath_files(
+        swath_path, GridRegistry().get(gtd.SyntheticSwathProduct.grid_name),
+        max(int(2 * scale), 1), max(int(50000 * scale), 1000))
+    grid_store = workdir / "grid_store"
+    runs = count()
+
+    def run():
+        out_path = workdir / f"resampled_{next(runs)}"
+        out_path.mkdir()
+        inverse_distance_resampling(swath_path, out_path, 1., "_1deg",
+                                    radius=80000., grid_store=grid_store,
+                                    product_id="SYNTHETIC")
+
+    return run
+
+
+def bench_regrid_swath_files(workdir, scale):
+    """
+    Regrid swath files to a regular 0.25 degree grid with a precomputed
+    `RegridOperator`.
+    """
+    gtd.register_synthetic_grid()
+    swath_path = workdir / "swaths"
+    swath_path.mkdir()
+    grid = GridRegistry().get(gtd.SyntheticSwathProduct.grid_name)
+    filenames = gtd.write_synthetic_swath_files(
+        swath_path, grid, max(int(4 * scale), 1),
+        max(int(50000 * scale), 1000))
+    trg_grid, operator = retrieve_or_store_regrid_operator(
+        grid, gtd.SyntheticSwathProduct.grid_name, "reg_grid_0.25deg", 0.25)
+    runs = count()
+
+    def run():
+        out_path = workdir / f"regridded_{next(runs)}"
+        out_path.mkdir()
+        regrid_swath_files(filenames, [out_path / f.name for f in filenames],
+                           trg_grid, operator)
+
+    return run
+
+
+benchmark_cases = {
+    "stack_to_cell_files": bench_stack_to_cell_files,
+    "ragged_array_ts_read": bench_ragged_array_ts_read,
+    "eps_product_read": bench_eps_product_read,
+    "eps_product_read_mmap": bench_eps_product_read_mmap,
+    "read_bufr_data": bench_read_bufr_data,
+    "contiguous_to_indexed": bench_contiguous_to_indexed,
+    "indexed_to_contiguous": bench_indexed_to_contiguous,
+    "contiguous_to_point": bench_contiguous_to_point,
+    "point_to_contiguous": bench_point_to_contiguous,
+    "contiguous_sel_instances": bench_contiguous_sel_instances,
+    "indexed_sel_instances": bench_indexed_sel_instances,
+    "cf_geom_sel_instances": bench_cf_geom_sel_instances,
+    "inverse_distance_resampling": bench_inverse_distance_resampling,
+    "regrid_swath_files": bench_regrid_swath_files,
+}
+
+
+def run_benchmarks(workdir, cases=None, scale=1., repeat=3):
+    """
+    Run benchmark cases.
+
+    Parameters
+    ----------
+    workdir : pathlib.Path
+        Directory for the synthetic data, a subdirectory per case is created.
+    cases : list of str, optional
+        Names of the cases to run (default: all cases).
+    scale : float, optional
+        Scale factor of the synthetic data size (default: 1).
+    repeat : int, optional
+        Number of runs per case (default: 3).
+
+    Returns
+    -------
+    results : dict
+        Scale, platform information and per case the minimum wall time in
+        seconds, the maximum peak RSS in bytes and the bytes read.
+    """
+    cases = cases or list(benchmark_cases)
+    unknown = set(cases) - set(benchmark_cases)
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {sorted(unknown)}")
+
+    results = {"scale": scale,
+               "created": datetime.now().isoformat(timespec="seconds"),
+               "platform": platform.platform(),
+               "python": platform.python_version(),
+               "cases": {}}
+
+    for name in cases:
+        case_dir = Path(workdir) / name
+        case_dir.mkdir(parents=True)
+        run = benchmark_cases[name](case_dir, scale)
+        measurements = [measure(run) for _ in range(repeat)]
+
+        results["cases"][name] = {
+            "wall_time": min(m.wall_time for m in measurements),
+            "peak_rss": max(m.peak_rss for m in measurements),
+            "bytes_read": measurements[-1].bytes_read,
+        }
+
+    return results
+
+
+def save_results(results, filename):
+    """
+    Save benchmark results, e.g. as baseline.
+
+    Parameters
+    ----------
+    results : dict
+        Benchmark results.
+    filename : str or pathlib.Path
+        JSON file.
+    """
+    with open(filename, "w") as fid:
+        json.dump(results, fid, indent=2)
+
+
+def load_results(filename):
+    """
+    Load benchmark results.
+
+    Parameters
+    ----------
+    filename : str or pathlib.Path
+        JSON file.
+
+    Returns
+    -------
+    results : dict
+        Benchmark results.
+    """
+    with open(filename) as fid:
+        return json.load(fid)
+
+
+def compare_results(results, baseline, tolerance=0.25):
+    """
+    Compare benchmark results against a baseline.
+
+    A case is a regression if its wall time or peak RSS exceeds the baseline
+    by more than the relative tolerance, and an improvement if its wall time
+    is below the baseline by more than the tolerance.
+
+    Parameters
+    ----------
+    results : dict
+        Benchmark results.
+    baseline : dict
+        Baseline results.
+    tolerance : float, optional
+        Relative tolerance (default: 0.25).
+
+    Returns
+    -------
+    comparison : dict
+        Per case the ratios of wall time, peak RSS and bytes read to the
+        baseline (None if not available) and the status "ok", "regression",
+        "improvement" or "new".
+    """
+    if results["scale"] != baseline["scale"]:
+        raise ValueError(f"Scale {results['scale']} differs from baseline "
+                         f"scale {baseline['scale']}")
+
+    comparison = {}
+    for name, current in results["cases"].items():
+        reference = baseline["cases"].get(name)
+        if reference is None:
+            comparison[name] = {"status": "new"}
+            continue
+
+        ratios = {}
+        for key in ["wall_time", "peak_rss", "bytes_read"]:
+            if current[key] is None or not reference[key]:
+                ratios[key] = None
+            else:
+                ratios[key] = current[key] / reference[key]
+
+        if any(ratios[key] is not None and ratios[key] > 1 + tolerance
+               for key in ["wall_time", "peak_rss"]):
+            status = "regression"
+        elif ratios["wall_time"] is not None and \
+                ratios["wall_time"] < 1 - tolerance:
+            status = "improvement"
+        else:
+            status = "ok"
+
+        comparison[name] = dict(ratios, status=status)
+
+    return comparison
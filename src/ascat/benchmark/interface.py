@@ -0,0 +1,134 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
+# SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
+
+import sys
+import argparse
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ascat.benchmark.benchmark import benchmark_cases
+from ascat.benchmark.benchmark import compare_results
+from ascat.benchmark.benchmark import load_results
+from ascat.benchmark.benchmark import run_benchmarks
+from ascat.benchmark.benchmark import save_results
+
+
+def parse_args_benchmark(args):
+    """
+    Parse command line arguments for running the benchmarks.
+
+    Parameters
+    ----------
+    args : list
+        Command line arguments.
+
+    Returns
+    -------
+    parser : ArgumentParser
+        Argument Parser object.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run benchmarks on synthetic data and compare them "
+        "against a baseline")
+    parser.add_argument(
+        "--cases",
+        metavar="CASES",
+        nargs="+",
+        choices=list(benchmark_cases),
+        help="Benchmark cases to run (default: all). Available cases: "
+        + ", ".join(benchmark_cases))
+    parser.add_argument(
+        "--scale",
+        metavar="SCALE",
+        type=float,
+        default=1.,
+        help="Scale factor of the synthetic data size (default: 1)")
+    parser.add_argument(
+        "--repeat",
+        metavar="REPEAT",
+        type=int,
+        default=3,
+        help="Number of runs per case (default: 3)")
+    parser.add_argument(
+        "--workdir",
+        metavar="WORKDIR",
+        help="Empty or non-existing directory for the synthetic data "
+        "(default: temporary directory)")
+    parser.add_argument(
+        "--baseline",
+        metavar="BASELINE",
+        help="Baseline results (JSON) to compare against")
+    parser.add_argument(
+        "--tolerance",
+        metavar="TOLERANCE",
+        type=float,
+        default=0.25,
+        help="Relative tolerance before a case counts as regression "
+        "(default: 0.25)")
+    parser.add_argument(
+        "--save_baseline",
+        metavar="SAVE_BASELINE",
+        help="Save results (JSON), e.g. as new baseline")
+
+    return parser.parse_args(args)
+
+
+def _format_ratio(ratio):
+    return "-" if ratio is None else f"{ratio:.2f}"
+
+
+def benchmark_main(cli_args):
+    """
+    Run benchmarks and compare them against a baseline.
+
+    Parameters
+    ----------
+    cli_args : list
+        Command line arguments.
+
+    Returns
+    -------
+    n_regressions : int
+        Number of cases slower or using more memory than the baseline.
+    """
+    args = parse_args_benchmark(cli_args)
+
+    if args.workdir:
+        results = run_benchmarks(Path(args.workdir), args.cases, args.scale,
+                                 args.repeat)
+    else:
+        with TemporaryDirectory() as workdir:
+            results = run_benchmarks(Path(workdir), args.cases, args.scale,
+                                     args.repeat)
+
+    if args.save_baseline:
+        save_results(results, args.save_baseline)
+
+    comparison = {}
+    if args.baseline:
+        comparison = compare_results(results, load_results(args.baseline),
+                                     args.tolerance)
+
+    print(f"{'case':<30}{'time [s]':>10}{'peak RSS [MB]':>15}"
+          f"{'read [MB]':>11}  vs. baseline (time/RSS/read)")
+    for name, result in results["cases"].items():
+        bytes_read = result["bytes_read"]
+        bytes_read = "-" if bytes_read is None else f"{bytes_read / 2**20:.1f}"
+        line = (f"{name:<30}{result['wall_time']:>10.3f}"
+                f"{result['peak_rss'] / 2**20:>15.1f}{bytes_read:>11}")
+        if name in comparison:
+            ratios = comparison[name]
+            line += f"  {ratios['status']}"
+            if ratios["status"] != "new":
+                line += " ({})".format("/".join(
+                    _format_ratio(ratios[key])
+                    for key in ["wall_time", "peak_rss", "bytes_read"]))
+        print(line)
+
+    return sum(c["status"] == "regression" for c in comparison.values())
+
+
+def run_benchmark():
+    """Run command line interface for the benchmarks."""
+    sys.exit(1 if benchmark_main(sys.argv[1:]) else 0)
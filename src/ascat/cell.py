@@ -2,6 +2,7 @@
 # SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
 # SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
 
+from contextlib import nullcontext
 from functools import partial
 from pathlib import Path
 
@@ -11,6 +12,8 @@ import numpy as np
 import ascat.accessors
 from ascat.grids import GridRegistry
 
+from ascat.cell_index import CellManifest
+from ascat.cell_index import LocationIndex
 from ascat.file_handling import Filenames
 from ascat.utils import get_grid_gpis
 from ascat.utils import append_to_netcdf
@@ -21,6 +24,21 @@ class RaggedArrayTs(Filenames):
     """
     Class to read and merge ragged array cell files.
     """
+    def __init__(self, filenames, location_index=None):
+        """
+        Initialize RaggedArrayTs.
+
+        Parameters
+        ----------
+        filenames : str, Path, or list
+            File path(s) to be handled.
+        location_index : LocationIndex, optional
+            Location index used to read only the observations of the requested
+            locations from contiguous ragged array files (default: None).
+        """
+        super().__init__(filenames)
+        self.location_index = location_index
+
     def _read(
         self,
         filename,
@@ -28,6 +46,7 @@ class RaggedArrayTs(Filenames):
         lookup_vector=None,
         date_range=None,
         preprocessor=None,
+        use_location_index=True,
         **xarray_kwargs
     ):
         """
@@ -46,6 +65,10 @@ class RaggedArrayTs(Filenames):
             Tuple of (start, end) dates.
         preprocessor : callable, optional
             Function to preprocess the dataset.
+        use_location_index : bool, optional
+            Read the locations through the location index, if there is one.
+            The index reads every location separately, so this should only
+            be used for a few locations (default: True).
         xarray_kwargs : dict
             Additional keyword arguments passed to xarray.open_dataset.
 
@@ -54,6 +77,21 @@ class RaggedArrayTs(Filenames):
         ds : xarray.Dataset
             Dataset.
         """
+        if (self.location_index is not None
+                and use_location_index
+                and location_id is not None
+                and not xarray_kwargs
+                and filename not in self.cache
+                and self.location_index.is_contiguous(filename)):
+            # read only the observations of the locations (no trimming needed)
+            ds = self.location_index.read(filename, location_id,
+                                          date_range=date_range)
+            if ds is not None:
+                if preprocessor:
+                    ds = preprocessor(ds)
+                ds = self._ensure_obs(ds)
+            return ds
+
         if ds := self.cache.get(filename):
             pass
         else:
@@ -78,6 +116,35 @@ class RaggedArrayTs(Filenames):
 
         return ds
 
+    def _read_eager(self, filename, date_range=None, **kwargs):
+        """
+        Read one file, trim it to the date range and load it into memory.
+
+        Used by the thread pool of `read`, so that the cells are opened,
+        trimmed and loaded concurrently.
+
+        Parameters
+        ----------
+        filename : str
+            File to read.
+        date_range : tuple of np.datetime64, optional
+            Tuple of (start, end) dates.
+        **kwargs : dict
+            Additional keyword arguments passed to `_read`.
+
+        Returns
+        -------
+        ds : xarray.Dataset
+            Dataset.
+        """
+        ds = self._read(filename, date_range=date_range, **kwargs)
+        if (ds is not None and date_range is not None
+                and ds.cf_geom.array_type == "contiguous"
+                and "locations" in ds.dims):
+            ds = self._trim_var_range(ds, "time", *date_range)
+
+        return ds.load(scheduler="synchronous") if ds is not None else ds
+
 
     def read(self,
              date_range=None,
@@ -86,6 +153,7 @@ class RaggedArrayTs(Filenames):
              preprocessor=None,
              return_format=None,
              parallel=False,
+             max_workers=None,
              **kwargs):
         """
         Read data from Ragged Array Cell files.
@@ -104,15 +172,24 @@ class RaggedArrayTs(Filenames):
             CF discrete geometry format to return data as. Can be "point", "indexed", or "contiguous".
         parallel : bool, optional
             Whether or not to read/preprocess in parallel. Default is False.
+        max_workers : int, optional
+            Open, trim and load the files in a pool of `max_workers` threads
+            instead of one by one. The data is returned in memory
+            (default: None).
         **kwargs : dict
         """
-        ds, closers = super().read(date_range=date_range,
-                                   location_id=location_id,
-                                   lookup_vector=lookup_vector,
-                                   preprocessor=preprocessor,
-                                   closer_attr="_close",
-                                   parallel=parallel,
-                                   **kwargs)
+        # save newly indexed cell files once after reading all of them
+        batch = (self.location_index.batch()
+                 if self.location_index is not None else nullcontext())
+        with batch:
+            ds, closers = super().read(date_range=date_range,
+                                       location_id=location_id,
+                                       lookup_vector=lookup_vector,
+                                       preprocessor=preprocessor,
+                                       closer_attr="_close",
+                                       parallel=parallel,
+                                       max_workers=max_workers,
+                                       **kwargs)
 
         if ds is not None:
             ds.set_close(partial(super()._multi_file_closer, closers))
@@ -551,6 +628,9 @@ class CellGridFiles():
         fn_format="{cell:04d}.nc",
         sf_format=None,
         preprocessor=None,
+        location_index=None,
+        manifest=None,
+        max_workers=None,
     ):
         """
         Initialize cell grid files.
@@ -569,6 +649,23 @@ class CellGridFiles():
             Format string for subdirectories, if any.
         preprocessor : callable, optional
             Function to preprocess datasets when reading.
+        location_index : bool, str, Path or LocationIndex, optional
+            Read location_id and coords requests from contiguous ragged array
+            cell files through a location index, reading only the observations
+            of the matched locations, and skip cell files without
+            observations in the date_range of a read. True keeps the index in
+            `root_path / "location_index.npz"`, a path or LocationIndex
+            selects another one. Only used with RaggedArrayTs files
+            (default: None, no index).
+        manifest : bool, str, Path or CellManifest, optional
+            Find the files of a cell in a manifest of the collection instead
+            of searching `root_path` recursively. True keeps the manifest in
+            `root_path / "cell_manifest.json"`, a path or CellManifest
+            selects another one (default: None, no manifest).
+        max_workers : int, optional
+            Default number of threads opening, trimming and loading the cell
+            files of a read concurrently (see `RaggedArrayTs.read`). Can be
+            overridden per read (default: None, files are read one by one).
         """
         self.root_path = Path(root_path)
         self.file_class = file_class
@@ -578,6 +675,12 @@ class CellGridFiles():
         self._preprocessor = preprocessor
         self._active_reader = None
 
+        self.location_index = LocationIndex.resolve(location_index,
+                                                    self.root_path)
+        self.manifest = CellManifest.resolve(manifest, self.root_path,
+                                             fn_format=fn_format)
+        self.max_workers = max_workers
+
 
     @classmethod
     def from_product_id(cls, root_path, product_id, **kwargs):
@@ -607,6 +710,8 @@ class CellGridFiles():
     def fn_search(self, cell):
         # get the paths to files matching a cell if the files exist
         filename = self.fn_format.format(cell)
+        if self.manifest is not None:
+            return self.manifest.lookup(filename, subfolder=self.sf_format)
         if self.sf_format is not None:
             subfolder = self.sf_format
             files = list(self.root_path.glob(subfolder + "/" + filename))
@@ -823,6 +928,9 @@ class CellGridFiles():
             selected (in spherical cartesian coordinates). Default is np.inf.
         date_range : tuple of np.datetime64
             Tuple of (start, end) dates.
+        **kwargs : dict
+            Keyword arguments passed to the read method of `file_class`,
+            e.g. `max_workers`.
 
         Returns
         -------
@@ -837,10 +945,21 @@ class CellGridFiles():
             bbox=bbox,
             geom=geom,
         )
+        if date_range is not None and self.location_index is not None:
+            # skip cell files without observations in the date range
+            with self.location_index.batch():
+                filenames = [f for f in filenames
+                             if self.location_index.overlaps(f, *date_range)]
+
         if ((self._active_reader is None)
+            or not filenames
             or not
             all(filename in self._active_reader.cache for filename in filenames)):
-            self._active_reader = self.file_class(filenames)
+            if self.location_index is not None:
+                self._active_reader = self.file_class(
+                    filenames, location_index=self.location_index)
+            else:
+                self._active_reader = self.file_class(filenames)
 
         if all(criterion is None for criterion in [cell, location_id, coords, bbox, geom]):
             valid_gpis = None
@@ -860,6 +979,15 @@ class CellGridFiles():
                 return_lookup=True
             )
 
+        if self.max_workers is not None and not kwargs.get("parallel"):
+            kwargs.setdefault("max_workers", self.max_workers)
+        if self.location_index is not None:
+            # the index reads every location separately, so it is only used
+            # for location_id and coords requests, not for bbox and geom
+            # requests covering whole cells
+            kwargs.setdefault("use_location_index",
+                              location_id is not None or coords is not None)
+
         out_ds = self._active_reader.read(date_range=date_range,
                                           location_id=valid_gpis,
                                           lookup_vector=lookup_vector,
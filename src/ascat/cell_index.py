@@ -0,0 +1,1027 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
+# SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
+
+"""
+Manifest, location and time index of ragged array cell files.
+
+Reading one location from a contiguous ragged array cell file normally means
+opening the cell, reading its whole count variable and summing it up to find
+where the observations of the location start. Reading a date range means
+opening every cell and comparing all of its times. :class:`LocationIndex`
+stores the position, start, count and time extent of every location, and the
+time extent of every cell file, once in a sidecar file. The time series of a
+location is then read as a hyperslab of only its observations, and cell
+files without observations in a date range are skipped.
+
+Finding the file of a cell normally means a recursive glob of the whole
+collection. :class:`CellManifest` keeps the paths, sizes, modification times
+and variable schemas of the cell files of a collection, so the files of a
+cell are found with a dict lookup.
+"""
+
+import fnmatch
+import glob
+import json
+import os
+import string
+import threading
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from pathlib import PurePosixPath
+from time import monotonic
+
+import h5netcdf
+import h5py
+import numpy as np
+import xarray as xr
+
+#: Variables of the per-location index entries.
+location_vars = ["location_id", "position", "start", "count", "time_min",
+                 "time_max"]
+
+_nat = np.datetime64("NaT", "ns")
+
+
+def _read_attrs(obj):
+    """
+    Attributes of a h5netcdf file or variable, with bytes decoded to str
+    like the xarray netCDF backends do, so CF decoding gives the same result.
+    """
+    attrs = {}
+    for key, value in obj.attrs.items():
+        if key not in ["_FillValue", "missing_value"] and isinstance(
+                value, bytes):
+            value = value.decode("utf-8", errors="replace")
+        attrs[key] = value
+
+    return attrs
+
+
+def _read_hyperslab(var, key):
+    """
+    Read a hyperslab of a h5netcdf variable, decoding variable length strings.
+    """
+    data = np.asarray(var[key])
+    string_info = h5py.check_string_dtype(var.dtype)
+    if string_info is not None and data.dtype.kind in "OS":
+        decode = np.frompyfunc(
+            lambda v: v.decode(string_info.encoding)
+            if isinstance(v, bytes) else v, 1, 1)
+        data = np.asarray(decode(data), dtype=object)
+
+    return data
+
+
+def _read_times(var, key=Ellipsis):
+    """
+    Read and decode a hyperslab of a time variable.
+
+    Returns
+    -------
+    time : numpy.ndarray or None
+        Times (datetime64[ns]), or None if the variable does not decode
+        to datetimes.
+    """
+    data = xr.Variable(var.dimensions, np.asarray(var[key]), _read_attrs(var))
+    time = xr.decode_cf(xr.Dataset({"time": data}))["time"].values
+    if time.dtype.kind != "M":
+        return None
+
+    return time.astype("datetime64[ns]")
+
+
+def _time_extent(time, start, count):
+    """
+    Minimum and maximum time of adjacent observation ranges, NaT for empty
+    ranges.
+    """
+    time_min = np.full(start.size, _nat)
+    time_max = np.full(start.size, _nat)
+    nonzero = np.flatnonzero(count > 0)
+    if nonzero.size == 0:
+        return time_min, time_max
+
+    nonzero = nonzero[np.argsort(start[nonzero])]
+    end = start[nonzero[-1]] + count[nonzero[-1]]
+    nat = np.isnat(time[:end])
+    values = time[:end].view(np.int64)
+    # NaT is the smallest int64, so it only has to be masked for the minimum
+    lo = np.minimum.reduceat(
+        np.where(nat, np.iinfo(np.int64).max, values), start[nonzero])
+    hi = np.maximum.reduceat(values, start[nonzero])
+    lo[lo == np.iinfo(np.int64).max] = hi[lo == np.iinfo(np.int64).max]
+    time_min[nonzero] = lo.view("datetime64[ns]")
+    time_max[nonzero] = hi.view("datetime64[ns]")
+
+    return time_min, time_max
+
+
+def index_cell_file(filename, count_var="row_size",
+                    instance_id_var="location_id", time_var="time"):
+    """
+    Time extent of a cell file and, for a contiguous ragged array file, the
+    observation ranges and time extents of its locations.
+
+    Only the count, instance identifier and time variables are read.
+    Fill/padding locations (negative or fill value counts) are left out, as in
+    `ContiguousRaggedArray.trim`.
+
+    Parameters
+    ----------
+    filename : str or Path
+        Cell file.
+    count_var : str, optional
+        Count variable name (default: "row_size").
+    instance_id_var : str, optional
+        Instance identifier variable name (default: "location_id").
+    time_var : str, optional
+        Time variable name (default: "time").
+
+    Returns
+    -------
+    index : dict
+        "has_time" (False if the file has no decodable 1-dimensional time
+        variable),
+        "time_min" and "time_max" of the file (NaT if it has no valid times)
+        and "locations": arrays "location_id",
+        "position" (on the instance dimension), "start", "count" (on the
+        sample dimension), "time_min" and "time_max" sorted by location_id,
+        or None if the file is not a contiguous ragged array file.
+    """
+    with h5netcdf.File(filename, "r") as f:
+        time = None
+        if time_var in f.variables and f.variables[time_var].ndim == 1:
+            time = _read_times(f.variables[time_var])
+
+        contiguous = (count_var in f.variables
+                      and instance_id_var in f.variables
+                      and "sample_dimension" in f.variables[count_var].attrs)
+        if contiguous:
+            count = np.asarray(f.variables[count_var][...], dtype=np.int64)
+            fill_value = f.variables[count_var].attrs.get("_FillValue")
+            location_id = np.asarray(f.variables[instance_id_var][...],
+                                     dtype=np.int64)
+
+    index = {"has_time": time is not None, "time_min": _nat,
+             "time_max": _nat, "locations": None}
+    if time is not None and not np.isnat(time).all():
+        valid_time = time[~np.isnat(time)]
+        index["time_min"], index["time_max"] = valid_time.min(), valid_time.max()
+
+    if not contiguous:
+        return index
+
+    valid = count >= 0
+    if fill_value is not None:
+        valid &= count != np.asarray(fill_value).item()
+    count = np.where(valid, count, 0)
+    start = np.cumsum(count) - count
+
+    position = np.flatnonzero(valid)
+    position = position[np.argsort(location_id[position], kind="stable")]
+
+    locations = {
+        "location_id": location_id[position],
+        "position": position,
+        "start": start[position],
+        "count": count[position],
+    }
+    if time is not None:
+        locations["time_min"], locations["time_max"] = _time_extent(
+            time, locations["start"], locations["count"])
+    else:
+        locations["time_min"] = np.full(position.size, _nat)
+        locations["time_max"] = np.full(position.size, _nat)
+    index["locations"] = locations
+
+    return index
+
+
+class LocationIndex:
+    """
+    Sidecar index of the locations and time extents of ragged array cell
+    files.
+
+    For every cell file the index holds the minimum and maximum time of its
+    observations, so files outside of a date range can be skipped without
+    opening them. For every location of a contiguous ragged array file it
+    also holds the position of the location on the instance dimension, the
+    start and count of its observations on the sample dimension and their
+    time extent. :meth:`read` then reads the time series of a location as
+    hyperslabs of only its observations instead of opening the whole cell,
+    and for time sorted locations only the observations within a date range.
+
+    Cell files are indexed on first use (or with :meth:`add`) and re-indexed
+    when their size or modification time changes. The index is saved as .npz
+    next to the cell files, with file paths relative to the index file.
+    """
+
+    #: Default file name of the index in the root path of a collection.
+    default_filename = "location_index.npz"
+
+    def __init__(self, filename, count_var="row_size",
+                 instance_id_var="location_id", time_var="time"):
+        """
+        Initialize the index.
+
+        Parameters
+        ----------
+        filename : str or Path
+            Index file (.npz). Loaded if it exists.
+        count_var : str, optional
+            Count variable name (default: "row_size").
+        instance_id_var : str, optional
+            Instance identifier variable name (default: "location_id").
+        time_var : str, optional
+            Time variable name (default: "time").
+        """
+        self.filename = Path(filename)
+        self.count_var = count_var
+        self.instance_id_var = instance_id_var
+        self.time_var = time_var
+        self._files = None
+        self._save_failed = False
+        self._dirty = False
+        self._batch_depth = 0
+        # cell files may be read from several threads
+        self._lock = threading.RLock()
+
+    @classmethod
+    def resolve(cls, location_index, root_path, **kwargs):
+        """
+        Index selected by a `location_index` option of a reader or writer.
+
+        Parameters
+        ----------
+        location_index : bool, str, Path, LocationIndex or None
+            True for the default index file in `root_path`, a path of an
+            index file or an index. False or None for no index.
+        root_path : str or Path
+            Root path of the cell files.
+        **kwargs : dict
+            Keyword arguments passed to LocationIndex if it is created.
+
+        Returns
+        -------
+        location_index : LocationIndex or None
+            Location index.
+        """
+        if location_index is None or location_index is False:
+            return None
+        if location_index is True:
+            location_index = Path(root_path) / cls.default_filename
+        if isinstance(location_index, (str, Path)):
+            location_index = cls(location_index, **kwargs)
+
+        return location_index
+
+    @property
+    def files(self):
+        """
+        Index entries of the cell files.
+
+        Returns
+        -------
+        files : dict
+            Absolute cell file path mapped to a dict with the "mtime_ns" and
+            "size" of the file when it was indexed and its index (see
+            `index_cell_file`).
+        """
+        with self._lock:
+            if self._files is None:
+                self._files = self._load()
+
+        return self._files
+
+    def _load(self):
+        """
+        Read the index file.
+        """
+        if not self.filename.exists():
+            return {}
+
+        root = self.filename.parent
+        with np.load(self.filename) as data:
+            settings = [str(data[key]) if key in data else None
+                        for key in ["count_var", "instance_id_var",
+                                    "time_var"]]
+            if settings != [self.count_var, self.instance_id_var,
+                            self.time_var]:
+                return {}
+
+            bounds = np.concatenate([[0], np.cumsum(data["n_locations"])])
+            files = {}
+            for i, name in enumerate(data["files"]):
+                locations = None
+                if data["contiguous"][i]:
+                    rows = slice(bounds[i], bounds[i + 1])
+                    locations = {
+                        var: data[f"location_{var}"][rows]
+                        if var.startswith("time") else data[var][rows]
+                        for var in location_vars
+                    }
+                    for var in ["time_min", "time_max"]:
+                        locations[var] = locations[var].view("datetime64[ns]")
+                files[os.path.normpath(root / str(name))] = {
+                    "mtime_ns": int(data["mtime_ns"][i]),
+                    "size": int(data["size"][i]),
+                    "has_time": bool(data["has_time"][i]),
+                    "time_min": data["time_min"][i].view("datetime64[ns]"),
+                    "time_max": data["time_max"][i].view("datetime64[ns]"),
+                    "locations": locations,
+                }
+
+        return files
+
+    def save(self):
+        """
+        Write the index file.
+
+        The file is written to a temporary file first and then moved into
+        place, so readers never see a partially written index.
+        """
+        entries = list(self.files.items())
+        locations = [entry["locations"] for _, entry in entries]
+        data = {
+            "count_var": np.array(self.count_var),
+            "instance_id_var": np.array(self.instance_id_var),
+            "time_var": np.array(self.time_var),
+            "files": np.array([
+                os.path.relpath(name, self.filename.parent)
+                for name, _ in entries
+            ], dtype=str),
+            "mtime_ns": np.array([e["mtime_ns"] for _, e in entries],
+                                 dtype=np.int64),
+            "size": np.array([e["size"] for _, e in entries], dtype=np.int64),
+            "has_time": np.array([e["has_time"] for _, e in entries],
+                                 dtype=bool),
+            "contiguous": np.array([loc is not None for loc in locations],
+                                   dtype=bool),
+            "n_locations": np.array([
+                0 if loc is None else loc["location_id"].size
+                for loc in locations
+            ], dtype=np.int64),
+        }
+        for var in ["time_min", "time_max"]:
+            data[var] = np.array([e[var] for _, e in entries],
+                                 dtype="datetime64[ns]").view(np.int64)
+        for var in location_vars:
+            values = np.concatenate(
+                [np.zeros(0, dtype=np.int64)]
+                + [loc[var].view(np.int64) for loc in locations
+                   if loc is not None])
+            if var.startswith("time"):
+                var = f"location_{var}"
+            data[var] = values
+
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        tmp_filename = self.filename.with_name(self.filename.name + ".tmp")
+        with open(tmp_filename, "wb") as f:
+            np.savez(f, **data)
+        os.replace(tmp_filename, self.filename)
+
+    def _save_or_warn(self):
+        """
+        Save the index, keeping it in memory only if the file is not writable.
+        """
+        try:
+            self.save()
+        except OSError as e:
+            if not self._save_failed:
+                warnings.warn(f"Location index could not be saved to "
+                              f"'{self.filename}': {e}", stacklevel=2)
+            self._save_failed = True
+        self._dirty = False
+
+    @contextmanager
+    def batch(self):
+        """
+        Save the index once at the end of a block instead of after every
+        newly indexed cell file.
+
+        Batches can be nested and used from several threads; the index is
+        saved when the outermost batch ends.
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._dirty:
+                    self._save_or_warn()
+
+    def _refresh(self, filename):
+        """
+        Index a cell file if it is new or has changed.
+
+        Returns
+        -------
+        changed : bool
+            True if the file was (re-)indexed.
+        """
+        name = os.path.abspath(filename)
+        stat = os.stat(name)
+        entry = self.files.get(name)
+        if (entry is not None and entry["mtime_ns"] == stat.st_mtime_ns
+                and entry["size"] == stat.st_size):
+            return False
+
+        self.files[name] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            **index_cell_file(name, self.count_var, self.instance_id_var,
+                              self.time_var),
+        }
+
+        return True
+
+    def add(self, filenames):
+        """
+        Index cell files and save the index.
+
+        Parameters
+        ----------
+        filenames : list of str or Path
+            Cell files. Files already indexed and unchanged are skipped.
+        """
+        with self.batch():
+            for f in filenames:
+                self._entry(f)
+
+    def _entry(self, filename):
+        """
+        Index entry of a cell file, (re-)indexing it if necessary.
+
+        A changed index is saved right away, or at the end of the current
+        batch.
+        """
+        with self._lock:
+            if self._refresh(filename):
+                self._dirty = True
+                if self._batch_depth == 0:
+                    self._save_or_warn()
+
+            return self.files[os.path.abspath(filename)]
+
+    def is_contiguous(self, filename):
+        """
+        Check whether locations of a file can be read through the index.
+
+        Parameters
+        ----------
+        filename : str or Path
+            Cell file.
+
+        Returns
+        -------
+        contiguous : bool
+            True if the file is a contiguous ragged array file.
+        """
+        return self._entry(filename)["locations"] is not None
+
+    def time_range(self, filename):
+        """
+        Time extent of the observations of a cell file.
+
+        Parameters
+        ----------
+        filename : str or Path
+            Cell file.
+
+        Returns
+        -------
+        time_min, time_max : numpy.datetime64
+            First and last time (NaT if the file has no valid times or no
+            time variable).
+        """
+        entry = self._entry(filename)
+
+        return entry["time_min"], entry["time_max"]
+
+    def overlaps(self, filename, start, end):
+        """
+        Check whether a cell file may have observations in a date range.
+
+        Parameters
+        ----------
+        filename : str or Path
+            Cell file.
+        start, end : numpy.datetime64
+            Date range, the end is exclusive.
+
+        Returns
+        -------
+        overlaps : bool
+            False if the file has no observations in the date range. Files
+            without a time variable are assumed to overlap.
+        """
+        entry = self._entry(filename)
+        if not entry["has_time"]:
+            return True
+        if np.isnat(entry["time_min"]):
+            return False
+
+        return bool(entry["time_min"] < np.datetime64(end, "ns")
+                    and entry["time_max"] >= np.datetime64(start, "ns"))
+
+    def lookup(self, filename, location_id):
+        """
+        Observation ranges of locations in a cell file.
+
+        Parameters
+        ----------
+        filename : str or Path
+            Cell file.
+        location_id : int or array-like of int
+            Location identifiers. Identifiers not in the file are ignored.
+
+        Returns
+        -------
+        locations : dict
+            Arrays "location_id", "position", "start", "count", "time_min"
+            and "time_max" of the found locations, sorted by identifier.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a contiguous ragged array file.
+        """
+        locations = self._entry(filename)["locations"]
+        if locations is None:
+            raise ValueError(
+                f"'{filename}' is not a contiguous ragged array file "
+                f"with '{self.count_var}' and '{self.instance_id_var}'")
+
+        location_id = np.unique(np.asarray(location_id, dtype=np.int64))
+        idx = np.searchsorted(locations["location_id"], location_id)
+        in_range = idx < locations["location_id"].size
+        idx = idx[in_range]
+        idx = idx[locations["location_id"][idx] == location_id[in_range]]
+
+        return {var: locations[var][idx] for var in location_vars}
+
+    def _select_dates(self, f, locations, start, end):
+        """
+        Observation ranges of locations restricted to a date range.
+
+        Locations entirely within or outside of the date range are resolved
+        from their time extent. For the others the times of the location are
+        read; if they are sorted only the range within the dates is kept,
+        otherwise a mask is returned along with the full range.
+
+        Returns
+        -------
+        selections : list of tuple
+            (slice, mask or None) on the sample dimension per location.
+        """
+        start = np.datetime64(start, "ns")
+        end = np.datetime64(end, "ns")
+
+        selections = []
+        for s, c, t0, t1 in zip(locations["start"], locations["count"],
+                                locations["time_min"], locations["time_max"]):
+            obs = slice(s, s + c)
+            if c == 0 or np.isnat(t0) or t0 >= end or t1 < start:
+                selections.append((slice(s, s), None))
+                continue
+            if t0 >= start and t1 < end:
+                selections.append((obs, None))
+                continue
+
+            time = _read_times(f.variables[self.time_var], obs)
+            if np.all(time[1:] >= time[:-1]):
+                i0, i1 = np.searchsorted(time, [start, end])
+                selections.append((slice(s + i0, s + i1), None))
+            else:
+                selections.append((obs, (time >= start) & (time < end)))
+
+        return selections
+
+    def read(self, filename, location_id, date_range=None, **kwargs):
+        """
+        Read the time series of locations from a cell file.
+
+        Only the observations of the requested locations and the requested
+        positions of the instance variables are read. The result is the
+        same as selecting the locations from the opened cell: a single
+        location comes without the instance dimension, several locations
+        are sorted by identifier and keep it.
+
+        Parameters
+        ----------
+        filename : str or Path
+            Cell file.
+        location_id : int or array-like of int
+            Location identifier(s).
+        date_range : tuple of numpy.datetime64, optional
+            Only read observations with start <= time < end. The count
+            variable holds the number of observations kept per location.
+        **kwargs : dict
+            Keyword arguments passed to `xarray.decode_cf`.
+
+        Returns
+        -------
+        ds : xarray.Dataset or None
+            Time series of the locations, or None if none of them is in
+            the file.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a contiguous ragged array file.
+        """
+        single = np.size(location_id) == 1
+        locations = self.lookup(filename, location_id)
+        position = locations["position"]
+        if position.size == 0:
+            return None
+
+        variables = {}
+        with h5netcdf.File(filename, "r") as f:
+            count_nc = f.variables[self.count_var]
+            sample_dim = count_nc.attrs["sample_dimension"]
+            if isinstance(sample_dim, bytes):
+                sample_dim = sample_dim.decode("utf-8")
+            instance_dim = count_nc.dimensions[0]
+
+            if date_range is None or not self._entry(filename)["has_time"]:
+                selections = [(slice(s, s + c), None) for s, c in
+                              zip(locations["start"], locations["count"])]
+            else:
+                selections = self._select_dates(f, locations, *date_range)
+
+            for name, var in f.variables.items():
+                dims = var.dimensions
+                key = [slice(None)] * len(dims)
+                if instance_dim in dims:
+                    key[dims.index(instance_dim)] = (int(position[0])
+                                                     if single else slice(None))
+
+                if sample_dim in dims:
+                    axis = dims.index(sample_dim)
+                    out_axis = axis - int(single and instance_dim in dims[:axis])
+                    parts = []
+                    for obs, mask in selections:
+                        key[axis] = obs
+                        part = _read_hyperslab(var, tuple(key))
+                        if mask is not None:
+                            part = np.compress(mask, part, axis=out_axis)
+                        parts.append(part)
+                    data = np.concatenate(parts, axis=out_axis)
+                else:
+                    data = _read_hyperslab(var, tuple(key))
+
+                if instance_dim in dims:
+                    if single:
+                        dims = tuple(d for d in dims if d != instance_dim)
+                    else:
+                        data = np.take(data, position,
+                                       axis=dims.index(instance_dim))
+
+                if name == self.count_var and date_range is not None:
+                    counts = [obs.stop - obs.start if mask is None
+                              else int(mask.sum())
+                              for obs, mask in selections]
+                    data = np.asarray(counts if not single else counts[0],
+                                      dtype=data.dtype)
+
+                variables[name] = xr.Variable(dims, data, _read_attrs(var))
+
+            attrs = _read_attrs(f)
+
+        return xr.decode_cf(xr.Dataset(variables, attrs=attrs), **kwargs)
+
+
+def _fn_pattern(fn_format):
+    """
+    Glob pattern of the file names of a cell file name format.
+    """
+    parts = []
+    for literal, field, _, _ in string.Formatter().parse(fn_format):
+        parts.append(glob.escape(literal))
+        if field is not None:
+            parts.append("*")
+
+    return "".join(parts)
+
+
+def _read_schema(filename):
+    """
+    Dimensions and data types of the variables of a netCDF file.
+
+    Returns
+    -------
+    schema : dict or None
+        Variable name mapped to its "dims" and "dtype", or None if the file
+        cannot be read.
+    """
+    try:
+        with h5netcdf.File(filename, "r") as f:
+            return {
+                name: {"dims": list(var.dimensions), "dtype": str(var.dtype)}
+                for name, var in f.variables.items()
+            }
+    except OSError:
+        return None
+
+
+class CellManifest:
+    """
+    Manifest of the cell files of a collection.
+
+    The manifest holds the path, size, modification time and variable schema
+    of every cell file below a root path, so the files of a cell are found
+    with a dict lookup instead of a recursive glob of the collection.
+
+    The manifest is refreshed incrementally: the modification times of the
+    indexed directories are checked on every lookup (or at most every
+    `listing_ttl` seconds if given) and only directories in which files were
+    added, removed or replaced are listed again. Cell files rewritten in place do not change the
+    modification time of their directory; ``refresh(stat_files=True)``
+    checks every file. The manifest is saved as JSON, with paths relative to
+    the root path.
+    """
+
+    #: Default file name of the manifest in the root path of a collection.
+    default_filename = "cell_manifest.json"
+
+    def __init__(self, filename, root_path=None, fn_format="{:04d}.nc",
+                 listing_ttl=0.):
+        """
+        Initialize the manifest.
+
+        Parameters
+        ----------
+        filename : str or Path
+            Manifest file (.json). Loaded if it exists.
+        root_path : str or Path, optional
+            Root path of the cell files (default: directory of `filename`).
+        fn_format : str, optional
+            Cell file name format; files with other names are not listed
+            (default: "{:04d}.nc").
+        listing_ttl : float, optional
+            Seconds after which the directory modification times are checked
+            again on lookup. Files added within this time are not found
+            unless `refresh` is called. 0 checks them on every lookup
+            (default: 0.).
+        """
+        self.filename = Path(filename)
+        self.root_path = (Path(root_path) if root_path is not None else
+                          self.filename.parent)
+        self.fn_format = fn_format
+        self.pattern = _fn_pattern(fn_format)
+        self.listing_ttl = listing_ttl
+        self._dirs = None
+        self._files = None
+        self._names = {}
+        self._checked = None
+        self._save_failed = False
+        self._lock = threading.RLock()
+
+    @classmethod
+    def resolve(cls, manifest, root_path, **kwargs):
+        """
+        Manifest selected by a `manifest` option of a reader.
+
+        Parameters
+        ----------
+        manifest : bool, str, Path, CellManifest or None
+            True for the default manifest file in `root_path`, a path of a
+            manifest file or a manifest. False or None for no manifest.
+        root_path : str or Path
+            Root path of the cell files.
+        **kwargs : dict
+            Keyword arguments passed to CellManifest if it is created.
+
+        Returns
+        -------
+        manifest : CellManifest or None
+            Cell manifest.
+        """
+        if manifest is None or manifest is False:
+            return None
+        if manifest is True:
+            manifest = Path(root_path) / cls.default_filename
+        if isinstance(manifest, (str, Path)):
+            manifest = cls(manifest, root_path=root_path, **kwargs)
+
+        return manifest
+
+    @property
+    def files(self):
+        """
+        Manifest entries of the cell files.
+
+        Returns
+        -------
+        files : dict
+            Absolute cell file path mapped to a dict with the "size",
+            "mtime_ns" and "schema" (see `schema`) of the file.
+        """
+        self._check()
+        return {os.path.abspath(self.root_path / name): entry
+                for name, entry in self._files.items()}
+
+    def _load(self):
+        """
+        Read the manifest file.
+        """
+        self._dirs, self._files = {}, {}
+        if not self.filename.exists():
+            return
+
+        with open(self.filename) as f:
+            data = json.load(f)
+        if data.get("pattern") == self.pattern:
+            self._dirs, self._files = data["dirs"], data["files"]
+
+    def save(self):
+        """
+        Write the manifest file.
+
+        The file is written to a temporary file first and then moved into
+        place, so readers never see a partially written manifest.
+        """
+        data = {"pattern": self.pattern, "dirs": self._dirs,
+                "files": self._files}
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        tmp_filename = self.filename.with_name(self.filename.name + ".tmp")
+        with open(tmp_filename, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_filename, self.filename)
+
+    def _save_or_warn(self):
+        """
+        Save the manifest, keeping it in memory only if the file is not
+        writable.
+        """
+        try:
+            self.save()
+        except OSError as e:
+            if not self._save_failed:
+                warnings.warn(f"Cell manifest could not be saved to "
+                              f"'{self.filename}': {e}", stacklevel=2)
+            self._save_failed = True
+
+    def _file_entry(self, name, entry):
+        """
+        Manifest entry of a cell file, reusing `entry` if the file did not
+        change.
+        """
+        try:
+            stat = os.stat(self.root_path / name)
+        except FileNotFoundError:
+            return None
+        if (entry is not None and entry["mtime_ns"] == stat.st_mtime_ns
+                and entry["size"] == stat.st_size):
+            return entry
+
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                "schema": _read_schema(self.root_path / name)}
+
+    def refresh(self, stat_files=False):
+        """
+        Update the manifest from the directories that changed and save it.
+
+        Parameters
+        ----------
+        stat_files : bool, optional
+            Also check the size and modification time of the files in
+            unchanged directories (default: False).
+
+        Returns
+        -------
+        changed : bool
+            True if cell files were added, removed or changed.
+        """
+        with self._lock:
+            return self._refresh(stat_files)
+
+    def _refresh(self, stat_files):
+        """
+        Update the manifest, see `refresh`.
+        """
+        if self._files is None:
+            self._load()
+
+        dirs, files = {}, {}
+        stack = ["."]
+        while stack:
+            dir_name = stack.pop()
+            path = self.root_path / dir_name
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                continue
+
+            entry = self._dirs.get(dir_name)
+            check_files = stat_files
+            if entry is None or entry["mtime_ns"] != mtime_ns:
+                subdirs, names = [], []
+                with os.scandir(path) as it:
+                    for item in it:
+                        if item.is_dir():
+                            subdirs.append(item.name)
+                        elif (item.is_file() and fnmatch.fnmatchcase(
+                                item.name, self.pattern)):
+                            names.append(item.name)
+                entry = {"mtime_ns": mtime_ns, "dirs": sorted(subdirs),
+                         "files": sorted(names)}
+                check_files = True
+            dirs[dir_name] = entry
+
+            prefix = PurePosixPath(dir_name)
+            for file_name in entry["files"]:
+                name = str(prefix / file_name)
+                file_entry = self._files.get(name)
+                if check_files or file_entry is None:
+                    file_entry = self._file_entry(name, file_entry)
+                if file_entry is not None:
+                    files[name] = file_entry
+            stack.extend(str(prefix / d) for d in entry["dirs"])
+
+        changed = files != self._files
+        self._dirs, self._files = dirs, files
+        self._names = {}
+        for name in sorted(files):
+            self._names.setdefault(PurePosixPath(name).name, []).append(name)
+        self._checked = monotonic()
+        if changed:
+            self._save_or_warn()
+
+        return changed
+
+    def _check(self):
+        """
+        Refresh the manifest if the directories were not checked within the
+        last `listing_ttl` seconds.
+        """
+        with self._lock:
+            if (self._checked is None
+                    or monotonic() - self._checked > self.listing_ttl):
+                self._refresh(False)
+
+    def lookup(self, name, subfolder=None):
+        """
+        Paths of the cell files with a file name.
+
+        Parameters
+        ----------
+        name : str
+            Cell file name.
+        subfolder : str, optional
+            Glob pattern of the directory of the files, relative to the root
+            path. If None (default), files in any directory are returned.
+
+        Returns
+        -------
+        filenames : list of Path
+            Sorted cell file paths.
+        """
+        self._check()
+        names = self._names.get(name, [])
+        if subfolder is not None:
+            pattern = PurePosixPath(subfolder, name)
+            names = [n for n in names
+                     if len(PurePosixPath(n).parts) == len(pattern.parts)
+                     and PurePosixPath(n).match(str(pattern))]
+
+        return [self.root_path / n for n in names]
+
+    def cell_files(self, cell):
+        """
+        Paths of the files of a cell.
+
+        Parameters
+        ----------
+        cell : int
+            Cell number.
+
+        Returns
+        -------
+        filenames : list of Path
+            Sorted cell file paths.
+        """
+        return self.lookup(self.fn_format.format(cell))
+
+    def schema(self, filename):
+        """
+        Variable schema of a cell file.
+
+        Parameters
+        ----------
+        filename : str or Path
+            Cell file.
+
+        Returns
+        -------
+        schema : dict or None
+            Variable name mapped to a dict of its "dims" and "dtype", or None
+            if the file is not in the manifest or could not be read.
+        """
+        entry = self.files.get(os.path.abspath(filename))
+        return None if entry is None else entry["schema"]
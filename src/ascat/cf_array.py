@@ -9,6 +9,8 @@ from typing import Union, Sequence, Callable
 import numpy as np
 import xarray as xr
 
+from ascat.array_utils import vrange
+
 # The dataset-level conversions live in a class-free module; re-exported here
 # for backward compatibility.
 from ascat.cf_conversions import (  # noqa: F401
@@ -480,57 +482,46 @@ class RaggedArray(CFDiscreteGeom):
             if instance_lookup_vector is not None and sum(instance_lookup_vector) > 0:
                 instance_vals = np.where(instance_lookup_vector)[0]
 
-        def get_single_instance_idxs(ds, instance_val):
-            instances_idx = np.where(ds[timeseries_id] == instance_val)[0]
-            if len(instances_idx) == 0:
-                return None
-            instances_idx = int(instances_idx[0])
-            sample_start = int(
-                ds[count_var].isel({instance_dim: slice(0, instances_idx)}).sum().values
-            )
-            sample_end = int(
-                sample_start + ds[count_var].isel({instance_dim: instances_idx}).values
-            )
-            return sample_start, sample_end, instances_idx
-
-        def select_single_instance(ds, sample_start, sample_end, instances_idx):
+        if len(instance_vals) == 0:
+            return None
+
+        # a single requested id is returned without the instance dimension
+        single = len(instance_vals) == 1
+        instance_vals = np.unique(instance_vals)
+        ds[count_var].load()
+        ds[timeseries_id].load()
+
+        # position of the first instance of each requested id
+        ids = ds[timeseries_id].values
+        order = np.argsort(ids, kind="stable")
+        rank = np.clip(np.searchsorted(ids[order], instance_vals), 0,
+                       max(ids.size - 1, 0))
+        found = (ids[order][rank] == instance_vals) if ids.size else \
+            np.zeros(instance_vals.size, dtype=bool)
+        instances_idxs = order[rank[found]]
+        if instances_idxs.size == 0:
+            return None
+
+        # fill locations (negative counts) hold no samples
+        counts = np.maximum(ds[count_var].values.astype(np.int64), 0)
+        sample_starts = (np.cumsum(counts) - counts)[instances_idxs]
+        sample_ends = sample_starts + counts[instances_idxs]
+
+        if single:
             return ds.isel(
                 {
-                    sample_dim: slice(sample_start, sample_end),
-                    instance_dim: instances_idx,
+                    sample_dim: slice(int(sample_starts[0]),
+                                      int(sample_ends[0])),
+                    instance_dim: int(instances_idxs[0]),
                 }
             )
 
-        def select_several_instances(ds, sample_starts, sample_ends, instances_idxs):
-            sample_idxs = np.concatenate(
-                [range(start, end)
-                 for start, end
-                 in zip(sample_starts, sample_ends)
-                 if end > start]
-            )
-            return ds.isel({sample_dim: sample_idxs,
-                            instance_dim: np.array(instances_idxs)})
-
-
-        if len(instance_vals) == 1:
-            if get_single_instance_idxs(ds, instance_vals[0]) is None:
-                return None
-            return select_single_instance(ds, *get_single_instance_idxs(ds, instance_vals[0]))
-        else:
-            instance_vals = np.unique(instance_vals)
-            ds[count_var].load()
-            ds[timeseries_id].load()
-            results = [get_single_instance_idxs(ds, instance_val)
-                       for instance_val in instance_vals]
-            results = [r for r in results if r is not None]
-            if len(results) == 0:
-                return None
-            if not ds.chunks:
-                ds = ds.chunk({sample_dim: -1})
-            return select_several_instances(
-                ds,
-                *zip(*results)
-            )
+        # gather the samples of all instances at once
+        sample_idxs = vrange(sample_starts, sample_ends)
+        if not ds.chunks:
+            ds = ds.chunk({sample_dim: -1})
+        return ds.isel({sample_dim: sample_idxs,
+                        instance_dim: instances_idxs})
 
 
 class OrthoMultiTimeseriesArray(CFDiscreteGeom):
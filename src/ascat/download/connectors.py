@@ -6,24 +6,43 @@
 HTTP and FTP download module.
 """
 
+import asyncio
 import base64
+import contextlib
+import ftplib
+import functools
+import json
+import os
+import posixpath
+import queue
+import threading
+import time
 import urllib.parse
 import warnings
 import requests
+import requests.adapters
 import logging
 from pathlib import Path, WindowsPath, PosixPath
 from ftplib import FTP
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 import concurrent.futures
 
 from tqdm.auto import tqdm
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 logger = logging.getLogger(__name__)
 
 # Default timeout (in seconds) for network requests so that a stalled server
 # cannot hang a download indefinitely.
 REQUEST_TIMEOUT = 120
 
+# Size (in bytes) of the chunks a download is streamed to disk in
+CHUNK_SIZE = 65536
+
 
 class Connector:
     """
@@ -86,13 +105,31 @@ class Connector:
         """
         pass
 
+    def _backoff(self, retry):
+        """
+        Wait before a retry.
+
+        Parameters
+        ----------
+        retry : int
+            Number of the retry, starting at 1.
+        """
+        delay = self.backoff_factor * 2**(retry - 1)
+        if delay > 0:
+            time.sleep(delay)
+
 
 class HttpConnector(Connector):
     """
     Class for http requests.
+
+    All requests of a connector go through one pooled session, so
+    connections are reused across files and download threads. Interrupted
+    downloads are kept as partial files (.part) and resumed with HTTP range
+    requests.
     """
 
-    def __init__(self, base_url):
+    def __init__(self, base_url, pool_size=10, backoff_factor=1.):
         """
         Initialize connector.
 
@@ -100,16 +137,48 @@ class HttpConnector(Connector):
         ----------
         base_url : string
             Location of remote resource.
+        pool_size : int, optional
+            Number of connections kept open per host (default: 10).
+        backoff_factor : float, optional
+            Retries wait backoff_factor * 2 ** (retry - 1) seconds
+            (default: 1.).
         """
         self.base_url = base_url
+        self.backoff_factor = backoff_factor
         # Set by subclasses that require token authentication (e.g. EumConnector
         # in connect()). Left as None for unauthenticated HTTP downloads.
         self.access_token = None
+        self.pool_size = None
+        self.session = None
+        self._create_session(pool_size)
+
+    def _create_session(self, pool_size):
+        """
+        Create the session with a connection pool of the given size.
+
+        Parameters
+        ----------
+        pool_size : int
+            Number of connections kept open per host.
+        """
+        if self.session is not None:
+            self.session.close()
+
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size,
+                                                pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def download_file(self, file_remote, file_local, overwrite=False, n_retry=5):
         """
         Download single file from passed url to local file.
 
+        The file is written to a partial file (.part) first, which is renamed
+        once it is complete. A partial file left by an interrupted attempt or
+        an earlier run is resumed with a range request.
+
         Parameters
         ----------
         file_remote : string
@@ -118,76 +187,148 @@ class HttpConnector(Connector):
             Path (local) where to save file
         overwrite : bool, optional
             If True, existing files will be overwritten.
+        n_retry : int, optional
+            Number of attempts before giving up (default: 5).
         """
-        request_flag = False
+        file_local = str2path(file_local)
 
-        i = 0
-        while i < n_retry:
-            logger.debug("Send request")
-
-            headers = {}
-            if self.access_token is not None:
-                headers["Authorization"] = f"Bearer {self.access_token}"
+        for i in range(n_retry):
+            if i > 0:
+                logger.debug(f"Download failed - retry #{i}")
+                self._backoff(i)
 
             try:
-                stream_response = requests.get(
-                    file_remote,
-                    params={"format": "json"},
-                    stream=True,
-                    timeout=REQUEST_TIMEOUT,
-                    headers=headers)
+                if self._download(file_remote, file_local, overwrite):
+                    return
+            except (AssertionError, requests.exceptions.RequestException) \
+                    as error:
+                logger.debug("Download interrupted: %s", error)
 
-                self._assert_response(stream_response)
-            except AssertionError:
-                i += 1
-                logger.debug(f"API Request failed - retry #{i}")
-            else:
-                logger.debug("API Request successful")
-                request_flag = True
-                break
-        else:
-            raise RuntimeError(
-                f"Download failed after {n_retry} attempts: {file_remote}")
+        raise RuntimeError(
+            f"Download failed after {n_retry} attempts: {file_remote}")
+
+    def _download(self, file_remote, file_local, overwrite):
+        """
+        Single download attempt, resuming a partial file if there is one.
 
-        if request_flag:
-            total = int(stream_response.headers["content-length"])
+        Parameters
+        ----------
+        file_remote : string
+            Path of file to download
+        file_local : pathlib.Path
+            Path (local) where to save file
+        overwrite : bool
+            If True, existing files will be overwritten.
+
+        Returns
+        -------
+        complete : bool
+            True if the file is complete, False if the attempt needs to be
+            repeated.
+        """
+        download = PartialDownload(file_local)
+        headers = dict(self._auth_headers(), **download.range_headers())
 
-            suffix = ""
-            if stream_response.headers["Content-Type"] == "application/zip":
-                suffix = ".zip"
+        logger.debug("Send request")
+        with self.session.get(file_remote,
+                              params={"format": "json"},
+                              stream=True,
+                              timeout=REQUEST_TIMEOUT,
+                              headers=headers) as stream_response:
 
-            filename = file_local.parent / (file_local.name + suffix)
+            if stream_response.status_code not in [206, 416]:
+                self._assert_response(stream_response)
+            action = download.start(stream_response.status_code,
+                                    stream_response.headers, overwrite)
+            if action != "write":
+                return action == "skip"
+            logger.debug("API Request successful")
+
+            pbar = tqdm(desc=file_local.name,
+                        total=download.total,
+                        initial=download.offset,
+                        unit="B",
+                        unit_divisor=1024,
+                        unit_scale=True,
+                        leave=False)
 
-            if not overwrite and filename.exists():
-                lstat = filename.lstat()
-                if lstat.st_size == total:
-                    logger.info("Skip download. File exists.")
-            else:
-                pbar = tqdm(desc=file_local.name,
-                            total=total,
-                            unit="B",
-                            unit_divisor=1024,
-                            unit_scale=True,
-                            leave=False)
-
-                with open(filename, "wb") as fp:
-                    for chunk in stream_response.iter_content(chunk_size=65536):
+            try:
+                with open(download.part_file, download.mode) as fp:
+                    for chunk in stream_response.iter_content(
+                            chunk_size=CHUNK_SIZE):
                         if chunk:
                             fp.write(chunk)
                             pbar.update(len(chunk))
+            finally:
                 pbar.close()
 
-                if filename.exists():
-                    lstat = filename.lstat()
-                    if lstat.st_size == total:
-                        logger.debug("Download successful")
-                    else:
-                        filename.unlink()
-                        logger.error(
-                            "Download unsuccessful (file size mismatch), "
-                            "removed partial file: %s", filename)
-                else:
-                    logger.error("Downloaded file not found")
+        return download.finish()
+
+    def download_files(self,
+                       download_url_list,
+                       local_file_list,
+                       max_workers=1,
+                       engine=None,
+                       max_per_host=None,
+                       overwrite=False):
+        """
+        Download multiple files concurrently.
+
+        Parameters
+        ----------
+        download_url_list : list
+            Download URLs.
+        local_file_list : list
+            Local filenames.
+        max_workers : int, optional
+            Number of concurrent downloads (default: 1).
+        engine : {"asyncio", "thread"}, optional
+            Download engine, `async_download` or `concurrent_download`
+            (default: "asyncio" if aiohttp is installed, otherwise
+            "thread").
+        max_per_host : int, optional
+            Number of concurrent downloads per host of the asyncio engine
+            (default: None, only limited by max_workers).
+        overwrite : bool, optional
+            If True, existing files will be overwritten.
+        """
+        max_workers = max_workers or 1
+        if engine is None:
+            engine = "thread" if aiohttp is None else "asyncio"
+
+        if engine == "asyncio":
+            async_download(download_url_list,
+                           local_file_list,
+                           max_workers,
+                           max_per_host=max_per_host,
+                           headers=self._auth_headers(),
+                           params={"format": "json"},
+                           overwrite=overwrite,
+                           backoff_factor=self.backoff_factor)
+        elif engine == "thread":
+            if max_workers > self.pool_size:
+                # one pooled connection per download thread
+                self._create_session(max_workers)
+
+            concurrent_download(
+                functools.partial(self.download_file, overwrite=overwrite),
+                download_url_list, local_file_list, max_workers)
+        else:
+            raise ValueError(f"Unknown download engine: {engine}")
+
+    def _auth_headers(self):
+        """
+        Authorization headers of the requests.
+
+        Returns
+        -------
+        headers : dict
+            Bearer token header if an access token is set.
+        """
+        if self.access_token is None:
+            return {}
+
+        return {"Authorization": f"Bearer {self.access_token}"}
 
     def _assert_response(self, response, success_code=200):
         """
@@ -200,27 +341,169 @@ class HttpConnector(Connector):
         success_code : int, optional
             The expected success status code (default: 200).
         """
-        msg = f"API Request Failed: {response.status_code}\n{response.content}"
-        assert (response.status_code == success_code), msg
+        # the message is only built on failure, reading the content of a
+        # streamed response would load the whole file into memory
+        assert (response.status_code == success_code), \
+            f"API Request Failed: {response.status_code}\n{response.content}"
+
+    def close(self):
+        """
+        Close the session and its pooled connections.
+        """
+        self.session.close()
+
+
+class FtpConnectionPool:
+    """
+    Pool of authenticated FTP connections.
+
+    Connections are opened on demand up to the pool size and handed to one
+    thread at a time. A connection that was idle for longer than the
+    keepalive interval is checked with a NOOP and replaced if the server
+    closed it, and a connection failing during use is discarded instead of
+    being returned to the pool.
+    """
+
+    def __init__(self, host, user, password, size=1, keepalive=30.,
+                 timeout=REQUEST_TIMEOUT):
+        """
+        Initialize pool.
+
+        Parameters
+        ----------
+        host : string
+            FTP server, optionally with port (host:port).
+        user : string
+            User name.
+        password : string
+            Password.
+        size : int, optional
+            Maximum number of connections (default: 1).
+        keepalive : float, optional
+            Seconds a connection may be idle before it is checked
+            (default: 30.).
+        timeout : float, optional
+            Socket timeout in seconds (default: REQUEST_TIMEOUT).
+        """
+        host, _, port = host.partition(":")
+        self.host = host
+        self.port = int(port) if port else 0
+        self.user = user
+        self.password = password
+        self.size = size
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        """
+        Open and authenticate a new connection.
+        """
+        ftp = FTP(timeout=self.timeout)
+        ftp.connect(self.host, self.port)
+        ftp.login(self.user, self.password)
+        logger.debug("FTP connection opened")
+
+        return ftp
+
+    def _get(self):
+        """
+        Idle connection that is still alive, or a new connection.
+        """
+        while True:
+            try:
+                ftp, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+
+            if time.monotonic() - last_used <= self.keepalive:
+                return ftp
+
+            try:
+                ftp.voidcmd("NOOP")
+            except ftplib.all_errors:
+                logger.debug("FTP connection lost, reconnect")
+                ftp.close()
+            else:
+                return ftp
+
+    @contextlib.contextmanager
+    def connection(self):
+        """
+        Borrow a connection.
+
+        Yields
+        ------
+        ftp : ftplib.FTP
+            Authenticated connection.
+        """
+        with self._slots:
+            ftp = self._get()
+            try:
+                yield ftp
+            except ftplib.error_perm:
+                # rejected command, the connection itself is fine
+                self._idle.put((ftp, time.monotonic()))
+                raise
+            except BaseException:
+                ftp.close()
+                raise
+            else:
+                self._idle.put((ftp, time.monotonic()))
+
+    def close(self):
+        """
+        Close the idle connections.
+        """
+        while True:
+            try:
+                ftp, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                ftp.quit()
+            except ftplib.all_errors:
+                ftp.close()
 
 
 class FtpConnector(Connector):
     """
     Class for downloading via FTP
+
+    Transfers use a pool of connections, so files can be downloaded in
+    parallel, and directory listings are cached.
     """
 
-    def __init__(self, base_url):
+    def __init__(self, base_url, n_connections=1, keepalive=30.,
+                 listing_ttl=600., backoff_factor=1.):
         """
         Initialize connector.
 
         Parameters
         ----------
         base_url : string
-            Location of remote resource.
+            Location of remote resource, optionally with port (host:port).
+        n_connections : int, optional
+            Maximum number of concurrent FTP connections (default: 1).
+        keepalive : float, optional
+            Seconds a pooled connection may be idle before it is checked
+            (default: 30.).
+        listing_ttl : float, optional
+            Seconds a directory listing is cached (default: 600.).
+        backoff_factor : float, optional
+            Retries wait backoff_factor * 2 ** (retry - 1) seconds
+            (default: 1.).
         """
         super().__init__(base_url)
+        self.n_connections = n_connections
+        self.keepalive = keepalive
+        self.listing_ttl = listing_ttl
+        self.backoff_factor = backoff_factor
         # Do not open a socket on construction; connect lazily in connect().
-        self.ftp = FTP(timeout=REQUEST_TIMEOUT)
+        self.pool = None
+        self._listings = {}
+        self._listings_lock = threading.Lock()
 
     def connect(self, credentials):
         """
@@ -231,18 +514,56 @@ class FtpConnector(Connector):
         credentials : dict
             Dictionary of needed authentication parameters.
         """
+        self.pool = FtpConnectionPool(self.base_url, credentials["user"],
+                                      credentials["password"],
+                                      self.n_connections, self.keepalive)
         try:
-            self.ftp.connect(self.base_url)
-            self.ftp.login(credentials["user"], credentials["password"])
+            # open the first connection to check the credentials
+            with self.pool.connection():
+                pass
             logger.info("FTP connection successfully established")
         except Exception as error:
             logger.error("FTP connection failed: %s", error)
             raise
 
-    def download_file(self, file_remote, file_local, overwrite=False):
+    def list_dir(self, remote_path):
+        """
+        Names of the files in a remote directory, cached for `listing_ttl`
+        seconds.
+
+        Parameters
+        ----------
+        remote_path : string
+            Remote directory.
+
+        Returns
+        -------
+        names : list of str
+            File names.
+        """
+        with self._listings_lock:
+            listed = self._listings.get(remote_path)
+            if listed is not None and \
+                    time.monotonic() - listed[0] <= self.listing_ttl:
+                return listed[1]
+
+        with self.pool.connection() as ftp:
+            names = [posixpath.basename(name) for name in ftp.nlst(remote_path)]
+
+        with self._listings_lock:
+            self._listings[remote_path] = (time.monotonic(), names)
+
+        return names
+
+    def download_file(self, file_remote, file_local, overwrite=False,
+                      n_retry=5):
         """
         Download single file from passed url to local file
 
+        The file is written to a partial file (.part) first, which is renamed
+        once it is complete. Interrupted transfers are resumed (REST) on a
+        new connection.
+
         Parameters
         ----------
         file_remote : string
@@ -251,54 +572,105 @@ class FtpConnector(Connector):
             path (local) where to save file
         overwrite : bool, optional
             If True, existing files will be overwritten.
+        n_retry : int, optional
+            Number of attempts before giving up (default: 5).
         """
-        if file_remote not in self.ftp.nlst():
+        file_local = str2path(file_local)
+        remote_dir, remote_name = posixpath.split(file_remote)
+
+        if remote_name not in self.list_dir(remote_dir):
             logger.warning(f"File not accessible on FTP: {file_remote}")
-        else:
-            logger.debug(f"Start download: {file_remote}")
+            return
 
-            total = self.ftp.size(file_remote)
+        logger.debug(f"Start download: {file_remote}")
 
-            if not overwrite and file_local.exists():
-                lstat = file_local.lstat()
-                if lstat.st_size == total:
-                    logger.info("Skip download. File exists.")
-            else:
-                pbar = tqdm(desc=file_local.name,
-                            total=total,
-                            unit="B",
-                            unit_divisor=1024,
-                            unit_scale=True,
-                            dynamic_ncols=True,
-                            leave=False)
+        for i in range(n_retry):
+            if i > 0:
+                logger.debug(f"Download failed - retry #{i}")
+                self._backoff(i)
+
+            try:
+                if self._download(file_remote, file_local, overwrite):
+                    return
+            except ftplib.error_perm:
+                raise
+            except ftplib.all_errors as error:
+                logger.debug("Download interrupted: %s", error)
+
+        raise RuntimeError(
+            f"Download failed after {n_retry} attempts: {file_remote}")
+
+    def _download(self, file_remote, file_local, overwrite):
+        """
+        Single download attempt, resuming a partial file if there is one.
+
+        Parameters
+        ----------
+        file_remote : string
+            path of file to download
+        file_local : pathlib.Path
+            path (local) where to save file
+        overwrite : bool
+            If True, existing files will be overwritten.
+
+        Returns
+        -------
+        complete : bool
+            True if the file is complete, False if the attempt needs to be
+            repeated.
+        """
+        part_file = file_local.parent / (file_local.name + ".part")
+
+        with self.pool.connection() as ftp:
+            ftp.voidcmd("TYPE I")
+            total = ftp.size(file_remote)
+
+            if not overwrite and file_local.exists() and \
+                    file_local.stat().st_size == total:
+                logger.info("Skip download. File exists.")
+                return True
+
+            offset = part_file.stat().st_size if part_file.exists() else 0
+            if offset > total:
+                part_file.unlink()
+                offset = 0
+
+            pbar = tqdm(desc=file_local.name,
+                        total=total,
+                        initial=offset,
+                        unit="B",
+                        unit_divisor=1024,
+                        unit_scale=True,
+                        dynamic_ncols=True,
+                        leave=False)
 
-                with open(file_local, "wb") as fp:
+            try:
+                with open(part_file, "ab" if offset else "wb") as fp:
 
                     def cb(data):
                         pbar.update(len(data))
                         fp.write(data)
 
-                    self.ftp.retrbinary(f"RETR {file_remote}", cb)
-
+                    ftp.retrbinary(f"RETR {file_remote}", cb,
+                                   rest=offset or None)
+            finally:
                 pbar.close()
 
-                if file_local.exists():
-                    lstat = file_local.lstat()
-                    if lstat.st_size == total:
-                        logger.debug("Download successful")
-                    else:
-                        file_local.unlink()
-                        logger.error(
-                            "Download unsuccessful (file size mismatch), "
-                            "removed partial file: %s", file_local)
-                else:
-                    logger.error("Downloaded file not found")
+        if part_file.stat().st_size != total:
+            logger.debug("Download incomplete: %s", part_file)
+            return False
+
+        os.replace(part_file, file_local)
+        logger.debug("Download successful")
+
+        return True
 
     def close(self):
         """
         Close connection.
         """
-        self.ftp.close()
+        if self.pool is not None:
+            self.pool.close()
         logger.info("FTP disconnected")
 
 
@@ -307,7 +679,7 @@ class HsafConnector(FtpConnector):
     Class for downloading from HSAF via FTP.
     """
 
-    def __init__(self, base_url="ftphsaf.meteoam.it"):
+    def __init__(self, base_url="ftphsaf.meteoam.it", **kwargs):
         """
         Initialize connector.
 
@@ -315,8 +687,10 @@ class HsafConnector(FtpConnector):
         ----------
         base_url : string, optional
             Location of remote resource (default: ftphsaf.meteoam.it).
+        **kwargs : dict
+            Keyword arguments passed to `FtpConnector`.
         """
-        super().__init__(base_url)
+        super().__init__(base_url, **kwargs)
 
     def download(self,
                  remote_path,
@@ -324,7 +698,8 @@ class HsafConnector(FtpConnector):
                  start_date,
                  end_date,
                  limit=None,
-                 overwrite=False):
+                 overwrite=False,
+                 max_workers=None):
         """
         Fetch resource location for download of multiple files in date range.
 
@@ -342,6 +717,9 @@ class HsafConnector(FtpConnector):
             Filter used to limit the returned results (default: 1).
         overwrite : bool, optional
             If True, existing files will be overwritten.
+        max_workers : int, optional
+            Number of parallel downloads (default: number of connections of
+            the connector).
         """
         download_url_list = []
         local_file_list = []
@@ -350,10 +728,9 @@ class HsafConnector(FtpConnector):
 
         i = 0
         for daily_files in self.files(remote_path, start_date, end_date):
-            for file_remote in daily_files:
-                file_local = local_path / file_remote
-                local_file_list.append(file_local)
-                download_url_list.append(file_remote)
+            for filename in daily_files:
+                local_file_list.append(local_path / filename)
+                download_url_list.append(posixpath.join(remote_path, filename))
 
                 i = i + 1
                 if limit and limit == i:
@@ -374,13 +751,10 @@ class HsafConnector(FtpConnector):
         download_url_list, local_file_list = zip(*sorted(zip(
             download_url_list, local_file_list)))
 
-        with tqdm(desc="Downloads", total=len(download_url_list)) as pbar:
-            for download_url, local_file in zip(download_url_list,
-                                                local_file_list):
-                self.download_file(download_url,
-                                   local_file,
-                                   overwrite=overwrite)
-                pbar.update()
+        concurrent_download(
+            functools.partial(self.download_file, overwrite=overwrite),
+            download_url_list, local_file_list, max_workers
+            or self.n_connections)
 
     def files(self, remote_path, start_date, end_date):
         """
@@ -402,10 +776,7 @@ class HsafConnector(FtpConnector):
         matches : list
             List of daily files.
         """
-        self.ftp.cwd(remote_path)
-
-        list_of_files = []
-        self.ftp.retrlines("NLST ", list_of_files.append)
+        list_of_files = self.list_dir(remote_path)
 
         days = end_date - start_date
         # +1 so the range is inclusive of end_date (otherwise the last day,
@@ -422,7 +793,11 @@ class EumConnector(HttpConnector):
     Class for downloading from EUMETSAT via HTTP requests.
     """
 
-    def __init__(self, base_url="https://api.eumetsat.int"):
+    def __init__(self,
+                 base_url="https://api.eumetsat.int",
+                 page_size=100,
+                 search_workers=4,
+                 **kwargs):
         """
         Initialize connector.
 
@@ -430,8 +805,17 @@ class EumConnector(HttpConnector):
         ----------
         base_url : string, optional
             Location of remote resource (default: https://api.eumetsat.int).
+        page_size : int, optional
+            Number of search results requested per page (default: 100).
+        search_workers : int, optional
+            Number of search result pages requested concurrently
+            (default: 4).
+        **kwargs : dict
+            Keyword arguments passed to `HttpConnector`.
         """
-        super().__init__(base_url)
+        super().__init__(base_url, **kwargs)
+        self.page_size = page_size
+        self.search_workers = search_workers
 
     def connect(self, credentials):
         """
@@ -453,7 +837,10 @@ class EumConnector(HttpConnector):
                  end_date,
                  max_workers=1,
                  coords=None,
-                 limit=None):
+                 limit=None,
+                 engine=None,
+                 catalog=None,
+                 max_per_host=None):
         """
         Fetch resource location for download of multiple files in daterange.
 
@@ -461,8 +848,6 @@ class EumConnector(HttpConnector):
         ----------
         product : string
             Product.
-        coords : list
-            Coordinates of polygon, where files will be downloaded
         local_path : string
             Local directory, where found datasets are stored.
         start_date : datetime
@@ -475,74 +860,151 @@ class EumConnector(HttpConnector):
             A custom polygon using EPSG:4326 decimal degrees (default: None).
         limit : int, optional
             Filter used to limit the returned results (default: None).
+        engine : {"asyncio", "thread"}, optional
+            Download engine (default: "asyncio" if aiohttp is installed,
+            otherwise "thread").
+        catalog : str or Path, optional
+            Catalog file caching the search results (default: None).
+        max_per_host : int, optional
+            Number of concurrent downloads per host of the asyncio engine
+            (default: None, only limited by max_workers).
         """
         local_path = str2path(local_path)
-
-        service_search = f"{self.base_url}/data/search-products/os"
         service_download = f"{self.base_url}/data/download/"
 
-        dataset_parameters = {"format": "json", "pi": product}
+        if catalog is not None:
+            catalog = ProductCatalog(catalog)
 
-        fmt = "%Y-%m-%dT%H:%M:%S.%fZ"
-        dataset_parameters["dtstart"] = start_date.strftime(fmt)
-        dataset_parameters["dtend"] = end_date.strftime(fmt)
+        found_products = self.search(product, start_date, end_date, coords,
+                                     catalog)
 
-        if coords:
-            dataset_parameters["geo"] = "POLYGON(({}))".format(",".join(
-                [f"{coord[0]} {coord[1]}" for coord in coords]))
+        if not found_products:
+            print("No data sets found")
+            return
 
-        url = service_search
-        response = requests.get(url, dataset_parameters,
-                                timeout=REQUEST_TIMEOUT)
-        found_data_sets = response.json()
-
-        url = service_search
-        dataset_parameters['si'] = 0
-        items_per_page = 10
-
-        if "type" in found_data_sets:
-            if found_data_sets["type"] == "ExceptionReport":
-                msg = found_data_sets["exceptions"][0]["exceptionText"]
-                raise RuntimeError(msg)
-
-        all_found_data_sets = []
-        while dataset_parameters['si'] < found_data_sets['totalResults']:
-            response = requests.get(url, dataset_parameters,
-                                timeout=REQUEST_TIMEOUT)
-            found_data_sets = response.json()
-            all_found_data_sets.append(found_data_sets)
-            dataset_parameters[
-                'si'] = dataset_parameters['si'] + items_per_page
+        print(f"Found {len(found_products)} data sets")
+
+        if limit and len(found_products) > limit:
+            print(f"Limited to {limit} data sets")
+            found_products = found_products[:limit]
 
         download_url_list = []
         local_file_list = []
+        for found_product in found_products:
+            url_temp = (f"collections/{found_product['collection']}/"
+                        f"products/{found_product['id']}")
+            download_url_list.append(service_download +
+                                     urllib.parse.quote(url_temp))
+            local_file_list.append(local_path / found_product["id"])
+
+        download_url_list, local_file_list = zip(*sorted(zip(
+            download_url_list, local_file_list)))
+
+        self.download_files(download_url_list, local_file_list, max_workers,
+                            engine, max_per_host)
 
-        if all_found_data_sets:
+    def search(self, product, start_date, end_date, coords=None,
+               catalog=None):
+        """
+        Search products in a date range.
+
+        The first page of results gives the number of results, the
+        remaining pages are requested concurrently. With a catalog, only
+        the parts of the date range that were not searched before are
+        requested.
 
-            for found_data_sets in all_found_data_sets:
-                for selected_data_set in found_data_sets["features"]:
-                    coll_id = selected_data_set["properties"][
-                        "parentIdentifier"]
-                    product_id = selected_data_set["properties"]["identifier"]
-                    url_temp = f"collections/{coll_id}/products/{product_id}"
-                    download_url_list.append(service_download +
-                                             urllib.parse.quote(url_temp))
-                    local_file_list.append(local_path / product_id)
+        Parameters
+        ----------
+        product : string
+            Product.
+        start_date : datetime
+            Start date of date range interval.
+        end_date : datetime
+            End date of date range interval.
+        coords : list of float, optional
+            A custom polygon using EPSG:4326 decimal degrees (default: None).
+        catalog : ProductCatalog, optional
+            Catalog caching the search results (default: None).
 
-            print(f"Found {found_data_sets['totalResults']} data sets")
+        Returns
+        -------
+        found_products : list of dict
+            Products found, with "id", "collection" and "date" (sensing
+            start and end separated by "/"), in the order of the search
+            results.
+        """
+        geo = None
+        if coords:
+            geo = "POLYGON(({}))".format(",".join(
+                [f"{coord[0]} {coord[1]}" for coord in coords]))
 
-            if limit and len(download_url_list) > limit:
-                print(f"Limited to {limit} data sets")
-                download_url_list = download_url_list[:limit]
-                local_file_list = local_file_list[:limit]
+        if catalog is None:
+            return self._search(product, start_date, end_date, geo)
 
-            download_url_list, local_file_list = zip(*sorted(zip(
-                download_url_list, local_file_list)))
+        for interval_start, interval_end in catalog.missing_intervals(
+                product, geo, start_date, end_date):
+            found_products = self._search(product, interval_start,
+                                          interval_end, geo)
+            catalog.add(product, geo, interval_start, interval_end,
+                        found_products)
+        catalog.save()
 
-            concurrent_download(self.download_file, download_url_list,
-                                local_file_list, max_workers)
-        else:
-            print("No data sets found")
+        return catalog.products(product, geo, start_date, end_date)
+
+    def _search(self, product, start_date, end_date, geo):
+        """
+        Request all pages of search results.
+        """
+        fmt = "%Y-%m-%dT%H:%M:%S.%fZ"
+        params = {
+            "format": "json",
+            "pi": product,
+            "dtstart": start_date.strftime(fmt),
+            "dtend": end_date.strftime(fmt),
+            "c": self.page_size,
+            "si": 0
+        }
+        if geo:
+            params["geo"] = geo
+
+        first_page = self._search_page(params)
+        pages = [first_page]
+
+        start_indices = range(self.page_size, first_page["totalResults"],
+                              self.page_size)
+        if start_indices:
+            with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.search_workers) as executor:
+                pages.extend(
+                    executor.map(
+                        lambda si: self._search_page(dict(params, si=si)),
+                        start_indices))
+
+        found_products = []
+        for page in pages:
+            for feature in page["features"]:
+                properties = feature["properties"]
+                found_products.append({
+                    "id": properties["identifier"],
+                    "collection": properties["parentIdentifier"],
+                    "date": properties.get("date")
+                })
+
+        return found_products
+
+    def _search_page(self, params):
+        """
+        Request a page of search results.
+        """
+        response = self.session.get(f"{self.base_url}/data/search-products/os",
+                                    params=params,
+                                    timeout=REQUEST_TIMEOUT)
+        page = response.json()
+
+        if page.get("type") == "ExceptionReport":
+            raise RuntimeError(page["exceptions"][0]["exceptionText"])
+
+        return page
 
     def _generate_token(self, consumer_key, consumer_secret):
         """
@@ -566,14 +1028,332 @@ class EumConnector(HttpConnector):
         encoded_userpass = base64.b64encode(userpass.encode()).decode()
         headers = {"Authorization": f"Basic {encoded_userpass}"}
         data_payload = {"grant_type": "client_credentials"}
-        response = requests.post(token_url, headers=headers, data=data_payload,
-                                 timeout=REQUEST_TIMEOUT)
+        response = self.session.post(token_url, headers=headers,
+                                     data=data_payload,
+                                     timeout=REQUEST_TIMEOUT)
 
         self._assert_response(response)
 
         return response.json()["access_token"]
 
 
+class ProductCatalog:
+    """
+    Local cache of EUMETSAT search results.
+
+    The products found are stored per product and geometry together with
+    the date ranges that were searched, so repeated or overlapping searches
+    only request the missing date ranges. Date ranges reaching into the
+    last `publication_delay` are not marked as searched, since products of
+    that period may still be published.
+    """
+
+    publication_delay = timedelta(days=1)
+
+    def __init__(self, filename):
+        """
+        Initialize catalog.
+
+        Parameters
+        ----------
+        filename : str or Path
+            Catalog file (JSON), created on the first save.
+        """
+        self.filename = str2path(filename)
+        self.entries = {}
+        if self.filename.exists():
+            with open(self.filename) as fp:
+                self.entries = json.load(fp)
+
+    @staticmethod
+    def _key(product, geo):
+        return f"{product}|{geo or ''}"
+
+    def _entry(self, product, geo):
+        return self.entries.setdefault(self._key(product, geo), {
+            "searched": [],
+            "products": {}
+        })
+
+    def missing_intervals(self, product, geo, start_date, end_date):
+        """
+        Parts of a date range that were not searched yet.
+
+        Parameters
+        ----------
+        product : string
+            Product.
+        geo : str or None
+            Search geometry.
+        start_date : datetime
+            Start date of date range interval.
+        end_date : datetime
+            End date of date range interval.
+
+        Returns
+        -------
+        intervals : list of tuple
+            Start and end dates of the missing date ranges.
+        """
+        intervals = []
+        for searched_start, searched_end in self._entry(product,
+                                                        geo)["searched"]:
+            searched_start = datetime.fromisoformat(searched_start)
+            searched_end = datetime.fromisoformat(searched_end)
+            if searched_end <= start_date or searched_start >= end_date:
+                continue
+            if searched_start > start_date:
+                intervals.append((start_date, searched_start))
+            start_date = max(start_date, searched_end)
+            if start_date >= end_date:
+                break
+
+        if start_date < end_date:
+            intervals.append((start_date, end_date))
+
+        return intervals
+
+    def add(self, product, geo, start_date, end_date, found_products):
+        """
+        Add the results of a search.
+
+        Parameters
+        ----------
+        product : string
+            Product.
+        geo : str or None
+            Search geometry.
+        start_date : datetime
+            Start date of the searched date range.
+        end_date : datetime
+            End date of the searched date range.
+        found_products : list of dict
+            Products found, see `EumConnector.search`.
+        """
+        entry = self._entry(product, geo)
+        for found_product in found_products:
+            if found_product["date"] is None:
+                found_product = dict(
+                    found_product,
+                    date=f"{start_date.isoformat()}/{end_date.isoformat()}")
+            entry["products"][found_product["id"]] = found_product
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        end_date = min(end_date, now - self.publication_delay)
+        if start_date >= end_date:
+            return
+
+        # merge with the overlapping and adjacent searched date ranges
+        searched = [(datetime.fromisoformat(searched_start),
+                     datetime.fromisoformat(searched_end))
+                    for searched_start, searched_end in entry["searched"]]
+        merged = []
+        for interval in sorted(searched + [(start_date, end_date)]):
+            if merged and interval[0] <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], interval[1]))
+            else:
+                merged.append(interval)
+
+        entry["searched"] = [(interval_start.isoformat(),
+                              interval_end.isoformat())
+                             for interval_start, interval_end in merged]
+
+    def products(self, product, geo, start_date, end_date):
+        """
+        Products sensed in a date range.
+
+        Parameters
+        ----------
+        product : string
+            Product.
+        geo : str or None
+            Search geometry.
+        start_date : datetime
+            Start date of date range interval.
+        end_date : datetime
+            End date of date range interval.
+
+        Returns
+        -------
+        found_products : list of dict
+            Products overlapping the date range, sorted by sensing start.
+        """
+        found_products = []
+        for found_product in self._entry(product, geo)["products"].values():
+            sensing_start, sensing_end = [
+                _parse_date(date) for date in found_product["date"].split("/")
+            ]
+            if sensing_start <= end_date and sensing_end >= start_date:
+                found_products.append((sensing_start, found_product))
+
+        return [
+            found_product for _, found_product in sorted(
+                found_products, key=lambda item: (item[0], item[1]["id"]))
+        ]
+
+    def save(self):
+        """
+        Write the catalog to its file.
+        """
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        tmp_filename = self.filename.parent / (self.filename.name + ".tmp")
+        with open(tmp_filename, "w") as fp:
+            json.dump(self.entries, fp)
+        os.replace(tmp_filename, self.filename)
+
+
+def _parse_date(date):
+    """
+    Parse an ISO 8601 date of the search results to a naive UTC datetime.
+    """
+    date = datetime.fromisoformat(date)
+    if date.tzinfo is not None:
+        date = date.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return date
+
+
+class PartialDownload:
+    """
+    Local state of a resumable download.
+
+    The file is written to a partial file (.part) first, which is renamed
+    once it is complete. A partial file left by an interrupted attempt or an
+    earlier run is resumed with a range request.
+    """
+
+    def __init__(self, file_local):
+        """
+        Initialize download.
+
+        Parameters
+        ----------
+        file_local : str or Path
+            Path (local) where to save file.
+        """
+        self.file_local = str2path(file_local)
+        # the suffix is only known from the response, so partial files of
+        # both possible names are looked up
+        self.part_files = [
+            self.file_local.parent / (self.file_local.name + suffix + ".part")
+            for suffix in ["", ".zip"]
+        ]
+        self.offset = max(
+            (f.stat().st_size for f in self.part_files if f.exists()),
+            default=0)
+        self.resume = False
+        self.total = None
+        self.filename = None
+        self.part_file = None
+
+    @property
+    def mode(self):
+        """
+        File mode the response is written with.
+        """
+        return "ab" if self.resume else "wb"
+
+    def range_headers(self):
+        """
+        Request headers resuming the partial file.
+
+        Returns
+        -------
+        headers : dict
+            Range header if there is a partial file.
+        """
+        if self.offset == 0:
+            return {}
+
+        return {"Range": f"bytes={self.offset}-"}
+
+    def start(self, status_code, headers, overwrite=False):
+        """
+        Decide what to do with a successful response.
+
+        Parameters
+        ----------
+        status_code : int
+            Status code of the response (200, 206 or 416).
+        headers : Mapping
+            Response headers.
+        overwrite : bool, optional
+            If True, existing files will be overwritten.
+
+        Returns
+        -------
+        action : str
+            "write" if the response is to be written to `part_file`, "skip"
+            if the file exists already and "retry" if the request has to be
+            repeated from the start.
+        """
+        if status_code == 416:
+            # the partial file does not fit the remote file (anymore)
+            self._remove_part_files()
+            return "retry"
+
+        self.resume = status_code == 206
+        if self.resume:
+            # Content-Range: bytes start-end/size
+            size = headers.get("Content-Range", "").rpartition("/")[2]
+        else:
+            self.offset = 0
+            size = headers.get("Content-Length", "")
+        self.total = int(size) if size.isdigit() else None
+
+        suffix = ""
+        if headers.get("Content-Type") == "application/zip":
+            suffix = ".zip"
+
+        self.filename = self.file_local.parent / (self.file_local.name +
+                                                  suffix)
+        self.part_file = self.filename.parent / (self.filename.name + ".part")
+
+        if not overwrite and self.filename.exists() and \
+                self.filename.stat().st_size == self.total:
+            logger.info("Skip download. File exists.")
+            return "skip"
+
+        if self.resume and not self.part_file.exists():
+            # range request answered for the partial file of the other
+            # suffix, start over
+            self._remove_part_files()
+            return "retry"
+
+        return "write"
+
+    def finish(self):
+        """
+        Rename the partial file if it is complete.
+
+        Returns
+        -------
+        complete : bool
+            True if the file is complete, False if the download needs to be
+            repeated.
+        """
+        size = self.part_file.stat().st_size
+        if self.total is not None and size != self.total:
+            if size > self.total:
+                self.part_file.unlink()
+                logger.error(
+                    "Download unsuccessful (file size mismatch), "
+                    "removed partial file: %s", self.part_file)
+            else:
+                logger.debug("Download incomplete (%d of %d bytes): %s",
+                             size, self.total, self.part_file)
+            return False
+
+        os.replace(self.part_file, self.filename)
+        logger.debug("Download successful")
+
+        return True
+
+    def _remove_part_files(self):
+        for part_file in self.part_files:
+            part_file.unlink(missing_ok=True)
+
+
 def concurrent_download(download_func,
                         download_url_list,
                         local_file_list,
@@ -614,6 +1394,265 @@ def concurrent_download(download_func,
                     pbar.update()
 
 
+class DownloadProgress:
+    """
+    Aggregate progress and throughput of concurrent downloads.
+
+    A single progress bar counts the bytes of all downloads, its total grows
+    as the sizes of the files become known, and the number of completed
+    files is shown next to it.
+    """
+
+    def __init__(self, n_files, **kwargs):
+        """
+        Initialize progress.
+
+        Parameters
+        ----------
+        n_files : int
+            Number of files.
+        **kwargs : dict
+            Keyword arguments passed to `tqdm`.
+        """
+        self.n_files = n_files
+        self.n_done = 0
+        self.n_failed = 0
+        self.nbytes = 0
+        self.pbar = tqdm(desc="Downloads",
+                         total=0,
+                         unit="B",
+                         unit_divisor=1024,
+                         unit_scale=True,
+                         **kwargs)
+        self._set_postfix()
+
+    def _set_postfix(self):
+        postfix = {"files": f"{self.n_done}/{self.n_files}"}
+        if self.n_failed:
+            postfix["failed"] = self.n_failed
+        self.pbar.set_postfix(postfix, refresh=False)
+
+    def add_total(self, nbytes):
+        """
+        Add the bytes of a started download to the total.
+
+        Parameters
+        ----------
+        nbytes : int
+            Number of bytes.
+        """
+        self.pbar.total += nbytes
+        self.pbar.refresh()
+
+    def update(self, nbytes):
+        """
+        Add downloaded bytes.
+
+        Parameters
+        ----------
+        nbytes : int
+            Number of bytes.
+        """
+        self.nbytes += nbytes
+        self.pbar.update(nbytes)
+
+    def file_done(self, failed=False):
+        """
+        Count a finished download.
+
+        Parameters
+        ----------
+        failed : bool, optional
+            True if the download failed (default: False).
+        """
+        self.n_done += 1
+        self.n_failed += failed
+        self._set_postfix()
+        self.pbar.refresh()
+
+    def close(self):
+        """
+        Close the progress bar.
+        """
+        self.pbar.close()
+
+
+def async_download(download_url_list,
+                   local_file_list,
+                   max_workers=10,
+                   max_per_host=None,
+                   headers=None,
+                   params=None,
+                   overwrite=False,
+                   n_retry=5,
+                   backoff_factor=1.,
+                   progress=None):
+    """
+    Asyncio file download.
+
+    All downloads run in one event loop sharing a connection pool, limited
+    to max_workers connections in total and max_per_host per host. Files
+    are streamed to disk in chunks, downloads are resumable like
+    `HttpConnector.download_file` and failed downloads are retried with an
+    exponential backoff without holding a connection.
+
+    Parameters
+    ----------
+    download_url_list : list
+        Download URLs.
+    local_file_list : list
+        Local filenames.
+    max_workers : int, optional
+        Number of concurrent downloads (default: 10).
+    max_per_host : int, optional
+        Number of concurrent downloads per host (default: None, only
+        limited by max_workers).
+    headers : dict, optional
+        Headers sent with every request (default: None).
+    params : dict, optional
+        Query parameters sent with every request (default: None).
+    overwrite : bool, optional
+        If True, existing files will be overwritten.
+    n_retry : int, optional
+        Number of attempts per file before giving up (default: 5).
+    backoff_factor : float, optional
+        Retries wait backoff_factor * 2 ** (retry - 1) seconds
+        (default: 1.).
+    progress : DownloadProgress, optional
+        Progress meter (default: a new one for the given files).
+
+    Raises
+    ------
+    RuntimeError
+        If downloads failed after all attempts, once all other downloads
+        are finished.
+    """
+    if aiohttp is None:
+        raise ImportError(
+            "aiohttp is required for asyncio downloads, install it with "
+            "'pip install ascat[download]'")
+
+    close_progress = progress is None
+    if progress is None:
+        progress = DownloadProgress(len(download_url_list))
+
+    downloads = _async_download_all(download_url_list, local_file_list,
+                                    max_workers, max_per_host, headers,
+                                    params, overwrite, n_retry,
+                                    backoff_factor, progress)
+    try:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            results = asyncio.run(downloads)
+        else:
+            # asyncio.run cannot be called from a running event loop (e.g. in
+            # Jupyter), so the downloads get their own loop in a worker thread
+            with concurrent.futures.ThreadPoolExecutor(1) as executor:
+                results = executor.submit(asyncio.run, downloads).result()
+    finally:
+        if close_progress:
+            progress.close()
+
+    failed = [
+        url for url, result in zip(download_url_list, results)
+        if isinstance(result, Exception)
+    ]
+    if failed:
+        raise RuntimeError(
+            f"{len(failed)} of {len(download_url_list)} downloads failed: "
+            f"{', '.join(failed[:5])}{', ...' if len(failed) > 5 else ''}")
+
+
+async def _async_download_all(download_url_list, local_file_list,
+                              max_workers, max_per_host, headers, params,
+                              overwrite, n_retry, backoff_factor, progress):
+    """
+    Run all downloads in a session with a limited connection pool.
+    """
+    connector = aiohttp.TCPConnector(limit=max_workers,
+                                     limit_per_host=max_per_host or 0)
+    timeout = aiohttp.ClientTimeout(total=None,
+                                    sock_connect=REQUEST_TIMEOUT,
+                                    sock_read=REQUEST_TIMEOUT)
+
+    async with aiohttp.ClientSession(connector=connector,
+                                     timeout=timeout,
+                                     headers=headers) as session:
+        return await asyncio.gather(
+            *[
+                _async_download_file(session, url, local_file, params,
+                                     overwrite, n_retry, backoff_factor,
+                                     progress)
+                for url, local_file in zip(download_url_list,
+                                           local_file_list)
+            ],
+            return_exceptions=True)
+
+
+async def _async_download_file(session, file_remote, file_local, params,
+                               overwrite, n_retry, backoff_factor, progress):
+    """
+    Download a single file with retries.
+    """
+    # bytes added to the progress total, but not received yet
+    pending = [0]
+    for i in range(n_retry):
+        if i > 0:
+            logger.debug(f"Download failed - retry #{i}")
+            await asyncio.sleep(backoff_factor * 2**(i - 1))
+
+        try:
+            if await _async_download_attempt(session, file_remote,
+                                             file_local, params, overwrite,
+                                             progress, pending):
+                progress.file_done()
+                return
+        except (AssertionError, aiohttp.ClientError,
+                asyncio.TimeoutError) as error:
+            logger.debug("Download interrupted: %s", error)
+
+    progress.file_done(failed=True)
+    raise RuntimeError(
+        f"Download failed after {n_retry} attempts: {file_remote}")
+
+
+async def _async_download_attempt(session, file_remote, file_local, params,
+                                  overwrite, progress, pending):
+    """
+    Single download attempt, resuming a partial file if there is one.
+    """
+    download = PartialDownload(file_local)
+
+    async with session.get(file_remote,
+                           params=params,
+                           headers=download.range_headers()) as response:
+        if response.status not in [206, 416]:
+            assert response.status == 200, \
+                f"API Request Failed: {response.status}\n" \
+                f"{await response.read()}"
+
+        action = download.start(response.status, response.headers,
+                                overwrite)
+        if action != "write":
+            return action == "skip"
+
+        if download.total is not None:
+            remaining = download.total - download.offset
+            progress.add_total(max(remaining - pending[0], 0))
+            pending[0] = remaining
+
+        # only one chunk per download is held in memory, the connection
+        # buffer is bounded by aiohttp's flow control
+        with open(download.part_file, download.mode) as fp:
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                fp.write(chunk)
+                progress.update(len(chunk))
+                pending[0] -= len(chunk)
+
+    return download.finish()
+
+
 def str2path(path):
     """
     Convert str path to pathlib.Path object.
@@ -37,7 +37,8 @@ def hsaf_download(credentials,
                   local_path,
                   start_date,
                   end_date,
-                  limit=None):
+                  limit=None,
+                  max_workers=1):
     """
     Function to start H SAF download.
 
@@ -55,8 +56,11 @@ def hsaf_download(credentials,
         End date of date range interval.
     limit : int, optional
         Filter used to limit the returned results (default: 1).
+    max_workers : int, optional
+        Number of parallel downloads, each with its own FTP connection
+        (default: 1).
     """
-    connector = HsafConnector()
+    connector = HsafConnector(n_connections=max_workers or 1)
     connector.connect(credentials)
     connector.download(remote_path, local_path, start_date, end_date, limit)
     connector.close()
@@ -69,7 +73,10 @@ def eumetsat_download(credentials,
                       end_date,
                       max_workers=1,
                       coords=None,
-                      limit=None):
+                      limit=None,
+                      engine=None,
+                      catalog=None,
+                      max_per_host=None):
     """
     Function to start EUMETSAT download.
 
@@ -91,11 +98,20 @@ def eumetsat_download(credentials,
         A custom polygon using EPSG:4326 decimal degrees (default: None).
     limit : int, optional
         Filter used to limit the returned results (default: None).
+    engine : {"asyncio", "thread"}, optional
+        Download engine (default: "asyncio" if aiohttp is installed,
+        otherwise "thread").
+    catalog : str or Path, optional
+        Catalog file caching the search results (default: None).
+    max_per_host : int, optional
+        Number of concurrent downloads per host of the asyncio engine
+        (default: None, only limited by max_workers).
     """
     connector = EumConnector()
     connector.connect(credentials)
     connector.download(product, local_path, start_date, end_date, max_workers,
-                       coords, limit)
+                       coords, limit, engine, catalog, max_per_host)
+    connector.close()
 
 
 def parse_args_hsaf_download(args):
@@ -136,6 +152,11 @@ def parse_args_hsaf_download(args):
                         type=parse_date,
                         help='end date in YYYYMMDD format')
 
+    parser.add_argument('-mw',
+                        '--max_workers',
+                        type=int,
+                        help='Number of parallel downloads')
+
     parser.add_argument(
         '-co',
         '--coords',
@@ -196,6 +217,26 @@ def parse_args_eumetsat_download(args):
 
     parser.add_argument('-l', '--limit', help='Filter number of results')
 
+    parser.add_argument(
+        '-e',
+        '--engine',
+        choices=['asyncio', 'thread'],
+        help=('Download engine (default: asyncio if aiohttp is installed, '
+              'otherwise thread)'))
+
+    parser.add_argument(
+        '-mph',
+        '--max_per_host',
+        type=int,
+        help=('Number of parallel downloads per host of the asyncio engine '
+              '(default: only limited by max_workers)'))
+
+    parser.add_argument(
+        '-ca',
+        '--catalog',
+        help=('Catalog file caching the search results, repeated searches '
+              'only request date ranges not searched before'))
+
     return parser.parse_args(args), parser
 
 
@@ -214,7 +255,8 @@ def hsaf_main(cli_args):
     credentials.read(args.credential_file)
 
     hsaf_download(credentials['hsaf'], args.remote_path, args.output_dir,
-                  args.start_date, args.end_date, args.limit)
+                  args.start_date, args.end_date, args.limit,
+                  args.max_workers)
 
 
 def eumetsat_main(cli_args):
@@ -233,7 +275,8 @@ def eumetsat_main(cli_args):
 
     eumetsat_download(credentials['eumetsat'], args.product, args.output_dir,
                       args.start_date, args.end_date, args.max_workers,
-                      args.coords, args.limit)
+                      args.coords, args.limit, args.engine, args.catalog,
+                      args.max_per_host)
 
 
 def run_hsaf_download():
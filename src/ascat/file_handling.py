@@ -6,14 +6,21 @@
 File search methods.
 """
 
+import os
 import abc
 import glob
+import json
 import re
 import warnings
+from bisect import bisect_left
 from pathlib import Path
 from datetime import timedelta
 from datetime import datetime
 from collections import defaultdict
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 
@@ -23,6 +30,57 @@ from tqdm.dask import TqdmCallback
 from dask.delayed import delayed
 from dask.base import compute
 
+
+def iter_prefetch(read, filenames, prefetch, prefetch_scheduler="threads",
+                  **kwargs):
+    """
+    Read files in a pool of background workers, keeping up to `prefetch`
+    files in flight, and yield the data in the order of `filenames`.
+
+    Parameters
+    ----------
+    read : callable
+        Function reading one file, called as ``read(filename, **kwargs)``.
+        It should load the data, so that all decoding happens in the worker.
+    filenames : iterable of Path
+        Files to read.
+    prefetch : int
+        Number of files to read ahead.
+    prefetch_scheduler : str, optional
+        "threads" or "processes" (default: "threads").
+    **kwargs : dict
+        Additional keyword arguments passed to `read`.
+
+    Yields
+    ------
+    object
+        Data read from each file.
+    """
+    if prefetch_scheduler == "threads":
+        executor_class = ThreadPoolExecutor
+    elif prefetch_scheduler == "processes":
+        executor_class = ProcessPoolExecutor
+    else:
+        raise ValueError(
+            f"Unknown prefetch scheduler '{prefetch_scheduler}'. Valid "
+            "schedulers are 'threads' and 'processes'.")
+
+    filenames = iter(filenames)
+    pending = deque()
+    with executor_class(max_workers=prefetch) as executor:
+        for filename in islice(filenames, prefetch):
+            pending.append(executor.submit(read, filename, **kwargs))
+        try:
+            while pending:
+                data = pending.popleft().result()
+                for filename in islice(filenames, 1):
+                    pending.append(executor.submit(read, filename, **kwargs))
+                yield data
+        finally:
+            for future in pending:
+                future.cancel()
+
+
 class FilenameTemplate:
     """
     FilenameTemplate class.
@@ -520,6 +578,169 @@ class MultiFileHandler(metaclass=abc.ABCMeta):
         return sorted(filenames, reverse=True)
 
 
+class FileDateIndex:
+    """
+    Index of the files matching a glob pattern, sorted by the date parsed
+    from their filename.
+
+    Listings are kept in memory and optionally stored on disk as JSON. A
+    listing is rebuilt whenever the modification time of the root path or of
+    any directory matching the directory part of the pattern changes, i.e.
+    when files are added, removed or renamed.
+    """
+
+    def __init__(self, filename=None):
+        """
+        Initialize index.
+
+        Parameters
+        ----------
+        filename : str or Path, optional
+            File in which the listings are stored between sessions. If None
+            (default), the index is only kept in memory. The file should not
+            be placed inside an indexed directory, since writing it changes the
+            modification time of that directory.
+        """
+        self.filename = Path(filename) if filename is not None else None
+        self._listings = {}
+
+        if self.filename is not None and self.filename.exists():
+            with open(self.filename) as f:
+                self._listings = json.load(f)
+
+    @staticmethod
+    def _key(pattern, *parse_args):
+        return "|".join([pattern, *parse_args])
+
+    @staticmethod
+    def _dir_stamps(root_path, pattern):
+        """
+        Modification times of the root path and of all directories between it
+        and the files that match the directory part of the pattern, including
+        directories that do not contain matching files yet.
+        """
+        root_path = Path(root_path)
+        dirs = {root_path}
+        parts = Path(pattern).parent.relative_to(root_path).parts
+        for i in range(1, len(parts) + 1):
+            dirs.update(
+                Path(d)
+                for d in glob.glob(str(root_path.joinpath(*parts[:i])))
+                if os.path.isdir(d))
+
+        return {str(d): os.stat(d).st_mtime_ns for d in dirs}
+
+    @staticmethod
+    def _is_current(stamps):
+        for d, mtime in stamps.items():
+            try:
+                if os.stat(d).st_mtime_ns != mtime:
+                    return False
+            except FileNotFoundError:
+                return False
+        return True
+
+    def listing(self, root_path, pattern, parse_date, *parse_args):
+        """
+        Files matching a glob pattern, sorted by date.
+
+        Parameters
+        ----------
+        root_path : str or Path
+            Directory the pattern is located in.
+        pattern : str
+            Glob pattern.
+        parse_date : callable
+            Function parsing the date of a filename, called as
+            ``parse_date(filename, *parse_args)``. Files whose date cannot be
+            parsed are not indexed.
+        *parse_args
+            Additional arguments of `parse_date`. Part of the index key.
+
+        Returns
+        -------
+        dates : list of datetime
+            Sorted dates.
+        filenames : list of str
+            Filenames corresponding to `dates`.
+        """
+        key = self._key(pattern, *parse_args)
+        listing = self._listings.get(key)
+
+        if listing is None or not self._is_current(listing["stamps"]):
+            entries = []
+            for filename in glob.glob(pattern):
+                try:
+                    date = parse_date(filename, *parse_args)
+                except (AttributeError, ValueError):
+                    continue
+                entries.append((date, filename))
+            entries.sort()
+
+            listing = {
+                "stamps": self._dir_stamps(root_path, pattern),
+                "dates": [d.isoformat() for d, _ in entries],
+                "filenames": [f for _, f in entries],
+            }
+            self._listings[key] = listing
+            self.save()
+
+        if "_dates" not in listing:
+            listing["_dates"] = [
+                datetime.fromisoformat(d) for d in listing["dates"]
+            ]
+
+        return listing["_dates"], listing["filenames"]
+
+    def search(self, root_path, pattern, parse_date, dt_start, dt_end,
+               *parse_args):
+        """
+        Files matching a glob pattern with a date in [dt_start, dt_end).
+
+        Parameters
+        ----------
+        root_path : str or Path
+            Directory the pattern is located in.
+        pattern : str
+            Glob pattern.
+        parse_date : callable
+            Function parsing the date of a filename.
+        dt_start : datetime
+            Start datetime.
+        dt_end : datetime
+            End datetime (exclusive).
+        *parse_args
+            Additional arguments of `parse_date`.
+
+        Returns
+        -------
+        filenames : list of str
+            Filenames sorted by date.
+        """
+        dates, filenames = self.listing(root_path, pattern, parse_date,
+                                        *parse_args)
+        i_start = bisect_left(dates, dt_start)
+        i_end = bisect_left(dates, dt_end)
+        return filenames[i_start:i_end]
+
+    def save(self):
+        """
+        Write the index to disk (if a filename is set).
+        """
+        if self.filename is None:
+            return
+
+        listings = {
+            key: {k: v for k, v in listing.items() if not k.startswith("_")}
+            for key, listing in self._listings.items()
+        }
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        tmp_filename = self.filename.with_name(self.filename.name + ".tmp")
+        with open(tmp_filename, "w") as f:
+            json.dump(listings, f)
+        os.replace(tmp_filename, self.filename)
+
+
 class ChronFiles(MultiFileHandler):
     """
     Managing chronological files with a date field in the filename.
@@ -538,6 +759,7 @@ class ChronFiles(MultiFileHandler):
         fn_write_fmt=None,
         sf_write_fmt=None,
         cache_size=0,
+        date_index=None,
     ):
         """
         Initialize ChronFiles class.
@@ -568,6 +790,11 @@ class ChronFiles(MultiFileHandler):
             Subfolder format for write operation.
         cache_size : int, optional
             Number of files to keep in memory (default=0).
+        date_index : bool or str or Path, optional
+            If given, `search_period` answers searches from a `FileDateIndex`
+            (a single directory listing sorted by file date) instead of one
+            file search per `dt_delta` step. Pass True to keep the index in
+            memory or a path to also store it on disk (default: None).
         """
         super().__init__(root_path, cls, fn_templ, sf_templ, cls_kwargs, err,
                          cache_size)
@@ -577,6 +804,13 @@ class ChronFiles(MultiFileHandler):
         self.fn_write_fmt = fn_write_fmt
         self.sf_write_fmt = sf_write_fmt
 
+        if date_index is True:
+            self.date_index = FileDateIndex()
+        elif date_index:
+            self.date_index = FileDateIndex(date_index)
+        else:
+            self.date_index = None
+
     def _fmt(self, *fmt_args, **fmt_kwargs):
         """
         Format filenames/filepaths.
@@ -734,8 +968,19 @@ class ChronFiles(MultiFileHandler):
         filenames = []
 
         dt_end = dt_end + dt_delta if end_inclusive else dt_end
-
-        for dt_cur in np.arange(dt_start, dt_end, dt_delta).astype(datetime):
+        search_dates = np.arange(dt_start, dt_end, dt_delta).astype(datetime)
+
+        if self.date_index is not None:
+            if len(search_dates) == 0:
+                return filenames
+            pattern = self._period_pattern(search_dates, date_field,
+                                           **fmt_kwargs)
+            return self.date_index.search(self.root_path, pattern,
+                                          self._parse_date, dt_start, dt_end,
+                                          date_field, date_field_fmt)
+
+        seen = set()
+        for dt_cur in search_dates:
             files, dates = self.search_date(
                 dt_cur,
                 search_date_fmt=search_date_fmt,
@@ -745,11 +990,55 @@ class ChronFiles(MultiFileHandler):
                 **fmt_kwargs,
             )
             for f, dt in zip(files, dates):
-                if f not in filenames and dt >= dt_start and dt < dt_end:
+                if f not in seen and dt >= dt_start and dt < dt_end:
+                    seen.add(f)
                     filenames.append(f)
 
         return filenames
 
+    def _period_pattern(self, search_dates, date_field, **fmt_kwargs):
+        """
+        Glob pattern matching the files of all search dates of a period.
+
+        The date field and all format fields that are not the same for every
+        search date (e.g. year or month subfolders) are replaced by wildcards.
+
+        Parameters
+        ----------
+        search_dates : list of datetime
+            Search dates of the period.
+        date_field : str
+            Date field name.
+
+        Returns
+        -------
+        pattern : str
+            Glob pattern.
+        """
+        def merge_fmts(fmts):
+            merged = dict(fmts[0])
+            for fmt in fmts[1:]:
+                for k, v in fmt.items():
+                    if merged.get(k) != v:
+                        merged[k] = "*"
+            return merged
+
+        fmts = [self._fmt(dt, **fmt_kwargs)[:2] for dt in search_dates]
+
+        fn_fmt = merge_fmts([fn_fmt for fn_fmt, _ in fmts])
+        fn_fmt[date_field] = "*"
+
+        sf_fmts = [sf_fmt for _, sf_fmt in fmts]
+        if sf_fmts[0] is None:
+            sf_fmt = None
+        else:
+            sf_fmt = {
+                name: merge_fmts([sf_fmt[name] for sf_fmt in sf_fmts])
+                for name in sf_fmts[0]
+            }
+
+        return self.ft.build_filename(fn_fmt, sf_fmt)
+
     def read_period(
         self,
         dt_start,
@@ -986,15 +1275,37 @@ class Filenames:
 
         return
 
-    def read(self, parallel=False, closer_attr=None, **kwargs):
+    def read(self, parallel=False, closer_attr=None, max_workers=None,
+             **kwargs):
         """
         Read all data from files.
 
+        Parameters
+        ----------
+        parallel : bool, optional
+            Read the files in parallel with the dask process scheduler
+            (default: False).
+        closer_attr : str, optional
+            Attribute of the data read from each file holding a function
+            closing the file. If set, the closers are returned as well
+            (default: None).
+        max_workers : int, optional
+            Read the files in a pool of `max_workers` threads. Each file is
+            read and loaded into memory in its worker, so no process is
+            spawned and no data is pickled. Cannot be combined with
+            `parallel` (default: None, files are read one by one).
+        **kwargs : dict
+            Additional keyword arguments passed to `_read`.
+
         Returns
         -------
         object
             Merged data from all files.
         """
+        if parallel and max_workers is not None:
+            raise ValueError("Only one of parallel and max_workers can be "
+                             "set.")
+
         if parallel:
             read_ = delayed(self._read)
             getattr_ = delayed(getattr)
@@ -1002,7 +1313,13 @@ class Filenames:
             read_ = self._read
             getattr_ = getattr
 
-        data = [read_(f, **kwargs) for f in self.filenames]
+        if max_workers is not None:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(self._read_eager, f, **kwargs)
+                           for f in self.filenames]
+                data = [future.result() for future in futures]
+        else:
+            data = [read_(f, **kwargs) for f in self.filenames]
         if closer_attr is not None:
             closers = [getattr_(d, closer_attr) for d in data if d is not None]
 
@@ -1018,10 +1335,73 @@ class Filenames:
 
         return data
 
-    def iter_read(self, print_progress=False, **kwargs):
+    def _read_eager(self, filename, **kwargs):
+        """
+        Read data from a single file and load any lazy (dask) data into memory.
+
+        Used by the prefetching reader pool, so that all decoding happens in the
+        background worker.
+
+        Parameters
+        ----------
+        filename : Path
+            The file to read from.
+        **kwargs : dict
+            Additional keyword arguments passed to `_read`.
+
+        Returns
+        -------
+        object
+            Data read from the file.
+        """
+        data = self._read(filename, **kwargs)
+        return compute(data, scheduler="synchronous")[0]
+
+    def _iter_prefetch(self, filenames, prefetch, prefetch_scheduler, **kwargs):
+        """
+        Read files in a pool of background workers, keeping up to `prefetch`
+        files in flight, see `iter_prefetch`.
+
+        Parameters
+        ----------
+        filenames : iterable of Path
+            Files to read.
+        prefetch : int
+            Number of files to read ahead.
+        prefetch_scheduler : str
+            "threads" or "processes".
+        **kwargs : dict
+            Additional keyword arguments passed to `_read`.
+
+        Returns
+        -------
+        data : generator
+            Data read from each file, in the order of `filenames`.
+        """
+        return iter_prefetch(self._read_eager, filenames, prefetch,
+                             prefetch_scheduler, **kwargs)
+
+    def iter_read(self,
+                  print_progress=False,
+                  prefetch=0,
+                  prefetch_scheduler="threads",
+                  **kwargs):
         """
         Iterate over all files and yield data.
 
+        Parameters
+        ----------
+        print_progress : bool, optional
+            If True, print a progress bar (default: False).
+        prefetch : int, optional
+            Number of files to read ahead in a pool of background workers while
+            the current data is processed. Prefetched data is loaded into memory.
+            If 0 (default), files are opened one at a time when requested.
+        prefetch_scheduler : str, optional
+            Pool used for prefetching, "threads" (default) or "processes".
+        **kwargs : dict
+            Additional keyword arguments passed to `_read`.
+
         Yields
         ------
         object
@@ -1032,22 +1412,39 @@ class Filenames:
         else:
             filenames = self.filenames
 
+        if prefetch > 0:
+            data_iter = self._iter_prefetch(filenames, prefetch,
+                                            prefetch_scheduler, **kwargs)
+        else:
+            data_iter = (self._read(f, **kwargs) for f in filenames)
+
         size = 0
-        for filename in filenames:
-            if print_progress:
-                filenames.set_description(f"Opening {Path(filename).name}, total {size} bytes...")
-            data = self._read(filename, **kwargs)
+        for data in data_iter:
             size += self._nbytes(data)
+            if print_progress:
+                filenames.set_description(f"Opened {size} bytes...")
             yield data
 
-    def iter_read_nbytes(self, max_nbytes, print_progress=False, **kwargs):
+    def iter_read_nbytes(self,
+                         max_nbytes,
+                         print_progress=False,
+                         prefetch=0,
+                         prefetch_scheduler="threads",
+                         **kwargs):
         """
         Iterate over all files and yield data until the specified number of bytes is reached.
         If `_read` returns dask objects, they are computed (in parallel) before merging the data.
+
+        With `prefetch` > 0 the next files are already read and loaded by a pool
+        of background workers (see `iter_read`) while the current chunk is being
+        processed by the caller.
         """
         size = 0
         data_list = []
-        for data in self.iter_read(print_progress, **kwargs):
+        for data in self.iter_read(print_progress,
+                                   prefetch=prefetch,
+                                   prefetch_scheduler=prefetch_scheduler,
+                                   **kwargs):
             data_size = self._nbytes(data)
             size += data_size
             if size > max_nbytes and size > data_size:
@@ -1113,7 +1510,9 @@ class Filenames:
     @staticmethod
     def _multi_file_closer(closers):
         for closer in closers:
-            closer()
+            # datasets read fully into memory have no closer
+            if closer is not None:
+                closer()
         return
 
 
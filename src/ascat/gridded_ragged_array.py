@@ -15,13 +15,15 @@ Use :class:`GriddedContiguousRaggedArray` for contiguous ragged cell files and
 :class:`GriddedIndexedRaggedArray` for indexed ragged cell files.
 """
 
+from collections import OrderedDict, namedtuple
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
 import numpy as np
 from fibgrid.realization import FibGrid
 from pygeogrids.grids import CellGrid
 
+from ascat.cell_index import CellManifest, LocationIndex
 from ascat.ragged_array import (
     ContiguousRaggedArray,
     IndexedRaggedArray,
@@ -75,6 +77,10 @@ class GridRegistry:
 #: Shared grid registry used by the readers when a grid name (str) is passed.
 grid_registry = GridRegistry()
 
+#: Cell cache statistics returned by :meth:`GriddedRaggedArray.cache_info`.
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "cells", "nbytes"])
+
 
 class GriddedRaggedArray:
     """
@@ -94,6 +100,15 @@ class GriddedRaggedArray:
     - ``cache=True``: every cell that is read is retained in memory. Efficient
       when reading many grid points spread across (and revisiting) cells, at the
       cost of memory.
+    - ``cache=True`` with ``max_cache_nbytes``: cells are retained in least
+      recently used order until their total size exceeds the byte budget; the
+      least recently used cells are then closed and dropped. Suited to long
+      extractions that revisit neighbouring cells. The size of a cell is the
+      nominal size of its dataset, i.e. of all its variables once loaded.
+      Cells are opened lazily, so the budget bounds the memory held by the
+      cache rather than measuring it.
+
+    :meth:`cache_info` reports hits, misses and evictions of the cell cache.
 
     This base class is not used directly; use
     :class:`GriddedContiguousRaggedArray` or :class:`GriddedIndexedRaggedArray`.
@@ -111,6 +126,16 @@ class GriddedRaggedArray:
     cache : bool, optional
         Keep every read cell in memory instead of only the last one
         (default: False).
+    max_cache_nbytes : int, optional
+        Byte budget of the cell cache if ``cache=True``; least recently used
+        cells are evicted once it is exceeded. The size of a cell is the
+        nominal size of its dataset, an upper bound of the memory it holds
+        (default: None, no limit).
+    manifest : bool, str, pathlib.Path or CellManifest, optional
+        Find cell files in a :class:`~ascat.cell_index.CellManifest` of the
+        collection instead of searching ``root_path`` recursively. ``True``
+        keeps the manifest in ``root_path / "cell_manifest.json"``; a path or
+        manifest object selects another one (default: None, no manifest).
     """
 
     def __init__(
@@ -119,18 +144,29 @@ class GriddedRaggedArray:
         grid: Union[CellGrid, str],
         fn_format: str = "{:04d}.nc",
         cache: bool = False,
+        max_cache_nbytes: Optional[int] = None,
+        manifest: Union[bool, str, Path, CellManifest, None] = None,
     ):
         self.root_path = Path(root_path)
         self.grid = grid_registry.get(grid) if isinstance(grid, str) else grid
         self.fn_format = fn_format
         self.cache = cache
-
-        # cache=True: {cell: ragged array}
-        self._cells = {}
+        self.max_cache_nbytes = max_cache_nbytes
+        self.manifest = CellManifest.resolve(manifest, self.root_path,
+                                             fn_format=fn_format)
+
+        # cache=True: {cell: ragged array}, least recently used first
+        self._cells = OrderedDict()
+        self._cell_nbytes = {}
+        self._cache_nbytes = 0
         # cache=False: only the most recently opened cell is kept
         self._active_cell = None
         self._active_reader = None
 
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
     def _open_cell(self, cell: int):
         """Open the file for ``cell`` and return a ragged-array reader."""
         raise NotImplementedError
@@ -138,7 +174,10 @@ class GriddedRaggedArray:
     def _cell_filename(self, cell: int) -> Path:
         """Locate the file for a cell under ``root_path``."""
         name = self.fn_format.format(cell)
-        matches = sorted(self.root_path.glob("**/" + name))
+        if self.manifest is not None:
+            matches = self.manifest.lookup(name)
+        else:
+            matches = sorted(self.root_path.glob("**/" + name))
         if not matches:
             raise FileNotFoundError(
                 f"No cell file for cell {cell} ('{name}') under "
@@ -161,15 +200,62 @@ class GriddedRaggedArray:
         """
         cell = int(cell)
         if self.cache:
-            if cell not in self._cells:
-                self._cells[cell] = self._open_cell(cell)
+            if cell in self._cells:
+                self._hits += 1
+                self._cells.move_to_end(cell)
+            else:
+                self._misses += 1
+                reader = self._open_cell(cell)
+                self._cells[cell] = reader
+                # nominal size: variables are only loaded as they are read
+                self._cell_nbytes[cell] = reader.ds.nbytes
+                self._cache_nbytes += self._cell_nbytes[cell]
+                self._evict()
             return self._cells[cell]
 
-        if cell != self._active_cell:
+        if cell == self._active_cell:
+            self._hits += 1
+        else:
+            self._misses += 1
+            if self._active_cell is not None:
+                self._close_reader(self._active_reader)
+                self._evictions += 1
             self._active_reader = self._open_cell(cell)
             self._active_cell = cell
         return self._active_reader
 
+    def _evict(self):
+        """Drop least recently used cells until the byte budget is met."""
+        if self.max_cache_nbytes is None:
+            return
+        # the most recently read cell is always kept
+        while (self._cache_nbytes > self.max_cache_nbytes
+               and len(self._cells) > 1):
+            cell, reader = self._cells.popitem(last=False)
+            self._cache_nbytes -= self._cell_nbytes.pop(cell)
+            self._close_reader(reader)
+            self._evictions += 1
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Statistics of the cell cache.
+
+        Returns
+        -------
+        info : CacheInfo
+            Named tuple of cache ``hits``, ``misses`` and ``evictions`` since
+            creation, and the number of ``cells`` currently held and their
+            total nominal size ``nbytes``.
+        """
+        if self.cache:
+            cells, nbytes = len(self._cells), self._cache_nbytes
+        elif self._active_reader is not None:
+            cells, nbytes = 1, self._active_reader.ds.nbytes
+        else:
+            cells, nbytes = 0, 0
+        return CacheInfo(self._hits, self._misses, self._evictions, cells,
+                         nbytes)
+
     def gpi_from_coords(
         self, lon: float, lat: float, max_dist: float = np.inf
     ) -> int:
@@ -242,11 +328,15 @@ class GriddedRaggedArray:
                 gpi = np.asarray(near)[np.asarray(dist) <= max_dist]
 
         if np.ndim(gpi) == 0:
-            cell = int(self.grid.gpi2cell(gpi))
-            return self.read_cell(cell).sel_instance(int(gpi))
+            return self._read_gpi(int(gpi))
 
         return self._read_gpis(np.asarray(gpi))
 
+    def _read_gpi(self, gpi: int):
+        """Read a single grid point from its cell."""
+        cell = int(self.grid.gpi2cell(gpi))
+        return self.read_cell(cell).sel_instance(gpi)
+
     def _read_gpis(self, gpis: np.ndarray) -> dict:
         """Read many grid points, reading each cell file only once."""
         cells = np.atleast_1d(self.grid.gpi2cell(gpis))
@@ -270,6 +360,8 @@ class GriddedRaggedArray:
             self._close_reader(reader)
         self._close_reader(self._active_reader)
         self._cells.clear()
+        self._cell_nbytes.clear()
+        self._cache_nbytes = 0
         self._active_cell = None
         self._active_reader = None
 
@@ -311,6 +403,18 @@ class GriddedContiguousRaggedArray(GriddedRaggedArray):
         Drop fill/padding locations when reading a cell (default: True).
     cache : bool, optional
         Keep every read cell in memory (default: False).
+    max_cache_nbytes : int, optional
+        Byte budget of the cell cache (default: None, no limit).
+    location_index : bool, str, pathlib.Path or LocationIndex, optional
+        Read grid points through a :class:`~ascat.cell_index.LocationIndex`
+        instead of opening their cells: only the observations of the grid
+        point are read. ``True`` keeps the index in
+        ``root_path / "location_index.npz"``; a path or index object selects
+        another one. Cell files are indexed on first use. Grid point reads
+        through the index bypass the cell cache (default: None, no index).
+    manifest : bool, str, pathlib.Path or CellManifest, optional
+        Find cell files in a :class:`~ascat.cell_index.CellManifest` instead
+        of searching ``root_path`` recursively (default: None, no manifest).
     """
 
     def __init__(
@@ -323,13 +427,33 @@ class GriddedContiguousRaggedArray(GriddedRaggedArray):
         instance_id_var: str = "location_id",
         trim: bool = True,
         cache: bool = False,
+        max_cache_nbytes: Optional[int] = None,
+        location_index: Union[bool, str, Path, LocationIndex, None] = None,
+        manifest: Union[bool, str, Path, CellManifest, None] = None,
     ):
-        super().__init__(root_path, grid, fn_format=fn_format, cache=cache)
+        super().__init__(root_path, grid, fn_format=fn_format, cache=cache,
+                         max_cache_nbytes=max_cache_nbytes, manifest=manifest)
         self.count_var = count_var
         self.instance_dim = instance_dim
         self.instance_id_var = instance_id_var
         self.trim = trim
 
+        self.location_index = LocationIndex.resolve(
+            location_index, self.root_path, count_var=count_var,
+            instance_id_var=instance_id_var)
+
+    def _read_gpi(self, gpi: int):
+        if self.location_index is None:
+            return super()._read_gpi(gpi)
+        filename = self._cell_filename(int(self.grid.gpi2cell(gpi)))
+        return self.location_index.read(filename, gpi)
+
+    def _read_gpis(self, gpis: np.ndarray) -> dict:
+        if self.location_index is None:
+            return super()._read_gpis(gpis)
+        with self.location_index.batch():
+            return {int(g): self._read_gpi(int(g)) for g in gpis}
+
     def _open_cell(self, cell: int) -> ContiguousRaggedArray:
         return ContiguousRaggedArray.from_file(
             self._cell_filename(cell),
@@ -365,6 +489,11 @@ class GriddedIndexedRaggedArray(GriddedRaggedArray):
         (default: "location_id").
     cache : bool, optional
         Keep every read cell in memory (default: False).
+    max_cache_nbytes : int, optional
+        Byte budget of the cell cache (default: None, no limit).
+    manifest : bool, str, pathlib.Path or CellManifest, optional
+        Find cell files in a :class:`~ascat.cell_index.CellManifest` instead
+        of searching ``root_path`` recursively (default: None, no manifest).
     """
 
     def __init__(
@@ -376,8 +505,11 @@ class GriddedIndexedRaggedArray(GriddedRaggedArray):
         sample_dim: str = "obs",
         instance_id_var: str = "location_id",
         cache: bool = False,
+        max_cache_nbytes: Optional[int] = None,
+        manifest: Union[bool, str, Path, CellManifest, None] = None,
     ):
-        super().__init__(root_path, grid, fn_format=fn_format, cache=cache)
+        super().__init__(root_path, grid, fn_format=fn_format, cache=cache,
+                         max_cache_nbytes=max_cache_nbytes, manifest=manifest)
         self.index_var = index_var
         self.sample_dim = sample_dim
         self.instance_id_var = instance_id_var
@@ -419,6 +551,11 @@ class GriddedOrthoMultiArray(GriddedRaggedArray):
         (default: "location_id").
     cache : bool, optional
         Keep every read cell in memory (default: False).
+    max_cache_nbytes : int, optional
+        Byte budget of the cell cache (default: None, no limit).
+    manifest : bool, str, pathlib.Path or CellManifest, optional
+        Find cell files in a :class:`~ascat.cell_index.CellManifest` instead
+        of searching ``root_path`` recursively (default: None, no manifest).
     """
 
     def __init__(
@@ -431,8 +568,11 @@ class GriddedOrthoMultiArray(GriddedRaggedArray):
         element_coord: str = None,
         instance_id_var: str = "location_id",
         cache: bool = False,
+        max_cache_nbytes: Optional[int] = None,
+        manifest: Union[bool, str, Path, CellManifest, None] = None,
     ):
-        super().__init__(root_path, grid, fn_format=fn_format, cache=cache)
+        super().__init__(root_path, grid, fn_format=fn_format, cache=cache,
+                         max_cache_nbytes=max_cache_nbytes, manifest=manifest)
         self.instance_dim = instance_dim
         self.element_dim = element_dim
         self.element_coord = element_coord
@@ -7,6 +7,7 @@ from pathlib import Path
 import numpy as np
 import xarray as xr
 
+from ascat.array_utils import vrange
 from ascat.cf_conversions import point_to_indexed
 from ascat.cf_conversions import point_to_contiguous
 from ascat.cf_conversions import indexed_to_contiguous
@@ -827,8 +828,10 @@ class ContiguousRaggedArray:
         Memory scales with the number of instances, not the largest id value.
         """
         self._lookup = _InstanceLookup(self._instance_ids)
-        # exclusive prefix sum: first sample offset of each instance
-        self._row_start = np.cumsum(self._row_size) - self._row_size
+        # exclusive prefix sum: first sample offset of each instance, fill
+        # locations (negative counts) hold no samples
+        row_size = np.maximum(self._row_size, 0)
+        self._row_start = np.cumsum(row_size) - row_size
 
     @classmethod
     def from_file(cls,
@@ -1000,10 +1003,10 @@ class ContiguousRaggedArray:
         if pos.size == 0:
             return None
 
+        # instances with a count <= 0 add no samples
         starts = self._row_start[pos]
-        ends = starts + self._row_size[pos]
-        sample_idx = np.concatenate(
-            [np.arange(s, e) for s, e in zip(starts, ends)])
+        sample_idx = vrange(starts,
+                            starts + np.maximum(self._row_size[pos], 0))
         return self._wrap(self.ds.isel({
             self.sample_dim: sample_idx,
             self.instance_dim: pos,
@@ -1029,10 +1032,8 @@ class ContiguousRaggedArray:
 
         clamped = np.where(valid, self._row_size, 0)
         starts = np.cumsum(clamped) - clamped
-        sample_idx = np.concatenate(
-            [np.arange(s, s + c)
-             for s, c, v in zip(starts, clamped, valid) if v]
-        ) if valid.any() else np.array([], dtype=np.int64)
+        # padding locations have a count of 0 and add no samples
+        sample_idx = vrange(starts, starts + clamped)
 
         ds = self.ds.isel({
             self.sample_dim: sample_idx,
@@ -1506,14 +1507,21 @@ class IndexedRaggedArray:
         i = i[keep]
         positions = positions[keep]
 
-        # keep samples whose index-variable position is among the selected ones
-        sample_mask = np.isin(self.ds[self.index_var].values, positions)
+        # new index of each old position (request order of i, the first
+        # request of a position if it is repeated), -1 if not selected
+        n_instances = self.ds.sizes[self.instance_dim]
+        new_position = np.full(n_instances, -1, dtype=np.int64)
+        new_position[positions[::-1]] = np.arange(positions.size)[::-1]
+
+        # gather the new index of every sample with one table look-up and
+        # keep the samples of the selected instances
+        index = self.ds[self.index_var].values
+        in_range = (index >= 0) & (index < n_instances)
+        new_index = np.where(
+            in_range, new_position[np.where(in_range, index, 0)], -1)
+        sample_mask = new_index != -1
         data = self.ds.isel({self.sample_dim: sample_mask})
-
-        # remap each old position to its new index (request order of i)
-        new_index = _InstanceLookup(positions).positions(
-            data[self.index_var].values)
-        data[self.index_var] = (self.sample_dim, new_index)
+        data[self.index_var] = (self.sample_dim, new_index[sample_mask])
         # select the instance-level data by position (request order)
         data = data.isel({self.instance_dim: positions})
 
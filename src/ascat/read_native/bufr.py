@@ -7,12 +7,22 @@ Readers for ASCAT Level 1b and Level 2 data in BUFR format.
 """
 
 import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 import numpy as np
 import pandas as pd
 import xarray as xr
 from cadati.cal_date import cal2dt
 
+try:
+    # Load PROJ before ecCodes. The pyproj and eccodes wheels bundle their own
+    # copies of shared libraries; if ecCodes is loaded first and both are used,
+    # the interpreter crashes with a double free on exit.
+    import pyproj  # noqa: F401
+except ImportError:
+    pass
+
 try:
     import eccodes
 except ImportError:
@@ -36,7 +46,118 @@ nan_val_dict = {
 }
 
 
-def read_bufr_data(filename, key_lookup):
+time_keys = ("year", "month", "day", "hour", "minute", "second")
+
+
+def scan_bufr_messages(filename):
+    """
+    Scan a BUFR file for its messages without unpacking the data sections.
+
+    Parameters
+    ----------
+    filename : str
+        BUFR filename.
+
+    Returns
+    -------
+    offsets : numpy.ndarray
+        Byte offset of each message in the file.
+    lengths : numpy.ndarray
+        Length of each message in bytes.
+    n_subsets : numpy.ndarray
+        Number of subsets (observations) of each message.
+    """
+    offsets, lengths, n_subsets = [], [], []
+
+    with open(filename, "rb") as fh:
+        while True:
+            handle = eccodes.codes_bufr_new_from_file(fh)
+            if handle is None:
+                break
+            try:
+                offsets.append(int(eccodes.codes_get(handle, "offset")))
+                lengths.append(eccodes.codes_get(handle, "totalLength"))
+                n_subsets.append(eccodes.codes_get(handle, "numberOfSubsets"))
+            finally:
+                eccodes.codes_release(handle)
+
+    return (np.array(offsets, dtype=np.int64),
+            np.array(lengths, dtype=np.int64),
+            np.array(n_subsets, dtype=np.int64))
+
+
+def _get_array(handle, key, n_obs):
+    """
+    Read a key of a BUFR message, broadcasting single values to all subsets.
+    """
+    arr = np.atleast_1d(eccodes.codes_get_array(handle, key))
+    if arr.size == 1 and n_obs != 1:
+        arr = np.repeat(arr, n_obs)
+    return arr
+
+
+def _decode_bufr_messages(filename, offsets, lengths, n_subsets, key_lookup):
+    """
+    Decode a batch of BUFR messages into preallocated column buffers.
+
+    Parameters
+    ----------
+    filename : str
+        BUFR filename.
+    offsets : numpy.ndarray
+        Byte offset of each message.
+    lengths : numpy.ndarray
+        Length of each message in bytes.
+    n_subsets : numpy.ndarray
+        Number of subsets of each message.
+    key_lookup : dict
+        Mapping of output field name to eccodes key.
+
+    Returns
+    -------
+    columns : dict of numpy.ndarray
+        Requested fields.
+    aux : dict of numpy.ndarray
+        Latitude, longitude and date/time fields.
+    """
+    n_total = int(np.sum(n_subsets))
+    columns = {}
+    aux = {"lat": np.empty(n_total, dtype=np.float32),
+           "lon": np.empty(n_total, dtype=np.float32)}
+    for tkey in time_keys:
+        aux[tkey] = np.empty(n_total, dtype=int)
+
+    pos = 0
+    with open(filename, "rb") as fh:
+        for offset, length, n_obs in zip(offsets, lengths, n_subsets):
+            fh.seek(offset)
+            handle = eccodes.codes_new_from_message(fh.read(length))
+            try:
+                eccodes.codes_set(handle, "unpack", 1)
+
+                obs = slice(pos, pos + n_obs)
+                for name, key in key_lookup.items():
+                    arr = _get_array(handle, key, n_obs)
+                    if name not in columns:
+                        columns[name] = np.empty(n_total, dtype=arr.dtype)
+                    else:
+                        # upcast like concatenating the messages would
+                        dtype = np.result_type(columns[name], arr)
+                        if dtype != columns[name].dtype:
+                            columns[name] = columns[name].astype(dtype)
+                    columns[name][obs] = arr
+                aux["lat"][obs] = _get_array(handle, "#1#latitude", n_obs)
+                aux["lon"][obs] = _get_array(handle, "#1#longitude", n_obs)
+                for tkey in time_keys:
+                    aux[tkey][obs] = _get_array(handle, "#1#" + tkey, n_obs)
+            finally:
+                eccodes.codes_release(handle)
+            pos += n_obs
+
+    return columns, aux
+
+
+def read_bufr_data(filename, key_lookup, processes=None, batch_size=None):
     """
     Read selected fields from a BUFR file using eccodes array access.
 
@@ -45,6 +166,9 @@ def read_bufr_data(filename, key_lookup):
     is orders of magnitude faster than ``pdbufr.read_bufr(..., flat=True)`` for
     the large ASCAT BUFR messages.
 
+    The message offsets are scanned first, so the messages can be decoded in
+    batches by a process pool, each batch filling preallocated column buffers.
+
     Parameters
     ----------
     filename : str
@@ -53,6 +177,12 @@ def read_bufr_data(filename, key_lookup):
         Mapping of output field name to the eccodes key to read, e.g.
         ``{"f_Backscatter": "#1#backscatter"}``. Keys yielding a single value
         per message (compressed scalars) are broadcast to all subsets.
+    processes : int, optional
+        Number of processes decoding message batches. Messages are decoded
+        in the calling process if None or smaller than 2 (default: None).
+    batch_size : int, optional
+        Number of messages per batch. By default the messages are split into
+        four batches per process.
 
     Returns
     -------
@@ -60,35 +190,33 @@ def read_bufr_data(filename, key_lookup):
         One row per observation with the requested fields plus ``lat``, ``lon``
         and ``time``.
     """
-    time_keys = ("year", "month", "day", "hour", "minute", "second")
-    columns = {name: [] for name in key_lookup}
-    aux = {name: [] for name in ("lat", "lon", *time_keys)}
+    offsets, lengths, n_subsets = scan_bufr_messages(filename)
 
-    with open(filename, "rb") as fh:
-        while True:
-            handle = eccodes.codes_bufr_new_from_file(fh)
-            if handle is None:
-                break
-            try:
-                eccodes.codes_set(handle, "unpack", 1)
-                n_obs = eccodes.codes_get(handle, "numberOfSubsets")
-
-                def get(key):
-                    arr = np.atleast_1d(eccodes.codes_get_array(handle, key))
-                    if arr.size == 1 and n_obs != 1:
-                        arr = np.repeat(arr, n_obs)
-                    return arr
-
-                for name, key in key_lookup.items():
-                    columns[name].append(get(key))
-                aux["lat"].append(get("#1#latitude").astype(np.float32))
-                aux["lon"].append(get("#1#longitude").astype(np.float32))
-                for tkey in time_keys:
-                    aux[tkey].append(get("#1#" + tkey).astype(int))
-            finally:
-                eccodes.codes_release(handle)
+    if offsets.size == 0:
+        raise ValueError(f"No BUFR messages found in {filename}")
 
-    data = {name: np.concatenate(parts) for name, parts in columns.items()}
+    if processes is None or processes < 2:
+        columns, aux = _decode_bufr_messages(filename, offsets, lengths,
+                                             n_subsets, key_lookup)
+    else:
+        if batch_size is None:
+            batch_size = -(-offsets.size // (4 * processes))
+        batches = np.arange(batch_size, offsets.size, batch_size)
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(
+                executor.map(_decode_bufr_messages,
+                             repeat(filename),
+                             np.split(offsets, batches),
+                             np.split(lengths, batches),
+                             np.split(n_subsets, batches),
+                             repeat(key_lookup)))
+
+        columns, aux = (
+            {name: np.concatenate([r[i][name] for r in results])
+             for name in results[0][i]} for i in range(2))
+
+    data = columns
     # eccodes returns its missing-value sentinel (~1.7e38) for absent values;
     # pdbufr's flat reader returned NaN, so match that for float fields.
     for name, arr in data.items():
@@ -96,12 +224,11 @@ def read_bufr_data(filename, key_lookup):
             arr[np.abs(arr) > 1e37] = np.nan
 
     data = pd.DataFrame(data)
-    data["lat"] = np.concatenate(aux["lat"])
-    data["lon"] = np.concatenate(aux["lon"])
+    data["lat"] = aux["lat"]
+    data["lon"] = aux["lon"]
 
     cal_dates = np.vstack(
-        [np.concatenate(aux[tkey]) for tkey in time_keys]
-        + [np.zeros(data.shape[0])]).T
+        [aux[tkey] for tkey in time_keys] + [np.zeros(data.shape[0])]).T
     data["time"] = cal2dt(cal_dates)
 
     return data
@@ -164,7 +291,7 @@ class AscatL1bBufrFile(AscatFile):
                 "a_ASCAT Land Fraction": "#3#landFraction",
             }
 
-    def _read(self, filename, generic=False, to_xarray=False):
+    def _read(self, filename, generic=False, to_xarray=False, processes=None):
         """
         Read one ASCAT Level 1b BUFR file.
 
@@ -176,13 +303,17 @@ class AscatL1bBufrFile(AscatFile):
         to_xarray : bool, optional
             'True' return data as xarray.Dataset
             'False' return data as numpy.ndarray (default: False).
+        processes : int, optional
+            Number of processes decoding BUFR messages in parallel
+            (default: None).
 
         Returns
         -------
         ds : xarray.Dataset, numpy.ndarray
             ASCAT Level 1b data.
         """
-        data = read_bufr_data(filename, self.msg_key_lookup)
+        data = read_bufr_data(filename, self.msg_key_lookup,
+                              processes=processes)
         data = data.to_records(index=False)
         data = {name:data[name] for name in data.dtype.names}
 
@@ -435,7 +566,7 @@ class AscatL2BufrFile(AscatFile):
             "Topographic Complexity": "#1#topographicComplexity",
         }
 
-    def _read(self, filename, generic=False, to_xarray=False):
+    def _read(self, filename, generic=False, to_xarray=False, processes=None):
         """
         Read one ASCAT Level 2 BUFR file.
 
@@ -447,6 +578,9 @@ class AscatL2BufrFile(AscatFile):
         to_xarray : bool, optional
             'True' return data as xarray.Dataset
             'False' return data as numpy.ndarray(default: False).
+        processes : int, optional
+            Number of processes decoding BUFR messages in parallel
+            (default: None).
 
         Returns
         -------
@@ -455,7 +589,8 @@ class AscatL2BufrFile(AscatFile):
         metadata : dict
             Metadata.
         """
-        data = read_bufr_data(filename, self.msg_key_lookup)
+        data = read_bufr_data(filename, self.msg_key_lookup,
+                              processes=processes)
         data = data.to_records(index=False)
         data = {name:data[name] for name in data.dtype.names}
 
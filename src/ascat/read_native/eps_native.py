@@ -7,7 +7,9 @@ Readers for ASCAT Level 1b and Level 2 data in EPS Native format.
 """
 
 import os
+import pickle
 import fnmatch
+import threading
 from gzip import GzipFile
 from collections import OrderedDict, defaultdict
 from tempfile import NamedTemporaryFile
@@ -48,7 +50,7 @@ class AscatL1bEpsSzfFile(AscatFile):
     """
 
     def _read(self, filename, toi=None, roi=None, generic=True, to_xarray=False,
-             ignore_noise_ool=False):
+             ignore_noise_ool=False, mmap=True):
         """
         Read one ASCAT Level 1b EPS Szf file.
 
@@ -68,6 +70,9 @@ class AscatL1bEpsSzfFile(AscatFile):
             returned (default: False).
         ignore_noise_ool : bool, optional
             Ignore noise out of limit flag (default: False).
+        mmap : bool, optional
+            Memory-map the measurement data instead of copying the whole
+            file into memory (default: True).
 
         Returns
         -------
@@ -89,7 +94,8 @@ class AscatL1bEpsSzfFile(AscatFile):
             full=False,
             unsafe=True,
             scale_mdr=False,
-            ignore_noise_ool=ignore_noise_ool)
+            ignore_noise_ool=ignore_noise_ool,
+            mmap=mmap)
 
         if toi:
             data = get_toi_subset(data, toi)
@@ -289,6 +295,65 @@ class AscatL2EpsFileGeneric(AscatL2EpsFile):
     def _read(self, filename, generic=True, to_xarray=False, **kwargs):
         return super()._read(filename, generic=generic, to_xarray=to_xarray, **kwargs)
 
+class ScaledRecords:
+    """
+    Scaled view of (unscaled) EPS records.
+
+    Fields are scaled on first access and cached, so only the fields that are
+    actually used are converted. Indexing by field name behaves like indexing
+    the structured array returned by `EPSProduct._scaling`.
+    """
+
+    def __init__(self, records, scaled_template, sfactor):
+        """
+        Initialize ScaledRecords.
+
+        Parameters
+        ----------
+        records : numpy.ndarray
+            Raw records (e.g. a numpy.memmap of the MDR block).
+        scaled_template : numpy.dtype
+            Scaled record template.
+        sfactor : dict
+            Scale factors.
+        """
+        self.records = records
+        self.dtype = scaled_template
+        self.sfactor = sfactor
+        self._fields = {}
+
+    @property
+    def shape(self):
+        return self.records.shape
+
+    @property
+    def size(self):
+        return self.records.size
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, key):
+        if not isinstance(key, str):
+            # record selection, scale all fields of the selected records
+            records = self.records[key]
+            scaled = np.empty(records.shape, dtype=self.dtype)
+            for name in self.dtype.names:
+                scaled[name] = self._scale(records, name)
+            return scaled
+
+        if key not in self._fields:
+            self._fields[key] = self._scale(self.records, key)
+        return self._fields[key]
+
+    def _scale(self, records, name):
+        value = self.sfactor[name]
+        dtype = self.dtype[name].base
+        if value != 1:
+            return (records[name] * 1. / value).astype(dtype)
+        return np.array(records[name], dtype=dtype)
+
+
 class EPSProduct:
     """
     Class for reading EPS products.
@@ -311,10 +376,11 @@ class EPSProduct:
         self.mdr = None
         self.scaled_mdr = None
         self.xml_file = None
-        self.xml_doc = None
+        self.templates = None
         self.mdr_template = None
         self.scaled_template = None
         self.sfactor = None
+        self.mmap = False
 
         self.grh_dtype = np.dtype([("record_class", "u1"),
                                    ("instrument_group", "u1"),
@@ -349,7 +415,7 @@ class EPSProduct:
 
         return mphr
 
-    def read(self, full=True, unsafe=False, scale_mdr=True):
+    def read(self, full=True, unsafe=False, scale_mdr=True, mmap=False):
         """
         Read EPS file.
 
@@ -364,6 +430,11 @@ class EPSProduct:
             Default: False
         scale_mdr : bool, optional
             Compute scaled MDR (True) or not (False). Default: True
+        mmap : bool, optional
+            Memory-map the MDR block instead of copying it into memory (True).
+            The MDR is then a read-only structured view of the file and the
+            scaled MDR is a `ScaledRecords` object, which scales fields only
+            when they are accessed. Default: False
 
         Returns
         -------
@@ -375,9 +446,10 @@ class EPSProduct:
             Auxiliary Header Products.
         mdr : numpy.ndarray
             Main Data Record (MDR)
-        scaled_mdr : numpy.ndarray
+        scaled_mdr : numpy.ndarray or ScaledRecords
             Scaled Main Data Record (MPHR) or None if not computed.
         """
+        self.mmap = mmap
         self.fid = open(self.filename, "rb")
 
         abs_pos = 0
@@ -451,7 +523,10 @@ class EPSProduct:
 
         self.fid.close()
 
-        if scale_mdr:
+        if scale_mdr and self.mmap:
+            self.scaled_mdr = ScaledRecords(self.mdr, self.scaled_template,
+                                            self.mdr_sfactor)
+        elif scale_mdr:
             self.scaled_mdr = self._scaling(self.mdr, self.scaled_template,
                                             self.mdr_sfactor)
 
@@ -473,12 +548,11 @@ class EPSProduct:
             self.fid.seek(grh.itemsize, 1)
             self._read_mphr(grh)
 
-            # find the xml file corresponding to the format version
-            # and load template
-            self.xml_file = self._get_eps_xml()
-            self.xml_doc = etree.parse(self.xml_file)
+            # get the (cached) templates of the format version
+            self.templates = eps_templates.get(self.mphr, self.grh_dtype)
+            self.xml_file = self.templates.xml_file
             self.mdr_template, self.scaled_template, self.mdr_sfactor = \
-                self._read_xml_mdr()
+                self.templates.mdr
 
         # sphr (Secondary Product Header Record)
         elif grh["record_class"] == 2:
@@ -503,7 +577,7 @@ class EPSProduct:
 
         # viadr (Variable Internal Auxiliary Data Record)
         elif grh["record_class"] == 7:
-            template, scaled_template, sfactor = self._read_xml_viadr(
+            template, scaled_template, sfactor = self.templates.viadr(
                 grh["record_subclass"])
             viadr_element = np.fromfile(
                 self.fid, dtype=template, count=record_count)
@@ -524,6 +598,14 @@ class EPSProduct:
             if grh["instrument_group"] == 13:
                 self.dummy_mdr = np.fromfile(
                     self.fid, dtype=self.mdr_template, count=record_count)
+            elif self.mmap:
+                offset = self.fid.tell()
+                # plain ndarray view, the memmap stays referenced as its base
+                self.mdr = np.memmap(self.filename, dtype=self.mdr_template,
+                                     mode="r", offset=offset,
+                                     shape=(record_count,)).view(np.ndarray)
+                self.fid.seek(offset + self.mdr.nbytes)
+                self.mdr_counter = record_count
             else:
                 self.mdr = np.fromfile(
                     self.fid, dtype=self.mdr_template, count=record_count)
@@ -589,66 +671,208 @@ class EPSProduct:
         """
         Find the corresponding eps xml file.
         """
-        format_path = os.path.join(os.path.dirname(__file__), "formats")
-
-        # loop through files where filename starts with "eps_ascat".
-        for filename in fnmatch.filter(os.listdir(format_path), "eps_ascat*"):
-            doc = etree.parse(os.path.join(format_path, filename))
-            file_extension = doc.xpath("//file-extensions")[0].getchildren()[0]
+        return eps_templates.find_xml(self.mphr)
 
-            format_version = doc.xpath("//format-version")
-            for elem in format_version:
-                major = elem.getchildren()[0]
-                minor = elem.getchildren()[1]
-
-                # return the xml file matching the metadata of the datafile.
-                if major.text == self.mphr["FORMAT_MAJOR_VERSION"] and \
-                        minor.text == self.mphr["FORMAT_MINOR_VERSION"] and \
-                        self.mphr[
-                            "PROCESSING_LEVEL"] in file_extension.text and \
-                        self.mphr["PRODUCT_TYPE"] in file_extension.text:
-                    return os.path.join(format_path, filename)
+    @property
+    def xml_doc(self):
+        """
+        Parsed format xml (None before the MPHR has been read).
+        """
+        if self.templates is None:
+            return None
+        return self.templates.xml_doc
 
     def _read_xml_viadr(self, subclassid):
         """
         Read xml record of viadr class.
         """
-        elements = self.xml_doc.xpath("//viadr")
-        data = OrderedDict()
+        return self.templates.viadr(subclassid)
+
+    def _read_xml_mdr(self):
+        """
+        Read xml record of mdr class.
+        """
+        return self.templates.mdr
+
+
+def parse_xml_viadr(xml_doc, subclassid):
+    """
+    Build the record templates of a viadr subclass from an EPS format xml.
+
+    Parameters
+    ----------
+    xml_doc : lxml.etree._ElementTree
+        Parsed EPS format xml.
+    subclassid : int
+        Record subclass.
+
+    Returns
+    -------
+    template : numpy.dtype
+        Record template.
+    scaled_template : numpy.dtype
+        Scaled record template.
+    sfactor : dict
+        Scale factors.
+    """
+    elements = xml_doc.xpath("//viadr")
+    data = OrderedDict()
+    length = []
+
+    # find the element with the correct subclass
+    for elem in elements:
+        item_dict = dict(elem.items())
+        subclass = int(item_dict["subclass"])
+        if subclass == subclassid:
+            break
+
+    for child in elem.getchildren():
+
+        if child.tag == "delimiter":
+            continue
+
+        child_items = dict(child.items())
+        name = child_items.pop("name")
+
+        # check if the item is of type longtime
+        longtime_flag = ("type" in child_items and
+                         "longtime" in child_items["type"])
+
+        # append the length if it isn"t the special case of type longtime
+        try:
+            var_len = child_items.pop("length")
+            if not longtime_flag:
+                length.append(np.int64(var_len))
+        except KeyError:
+            pass
+
+        data[name] = child_items
+
+        if child.tag == "array":
+            for arr in child.iterdescendants():
+                arr_items = dict(arr.items())
+                if arr.tag == "field":
+                    data[name].update(arr_items)
+                else:
+                    try:
+                        var_len = arr_items.pop("length")
+                        length.append(np.int64(var_len))
+                    except KeyError:
+                        pass
+
+        if length:
+            data[name].update({"length": length})
+        else:
+            data[name].update({"length": 1})
+
         length = []
 
-        # find the element with the correct subclass
-        for elem in elements:
-            item_dict = dict(elem.items())
-            subclass = int(item_dict["subclass"])
-            if subclass == subclassid:
-                break
+    conv = {
+        "longtime": long_cds_time,
+        "time": short_cds_time,
+        "boolean": "u1",
+        "integer1": "i1",
+        "uinteger1": "u1",
+        "integer": ">i4",
+        "uinteger": ">u4",
+        "integer2": ">i2",
+        "uinteger2": ">u2",
+        "integer4": ">i4",
+        "uinteger4": ">u4",
+        "integer8": ">i8",
+        "enumerated": "u1",
+        "string": "str",
+        "bitfield": "u1"
+    }
+
+    scaling_factor = {}
+    scaled_dtype = []
+    dtype = []
+
+    for key, value in data.items():
+
+        if "scaling-factor" in value:
+            sf_dtype = np.float32
+            sf_split = value["scaling-factor"].split("^")
+            scaling_factor[key] = np.int64(sf_split[0])**np.int64(
+                sf_split[1])
+        else:
+            sf_dtype = conv[value["type"]]
+            scaling_factor[key] = 1
+
+        length = value["length"]
+
+        if length == 1:
+            scaled_dtype.append((key, sf_dtype))
+            dtype.append((key, conv[value["type"]]))
+        else:
+            scaled_dtype.append((key, sf_dtype, length))
+            dtype.append((key, conv[value["type"]], length))
+
+    return np.dtype(dtype), np.dtype(scaled_dtype), scaling_factor
+
+
+def parse_xml_mdr(xml_doc, grh_dtype):
+    """
+    Build the mdr record templates from an EPS format xml.
+
+    Parameters
+    ----------
+    xml_doc : lxml.etree._ElementTree
+        Parsed EPS format xml.
+    grh_dtype : numpy.dtype
+        Generic record header template.
+
+    Returns
+    -------
+    template : numpy.dtype
+        Record template.
+    scaled_template : numpy.dtype
+        Scaled record template.
+    sfactor : dict
+        Scale factors.
+    """
+    elements = xml_doc.xpath("//mdr")
+    data = OrderedDict()
+    length = []
+    elem = elements[0]
 
-        for child in elem.getchildren():
+    for child in elem.getchildren():
 
-            if child.tag == "delimiter":
-                continue
+        if child.tag == "delimiter":
+            continue
 
-            child_items = dict(child.items())
-            name = child_items.pop("name")
+        child_items = dict(child.items())
+        name = child_items.pop("name")
 
-            # check if the item is of type longtime
-            longtime_flag = ("type" in child_items and
-                             "longtime" in child_items["type"])
+        # check if the item is of type bitfield
+        bitfield_flag = ("type" in child_items and
+                         ("bitfield" in child_items["type"] or
+                          "time" in child_items["type"]))
 
-            # append the length if it isn"t the special case of type longtime
-            try:
-                var_len = child_items.pop("length")
-                if not longtime_flag:
-                    length.append(np.int64(var_len))
-            except KeyError:
-                pass
+        # append the length if it isn"t the special case of type
+        # bitfield or time
+        try:
+            var_len = child_items.pop("length")
+            if not bitfield_flag:
+                length.append(np.int64(var_len))
+        except KeyError:
+            pass
 
-            data[name] = child_items
+        data[name] = child_items
 
-            if child.tag == "array":
-                for arr in child.iterdescendants():
-                    arr_items = dict(arr.items())
+        if child.tag == "array":
+            for arr in child.iterdescendants():
+                arr_items = dict(arr.items())
+
+                # check if the type is bitfield
+                bitfield_flag = ("type" in arr_items and
+                                 "bitfield" in arr_items["type"])
+
+                if bitfield_flag:
+                    data[name].update(arr_items)
+                    break
+                else:
                     if arr.tag == "field":
                         data[name].update(arr_items)
                     else:
@@ -658,161 +882,280 @@ class EPSProduct:
                         except KeyError:
                             pass
 
-            if length:
-                data[name].update({"length": length})
-            else:
-                data[name].update({"length": 1})
-
-            length = []
-
-        conv = {
-            "longtime": long_cds_time,
-            "time": short_cds_time,
-            "boolean": "u1",
-            "integer1": "i1",
-            "uinteger1": "u1",
-            "integer": ">i4",
-            "uinteger": ">u4",
-            "integer2": ">i2",
-            "uinteger2": ">u2",
-            "integer4": ">i4",
-            "uinteger4": ">u4",
-            "integer8": ">i8",
-            "enumerated": "u1",
-            "string": "str",
-            "bitfield": "u1"
-        }
+        if length:
+            data[name].update({"length": length})
+        else:
+            data[name].update({"length": 1})
 
-        scaling_factor = {}
-        scaled_dtype = []
-        dtype = []
+        length = []
 
-        for key, value in data.items():
+    conv = {
+        "longtime": long_cds_time,
+        "time": short_cds_time,
+        "boolean": "u1",
+        "integer1": "i1",
+        "uinteger1": "u1",
+        "integer": ">i4",
+        "uinteger": ">u4",
+        "integer2": ">i2",
+        "uinteger2": ">u2",
+        "integer4": ">i4",
+        "uinteger4": ">u4",
+        "integer8": ">i8",
+        "enumerated": "u1",
+        "string": "str",
+        "bitfield": "u1"
+    }
 
-            if "scaling-factor" in value:
-                sf_dtype = np.float32
-                sf_split = value["scaling-factor"].split("^")
-                scaling_factor[key] = np.int64(sf_split[0])**np.int64(
-                    sf_split[1])
-            else:
-                sf_dtype = conv[value["type"]]
-                scaling_factor[key] = 1
+    scaling_factor = {}
+    scaled_dtype = []
+    dtype = [("grh", grh_dtype)]
 
-            length = value["length"]
+    for key, value in data.items():
 
-            if length == 1:
-                scaled_dtype.append((key, sf_dtype))
-                dtype.append((key, conv[value["type"]]))
-            else:
-                scaled_dtype.append((key, sf_dtype, length))
-                dtype.append((key, conv[value["type"]], length))
+        if "scaling-factor" in value:
+            sf_dtype = np.float32
+            sf_split = value["scaling-factor"].split("^")
+            scaling_factor[key] = np.int64(sf_split[0])**np.int64(
+                sf_split[1])
+        else:
+            sf_dtype = conv[value["type"]]
+            scaling_factor[key] = 1
 
-        return np.dtype(dtype), np.dtype(scaled_dtype), scaling_factor
+        length = value["length"]
 
-    def _read_xml_mdr(self):
+        if length == 1:
+            scaled_dtype.append((key, sf_dtype))
+            dtype.append((key, conv[value["type"]]))
+        else:
+            scaled_dtype.append((key, sf_dtype, length))
+            dtype.append((key, conv[value["type"]], length))
+
+    return np.dtype(dtype), np.dtype(scaled_dtype), scaling_factor
+
+
+#: Directory of the EPS format xml files shipped with this package.
+eps_format_path = os.path.join(os.path.dirname(__file__), "formats")
+
+
+class EPSTemplates:
+    """
+    Compiled record templates of one EPS format version.
+
+    The format xml is only parsed when a template is built for the first time.
+    Pickled templates keep only the name of the xml file, which is looked up
+    in the format directory of the registry loading them.
+    """
+
+    def __init__(self, xml_file, grh_dtype):
         """
-        Read xml record of mdr class.
+        Initialize EPSTemplates.
+
+        Parameters
+        ----------
+        xml_file : str
+            EPS format xml file.
+        grh_dtype : numpy.dtype
+            Generic record header template.
         """
-        elements = self.xml_doc.xpath("//mdr")
-        data = OrderedDict()
-        length = []
-        elem = elements[0]
+        self.format_path, self.xml_name = os.path.split(xml_file)
+        self.grh_dtype = grh_dtype
+        self._xml_doc = None
+        self._mdr = None
+        self._viadr = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_xml_doc"] = None
+        state["format_path"] = None
+        return state
+
+    @property
+    def xml_file(self):
+        """
+        EPS format xml file.
+        """
+        return os.path.join(self.format_path or eps_format_path,
+                            self.xml_name)
 
-        for child in elem.getchildren():
+    @property
+    def xml_doc(self):
+        """
+        Parsed format xml.
+        """
+        if self._xml_doc is None:
+            self._xml_doc = etree.parse(self.xml_file)
+        return self._xml_doc
 
-            if child.tag == "delimiter":
-                continue
+    @property
+    def mdr(self):
+        """
+        Template, scaled template and scale factors of the mdr.
+        """
+        if self._mdr is None:
+            self._mdr = parse_xml_mdr(self.xml_doc, self.grh_dtype)
+        return self._mdr
 
-            child_items = dict(child.items())
-            name = child_items.pop("name")
+    def viadr(self, subclassid):
+        """
+        Template, scaled template and scale factors of a viadr subclass.
 
-            # check if the item is of type bitfield
-            bitfield_flag = ("type" in child_items and
-                             ("bitfield" in child_items["type"] or
-                              "time" in child_items["type"]))
+        Parameters
+        ----------
+        subclassid : int
+            Record subclass.
+        """
+        subclassid = int(subclassid)
+        if subclassid not in self._viadr:
+            self._viadr[subclassid] = parse_xml_viadr(self.xml_doc,
+                                                      subclassid)
+        return self._viadr[subclassid]
 
-            # append the length if it isn"t the special case of type
-            # bitfield or time
-            try:
-                var_len = child_items.pop("length")
-                if not bitfield_flag:
-                    length.append(np.int64(var_len))
-            except KeyError:
-                pass
 
-            data[name] = child_items
+class EPSTemplateRegistry:
+    """
+    Process-wide registry of compiled EPS record templates.
 
-            if child.tag == "array":
-                for arr in child.iterdescendants():
-                    arr_items = dict(arr.items())
+    Templates are looked up by (product type, processing level, format major
+    version, format minor version) of the MPHR, so the format xml files are
+    scanned and parsed only once per process. The compiled templates can be
+    saved to and loaded from a pickle file to skip the xml parsing entirely.
+    """
 
-                    # check if the type is bitfield
-                    bitfield_flag = ("type" in arr_items and
-                                     "bitfield" in arr_items["type"])
+    def __init__(self, format_path=None):
+        """
+        Initialize EPSTemplateRegistry.
 
-                    if bitfield_flag:
-                        data[name].update(arr_items)
-                        break
-                    else:
-                        if arr.tag == "field":
-                            data[name].update(arr_items)
-                        else:
-                            try:
-                                var_len = arr_items.pop("length")
-                                length.append(np.int64(var_len))
-                            except KeyError:
-                                pass
-
-            if length:
-                data[name].update({"length": length})
-            else:
-                data[name].update({"length": 1})
-
-            length = []
-
-        conv = {
-            "longtime": long_cds_time,
-            "time": short_cds_time,
-            "boolean": "u1",
-            "integer1": "i1",
-            "uinteger1": "u1",
-            "integer": ">i4",
-            "uinteger": ">u4",
-            "integer2": ">i2",
-            "uinteger2": ">u2",
-            "integer4": ">i4",
-            "uinteger4": ">u4",
-            "integer8": ">i8",
-            "enumerated": "u1",
-            "string": "str",
-            "bitfield": "u1"
-        }
+        Parameters
+        ----------
+        format_path : str, optional
+            Directory of the EPS format xml files (default: the formats
+            shipped with this package).
+        """
+        if format_path is None:
+            format_path = eps_format_path
+        self.format_path = format_path
+        self._formats = None
+        self._templates = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(mphr):
+        return (mphr["PRODUCT_TYPE"], mphr["PROCESSING_LEVEL"],
+                mphr["FORMAT_MAJOR_VERSION"], mphr["FORMAT_MINOR_VERSION"])
+
+    def _scan(self):
+        """
+        Collect format versions and file extensions of all format xml files.
+        """
+        formats = []
+        # loop through files where filename starts with "eps_ascat".
+        for filename in sorted(
+                fnmatch.filter(os.listdir(self.format_path), "eps_ascat*")):
+            doc = etree.parse(os.path.join(self.format_path, filename))
+            file_extension = doc.xpath("//file-extensions")[0].getchildren()[0]
 
-        scaling_factor = {}
-        scaled_dtype = []
-        dtype = [("grh", self.grh_dtype)]
+            for elem in doc.xpath("//format-version"):
+                major = elem.getchildren()[0]
+                minor = elem.getchildren()[1]
+                formats.append((major.text, minor.text, file_extension.text,
+                                os.path.join(self.format_path, filename)))
 
-        for key, value in data.items():
+        return formats
 
-            if "scaling-factor" in value:
-                sf_dtype = np.float32
-                sf_split = value["scaling-factor"].split("^")
-                scaling_factor[key] = np.int64(sf_split[0])**np.int64(
-                    sf_split[1])
-            else:
-                sf_dtype = conv[value["type"]]
-                scaling_factor[key] = 1
+    def find_xml(self, mphr):
+        """
+        Find the format xml file matching the MPHR of a product.
 
-            length = value["length"]
+        Parameters
+        ----------
+        mphr : dict
+            Main Product Header Record.
 
-            if length == 1:
-                scaled_dtype.append((key, sf_dtype))
-                dtype.append((key, conv[value["type"]]))
-            else:
-                scaled_dtype.append((key, sf_dtype, length))
-                dtype.append((key, conv[value["type"]], length))
+        Returns
+        -------
+        xml_file : str or None
+            Format xml file, or None if no format matches.
+        """
+        with self._lock:
+            if self._formats is None:
+                self._formats = self._scan()
+
+        # return the xml file matching the metadata of the datafile.
+        for major, minor, file_extension, xml_file in self._formats:
+            if major == mphr["FORMAT_MAJOR_VERSION"] and \
+                    minor == mphr["FORMAT_MINOR_VERSION"] and \
+                    mphr["PROCESSING_LEVEL"] in file_extension and \
+                    mphr["PRODUCT_TYPE"] in file_extension:
+                return xml_file
+
+    def get(self, mphr, grh_dtype):
+        """
+        Get the templates for the format of a product.
+
+        Parameters
+        ----------
+        mphr : dict
+            Main Product Header Record.
+        grh_dtype : numpy.dtype
+            Generic record header template.
+
+        Returns
+        -------
+        templates : EPSTemplates
+            Record templates.
+
+        Raises
+        ------
+        RuntimeError
+            If the format version is not supported.
+        """
+        key = self._key(mphr)
+        with self._lock:
+            if key not in self._templates:
+                xml_file = self.find_xml(mphr)
+                if xml_file is None:
+                    raise RuntimeError(
+                        "EPS format not supported. Product type {} processing"
+                        " level {} format version {}.{}".format(*key))
+                self._templates[key] = EPSTemplates(xml_file, grh_dtype)
+            return self._templates[key]
+
+    def save(self, filename):
+        """
+        Pickle all compiled templates to a cache file.
 
-        return np.dtype(dtype), np.dtype(scaled_dtype), scaling_factor
+        Parameters
+        ----------
+        filename : str
+            Cache file.
+        """
+        with self._lock:
+            with open(filename, "wb") as fid:
+                pickle.dump(self._templates, fid)
+
+    def load(self, filename):
+        """
+        Load compiled templates from a cache file written by `save`.
+
+        The xml files of templates not compiled yet are looked up in the
+        format directory of this registry.
+
+        Parameters
+        ----------
+        filename : str
+            Cache file.
+        """
+        with open(filename, "rb") as fid:
+            templates = pickle.load(fid)
+        for t in templates.values():
+            t.format_path = self.format_path
+        with self._lock:
+            self._templates.update(templates)
+
+
+#: Template registry shared by all EPSProduct instances.
+eps_templates = EPSTemplateRegistry()
 
 
 def conv_epsl1bszf_generic(data, metadata, gen_fields_lut, skip_fields):
@@ -964,7 +1307,8 @@ def read_eps_l1b(filename,
                  unsafe=False,
                  scale_mdr=True,
                  ignore_noise_ool=False,
-                 return_ptype=False):
+                 return_ptype=False,
+                 mmap=False):
     """
     Level 1b reader and data preparation.
 
@@ -989,6 +1333,9 @@ def read_eps_l1b(filename,
         Compute scaled MDR (True) or not (False). Default: True
     ignore_noise_ool : bool, optional
         Ignore noise out of limit flag (default: False).
+    mmap : bool, optional
+        Memory-map the Main Data Record instead of copying it into memory.
+        Default: False
 
     Returns
     -------
@@ -996,7 +1343,7 @@ def read_eps_l1b(filename,
         ASCAT Level 1b data.
     """
     eps_file = read_eps(
-        filename, full=full, unsafe=unsafe, scale_mdr=scale_mdr)
+        filename, full=full, unsafe=unsafe, scale_mdr=scale_mdr, mmap=mmap)
 
     ptype = eps_file.mphr["PRODUCT_TYPE"]
     fmv = int(eps_file.mphr["FORMAT_MAJOR_VERSION"])
@@ -1215,7 +1562,8 @@ def read_eps_l1b(filename,
     return ds, metadata
 
 
-def read_eps_l2(filename, generic=False, to_xarray=False, return_ptype=False):
+def read_eps_l2(filename, generic=False, to_xarray=False, return_ptype=False,
+                mmap=False):
     """
     Level 2 reader and data preparation.
 
@@ -1229,6 +1577,9 @@ def read_eps_l2(filename, generic=False, to_xarray=False, return_ptype=False):
     to_xarray : bool, optional
         "True" return data as xarray.Dataset
         "False" return data as numpy.ndarray (default: False).
+    mmap : bool, optional
+        Memory-map the Main Data Record and scale only the fields that are
+        used (default: False).
 
     Returns
     -------
@@ -1237,7 +1588,7 @@ def read_eps_l2(filename, generic=False, to_xarray=False, return_ptype=False):
     metadata : dict
         Metadata.
     """
-    eps_file = read_eps(filename)
+    eps_file = read_eps(filename, mmap=mmap)
     ptype = eps_file.mphr["PRODUCT_TYPE"]
     fmv = int(eps_file.mphr["FORMAT_MAJOR_VERSION"])
 
@@ -1314,7 +1665,8 @@ def read_eps(filename,
              mphr_only=False,
              full=True,
              unsafe=False,
-             scale_mdr=True):
+             scale_mdr=True,
+             mmap=False):
     """
     Read EPS file.
 
@@ -1322,6 +1674,9 @@ def read_eps(filename,
     ----------
     filename : str
         Filename
+    mmap : bool, optional
+        Memory-map the MDR block (see `EPSProduct.read`). Ignored for gzipped
+        files, which are decompressed to a temporary copy (default: False).
 
     Returns
     -------
@@ -1346,7 +1701,7 @@ def read_eps(filename,
         mphr = prod.read_mphr()
         prod.mphr = mphr
     else:
-        prod.read(full, unsafe, scale_mdr)
+        prod.read(full, unsafe, scale_mdr, mmap=mmap and not zipped)
 
     # remove the temporary copy
     if zipped:
@@ -2170,22 +2525,13 @@ def set_flags(data, ignore_noise_ool=False):
 
     f_usable = np.zeros(data["flagfield_rf1"].size, dtype=np.uint8)
 
-    for flagfield, bitmask in flag_status_bit.items():
-        subset = np.nonzero(data[flagfield])[0]
-
-        if subset.size > 0:
-            unpacked_bits = np.fliplr(
-                np.unpackbits(data[flagfield][subset]).reshape(-1,
-                                                               8).astype(bool))
+    # one 256-entry look-up table per flagfield, holding the highest
+    # category of all bits set in each possible flag byte
+    bit_set = (np.arange(256)[:, np.newaxis] >> np.arange(8)) & 1
 
-            flag = np.ma.array(
-                np.tile(bitmask, unpacked_bits.shape[0]).reshape(-1, 8),
-                mask=~unpacked_bits,
-                fill_value=0)
-
-            f_usable[subset] = np.max(
-                np.vstack((f_usable[subset], flag.filled().max(axis=1))),
-                axis=0)
+    for flagfield, bitmask in flag_status_bit.items():
+        lut = (bit_set * bitmask).max(axis=1).astype(np.uint8)
+        np.maximum(f_usable, lut[data[flagfield]], out=f_usable)
 
     return f_usable
 
@@ -3,8 +3,22 @@
 # SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
 # SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
 
+from datetime import datetime
+
 import xarray as xr
 import numpy as np
+from pygeogrids.grids import genreg_grid
+
+from ascat.grids.grid_registry import GridRegistry
+from ascat.product_info.product_info import AscatSwathProduct
+from ascat.read_native.eps_native import EPSProduct
+from ascat.read_native.eps_native import eps_templates
+
+try:
+    # the BUFR reader loads pyproj before eccodes
+    from ascat.read_native.bufr import eccodes
+except ImportError:
+    eccodes = None
 
 contiguous_ragged_ds_2588 = xr.Dataset(
     {
@@ -443,3 +457,309 @@ swath_ds_2 = xr.Dataset(
     },
     attrs={"featureType": "point"},
 )
+
+
+# Generators for synthetic data of configurable size, e.g. for benchmarks.
+
+szf_mphr = {
+    "PRODUCT_TYPE": "SZF",
+    "PROCESSING_LEVEL": "1B",
+    "SPACECRAFT_ID": "M01",
+    "FORMAT_MAJOR_VERSION": "13",
+    "FORMAT_MINOR_VERSION": "1",
+    "PROCESSOR_MAJOR_VERSION": "12",
+    "PROCESSOR_MINOR_VERSION": "0",
+    "ORBIT_START": "12345",
+    "STATE_VECTOR_TIME": "20180611041800000Z",
+}
+
+
+def synthetic_grid(spacing):
+    """
+    Global regular lat/lon cell grid (5 degree cells).
+
+    After `register_synthetic_grid`, ``GridRegistry().get("synthetic_0.5")``
+    returns a 0.5 degree grid.
+
+    Parameters
+    ----------
+    spacing : float or str
+        Grid spacing in degrees.
+
+    Returns
+    -------
+    grid : pygeogrids.grids.CellGrid
+        Cell grid.
+    """
+    spacing = float(spacing)
+    grid = genreg_grid(spacing, spacing).to_cell_grid(cellsize=5.)
+    # grid resolution attribute as provided by FibGrid
+    grid.res = spacing
+    return grid
+
+
+def register_synthetic_grid():
+    """
+    Register `synthetic_grid` as grid type "synthetic", as needed to find
+    the grid of `SyntheticSwathProduct` by name.
+    """
+    GridRegistry().register("synthetic", synthetic_grid)
+
+
+def synthetic_swath_ds(grid, n_obs, t0, seed=0):
+    """
+    Swath dataset covering a band of consecutive grid points.
+
+    Parameters
+    ----------
+    grid : pygeogrids.grids.BasicGrid
+        Grid of the swath locations.
+    n_obs : int
+        Number of observations.
+    t0 : numpy.datetime64
+        Time of the first observation.
+    seed : int, optional
+        Random seed (default: 0).
+
+    Returns
+    -------
+    ds : xarray.Dataset
+        Swath dataset in point format.
+    """
+    rng = np.random.default_rng(seed)
+    n_gpis = grid.activegpis.size
+    start = rng.integers(0, max(n_gpis - n_obs, 1))
+    idx = (start + np.arange(n_obs)) % n_gpis
+
+    return xr.Dataset(
+        {
+            "longitude": ("obs", grid.activearrlon[idx].astype(np.float64)),
+            "latitude": ("obs", grid.activearrlat[idx].astype(np.float64)),
+            "location_id": ("obs", grid.activegpis[idx].astype(np.int32),
+                            {"cf_role": "timeseries_id"}),
+            "time": ("obs", np.datetime64(t0, "ns")
+                     + np.arange(n_obs) * np.timedelta64(10, "ms")),
+            "as_des_pass": ("obs", rng.integers(0, 2, n_obs, dtype=np.uint8)),
+            "surface_flag": ("obs", (rng.random(n_obs) < 0.1)
+                             .astype(np.uint8)),
+            "surface_soil_moisture": (
+                "obs", (rng.random(n_obs) * 100).astype(np.float32)),
+            "surface_soil_moisture_sensitivity": (
+                "obs", (rng.random(n_obs) * 5).astype(np.float32)),
+            "backscatter40": (
+                "obs", (rng.random(n_obs) * -20).astype(np.float32)),
+            "snow_cover_probability": (
+                "obs", rng.integers(0, 101, n_obs, dtype=np.uint8)),
+            "frozen_soil_probability": (
+                "obs", rng.integers(0, 101, n_obs, dtype=np.uint8)),
+            "subsurface_scattering_probability": (
+                "obs", rng.integers(0, 101, n_obs, dtype=np.uint8)),
+        },
+        attrs={"featureType": "point"},
+    )
+
+
+def write_synthetic_swath_files(directory, grid, n_files, n_obs, seed=0):
+    """
+    Write swath files named ``swath_{date}.nc`` (date as %Y%m%d%H%M%S).
+
+    Longitude and latitude are written as scaled integers and all variables
+    have a fill value, as in the H SAF swath products.
+
+    Parameters
+    ----------
+    directory : pathlib.Path
+        Output directory.
+    grid : pygeogrids.grids.BasicGrid
+        Grid of the swath locations.
+    n_files : int
+        Number of files.
+    n_obs : int
+        Number of observations per file.
+    seed : int, optional
+        Random seed (default: 0).
+
+    Returns
+    -------
+    filenames : list of pathlib.Path
+        Swath files.
+    """
+    encoding = {
+        "longitude": {"dtype": "int32", "scale_factor": 1e-6,
+                      "_FillValue": np.iinfo(np.int32).min},
+        "latitude": {"dtype": "int32", "scale_factor": 1e-6,
+                     "_FillValue": np.iinfo(np.int32).min},
+        "location_id": {"_FillValue": -1},
+        "time": {"dtype": "float64", "units": "days since 2000-01-01",
+                 "_FillValue": 0.},
+        "as_des_pass": {"_FillValue": 255},
+        "surface_flag": {"_FillValue": 255},
+        "surface_soil_moisture": {"_FillValue": -9999.},
+        "surface_soil_moisture_sensitivity": {"_FillValue": -9999.},
+        "backscatter40": {"_FillValue": -9999.},
+        "snow_cover_probability": {"_FillValue": 255},
+        "frozen_soil_probability": {"_FillValue": 255},
+        "subsurface_scattering_probability": {"_FillValue": 255},
+    }
+
+    filenames = []
+    t0 = np.datetime64("2021-01-01T00:00:00", "ns")
+    for i in range(n_files):
+        t = t0 + i * np.timedelta64(100, "m")
+        date = datetime.fromisoformat(str(t)[:19])
+        filename = directory / f"swath_{date:%Y%m%d%H%M%S}.nc"
+        ds = synthetic_swath_ds(grid, n_obs, t, seed=seed + i)
+        ds.to_netcdf(filename, encoding=encoding)
+        filenames.append(filename)
+
+    return filenames
+
+
+class SyntheticSwathProduct(AscatSwathProduct):
+    """
+    Swath files written by `write_synthetic_swath_files` on the 0.5 degree
+    synthetic grid (see `register_synthetic_grid`).
+
+    The product is not part of `ascat.product_info.swath_io_catalog`, it has
+    to be added to be found by product id.
+    """
+    fn_pattern = "swath_{date}.nc"
+    sf_pattern = None
+    date_field_fmt = "%Y%m%d%H%M%S"
+    grid_name = "synthetic_0.5"
+    cell_fn_format = "{:04d}.nc"
+    sf_read_fmt = None
+
+    @staticmethod
+    def fn_read_fmt(timestamp):
+        return {"date": timestamp.strftime("%Y%m%d*")}
+
+
+def synthetic_contiguous_ragged_ds(n_locations, n_obs, seed=0):
+    """
+    Contiguous ragged array time series dataset.
+
+    Parameters
+    ----------
+    n_locations : int
+        Number of time series.
+    n_obs : int
+        Total number of observations.
+    seed : int, optional
+        Random seed (default: 0).
+
+    Returns
+    -------
+    ds : xarray.Dataset
+        Dataset with "locations" instance and "obs" sample dimension.
+    """
+    rng = np.random.default_rng(seed)
+    location_idx = np.sort(rng.integers(0, n_locations, n_obs))
+    row_size = np.bincount(location_idx, minlength=n_locations)
+
+    return xr.Dataset(
+        {
+            "location_id": ("locations", np.arange(n_locations,
+                                                   dtype=np.int64),
+                            {"cf_role": "timeseries_id"}),
+            "lon": ("locations", rng.uniform(-180, 180, n_locations)
+                    .astype(np.float32)),
+            "lat": ("locations", rng.uniform(-90, 90, n_locations)
+                    .astype(np.float32)),
+            "row_size": ("locations", row_size.astype(np.int32),
+                         {"sample_dimension": "obs"}),
+            "time": ("obs", np.datetime64("2020-01-01", "ns")
+                     + rng.integers(0, 10**15, n_obs)
+                     .astype("timedelta64[ns]")),
+            "sm": ("obs", rng.random(n_obs).astype(np.float32)),
+        },
+        attrs={"featureType": "timeSeries"},
+    ).set_coords(["lon", "lat"])
+
+
+def write_szf_file(filename, n_mdr=12, seed=42):
+    """
+    Write an EPS Native SZF file (MPHR followed by MDRs) in format 13.1.
+
+    Parameters
+    ----------
+    filename : str or pathlib.Path
+        Output filename.
+    n_mdr : int, optional
+        Number of MDRs, cycling through beam numbers 1 to 6 (default: 12).
+    seed : int, optional
+        Random seed (default: 42).
+    """
+    mphr = "".join(f"{k} = {v}\n" for k, v in szf_mphr.items()).encode()
+
+    # the record header template does not depend on the product
+    grh_dtype = EPSProduct(__file__).grh_dtype
+    mdr_template = eps_templates.get(szf_mphr, grh_dtype).mdr[0]
+
+    grh = np.zeros(1, dtype=grh_dtype)
+    grh["record_class"] = 1
+    grh["record_size"] = grh_dtype.itemsize + len(mphr)
+
+    rng = np.random.default_rng(seed)
+    mdr = np.zeros(n_mdr, dtype=mdr_template)
+    mdr["grh"]["record_class"] = 8
+    mdr["grh"]["instrument_group"] = 8
+    mdr["grh"]["record_size"] = mdr_template.itemsize
+    mdr["BEAM_NUMBER"] = np.arange(n_mdr) % 6 + 1
+    mdr["UTC_LOCALISATION"]["day"] = 6736
+    mdr["UTC_LOCALISATION"]["time"] = np.arange(n_mdr) * 1000
+    for name in ["LONGITUDE_FULL", "LATITUDE_FULL", "SIGMA0_FULL",
+                 "INC_ANGLE_FULL", "AZI_ANGLE_FULL", "SAT_TRACK_AZI"]:
+        mdr[name] = rng.integers(0, 30000, mdr[name].shape)
+
+    with open(filename, "wb") as fid:
+        fid.write(grh.tobytes())
+        fid.write(mphr)
+        fid.write(mdr.tobytes())
+
+
+def write_bufr_file(filename, n_subsets):
+    """
+    Write compressed BUFR messages with location, time and two temperature
+    fields ("#1#airTemperature" and the per message constant
+    "#2#airTemperature").
+
+    Parameters
+    ----------
+    filename : str or pathlib.Path
+        Output filename.
+    n_subsets : list of int
+        Number of subsets of each message.
+
+    Raises
+    ------
+    ImportError
+        If eccodes is not installed.
+    """
+    if eccodes is None:
+        raise ImportError("eccodes is required to write BUFR files")
+
+    with open(filename, "wb") as fh:
+        for i, n in enumerate(n_subsets):
+            handle = eccodes.codes_bufr_new_from_samples("BUFR4")
+            eccodes.codes_set(handle, "numberOfSubsets", n)
+            eccodes.codes_set(handle, "compressedData", 1)
+            eccodes.codes_set_array(handle, "unexpandedDescriptors",
+                                    [301011, 301012, 4006, 5001, 6001,
+                                     12101, 12101])
+            eccodes.codes_set_array(handle, "year", np.full(n, 2020))
+            eccodes.codes_set_array(handle, "month", np.full(n, 1))
+            eccodes.codes_set_array(handle, "day", np.full(n, 2))
+            eccodes.codes_set_array(handle, "hour", np.full(n, i % 24))
+            eccodes.codes_set_array(handle, "minute", np.arange(n) % 60)
+            eccodes.codes_set_array(handle, "second", np.full(n, 30))
+            eccodes.codes_set_array(handle, "latitude",
+                                    np.linspace(-10, 10, n))
+            eccodes.codes_set_array(handle, "longitude",
+                                    np.linspace(0, 20, n) + i % 100)
+            eccodes.codes_set_array(handle, "#1#airTemperature",
+                                    270 + np.arange(n) % 100 * 0.1)
+            eccodes.codes_set(handle, "#2#airTemperature", 250. + i % 50)
+            eccodes.codes_set(handle, "pack", 1)
+            eccodes.codes_write(handle, fh)
+            eccodes.codes_release(handle)
@@ -22,6 +22,7 @@ from ascat.read_native.xarray_io import swath_io_catalog
 from ascat.read_native.xarray_io import trim_dates
 from ascat.read_native.xarray_io import append_to_netcdf
 
+from ascat.file_handling import iter_prefetch
 from ascat.utils import Spacecraft
 from ascat.utils import vrange
 
@@ -1493,7 +1494,8 @@ class SwathFileCollection:
             mode="w",
             processes=1,
             buffer_memory_mb=None,
-            dupe_window=None
+            dupe_window=None,
+            prefetch=0,
     ):
         """Stack swath files and split them into cell timeseries files.
 
@@ -1523,6 +1525,9 @@ class SwathFileCollection:
         dupe_window : numpy.timedelta64, optional
             Time window within which duplicate observations will be removed. Default is
             `None`.
+        prefetch : int, optional
+            Number of swath files to read ahead in background threads while the
+            buffer is processed and written. Default is 0 (no prefetching).
 
         Raises
         ------
@@ -1566,9 +1571,7 @@ class SwathFileCollection:
         buffer_size = 0
         # process = psutil.Process()
         total_swaths = len(fnames)
-        for iteration, f in enumerate(fnames):
-            self._open(f)
-            ds = self.fid.read(mask_and_scale=False).load()
+        for iteration, ds in enumerate(self._iter_swaths(fnames, prefetch)):
             # buffer_size  = process.memory_info().rss / 1e6
             print("Filling swaths buffer..."
                   f" {buffer_size:.2f}MB/{self.max_buffer_memory_mb:.2f}MB",
@@ -1625,6 +1628,48 @@ class SwathFileCollection:
                   " cell files.")
             combined_ds.close()
 
+    def _read_swath(self, fname):
+        """Read a single swath file into memory.
+
+        Parameters
+        ----------
+        fname : pathlib.Path
+            Swath filename.
+
+        Returns
+        -------
+        ds : xarray.Dataset
+            Swath dataset, loaded into memory.
+        """
+        fid = self.ioclass(fname, **self.ioclass_kws)
+        ds = fid.read(mask_and_scale=False).load()
+        fid.close()
+        return ds
+
+    def _iter_swaths(self, fnames, prefetch=0):
+        """Yield the loaded datasets of the swath files in order.
+
+        Parameters
+        ----------
+        fnames : list of pathlib.Path
+            Swath filenames.
+        prefetch : int, optional
+            Number of files to read ahead in background threads. If 0, files are
+            read in the calling thread when requested. Default is 0.
+
+        Yields
+        ------
+        ds : xarray.Dataset
+            Swath dataset, loaded into memory.
+        """
+        if prefetch <= 0:
+            for f in fnames:
+                self._open(f)
+                yield self.fid.read(mask_and_scale=False).load()
+            return
+
+        yield from iter_prefetch(self._read_swath, fnames, prefetch)
+
     def process(self, data):
         """Process a stacked dataset of swath data into a format that is ready to be
         split into cell timeseries datasets, and return the processed dataset.
@@ -0,0 +1,308 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
+# SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import netCDF4
+import numpy as np
+import xarray as xr
+import zarr
+
+# default chunk sizes of the time cube
+cube_chunks = {"swath_time": 32, "latitude": 128, "longitude": 128}
+
+swath_time_units = "seconds since 1970-01-01 00:00:00"
+
+
+def swath_start_time(ds):
+    """
+    Time of the first observation of a swath.
+
+    Parameters
+    ----------
+    ds : xarray.Dataset
+        Swath dataset, decoded or as stored in the file.
+
+    Returns
+    -------
+    swath_time : numpy.datetime64
+        Time of the first observation.
+    """
+    time = xr.decode_cf(ds[["time"]].reset_coords(drop=True))["time"]
+
+    return np.datetime64(time.min().values, "ns")
+
+
+class TimeCube:
+    """
+    Regridded swaths stacked in a single chunked (swath_time, latitude,
+    longitude) cube stored as Zarr (.zarr) or NetCDF (.nc).
+
+    Swaths are appended along the swath_time dimension, so the cube can grow
+    as new swaths arrive, and a time series of a region is a single chunked
+    read. The datasets are written as they are, i.e. as produced by
+    regridding or resampling swath files read without decoding, and all
+    appended swaths need the same variables and target grid.
+
+    Appended swaths are buffered and written a whole swath_time chunk at a
+    time, so every chunk is written once. The remaining swaths are written
+    by `flush`, which is also called by `read` and when leaving a with
+    block.
+    """
+
+    def __init__(self, filename, chunks=None):
+        """
+        Initialize the cube.
+
+        Parameters
+        ----------
+        filename : str or Path
+            Cube filename (.zarr or .nc).
+        chunks : dict, optional
+            Chunk sizes of the swath_time, latitude and longitude dimensions
+            used when the cube is created (default: `cube_chunks`).
+        """
+        self.filename = Path(filename)
+        if self.filename.suffix not in [".zarr", ".nc"]:
+            raise ValueError(f"Unknown file suffix '{self.filename.suffix}' "
+                             "(.nc and .zarr supported)")
+
+        self.chunks = dict(cube_chunks, **(chunks or {}))
+        self._swath_times = None
+        self._pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    @property
+    def swath_times(self):
+        """
+        Times of the swaths in the cube in the order of appending,
+        including buffered swaths.
+
+        Returns
+        -------
+        swath_times : numpy.ndarray
+            Swath times (datetime64[ns]).
+        """
+        if self._swath_times is None:
+            if not self.filename.exists():
+                self._swath_times = np.array([], dtype="datetime64[ns]")
+            else:
+                with self._open() as ds:
+                    self._swath_times = ds["swath_time"].values
+
+        return self._swath_times
+
+    def _open(self, **kwargs):
+        if self.filename.suffix == ".zarr":
+            return xr.open_zarr(self.filename, consolidated=False, **kwargs)
+
+        return xr.open_dataset(self.filename, **kwargs)
+
+    def _create(self, ds):
+        """
+        Write the first swaths and define the chunking.
+        """
+        encoding = {
+            "swath_time": {
+                "units": swath_time_units,
+                "dtype": np.dtype("float64")
+            }
+        }
+        for var in ds.data_vars:
+            chunks = tuple(
+                min(self.chunks.get(dim, size), size) if dim != "swath_time"
+                else self.chunks["swath_time"]
+                for dim, size in ds[var].sizes.items())
+            if self.filename.suffix == ".zarr":
+                encoding[var] = {"chunks": chunks}
+            else:
+                encoding[var] = {
+                    "chunksizes": chunks,
+                    "zlib": True,
+                    "complevel": 4
+                }
+
+        if self.filename.suffix == ".zarr":
+            ds.to_zarr(self.filename, mode="w-", encoding=encoding,
+                       consolidated=False)
+        else:
+            ds.to_netcdf(self.filename, encoding=encoding,
+                         unlimited_dims=["swath_time"])
+
+    def _cube_vars(self):
+        """
+        Variables along the swath_time dimension of the cube or of the
+        buffered swaths.
+        """
+        if self._pending:
+            return set(self._pending[0].data_vars)
+        if not self.filename.exists():
+            return None
+
+        with self._open() as cube:
+            return {
+                var for var in cube.data_vars
+                if "swath_time" in cube[var].dims
+            }
+
+    def _append(self, ds):
+        """
+        Append swaths to the existing cube without re-encoding the data.
+        """
+        time_values = ((ds["swath_time"].values
+                        - np.datetime64("1970-01-01", "ns"))
+                       / np.timedelta64(1, "s"))
+
+        if self.filename.suffix == ".zarr":
+            group = zarr.open_group(self.filename, mode="a")
+            for var in ds.data_vars:
+                group[var].append(ds[var].values, axis=0)
+            group["swath_time"].append(time_values)
+        else:
+            with netCDF4.Dataset(self.filename, "a") as nc:
+                nc.set_auto_maskandscale(False)
+                i = len(nc.dimensions["swath_time"])
+                n = time_values.size
+                for var in ds.data_vars:
+                    nc[var][i:i + n] = ds[var].values
+                nc["swath_time"][i:i + n] = time_values
+
+    def append(self, ds, swath_time):
+        """
+        Append a regridded swath.
+
+        The swath is buffered until the current swath_time chunk is
+        complete, see `flush`.
+
+        Parameters
+        ----------
+        ds : xarray.Dataset
+            Regridded swath with latitude and longitude dimensions.
+        swath_time : numpy.datetime64
+            Time of the swath, e.g. from `swath_start_time`.
+
+        Returns
+        -------
+        appended : bool
+            False if a swath with the same time is already in the cube.
+
+        Raises
+        ------
+        ValueError
+            If the variables of the swath differ from the ones of the cube.
+        """
+        swath_time = np.datetime64(swath_time, "ns")
+        if swath_time in self.swath_times:
+            return False
+
+        cube_vars = self._cube_vars()
+        if cube_vars is not None and set(ds.data_vars) != cube_vars:
+            raise ValueError(
+                f"Variables {sorted(ds.data_vars)} do not match the "
+                f"variables of the cube {sorted(cube_vars)}")
+
+        self._pending.append(ds.expand_dims(swath_time=[swath_time]))
+        self._swath_times = np.append(self.swath_times, swath_time)
+        if self._swath_times.size % self.chunks["swath_time"] == 0:
+            self.flush()
+
+        return True
+
+    def flush(self):
+        """
+        Write the buffered swaths to the cube.
+        """
+        if not self._pending:
+            return
+
+        ds = xr.concat(self._pending, dim="swath_time", coords="minimal",
+                       compat="override")
+        if not self.filename.exists():
+            self._create(ds)
+        else:
+            self._append(ds)
+        self._pending = []
+
+    def read(self, **kwargs):
+        """
+        Open the cube lazily.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            Keyword arguments passed to `xarray.open_zarr` or
+            `xarray.open_dataset`.
+
+        Returns
+        -------
+        ds : xarray.Dataset
+            Cube with swath_time, latitude and longitude dimensions.
+        """
+        self.flush()
+        if self.filename.suffix == ".nc":
+            kwargs.setdefault("chunks", {})
+
+        return self._open(**kwargs)
+
+
+def append_swath_files(cube, read, filenames, args=(), processes=None,
+                       initializer=None, initargs=None):
+    """
+    Read swath files, e.g. regridding or resampling them, and append them to
+    a time cube in the order of the files.
+
+    Parameters
+    ----------
+    cube : TimeCube
+        Time cube.
+    read : callable
+        Function returning the swath time and dataset of a swath file. It is
+        called as ``read(filename, *args)`` in the calling process or as
+        ``read(filename)`` in worker processes set up by `initializer`.
+    filenames : list of str or Path
+        Swath files in the order they are appended.
+    args : tuple, optional
+        Additional arguments of `read` in the calling process.
+    processes : int, optional
+        Number of worker processes reading the files, which are appended by
+        the calling process (default: None).
+    initializer : callable, optional
+        Initializer of the worker processes.
+    initargs : tuple, optional
+        Arguments of `initializer` (default: `args`).
+
+    Returns
+    -------
+    n_appended : int
+        Number of swaths appended, swaths already in the cube are skipped.
+    """
+    n_appended = 0
+    if processes is None or processes < 2:
+        for filename in filenames:
+            swath_time, ds = read(filename, *args)
+            n_appended += cube.append(ds, swath_time)
+        cube.flush()
+        return n_appended
+
+    if initargs is None:
+        initargs = args
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=initializer,
+                             initargs=initargs) as executor:
+        # swaths are submitted in batches to limit the number of swaths
+        # waiting to be appended
+        batch_size = 4 * processes
+        for i in range(0, len(filenames), batch_size):
+            for swath_time, ds in executor.map(read,
+                                               filenames[i:i + batch_size]):
+                n_appended += cube.append(ds, swath_time)
+    cube.flush()
+
+    return n_appended
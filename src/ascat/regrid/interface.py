@@ -6,13 +6,13 @@ import sys
 import argparse
 from pathlib import Path
 
-import xarray as xr
-
 from ascat.grids.grid_registry import GridRegistry
 from ascat.product_info import get_swath_product_id
 from ascat.product_info import swath_io_catalog
-from ascat.regrid.regrid import regrid_swath_ds
-from ascat.regrid.regrid import retrieve_or_store_grid_lut
+from ascat.regrid.cube import TimeCube
+from ascat.regrid.regrid import regrid_swath_files
+from ascat.regrid.regrid import regrid_swath_files_to_cube
+from ascat.regrid.regrid import retrieve_or_store_regrid_operator
 
 
 def parse_args_swath_regrid(args):
@@ -53,10 +53,48 @@ def parse_args_swath_regrid(args):
         "--suffix",
         metavar="SUFFIX",
         help="File suffix (default: _REGRID_DEGdeg)")
+    parser.add_argument(
+        "--processes",
+        metavar="PROCESSES",
+        type=int,
+        help="Number of worker processes regridding files (default: 1)")
+    parser.add_argument(
+        "--cube",
+        metavar="CUBE",
+        help=("Append the regridded swaths to a time cube in OUTPATH (name "
+              "ending with .zarr or .nc) instead of writing one file per "
+              "swath"))
+    parser.add_argument(
+        "--chunks",
+        metavar=("TIME", "LAT", "LON"),
+        type=int,
+        nargs=3,
+        help=("Chunk sizes of the swath_time, latitude and longitude "
+              "dimensions of a new cube (default: 32 128 128)"))
 
     return parser.parse_args(args)
 
 
+def cube_chunks(chunks):
+    """
+    Chunk sizes of a time cube from command line arguments.
+
+    Parameters
+    ----------
+    chunks : list of int or None
+        Chunk sizes of the swath_time, latitude and longitude dimensions.
+
+    Returns
+    -------
+    chunks : dict or None
+        Chunk sizes by dimension.
+    """
+    if chunks is None:
+        return None
+
+    return dict(zip(["swath_time", "latitude", "longitude"], chunks))
+
+
 def swath_regrid_main(cli_args):
     """
     Regrid an ASCAT swath file or directory of swath files
@@ -113,19 +151,22 @@ def swath_regrid_main(cli_args):
     src_grid_id = f"fib_grid_{src_grid_size}km"
     trg_grid_id = f"reg_grid_{trg_grid_size}deg"
 
-    trg_grid, grid_lut = retrieve_or_store_grid_lut(
+    trg_grid, operator = retrieve_or_store_regrid_operator(
         src_grid,
         src_grid_id,
         trg_grid_id,
         trg_grid_size,
         args.grid_store)
 
-    for f in files:
-        outfile = outpath / Path(f.stem + suffix + f.suffix)
-
-        with xr.open_dataset(f, decode_cf=False, mask_and_scale=False) as ds:
-            regrid_ds = regrid_swath_ds(ds, src_grid, trg_grid, grid_lut)
-            regrid_ds.to_netcdf(outfile)
+    if args.cube:
+        outpath.mkdir(parents=True, exist_ok=True)
+        cube = TimeCube(outpath / args.cube, cube_chunks(args.chunks))
+        regrid_swath_files_to_cube(sorted(files), cube, trg_grid, operator,
+                                   args.processes)
+    else:
+        outfiles = [outpath / Path(f.stem + suffix + f.suffix) for f in files]
+        regrid_swath_files(files, outfiles, trg_grid, operator,
+                           args.processes)
 
 
 def run_swath_regrid():
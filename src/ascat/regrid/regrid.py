@@ -3,13 +3,15 @@
 # SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
 
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 import xarray as xr
 
-from pygeogrids.grids import genreg_grid
+from pygeogrids.grids import BasicGrid, genreg_grid
 from pygeogrids.netcdf import load_grid, save_grid
 
+from ascat.regrid.cube import append_swath_files, swath_start_time
 from ascat.utils import dtype_to_nan
 
 
@@ -69,11 +71,140 @@ def retrieve_or_store_grid_lut(src_grid,
     return trg_grid, grid_lut
 
 
+class RegridOperator:
+    """
+    Sparse nearest neighbour regridding operator.
+
+    Stores the inverse of a grid look-up table: for every source grid point
+    that is the nearest neighbour of at least one target grid point, the
+    (flat) indices of these target grid points, in compressed sparse row
+    format sorted by source grid point. Regridding a swath then only touches
+    the target grid points covered by its locations.
+    """
+
+    def __init__(self, src_gpis, indptr, trg_idx, shape):
+        """
+        Initialize the operator.
+
+        Parameters
+        ----------
+        src_gpis : numpy.ndarray
+            Sorted source grid point indices.
+        indptr : numpy.ndarray
+            Start of the target indices of each source grid point in
+            `trg_idx`, followed by the total number of target indices.
+        trg_idx : numpy.ndarray
+            Flat target grid point indices.
+        shape : tuple
+            Shape of the target grid.
+        """
+        self.src_gpis = src_gpis
+        self.indptr = indptr
+        self.trg_idx = trg_idx
+        self.shape = tuple(int(n) for n in shape)
+
+    @classmethod
+    def from_lut(cls, grid_lut):
+        """
+        Create the operator from a grid look-up table.
+
+        Parameters
+        ----------
+        grid_lut : numpy.ndarray
+            Nearest source grid point of each target grid point.
+
+        Returns
+        -------
+        operator : RegridOperator
+            Regridding operator.
+        """
+        lut = np.asarray(grid_lut).ravel()
+        trg_idx = np.argsort(lut, kind="stable")
+        src_gpis, counts = np.unique(lut[trg_idx], return_counts=True)
+        indptr = np.zeros(src_gpis.size + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+
+        if lut.size <= np.iinfo(np.int32).max:
+            trg_idx = trg_idx.astype(np.int32)
+
+        return cls(src_gpis, indptr, trg_idx, np.shape(grid_lut))
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load an operator saved with `save`.
+
+        Parameters
+        ----------
+        filename : str or Path
+            Operator file (.npz).
+
+        Returns
+        -------
+        operator : RegridOperator
+            Regridding operator.
+        """
+        with np.load(filename) as data:
+            return cls(data["src_gpis"], data["indptr"], data["trg_idx"],
+                       data["shape"])
+
+    def save(self, filename):
+        """
+        Save the operator.
+
+        Parameters
+        ----------
+        filename : str or Path
+            Operator file (.npz).
+        """
+        np.savez(filename, src_gpis=self.src_gpis, indptr=self.indptr,
+                 trg_idx=self.trg_idx, shape=np.array(self.shape))
+
+    def target_index(self, location_id):
+        """
+        Map observations to the target grid points they are the nearest
+        neighbour of.
+
+        If a location occurs several times, its last observation is used.
+
+        Parameters
+        ----------
+        location_id : numpy.ndarray
+            Source grid point index of each observation.
+
+        Returns
+        -------
+        trg_idx : numpy.ndarray
+            Flat target grid point indices.
+        obs_idx : numpy.ndarray
+            Observation index for each target grid point index.
+        """
+        location_id = np.asarray(location_id)
+        gpis, rev_idx = np.unique(location_id[::-1], return_index=True)
+        obs = location_id.size - 1 - rev_idx
+
+        pos = np.searchsorted(self.src_gpis, gpis)
+        pos[pos == self.src_gpis.size] = 0
+        found = self.src_gpis[pos] == gpis
+        pos, obs = pos[found], obs[found]
+
+        starts = self.indptr[pos]
+        counts = self.indptr[pos + 1] - starts
+        offsets = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts)
+
+        return (self.trg_idx[np.repeat(starts, counts) + offsets],
+                np.repeat(obs, counts))
+
+
 def regrid_swath_ds(ds, src_grid, trg_grid, grid_lut):
     """
     Convert a swath dataset to their nearest neighbors
     on a regular lat/lon grid.
 
+    All variables of the same data type are regridded together in one
+    vectorized pass.
+
     Parameters
     ----------
     ds : xarray.Dataset
@@ -82,18 +213,21 @@ def regrid_swath_ds(ds, src_grid, trg_grid, grid_lut):
         Sourde grid.
     trg_grid : pygeogrids.grids.BasicGrid
         Target grid.
-    trg_grid_lut : numpy.ndarray
-        Grid look-up table.
+    grid_lut : numpy.ndarray or RegridOperator
+        Grid look-up table or the regridding operator created from it.
+        Pass the operator to reuse it for several swaths.
 
     Returns
     -------
     ds : xarray.Dataset
         Swath dataset resampled on a regular lat/lon grid.
     """
-    index_lut = np.zeros(src_grid.n_gpi, dtype=np.int32) - 1
-    index_lut[ds["location_id"].data] = np.arange(ds["location_id"].size)
-    idx = index_lut[grid_lut]
-    nan_pos = idx == -1
+    if isinstance(grid_lut, RegridOperator):
+        operator = grid_lut
+    else:
+        operator = RegridOperator.from_lut(grid_lut)
+
+    trg_idx, obs_idx = operator.target_index(ds["location_id"].data)
 
     coords = {
         "latitude": np.int32(trg_grid.lat2d[:, 0] / 1e-6),
@@ -107,23 +241,252 @@ def regrid_swath_ds(ds, src_grid, trg_grid, grid_lut):
     regrid_ds["longitude"].attrs = ds["longitude"].attrs
     dim = ("latitude", "longitude")
 
-    for var in ds.variables:
-        if var in ["latitude", "longitude"]:
-            continue
+    variables = [
+        var for var in ds.variables
+        if var not in ["latitude", "longitude"] and ds[var].size != 1
+    ]
 
-        if ds[var].size == 1:
-            continue
+    dtype_groups = {}
+    for var in variables:
+        dtype_groups.setdefault(ds[var].dtype, []).append(var)
 
-        regrid_ds[var] = (dim, ds[var].data[idx])
+    regridded = {}
+    n_trg = int(np.prod(operator.shape))
+    for dtype, names in dtype_groups.items():
+        fill_values = []
+        for var in names:
+            if hasattr(ds[var], "_FillValue"):
+                fill_values.append(ds[var]._FillValue)
+            elif var == "time":
+                fill_values.append(0)
+            else:
+                fill_values.append(dtype_to_nan[dtype])
+
+        data = np.empty((len(names), n_trg), dtype=dtype)
+        data[:] = np.array(fill_values, dtype=dtype)[:, np.newaxis]
+        data[:, trg_idx] = np.stack([ds[var].data for var in names])[:,
+                                                                     obs_idx]
+        for var, var_data in zip(names, data):
+            regridded[var] = var_data.reshape(operator.shape)
+
+    for var in variables:
+        regrid_ds[var] = (dim, regridded[var])
         regrid_ds[var].attrs = ds[var].attrs
         regrid_ds[var].encoding = {"zlib": True, "complevel": 4}
 
-        if hasattr(ds[var], "_FillValue"):
-            regrid_ds[var].data[nan_pos] = ds[var]._FillValue
-        else:
-            if var == "time":
-                regrid_ds[var].data[nan_pos] = 0
-            else:
-                regrid_ds[var].data[nan_pos] = dtype_to_nan[ds[var].dtype]
-
     return regrid_ds
+
+
+def retrieve_or_store_regrid_operator(src_grid,
+                                      src_grid_id,
+                                      trg_grid_id,
+                                      trg_grid_size,
+                                      store_path=None):
+    """
+    Get a grid and its regridding operator either from a store directory or
+    create and return them.
+
+    The operator is stored next to the look-up table of
+    `retrieve_or_store_grid_lut`.
+
+    Parameters
+    ----------
+    src_grid : pygeogrids.BasicGrid
+        Source grid.
+    src_grid_id : str
+        The source grid's id.
+    trg_grid_id : str
+        The target grid's id.
+    trg_grid_size : int
+        The size of the target grid in degrees.
+    store_path : str, optional
+        Path to the store directory (default: None).
+
+    Returns
+    -------
+    trg_grid : pygeogrids.grids.BasicGrid
+        Target grid.
+    operator : RegridOperator
+        Regridding operator.
+    """
+    if store_path is not None:
+        operator_file = (Path(store_path)
+                         / f"operator_{src_grid_id}_{trg_grid_id}.npz")
+        if operator_file.exists():
+            trg_grid_file = Path(store_path) / f"{trg_grid_id}.nc"
+            return load_grid(trg_grid_file), RegridOperator.load(operator_file)
+
+    trg_grid, grid_lut = retrieve_or_store_grid_lut(
+        src_grid, src_grid_id, trg_grid_id, trg_grid_size, store_path)
+    operator = RegridOperator.from_lut(grid_lut)
+
+    if store_path is not None:
+        operator.save(operator_file)
+
+    return trg_grid, operator
+
+
+def picklable_grid(grid):
+    """
+    Copy of a grid without its k-d tree, which cannot be pickled, e.g. to
+    send it to worker processes.
+
+    Parameters
+    ----------
+    grid : pygeogrids.grids.BasicGrid
+        Grid.
+
+    Returns
+    -------
+    grid : pygeogrids.grids.BasicGrid
+        Grid without k-d tree.
+    """
+    return BasicGrid(grid.arrlon, grid.arrlat, gpis=grid.gpis,
+                     subset=grid.subset, setup_kdTree=False, shape=grid.shape)
+
+
+_worker_regrid = {}
+
+
+def _init_regrid_worker(trg_grid, operator):
+    """
+    Keep the target grid and operator in a worker process, so they are
+    only sent once instead of with every file.
+    """
+    _worker_regrid["trg_grid"] = trg_grid
+    _worker_regrid["operator"] = operator
+
+
+def regrid_swath_file(filename, outfile, trg_grid=None, operator=None):
+    """
+    Regrid a swath file and write the result.
+
+    Parameters
+    ----------
+    filename : str or Path
+        Swath file.
+    outfile : str or Path
+        Output file.
+    trg_grid : pygeogrids.grids.BasicGrid, optional
+        Target grid (default: the one of the worker process).
+    operator : RegridOperator, optional
+        Regridding operator (default: the one of the worker process).
+
+    Returns
+    -------
+    outfile : str or Path
+        Output file.
+    """
+    if trg_grid is None:
+        trg_grid = _worker_regrid["trg_grid"]
+    if operator is None:
+        operator = _worker_regrid["operator"]
+
+    with xr.open_dataset(filename, decode_cf=False,
+                         mask_and_scale=False) as ds:
+        regrid_ds = regrid_swath_ds(ds, None, trg_grid, operator)
+        regrid_ds.to_netcdf(outfile)
+
+    return outfile
+
+
+def regrid_swath_files(filenames, outfiles, trg_grid, operator,
+                       processes=None):
+    """
+    Regrid swath files with the same operator.
+
+    Parameters
+    ----------
+    filenames : list of str or Path
+        Swath files.
+    outfiles : list of str or Path
+        Output files.
+    trg_grid : pygeogrids.grids.BasicGrid
+        Target grid.
+    operator : RegridOperator
+        Regridding operator.
+    processes : int, optional
+        Number of worker processes. The target grid and operator are sent
+        to every worker once. By default the files are regridded in the
+        calling process (default: None).
+
+    Returns
+    -------
+    outfiles : list of str or Path
+        Output files.
+    """
+    if processes is None or processes < 2:
+        return [
+            regrid_swath_file(filename, outfile, trg_grid, operator)
+            for filename, outfile in zip(filenames, outfiles)
+        ]
+
+    with ProcessPoolExecutor(max_workers=processes,
+                             initializer=_init_regrid_worker,
+                             initargs=(picklable_grid(trg_grid),
+                                       operator)) as executor:
+        chunksize = max(1, len(filenames) // (4 * processes))
+        return list(
+            executor.map(regrid_swath_file, filenames, outfiles,
+                         chunksize=chunksize))
+
+
+def read_regridded_swath(filename, trg_grid=None, operator=None):
+    """
+    Regrid a swath file.
+
+    Parameters
+    ----------
+    filename : str or Path
+        Swath file.
+    trg_grid : pygeogrids.grids.BasicGrid, optional
+        Target grid (default: the one of the worker process).
+    operator : RegridOperator, optional
+        Regridding operator (default: the one of the worker process).
+
+    Returns
+    -------
+    swath_time : numpy.datetime64
+        Time of the first observation of the swath.
+    regrid_ds : xarray.Dataset
+        Regridded swath.
+    """
+    if trg_grid is None:
+        trg_grid = _worker_regrid["trg_grid"]
+    if operator is None:
+        operator = _worker_regrid["operator"]
+
+    with xr.open_dataset(filename, decode_cf=False,
+                         mask_and_scale=False) as ds:
+        return (swath_start_time(ds),
+                regrid_swath_ds(ds, None, trg_grid, operator))
+
+
+def regrid_swath_files_to_cube(filenames, cube, trg_grid, operator,
+                               processes=None):
+    """
+    Regrid swath files and append them to a time cube.
+
+    Parameters
+    ----------
+    filenames : list of str or Path
+        Swath files in the order they are appended.
+    cube : TimeCube
+        Time cube.
+    trg_grid : pygeogrids.grids.BasicGrid
+        Target grid.
+    operator : RegridOperator
+        Regridding operator.
+    processes : int, optional
+        Number of worker processes regridding the files, which are appended
+        by the calling process (default: None).
+
+    Returns
+    -------
+    n_appended : int
+        Number of swaths appended, swaths already in the cube are skipped.
+    """
+    return append_swath_files(cube, read_regridded_swath, filenames,
+                              (trg_grid, operator), processes,
+                              _init_regrid_worker,
+                              (picklable_grid(trg_grid), operator))
@@ -6,14 +6,15 @@ import sys
 import argparse
 from pathlib import Path
 
-import numpy as np
-import xarray as xr
-from pyresample import kd_tree, SwathDefinition
-
 from ascat.grids.grid_registry import GridRegistry
 from ascat.product_info import get_swath_product_id
 from ascat.product_info import swath_io_catalog
+from ascat.regrid.cube import TimeCube
+from ascat.regrid.interface import cube_chunks
 from ascat.regrid.regrid import retrieve_or_store_grid_lut
+from ascat.resample.resample import InverseDistanceResampler
+from ascat.resample.resample import resample_swath_files
+from ascat.resample.resample import resample_swath_files_to_cube
 
 
 def parse_args_swath_resample(args):
@@ -67,6 +68,24 @@ def parse_args_swath_resample(args):
         type=float,
         default=10000,
         help="Cut off distance in meters (default: 10000)")
+    parser.add_argument(
+        "--workers",
+        metavar="WORKERS",
+        type=int,
+        help="Number of worker processes resampling files (default: 1)")
+    parser.add_argument(
+        "--cube",
+        metavar="CUBE",
+        help=("Append the resampled swaths to a time cube in OUTPATH (name "
+              "ending with .zarr or .nc) instead of writing one file per "
+              "swath"))
+    parser.add_argument(
+        "--chunks",
+        metavar=("TIME", "LAT", "LON"),
+        type=int,
+        nargs=3,
+        help=("Chunk sizes of the swath_time, latitude and longitude "
+              "dimensions of a new cube (default: 32 128 128)"))
 
     return parser.parse_args(args)
 
@@ -105,8 +124,14 @@ def swath_resample_main(cli_args):
     else:
         grid_store = None
 
+    cube = None
+    if args.cube:
+        outpath.mkdir(parents=True, exist_ok=True)
+        cube = TimeCube(outpath / args.cube, cube_chunks(args.chunks))
+
     inverse_distance_resampling(filepath, outpath, trg_grid_size, suffix, k,
-                                radius, grid_store, product_id=product_id)
+                                radius, grid_store, product_id=product_id,
+                                workers=args.workers, cube=cube)
 
 
 def inverse_distance_resampling(filepath,
@@ -116,7 +141,9 @@ def inverse_distance_resampling(filepath,
                                 k=6,
                                 radius=10000.,
                                 grid_store=None,
-                                product_id=None):
+                                product_id=None,
+                                workers=None,
+                                cube=None):
     """
     Inverse distance resampling of ASCAT swath data.
 
@@ -139,6 +166,11 @@ def inverse_distance_resampling(filepath,
     product_id : str, optional
         Product identifier (e.g. H129, H125, H121, etc.). If not provided,
         an attempt is made to determine it from the file name.
+    workers : int, optional
+        Number of worker processes resampling files (default: None).
+    cube : TimeCube, optional
+        Time cube the resampled swaths are appended to instead of writing
+        one file per swath (default: None).
     """
     if filepath.is_dir():
         files = list(filepath.glob("**/*.nc"))
@@ -169,100 +201,12 @@ def inverse_distance_resampling(filepath,
                                                     trg_grid_id, sampling,
                                                     grid_store)
 
-    var_list = [
-        ("time", "nn"),
-        ("as_des_pass", "nn"),
-        ("swath_indicator", "nn"),
-        ("surface_flag", "nn"),
-        ("surface_flag_source", "nn"),
-        ("surface_soil_moisture", "idw"),
-        ("surface_soil_moisture_noise", "idw"),
-        ("surface_soil_moisture_sensitivity", "idw"),
-        ("backscatter40", "idw"),
-        ("slope40", "idw"),
-        ("curvature40", "idw"),
-        ("snow_cover_probability", "idw"),
-        ("frozen_soil_probability", "idw"),
-        ("topographic_complexity", "idw"),
-        ("wetland_fraction", "idw"),
-        ("subsurface_scattering_prob", "idw"),
-        # ("processing_flag", "major"),
-        ("correction_flag", "bitwise_or"),
-        ("backscatter40_flag", "bitwise_or"),
-    ]
-
-    target_def = SwathDefinition(lons=trg_grid.arrlon, lats=trg_grid.arrlat)
-    output_shape = trg_grid.shape
-    dim = ("latitude", "longitude")
-
-    for f in files:
-        outfile = outpath / Path(f.stem + suffix + f.suffix)
-
-        with xr.open_dataset(f, decode_cf=False, mask_and_scale=False) as ds:
-
-            lons = ds["longitude"] * ds["longitude"].scale_factor
-            lats = ds["latitude"] * ds["latitude"].scale_factor
-
-            coords = {
-                "latitude": np.int32(trg_grid.lat2d[:, 0] / 1e-6),
-                "longitude": np.int32(trg_grid.lon2d[0] / 1e-6)
-            }
-
-            resampled_ds = xr.Dataset(coords=coords)
-            resampled_ds.attrs = ds.attrs
-
-            resampled_ds["latitude"].attrs = ds["latitude"].attrs
-            resampled_ds["longitude"].attrs = ds["longitude"].attrs
-
-            swath_def = SwathDefinition(lons=lons, lats=lats)
-            valid_input_index, valid_output_index, index_array, distance_array = \
-                    kd_tree.get_neighbour_info(swath_def, target_def,
-                                                radius, neighbours=k)
-
-            invalid_pos = index_array == lons.size
-            index_array = index_array.astype(np.int32)
-            index_array[invalid_pos] = -1
-
-            for var, method in var_list:
-
-                if var not in ds or len(ds[var].dims) == 0:
-                    continue
-
-                data = ds[var].data[valid_input_index][index_array]
-                data[invalid_pos] = ds[var]._FillValue
-
-                resam_data = np.zeros(
-                    data.shape[0], dtype=ds[var].dtype) + ds[var]._FillValue
-
-                if method == "idw":
-                    p = 2
-                    weights = 1 / (distance_array**p)
-                    invalid = invalid_pos | (data == ds[var]._FillValue)
-                    weights[invalid] = 0
-                    total_weights = weights.sum(axis=1)
-                    idx = total_weights != 0
-                    resam_data[idx] = np.sum(
-                        weights * data, axis=1)[idx] / total_weights[idx]
-                elif method == "nn":
-                    valid = index_array != -1
-                    first_idx = np.where(
-                        valid.any(axis=1), valid.argmax(axis=1), -1)
-                    valid_mask = first_idx != -1
-                    valid_rows = np.arange(index_array.shape[0])[valid_mask]
-                    resam_data[valid_rows] = data[valid_rows,
-                                                  first_idx[valid_rows]]
-                elif method == "bitwise_or":
-                    mask = index_array == -1
-                    data[mask] = 0
-                    resam_data = np.bitwise_or.reduce(data, axis=1)
-                else:
-                    raise ValueError("Resampling method unknown")
-
-                resampled_ds[var] = (dim, resam_data.reshape(output_shape))
-                resampled_ds[var].attrs = ds[var].attrs
-                resampled_ds[var].encoding = {"zlib": True, "complevel": 4}
-
-            resampled_ds.to_netcdf(outfile)
+    resampler = InverseDistanceResampler(trg_grid, k, radius)
+    if cube is not None:
+        resample_swath_files_to_cube(sorted(files), cube, resampler, workers)
+    else:
+        outfiles = [outpath / Path(f.stem + suffix + f.suffix) for f in files]
+        resample_swath_files(files, outfiles, resampler, workers)
 
 
 def run_swath_resample():
@@ -0,0 +1,408 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
+# SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import xarray as xr
+from pykdtree.kdtree import KDTree
+
+from ascat.regrid.cube import append_swath_files, swath_start_time
+from ascat.regrid.regrid import picklable_grid
+
+# earth radius used by pyresample for its cartesian coordinates
+earth_radius = 6370997.
+
+# variables and their resampling methods
+resample_vars = [
+    ("time", "nn"),
+    ("as_des_pass", "nn"),
+    ("swath_indicator", "nn"),
+    ("surface_flag", "nn"),
+    ("surface_flag_source", "nn"),
+    ("surface_soil_moisture", "idw"),
+    ("surface_soil_moisture_noise", "idw"),
+    ("surface_soil_moisture_sensitivity", "idw"),
+    ("backscatter40", "idw"),
+    ("slope40", "idw"),
+    ("curvature40", "idw"),
+    ("snow_cover_probability", "idw"),
+    ("frozen_soil_probability", "idw"),
+    ("topographic_complexity", "idw"),
+    ("wetland_fraction", "idw"),
+    ("subsurface_scattering_prob", "idw"),
+    # ("processing_flag", "major"),
+    ("correction_flag", "bitwise_or"),
+    ("backscatter40_flag", "bitwise_or"),
+]
+
+
+def lonlat2xyz(lons, lats):
+    """
+    Convert longitudes and latitudes to cartesian coordinates.
+
+    Parameters
+    ----------
+    lons : numpy.ndarray
+        Longitudes in degrees.
+    lats : numpy.ndarray
+        Latitudes in degrees.
+
+    Returns
+    -------
+    xyz : numpy.ndarray
+        Cartesian coordinates in meters, shape (n, 3).
+    """
+    lons = np.deg2rad(np.asarray(lons, dtype=np.float64))
+    lats = np.deg2rad(np.asarray(lats, dtype=np.float64))
+
+    return np.column_stack([
+        earth_radius * np.cos(lats) * np.cos(lons),
+        earth_radius * np.cos(lats) * np.sin(lons),
+        earth_radius * np.sin(lats)
+    ])
+
+
+def _group_by_dtype(ds, names):
+    """
+    Group variables by data type.
+    """
+    groups = {}
+    for var in names:
+        groups.setdefault(ds[var].dtype, []).append(var)
+
+    return groups
+
+
+class InverseDistanceResampler:
+    """
+    Inverse distance resampling of swath data to a fixed target grid.
+
+    The cartesian coordinates of the target grid are computed once. For
+    every swath a k-d tree of its observations is built and the neighbours
+    of the target grid points are searched in segments, keeping only the
+    target grid points covered by the swath. The resulting neighbour and
+    weight matrices are applied to all variables.
+    """
+
+    def __init__(self, trg_grid, k=6, radius=10000., p=2, var_list=None,
+                 segment_size=2**20):
+        """
+        Initialize the resampler.
+
+        Parameters
+        ----------
+        trg_grid : pygeogrids.grids.BasicGrid
+            Regular target grid.
+        k : int, optional
+            Number of neighbours to consider for each grid point (default: 6).
+        radius : float, optional
+            Cut off distance in meters (default: 10000.).
+        p : int, optional
+            Power of the inverse distance weights (default: 2).
+        var_list : list of tuple, optional
+            Variable names and resampling methods ("idw", "nn" or
+            "bitwise_or") (default: `resample_vars`).
+        segment_size : int, optional
+            Number of target grid points searched at once (default: 2**20).
+        """
+        self.trg_grid = trg_grid
+        self.k = k
+        self.radius = radius
+        self.p = p
+        self.var_list = var_list or resample_vars
+        self.segment_size = segment_size
+        self._trg_xyz = lonlat2xyz(trg_grid.arrlon, trg_grid.arrlat)
+
+    def __getstate__(self):
+        # the coordinates are recomputed instead of pickled, e.g. once per
+        # worker process
+        state = self.__dict__.copy()
+        del state["_trg_xyz"]
+        state["trg_grid"] = picklable_grid(self.trg_grid)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._trg_xyz = lonlat2xyz(self.trg_grid.arrlon, self.trg_grid.arrlat)
+
+    def neighbours(self, lons, lats):
+        """
+        Find the k nearest observations within the radius of each target
+        grid point.
+
+        Parameters
+        ----------
+        lons : numpy.ndarray
+            Longitudes of the observations.
+        lats : numpy.ndarray
+            Latitudes of the observations.
+
+        Returns
+        -------
+        trg_idx : numpy.ndarray
+            Indices of the target grid points with at least one neighbour.
+        index_array : numpy.ndarray
+            Observation indices of the neighbours sorted by distance, -1 if
+            there are less than k neighbours, shape (n, k).
+        distance_array : numpy.ndarray
+            Distances of the neighbours, inf if there are less than k
+            neighbours, shape (n, k).
+        """
+        lons = np.asarray(lons)
+        lats = np.asarray(lats)
+        obs = np.flatnonzero((lons >= -180) & (lons <= 180) & (lats >= -90)
+                             & (lats <= 90))
+        if obs.size == 0:
+            return (np.zeros(0, dtype=np.int64),
+                    np.zeros((0, self.k), dtype=np.int64),
+                    np.zeros((0, self.k)))
+
+        tree = KDTree(lonlat2xyz(lons[obs], lats[obs]))
+        # index of missing neighbours
+        obs = np.append(obs, -1)
+
+        trg_idx = []
+        index_array = []
+        distance_array = []
+        for start in range(0, self._trg_xyz.shape[0], self.segment_size):
+            dist, idx = tree.query(
+                self._trg_xyz[start:start + self.segment_size],
+                k=self.k,
+                distance_upper_bound=self.radius)
+            dist = dist.reshape(-1, self.k)
+            idx = idx.reshape(-1, self.k)
+            covered = np.flatnonzero(np.isfinite(dist[:, 0]))
+
+            trg_idx.append(start + covered)
+            index_array.append(obs[idx[covered]])
+            distance_array.append(dist[covered])
+
+        return (np.concatenate(trg_idx), np.concatenate(index_array),
+                np.concatenate(distance_array))
+
+    def resample(self, ds):
+        """
+        Resample a swath dataset.
+
+        Parameters
+        ----------
+        ds : xarray.Dataset
+            Swath dataset read without decoding (scaled coordinates and fill
+            values as stored in the file).
+
+        Returns
+        -------
+        resampled_ds : xarray.Dataset
+            Swath dataset resampled on the target grid.
+        """
+        lons = (ds["longitude"].values
+                * ds["longitude"].attrs.get("scale_factor", 1))
+        lats = (ds["latitude"].values
+                * ds["latitude"].attrs.get("scale_factor", 1))
+        trg_idx, index_array, distance_array = self.neighbours(lons, lats)
+        missing = index_array == -1
+        with np.errstate(divide="ignore"):
+            weights = 1 / (distance_array**self.p)
+
+        coords = {
+            "latitude": np.int32(self.trg_grid.lat2d[:, 0] / 1e-6),
+            "longitude": np.int32(self.trg_grid.lon2d[0] / 1e-6)
+        }
+
+        resampled_ds = xr.Dataset(coords=coords)
+        resampled_ds.attrs = ds.attrs
+
+        resampled_ds["latitude"].attrs = ds["latitude"].attrs
+        resampled_ds["longitude"].attrs = ds["longitude"].attrs
+
+        methods = {}
+        for var, method in self.var_list:
+            if var not in ds or len(ds[var].dims) == 0:
+                continue
+            if method not in ["idw", "nn", "bitwise_or"]:
+                raise ValueError("Resampling method unknown")
+            methods.setdefault(method, []).append(var)
+
+        n_trg = self.trg_grid.arrlon.size
+        resampled = {}
+
+        if "idw" in methods:
+            names = methods["idw"]
+            fill_values = np.array([ds[var]._FillValue for var in names],
+                                   dtype=np.float64)[:, np.newaxis,
+                                                     np.newaxis]
+            data = np.stack([ds[var].values for var in names]).astype(
+                np.float64)[:, index_array]
+            data[:, missing] = fill_values[:, 0]
+            var_weights = np.where(missing | (data == fill_values), 0,
+                                   weights)
+            total_weights = var_weights.sum(axis=2)
+            values = np.sum(var_weights * data, axis=2)
+
+            for i, var in enumerate(names):
+                resam_data = np.zeros(
+                    n_trg, dtype=ds[var].dtype) + ds[var]._FillValue
+                idx = total_weights[i] != 0
+                resam_data[trg_idx[idx]] = values[i, idx] / total_weights[i,
+                                                                          idx]
+                resampled[var] = resam_data
+
+        for dtype, names in _group_by_dtype(ds, methods.get("nn", [])).items():
+            # neighbours are sorted by distance, so the first is the nearest
+            data = np.stack([ds[var].values for var in names])[:,
+                                                               index_array[:,
+                                                                           0]]
+            for var, var_data in zip(names, data):
+                resam_data = np.zeros(n_trg, dtype=dtype) + ds[var]._FillValue
+                resam_data[trg_idx] = var_data
+                resampled[var] = resam_data
+
+        for dtype, names in _group_by_dtype(ds, methods.get("bitwise_or",
+                                                            [])).items():
+            data = np.stack([ds[var].values for var in names])[:, index_array]
+            data[:, missing] = 0
+            data = np.bitwise_or.reduce(data, axis=2)
+            for var, var_data in zip(names, data):
+                resam_data = np.zeros(n_trg, dtype=dtype)
+                resam_data[trg_idx] = var_data
+                resampled[var] = resam_data
+
+        dim = ("latitude", "longitude")
+        for var, _ in self.var_list:
+            if var not in resampled:
+                continue
+            resampled_ds[var] = (dim,
+                                 resampled[var].reshape(self.trg_grid.shape))
+            resampled_ds[var].attrs = ds[var].attrs
+            resampled_ds[var].encoding = {"zlib": True, "complevel": 4}
+
+        return resampled_ds
+
+
+_worker_resampler = {}
+
+
+def _init_resample_worker(resampler):
+    """
+    Keep the resampler in a worker process, so its target grid is only sent
+    and indexed once instead of for every file.
+    """
+    _worker_resampler["resampler"] = resampler
+
+
+def resample_swath_file(filename, outfile, resampler=None):
+    """
+    Resample a swath file and write the result.
+
+    Parameters
+    ----------
+    filename : str or Path
+        Swath file.
+    outfile : str or Path
+        Output file.
+    resampler : InverseDistanceResampler, optional
+        Resampler (default: the one of the worker process).
+
+    Returns
+    -------
+    outfile : str or Path
+        Output file.
+    """
+    if resampler is None:
+        resampler = _worker_resampler["resampler"]
+
+    with xr.open_dataset(filename, decode_cf=False,
+                         mask_and_scale=False) as ds:
+        resampled_ds = resampler.resample(ds)
+        resampled_ds.to_netcdf(outfile)
+
+    return outfile
+
+
+def resample_swath_files(filenames, outfiles, resampler, workers=None):
+    """
+    Resample swath files with the same resampler.
+
+    Parameters
+    ----------
+    filenames : list of str or Path
+        Swath files.
+    outfiles : list of str or Path
+        Output files.
+    resampler : InverseDistanceResampler
+        Resampler.
+    workers : int, optional
+        Number of worker processes. By default the files are resampled in
+        the calling process (default: None).
+
+    Returns
+    -------
+    outfiles : list of str or Path
+        Output files.
+    """
+    if workers is None or workers < 2:
+        return [
+            resample_swath_file(filename, outfile, resampler)
+            for filename, outfile in zip(filenames, outfiles)
+        ]
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_resample_worker,
+                             initargs=(resampler,)) as executor:
+        chunksize = max(1, len(filenames) // (4 * workers))
+        return list(
+            executor.map(resample_swath_file, filenames, outfiles,
+                         chunksize=chunksize))
+
+
+def read_resampled_swath(filename, resampler=None):
+    """
+    Resample a swath file.
+
+    Parameters
+    ----------
+    filename : str or Path
+        Swath file.
+    resampler : InverseDistanceResampler, optional
+        Resampler (default: the one of the worker process).
+
+    Returns
+    -------
+    swath_time : numpy.datetime64
+        Time of the first observation of the swath.
+    resampled_ds : xarray.Dataset
+        Resampled swath.
+    """
+    if resampler is None:
+        resampler = _worker_resampler["resampler"]
+
+    with xr.open_dataset(filename, decode_cf=False,
+                         mask_and_scale=False) as ds:
+        return swath_start_time(ds), resampler.resample(ds)
+
+
+def resample_swath_files_to_cube(filenames, cube, resampler, workers=None):
+    """
+    Resample swath files and append them to a time cube.
+
+    Parameters
+    ----------
+    filenames : list of str or Path
+        Swath files in the order they are appended.
+    cube : TimeCube
+        Time cube.
+    resampler : InverseDistanceResampler
+        Resampler.
+    workers : int, optional
+        Number of worker processes resampling the files, which are appended
+        by the calling process (default: None).
+
+    Returns
+    -------
+    n_appended : int
+        Number of swaths appended, swaths already in the cube are skipped.
+    """
+    return append_swath_files(cube, read_resampled_swath, filenames,
+                              (resampler,), workers, _init_resample_worker)
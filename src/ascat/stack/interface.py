@@ -89,6 +89,30 @@ def parse_args_swath_stacker(args):
         type=int,
         nargs='+',
         help="Numbers of the cells to process (default: None)")
+    parser.add_argument(
+        "--strategy",
+        metavar="STRATEGY",
+        type=str,
+        default="chunked",
+        choices=["chunked", "buffered", "external_sort"],
+        help="Stacking strategy: 'chunked' appends every dumped chunk to all its "
+        "cells, 'buffered' keeps a buffer per cell and only writes the largest "
+        "buffers once DUMP_SIZE is reached, 'external_sort' spills sorted runs "
+        "and writes each cell once as a contiguous ragged array "
+        "(default: chunked)")
+    parser.add_argument(
+        "--prefetch",
+        metavar="PREFETCH",
+        type=int,
+        default=0,
+        help="Number of swath files to decode ahead in background threads "
+        "while the current data is written (default: 0)")
+    parser.add_argument(
+        "--location_index",
+        action="store_true",
+        help="Record the time extents and location offsets of the written "
+        "cell files in OUTPATH/location_index.npz, used by cell reads with a "
+        "location index")
     parser.add_argument(
         "--quiet",
         action="store_true",
@@ -145,6 +169,9 @@ def swath_stacker_main(cli_args):
         fmt_kwargs=fmt_kwargs,
         cells=cells,
         print_progress=(not quiet),
+        strategy=args.strategy,
+        prefetch=args.prefetch,
+        location_index=args.location_index,
     )
 
 
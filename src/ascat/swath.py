@@ -2,9 +2,12 @@
 # SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
 # SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
 
+import os
+import json
 from datetime import timedelta
 from functools import partial
 from pathlib import Path
+from tempfile import TemporaryDirectory
 
 import dask
 import numpy as np
@@ -14,6 +17,7 @@ from pyresample import kd_tree
 from pyresample.geometry import AreaDefinition
 from pyresample.geometry import SwathDefinition
 
+from ascat.cell_index import LocationIndex
 from ascat.grids import GridRegistry
 
 from ascat.utils import get_grid_gpis
@@ -206,6 +210,8 @@ class SwathGridFiles(ChronFiles):
         preprocessor=None,
         postprocessor=None,
         cache_size=0,
+        footprint_index=None,
+        date_index=None,
     ):
         """
         Initialize SwathFiles class.
@@ -245,6 +251,15 @@ class SwathGridFiles(ChronFiles):
             when stacking to cell files.
         cache_size : int, optional
             Number of files to keep in memory (default=0).
+        footprint_index : bool or str or Path, optional
+            If given, spatial searches are answered from a persistent index of the
+            grid cells touched by each swath file (see `SwathFootprintIndex`)
+            instead of intersecting every file with the search area. Pass a path
+            for the index file, or True to store it as
+            ".swath_footprints.json" in `root_path` (default: None).
+        date_index : bool or str or Path, optional
+            Answer date searches from a sorted listing of the swath files, see
+            `ascat.file_handling.ChronFiles` (default: None).
         """
         # first check if any files directly under root_path contain the ending (make
         # sure not to iterate through every file - just stop after the first one).
@@ -262,7 +277,7 @@ class SwathGridFiles(ChronFiles):
 
         super().__init__(root_path, Swath, fn_templ, sf_templ, cls_kwargs, err,
                          fn_read_fmt, sf_read_fmt, fn_write_fmt, sf_write_fmt,
-                         cache_size)
+                         cache_size, date_index=date_index)
 
         self.date_field_fmt = date_field_fmt
         self.grid_name = grid_name
@@ -272,11 +287,20 @@ class SwathGridFiles(ChronFiles):
         self.preprocessor = preprocessor
         self.postprocessor = postprocessor
 
+        if footprint_index is True:
+            footprint_index = Path(root_path) / ".swath_footprints.json"
+        if footprint_index:
+            self.footprint_index = SwathFootprintIndex(
+                footprint_index, self.grid, grid_name, root_path)
+        else:
+            self.footprint_index = None
+
     @classmethod
     def from_product_id(
         cls,
         path,
         product_id,
+        footprint_index=None,
     ):
         """Create a SwathGridFiles object based on a product_id.
 
@@ -289,6 +313,8 @@ class SwathGridFiles(ChronFiles):
             Path to the swath file collection.
         product_id : str
             Identifier for the specific ASCAT product the swath files are part of.
+        footprint_index : bool or str or Path, optional
+            Persistent spatial search index, see `SwathGridFiles` (default: None).
 
         Raises
         ------
@@ -312,13 +338,15 @@ class SwathGridFiles(ChronFiles):
             error_str += f" {', '.join(swath_io_catalog.keys())}."
             raise ValueError(error_str)
 
-        return cls.from_product_class(path, product_class)
+        return cls.from_product_class(path, product_class,
+                                      footprint_index=footprint_index)
 
     @classmethod
     def from_product_class(
         cls,
         path,
         product_class,
+        footprint_index=None,
     ):
         """Create a SwathGridFiles from a given io_class.
 
@@ -330,6 +358,8 @@ class SwathGridFiles(ChronFiles):
             Path to the swath file collection.
         io_class : class
             Class to use for reading and writing the swath files.
+        footprint_index : bool or str or Path, optional
+            Persistent spatial search index, see `SwathGridFiles` (default: None).
 
         Examples
         --------
@@ -349,6 +379,7 @@ class SwathGridFiles(ChronFiles):
             fn_read_fmt=product_class.fn_read_fmt,
             sf_read_fmt=product_class.sf_read_fmt,
             preprocessor=product_class.preprocess_,
+            footprint_index=footprint_index,
         )
 
     def _spatial_filter(
@@ -379,6 +410,11 @@ class SwathGridFiles(ChronFiles):
         filenames : list of str
             Filenames.
         """
+        if self.footprint_index is not None:
+            cells = self._search_cells(cell, location_id, coords, bbox, geom)
+            if cells is None:
+                return filenames
+            return self.footprint_index.filter(filenames, cells)
 
         if cell is not None:
             gpis = get_grid_gpis(self.grid, cell=cell)
@@ -440,6 +476,35 @@ class SwathGridFiles(ChronFiles):
 
         return filtered_filenames
 
+    def _search_cells(
+        self,
+        cell=None,
+        location_id=None,
+        coords=None,
+        bbox=None,
+        geom=None,
+    ):
+        """
+        Grid cells covering a spatial criterion.
+
+        Returns
+        -------
+        cells : numpy.ndarray or None
+            Cell numbers, or None if no spatial criterion is given.
+        """
+        if cell is not None:
+            return np.atleast_1d(cell)
+        if all(arg is None for arg in (location_id, coords, bbox, geom)):
+            return None
+
+        gpis = get_grid_gpis(self.grid, location_id=location_id,
+                             coords=coords, bbox=bbox, geom=geom)
+        gpis = np.atleast_1d(gpis)
+        if gpis.size == 0:
+            # no grid points in the search area
+            return np.array([], dtype=int)
+        return np.unique(self.grid.gpi2cell(gpis))
+
     def _check_intersection(self, filename, spatial):
         """
         Check if a file intersects with a pyresample SwathDefinition or AreaDefinition.
@@ -654,6 +719,44 @@ class SwathGridFiles(ChronFiles):
             f"geom={geom}, max_coord_dist={max_coord_dist}, \n")
         warnings.warn(warning_str, UserWarning, 2)
 
+    def _iter_cell_slices(self, ds, cells=None):
+        """
+        Split a swath dataset into per-cell slices.
+
+        Parameters
+        ----------
+        ds : xarray.Dataset
+            Swath dataset with a `location_id` variable.
+        cells : list of int, optional
+            Only yield slices for these cells. If None (default), all cells.
+
+        Yields
+        ------
+        cell : int
+            Cell number.
+        cell_ds : xarray.Dataset
+            Observations of `ds` falling into `cell`.
+        """
+        ds_cells = self.grid.gpi2cell(ds["location_id"])
+        if isinstance(ds_cells, np.ma.MaskedArray):
+            ds_cells = ds_cells.compressed()
+        ds_cells = xr.DataArray(ds_cells, dims="obs", name="cell")
+
+        # sorting here enables us to manually select each cell's data much faster
+        # than using a .groupby
+        ds = ds.sortby(ds_cells)
+
+        unique_cells, cell_counts = np.unique(ds_cells, return_counts=True)
+        cell_counts = np.hstack([0, np.cumsum(cell_counts)])
+
+        # for each cell in unique cells, isel the slice from the dataarray corresponding to it
+        for i, c in enumerate(unique_cells):
+            if (cells is None) or (c in cells):
+                cell_ds = ds.isel(obs=slice(cell_counts[i], cell_counts[i + 1]))
+                if len(cell_ds) == 0:
+                    continue
+                yield c, cell_ds
+
     def stack_to_cell_files(
         self,
         out_dir,
@@ -663,16 +766,45 @@ class SwathGridFiles(ChronFiles):
         cells=None,
         print_progress=True,
         parallel=True,
+        strategy="chunked",
+        max_cell_nbytes=None,
+        tmp_dir=None,
+        prefetch=0,
+        location_index=None,
     ):
         """
         Stack all swath files to cell files, writing them in parallel.
 
+        Three strategies are available:
+
+        - "chunked" (default): swath files are opened until `max_nbytes` is
+          reached, the merged chunk is split by cell and every cell contained in
+          the chunk is appended to its file.
+        - "buffered": swath files are streamed one by one into a separate
+          in-memory buffer per cell. Once all buffers together exceed
+          `max_nbytes`, only the largest buffers are appended to their cell files
+          until the total drops to half of the budget. Cells with few
+          observations per swath are therefore written far less often.
+        - "external_sort": like "buffered", but instead of appending to the cell
+          files, the largest buffers are spilled as runs sorted by
+          (location_id, time) to a temporary directory. At the end the runs of
+          each cell are merged and written once as a contiguous ragged array,
+          so no separate conversion with
+          `CellGridFiles.convert_to_contiguous` is needed. Existing cell files
+          in `out_dir` are overwritten.
+
+        The "chunked" and "buffered" strategies write point arrays and append to
+        existing cell files, so a fresh export should be pointed to an empty
+        directory.
+
         Parameters
         ----------
         out_dir : str
             Output directory.
         max_nbytes : int
             Maximum number of bytes to open as xarray datasets before dumping to disk.
+            For the "buffered" and "external_sort" strategies, this is the budget
+            of all cell buffers.
         date_range : tuple of datetime.datetime, optional
             Start and end date for the search.
         fmt_kwargs : dict, optional
@@ -683,9 +815,26 @@ class SwathGridFiles(ChronFiles):
             If True (default), print progress bars.
         parallel: bool, optional
             If True, write data to files in parallel (use all available resources).
+        strategy : str, optional
+            Stacking strategy, "chunked" (default), "buffered" or
+            "external_sort".
+        max_cell_nbytes : int, optional
+            Only used by the "buffered" and "external_sort" strategies. A single
+            cell buffer is written as soon as it exceeds this size (default: no
+            per-cell limit besides `max_nbytes`).
+        tmp_dir : str or Path, optional
+            Only used by the "external_sort" strategy. Directory in which the
+            sorted runs are stored temporarily (default: `out_dir`).
+        prefetch : int, optional
+            Number of swath files decoded ahead by a pool of background threads
+            while the current data is split and written (default: 0, no
+            prefetching).
+        location_index : bool, str, Path or LocationIndex, optional
+            Record the time extent (and, for contiguous ragged arrays, the
+            observation ranges of the locations) of the written cell files in
+            a `LocationIndex` used by `CellGridFiles` reads. True keeps the
+            index in `out_dir / "location_index.npz"` (default: None, no index).
         """
-        from ascat.cell import RaggedArrayTs
-
         fmt_kwargs = fmt_kwargs or {}
         if date_range is not None:
             dt_start, dt_end = date_range
@@ -696,44 +845,517 @@ class SwathGridFiles(ChronFiles):
 
         swath = self.cls(filenames)
 
+        if strategy == "chunked":
+            cell_fnames = self._stack_chunked(swath, out_dir, max_nbytes,
+                                              cells, print_progress, parallel,
+                                              prefetch)
+        elif strategy == "buffered":
+            cell_fnames = self._stack_buffered(swath, out_dir, max_nbytes,
+                                               cells, print_progress, parallel,
+                                               max_cell_nbytes, prefetch)
+        elif strategy == "external_sort":
+            cell_fnames = self._stack_external_sort(
+                swath, out_dir, max_nbytes, cells, print_progress, parallel,
+                max_cell_nbytes, tmp_dir, prefetch)
+        else:
+            raise ValueError(
+                f"Unknown stacking strategy '{strategy}'. Valid strategies are "
+                "'chunked', 'buffered' and 'external_sort'.")
+
+        location_index = LocationIndex.resolve(location_index, out_dir)
+        if location_index is not None:
+            location_index.add(sorted(cell_fnames))
+
+        if print_progress:
+            print("\n")
+
+    def _write_cells(self, out_dir, cell_data, parallel, print_progress):
+        """
+        Append point data to cell files.
+
+        Parameters
+        ----------
+        out_dir : str or Path
+            Output directory.
+        cell_data : dict
+            Cell number as key, xarray.Dataset as value.
+        parallel : bool
+            If True, write data to files in parallel.
+        print_progress : bool
+            If True, print progress bars.
+
+        Returns
+        -------
+        cell_fnames : list of Path
+            Written cell files.
+        """
+        from ascat.cell import RaggedArrayTs
+
+        if len(cell_data) == 0:
+            return []
+
+        cell_fnames = [
+            Path(out_dir) / self.cell_fn_format.format(c) for c in cell_data
+        ]
+        writer_class = RaggedArrayTs(cell_fnames)
+        writer_class.write(
+            list(cell_data.values()),
+            parallel=parallel,
+            postprocessor=self.postprocessor,
+            ra_type="point",
+            mode="a",
+            print_progress=print_progress)
+
+        return cell_fnames
+
+    def _stack_chunked(self, swath, out_dir, max_nbytes, cells, print_progress,
+                       parallel, prefetch=0):
+        """
+        Merge swath files into chunks of `max_nbytes` and append every chunk to
+        the cell files.
+        """
+        cell_fnames = set()
         for ds in swath.iter_read_nbytes(
                 max_nbytes,
                 preprocessor=self.preprocessor,
                 print_progress=print_progress,
+                prefetch=prefetch,
                 chunks=-1):
-            ds_cells = self.grid.gpi2cell(ds["location_id"])
-            if isinstance(ds_cells, np.ma.MaskedArray):
-                ds_cells = ds_cells.compressed()
-            ds_cells = xr.DataArray(ds_cells, dims="obs", name="cell")
+            cell_data = dict(self._iter_cell_slices(ds, cells))
+            cell_fnames.update(
+                self._write_cells(out_dir, cell_data, parallel,
+                                  print_progress))
+
+        return cell_fnames
 
-            # sorting here enables us to manually select each cell's data much faster
-            # than using a .groupby
-            ds = ds.sortby(ds_cells)
+    def _stack_buffered(self, swath, out_dir, max_nbytes, cells, print_progress,
+                        parallel, max_cell_nbytes=None, prefetch=0):
+        """
+        Stream swath files into per-cell buffers and write the largest buffers
+        whenever the memory budget is exceeded.
+        """
+        buffers = CellBuffers(max_nbytes, max_cell_nbytes=max_cell_nbytes)
+        cell_fnames = set()
+
+        for ds in swath.iter_read(print_progress,
+                                  prefetch=prefetch,
+                                  preprocessor=self.preprocessor):
+            ds = ds.load()
+            for c, cell_ds in self._iter_cell_slices(ds, cells):
+                buffers.add(c, cell_ds)
+            ds.close()
+
+            if buffers.full:
+                cell_fnames.update(
+                    self._write_cells(out_dir,
+                                      buffers.pop_largest(swath.merge),
+                                      parallel, print_progress=False))
+
+        cell_fnames.update(
+            self._write_cells(out_dir, buffers.pop_all(swath.merge), parallel,
+                              print_progress))
+
+        return cell_fnames
+
+    def _stack_external_sort(self, swath, out_dir, max_nbytes, cells,
+                             print_progress, parallel, max_cell_nbytes=None,
+                             tmp_dir=None, prefetch=0):
+        """
+        Stream swath files into per-cell buffers, spill the largest buffers as
+        sorted runs to disk and finally merge the runs of each cell into a
+        contiguous ragged array cell file.
+        """
+        from ascat.cell import RaggedArrayTs
 
-            unique_cells, cell_counts = np.unique(ds_cells, return_counts=True)
-            cell_counts = np.hstack([0, np.cumsum(cell_counts)])
+        buffers = CellBuffers(max_nbytes, max_cell_nbytes=max_cell_nbytes)
+        run_files = {}
+
+        tmp_dir = Path(tmp_dir or out_dir)
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+
+        with TemporaryDirectory(prefix=".runs_", dir=tmp_dir) as run_dir:
+            n_runs = 0
+            for ds in swath.iter_read(print_progress,
+                                      prefetch=prefetch,
+                                      preprocessor=self.preprocessor):
+                ds = ds.load()
+                for c, cell_ds in self._iter_cell_slices(ds, cells):
+                    buffers.add(c, cell_ds)
+                ds.close()
+
+                if buffers.full:
+                    for c, cell_ds in buffers.pop_largest(swath.merge).items():
+                        run_file = Path(run_dir) / f"{c}_{n_runs:08d}.nc"
+                        cell_ds.sortby(self._sort_keys).to_netcdf(run_file)
+                        run_files.setdefault(c, []).append(run_file)
+                        n_runs += 1
+
+            # the remaining buffers are merged straight from memory
+            remaining = buffers.pop_all(swath.merge)
+            out_cells = sorted(set(run_files) | set(remaining))
+
+            if parallel:
+                merge_ = dask.delayed(self._merge_sorted_runs)
+            else:
+                merge_ = self._merge_sorted_runs
+
+            # in sequential mode only one merged cell is held in memory at a
+            # time, in parallel mode the cells merged by one graph are bounded
+            # by max_nbytes
+            if parallel:
+                groups = self._cell_groups(out_cells, run_files, remaining,
+                                           max_nbytes)
+            else:
+                groups = [[c] for c in out_cells]
+            if print_progress and not parallel:
+                from tqdm import tqdm
+                groups = tqdm(groups, desc="Merging sorted runs...")
 
-            # for each cell in unique cells, isel the slice from the dataarray corresponding to it
-            ds_list = []
             cell_fnames = []
-            for i, c in enumerate(unique_cells):
-                if (cells is None) or (c in cells):
-                    cell_ds = ds.isel(
-                        obs=slice(cell_counts[i], cell_counts[i + 1]))
-                    if len(cell_ds) == 0:
-                        continue
-                    ds_list.append(cell_ds)
-                    cell_fname = Path(out_dir) / self.cell_fn_format.format(c)
-                    cell_fnames.append(cell_fname)
-
-            writer_class = RaggedArrayTs(cell_fnames)
-            writer_class.write(
-                ds_list,
-                parallel=parallel,
-                postprocessor=self.postprocessor,
-                ra_type="point",
-                mode="a",
-                print_progress=print_progress)
+            for group in groups:
+                data = [
+                    merge_(run_files.get(c, []), remaining.pop(c, None))
+                    for c in group
+                ]
+                group_fnames = [Path(out_dir) / self.cell_fn_format.format(c)
+                                for c in group]
+                cell_fnames.extend(group_fnames)
+                writer_class = RaggedArrayTs(group_fnames)
+                writer_class.write(
+                    data,
+                    parallel=parallel,
+                    postprocessor=self.postprocessor,
+                    ra_type="contiguous",
+                    mode="w",
+                    print_progress=print_progress and parallel)
+
+        return cell_fnames
 
-        if print_progress:
-            print("\n")
+    @staticmethod
+    def _cell_groups(cells, run_files, remaining, max_nbytes):
+        """
+        Split cells into groups merged together, each holding sorted runs and
+        remaining buffers of at most `max_nbytes` (or a single cell).
+
+        Parameters
+        ----------
+        cells : list of int
+            Cells to merge.
+        run_files : dict
+            Sorted run files per cell.
+        remaining : dict
+            Remaining in-memory buffers per cell.
+        max_nbytes : int
+            Size budget of a group.
+
+        Returns
+        -------
+        groups : list of list of int
+            Groups of cells.
+        """
+        groups = []
+        group_nbytes = 0
+        for c in cells:
+            nbytes = sum(f.stat().st_size for f in run_files.get(c, []))
+            if c in remaining:
+                nbytes += remaining[c].nbytes
+            if groups and group_nbytes + nbytes <= max_nbytes:
+                groups[-1].append(c)
+                group_nbytes += nbytes
+            else:
+                groups.append([c])
+                group_nbytes = nbytes
+
+        return groups
+
+    #: variables defining the order of observations within a sorted run
+    _sort_keys = ["location_id", "time"]
+
+    @classmethod
+    def _merge_sorted_runs(cls, run_files, ds=None):
+        """
+        Merge runs sorted by (location_id, time) into one sorted dataset.
+
+        Parameters
+        ----------
+        run_files : list of Path
+            Files containing runs sorted by `_sort_keys`.
+        ds : xarray.Dataset, optional
+            Additional (unsorted) in-memory data to merge.
+
+        Returns
+        -------
+        merged : xarray.Dataset
+            Point dataset sorted by `_sort_keys`.
+        """
+        runs = []
+        for run_file in run_files:
+            with xr.open_dataset(run_file) as run:
+                runs.append(run.load())
+        if ds is not None:
+            runs.append(ds.sortby(cls._sort_keys))
+
+        if len(runs) == 1:
+            return runs[0]
+
+        merged = xr.concat(runs, dim="obs", data_vars="minimal",
+                           coords="minimal", combine_attrs="drop_conflicts")
+
+        # the concatenation consists of presorted runs, which the stable sort
+        # merges without reordering equal keys
+        order = np.lexsort(
+            [merged[k].values for k in reversed(cls._sort_keys)])
+        return merged.isel(obs=order)
+
+
+class CellBuffers:
+    """
+    Bounded in-memory buffers of per-cell datasets.
+
+    Datasets are collected per cell until the size of all buffers exceeds
+    `max_nbytes`. The largest buffers are then handed out for writing until
+    the total size drops below `low_watermark` times `max_nbytes`, so cells
+    receiving few observations stay buffered and are written rarely.
+    """
+
+    def __init__(self, max_nbytes, max_cell_nbytes=None, low_watermark=0.5):
+        """
+        Initialize cell buffers.
+
+        Parameters
+        ----------
+        max_nbytes : int
+            Budget of all buffers together in bytes.
+        max_cell_nbytes : int, optional
+            Budget of a single cell buffer in bytes (default: `max_nbytes`).
+        low_watermark : float, optional
+            Fraction of `max_nbytes` the buffers are reduced to when the budget
+            is exceeded (default: 0.5).
+        """
+        self.max_nbytes = max_nbytes
+        self.max_cell_nbytes = max_cell_nbytes or max_nbytes
+        self.low_watermark = low_watermark
+
+        self._data = {}
+        self._nbytes = {}
+        self.nbytes = 0
+        self.n_flushes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def full(self):
+        """
+        True if the buffers exceed the total or a single cell budget.
+        """
+        return (self.nbytes > self.max_nbytes or
+                any(n > self.max_cell_nbytes for n in self._nbytes.values()))
+
+    def add(self, cell, ds):
+        """
+        Add a dataset to the buffer of a cell.
+
+        Parameters
+        ----------
+        cell : int
+            Cell number.
+        ds : xarray.Dataset
+            Data to buffer (should be loaded into memory).
+        """
+        nbytes = ds.nbytes
+        self._data.setdefault(cell, []).append(ds)
+        self._nbytes[cell] = self._nbytes.get(cell, 0) + nbytes
+        self.nbytes += nbytes
+
+    def _pop(self, cell, merge):
+        data = self._data.pop(cell)
+        self.nbytes -= self._nbytes.pop(cell)
+        self.n_flushes += 1
+        return merge(data)
+
+    def pop_largest(self, merge):
+        """
+        Remove the largest buffers until the budgets are met again.
+
+        Parameters
+        ----------
+        merge : callable
+            Function merging a list of datasets into one.
+
+        Returns
+        -------
+        cell_data : dict
+            Cell number as key, merged dataset as value.
+        """
+        target = self.max_nbytes * self.low_watermark
+        by_size = sorted(self._nbytes, key=self._nbytes.get, reverse=True)
+
+        cell_data = {}
+        for cell in by_size:
+            if (self.nbytes <= target and
+                    self._nbytes[cell] <= self.max_cell_nbytes):
+                continue
+            cell_data[cell] = self._pop(cell, merge)
+
+        return cell_data
+
+    def pop_all(self, merge):
+        """
+        Remove all buffers.
+
+        Parameters
+        ----------
+        merge : callable
+            Function merging a list of datasets into one.
+
+        Returns
+        -------
+        cell_data : dict
+            Cell number as key, merged dataset as value.
+        """
+        return {cell: self._pop(cell, merge) for cell in list(self._data)}
+
+
+class SwathFootprintIndex:
+    """
+    Persistent index of the grid cells touched by each swath file.
+
+    The index is stored as a JSON sidecar file. Entries are keyed by the path
+    of the swath file relative to `root_path` and are recomputed whenever the
+    modification time or size of a file changes, so the index can be updated
+    incrementally as new swath files arrive.
+    """
+
+    def __init__(self, filename, grid, grid_name, root_path):
+        """
+        Initialize footprint index.
+
+        Parameters
+        ----------
+        filename : str or Path
+            Path of the index file. It is created on the first update if it
+            does not exist yet.
+        grid : pygeogrids.CellGrid
+            Grid of the swath files.
+        grid_name : str
+            Name of the grid. An existing index built for another grid is
+            discarded.
+        root_path : str or Path
+            Root path of the swath files.
+        """
+        self.filename = Path(filename)
+        self.grid = grid
+        self.grid_name = grid_name
+        self.root_path = Path(root_path)
+        self._entries = {}
+
+        if self.filename.exists():
+            with open(self.filename) as f:
+                content = json.load(f)
+            if content.get("grid_name") == grid_name:
+                self._entries = content["files"]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _key(self, filename):
+        filename = Path(filename)
+        try:
+            return filename.relative_to(self.root_path).as_posix()
+        except ValueError:
+            return filename.resolve().as_posix()
+
+    @staticmethod
+    def _stamp(filename):
+        stat = os.stat(filename)
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _file_cells(self, filename):
+        """
+        Read the location ids of a swath file and return the cells they belong to.
+        """
+        with xr.open_dataset(filename, engine="h5netcdf") as ds:
+            gpis = np.unique(ds["location_id"].values)
+        if len(gpis) == 0:
+            return []
+        return np.unique(self.grid.gpi2cell(gpis)).tolist()
+
+    def update(self, filenames):
+        """
+        Add new or modified swath files to the index and save it.
+
+        Parameters
+        ----------
+        filenames : list of str or Path
+            Swath files that should be part of the index.
+        """
+        stale = []
+        for filename in filenames:
+            entry = self._entries.get(self._key(filename))
+            stamp = self._stamp(filename)
+            if entry is None or entry["stamp"] != stamp:
+                stale.append((filename, stamp))
+
+        if len(stale) == 0:
+            return
+
+        cells = dask.compute(
+            *[dask.delayed(self._file_cells)(f) for f, _ in stale])
+        for (filename, stamp), file_cells in zip(stale, cells):
+            self._entries[self._key(filename)] = {
+                "stamp": stamp,
+                "cells": file_cells
+            }
+
+        self.save()
+
+    def save(self):
+        """
+        Write the index to disk.
+        """
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        tmp_filename = self.filename.with_name(self.filename.name + ".tmp")
+        with open(tmp_filename, "w") as f:
+            json.dump({"grid_name": self.grid_name, "files": self._entries}, f)
+        os.replace(tmp_filename, self.filename)
+
+    def cells(self, filename):
+        """
+        Cells touched by a swath file (updating the index if necessary).
+
+        Parameters
+        ----------
+        filename : str or Path
+            Swath file.
+
+        Returns
+        -------
+        cells : list of int
+            Cell numbers.
+        """
+        self.update([filename])
+        return self._entries[self._key(filename)]["cells"]
+
+    def filter(self, filenames, cells):
+        """
+        Select the swath files touching any of the given cells.
+
+        Parameters
+        ----------
+        filenames : list of str or Path
+            Candidate swath files.
+        cells : int or list of int
+            Cell numbers.
+
+        Returns
+        -------
+        filenames : list of str or Path
+            Swath files touching any of the cells, in the original order.
+        """
+        self.update(filenames)
+        cells = set(np.atleast_1d(cells).tolist())
+        return [
+            f for f in filenames
+            if not cells.isdisjoint(self._entries[self._key(f)]["cells"])
+        ]
@@ -0,0 +1,210 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
+# SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
+
+"""
+Tests for the temporal swath aggregation on synthetic swath files.
+"""
+
+import shutil
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy.testing as nptest
+
+import ascat.read_native.generate_test_data as gtd
+from ascat.aggregate.aggregators import TemporalSwathAggregator
+from ascat.grids.grid_registry import GridRegistry
+from ascat.product_info import swath_io_catalog
+
+
+class TestTemporalSwathAggregator(unittest.TestCase):
+    """
+    Test single pass aggregation against aggregation per time step.
+    """
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.tempdir_path = Path(self.tempdir.name)
+        gtd.register_synthetic_grid()
+        swath_io_catalog.setdefault("SYNTHETIC", gtd.SyntheticSwathProduct)
+        # six files starting every 100 minutes, none at a 2h border
+        # except for the start of the period
+        gtd.write_synthetic_swath_files(
+            self.tempdir_path,
+            GridRegistry().get(gtd.SyntheticSwathProduct.grid_name), 6,
+            3000)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def _aggregator(self, agg, filepath=None, **kwargs):
+        return TemporalSwathAggregator(
+            filepath or self.tempdir_path, "2021-01-01T00:00:00",
+            "2021-01-01T08:00:00", "2h", agg, product_id="SYNTHETIC",
+            **kwargs)
+
+    def assert_time_steps_equal(self, time_steps, ref_time_steps,
+                                rtol=1e-6):
+        self.assertEqual(len(time_steps), len(ref_time_steps))
+        for ds, ref_ds in zip(time_steps, ref_time_steps):
+            self.assertEqual(ds.attrs["start_time"],
+                             ref_ds.attrs["start_time"])
+            self.assertEqual(ds.attrs["end_time"], ref_ds.attrs["end_time"])
+            self.assertEqual(ds["time"].values, ref_ds["time"].values)
+            nptest.assert_array_equal(ds["location_id"],
+                                      ref_ds["location_id"])
+            nptest.assert_array_equal(ds["longitude"], ref_ds["longitude"])
+            for var in ["surface_soil_moisture", "backscatter40"]:
+                nptest.assert_allclose(ds[var], ref_ds[var], rtol=rtol)
+
+    def test_single_pass(self):
+        """
+        Test that single pass aggregation matches the time step reads.
+        """
+        for agg in ["mean", "max", "std"]:
+            ref_time_steps = list(
+                self._aggregator(agg).get_aggregated_time_steps())
+            self.assertEqual(len(ref_time_steps), 5)
+
+            time_steps = list(self._aggregator(
+                agg).get_aggregated_time_steps_single_pass())
+            self.assert_time_steps_equal(time_steps, ref_time_steps)
+
+    def test_single_pass_flush(self):
+        """
+        Test that time steps are aggregated when the buffer is full.
+        """
+        ref_time_steps = list(self._aggregator(
+            "mean").get_aggregated_time_steps_single_pass())
+
+        aggregator = self._aggregator("mean", single_pass=True, max_nbytes=1)
+        steps = []
+        reads = []
+        original_iter = aggregator._iter_binned_swaths
+
+        def iter_binned_swaths(edges):
+            for item in original_iter(edges):
+                reads.append(len(steps))
+                yield item
+
+        original_reduce = aggregator._reduce_time_steps
+        reduced_files = []
+
+        def reduce_time_steps(chunk, edges, attrs, var_attrs):
+            reduced_files.append(len(attrs))
+            return original_reduce(chunk, edges, attrs, var_attrs)
+
+        aggregator._iter_binned_swaths = iter_binned_swaths
+        aggregator._reduce_time_steps = reduce_time_steps
+        for ds in aggregator.get_aggregated_time_steps_single_pass():
+            steps.append(ds)
+
+        # completed time steps are yielded before all files are read
+        self.assertEqual(len(reads), 6)
+        self.assertGreater(reads[-1], 0)
+        # the buffer is only flushed when a time step was completed (files
+        # at 0, 100, ..., 500 minutes complete 2h steps at files 2 to 5),
+        # with the attributes of the buffered files only
+        self.assertEqual(len(reduced_files), 5)
+        self.assertLessEqual(max(reduced_files), 2)
+        self.assert_time_steps_equal(steps, ref_time_steps)
+
+    def test_write_time_steps(self):
+        """
+        Test writing single pass aggregates.
+        """
+        out_path = self.tempdir_path / "out"
+        out_path.mkdir()
+        paths = self._aggregator("mean",
+                                 single_pass=True).write_time_steps(out_path)
+        self.assertEqual(len(paths), 5)
+        self.assertTrue(all(p.exists() for p in paths))
+        self.assertIn("20210101020000_20210101035959", paths[1].name)
+
+    def test_partial_aggregates(self):
+        """
+        Test incremental updates of the partial aggregates.
+        """
+        nrt_path = self.tempdir_path / "nrt"
+        nrt_path.mkdir()
+        state_path = self.tempdir_path / "state"
+        filenames = sorted(self.tempdir_path.glob("swath_*.nc"))
+
+        shutil.copy(filenames[0], nrt_path)
+        steps = self._aggregator(
+            "mean", nrt_path).update_partial_aggregates(state_path)
+        nptest.assert_array_equal(steps, [0])
+
+        # the same locations again in the first time step, plus new files
+        shutil.copy(filenames[0], nrt_path / "swath_20210101010000.nc")
+        for filename in filenames[1:]:
+            shutil.copy(filename, nrt_path)
+        steps = self._aggregator(
+            "mean", nrt_path, max_nbytes=1).update_partial_aggregates(
+                state_path)
+        nptest.assert_array_equal(steps, [0, 1, 2, 3, 4])
+
+        steps = self._aggregator(
+            "mean", nrt_path).update_partial_aggregates(state_path)
+        self.assertEqual(steps.size, 0)
+
+        for agg in ["mean", "std", "min", "max"]:
+            aggregator = self._aggregator(agg, nrt_path)
+            ref_time_steps = list(
+                aggregator.get_aggregated_time_steps_single_pass())
+            time_steps = list(
+                aggregator.get_aggregated_time_steps_from_partial(state_path))
+            self.assert_time_steps_equal(time_steps, ref_time_steps,
+                                         rtol=1e-5)
+
+    def test_partial_aggregates_write(self):
+        """
+        Test that only the updated time steps are written.
+        """
+        nrt_path = self.tempdir_path / "nrt"
+        nrt_path.mkdir()
+        out_path = self.tempdir_path / "out"
+        out_path.mkdir()
+        state_path = self.tempdir_path / "state"
+        filenames = sorted(self.tempdir_path.glob("swath_*.nc"))
+
+        for filename in filenames[:3]:
+            shutil.copy(filename, nrt_path)
+        paths = self._aggregator("mean", nrt_path).write_time_steps(
+            out_path, state_path)
+        self.assertEqual(len(paths), 2)
+
+        shutil.copy(filenames[3], nrt_path)
+        paths = self._aggregator("mean", nrt_path).write_time_steps(
+            out_path, state_path)
+        self.assertEqual(len(paths), 1)
+        self.assertIn("20210101040000_20210101055959", paths[0].name)
+
+    def test_partial_aggregates_invalid(self):
+        """
+        Test that unsupported aggregations and changed settings are rejected.
+        """
+        state_path = self.tempdir_path / "state"
+        with self.assertRaises(ValueError):
+            self._aggregator("median").update_partial_aggregates(state_path)
+
+        self._aggregator("mean").update_partial_aggregates(state_path)
+        with self.assertRaises(ValueError):
+            self._aggregator(
+                "mean", no_masking=True).update_partial_aggregates(state_path)
+        with self.assertRaises(ValueError):
+            self._aggregator(
+                "mean", sat="a").update_partial_aggregates(state_path)
+
+        # time steps anchored at another start
+        with self.assertRaises(ValueError):
+            TemporalSwathAggregator(
+                self.tempdir_path, "2021-01-01T01:00:00",
+                "2021-01-01T08:00:00", "2h", "mean",
+                product_id="SYNTHETIC").update_partial_aggregates(state_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
+# SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
+
+"""
+Tests for the benchmark suite.
+"""
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ascat.benchmark.benchmark import benchmark_cases
+from ascat.benchmark.benchmark import compare_results
+from ascat.benchmark.benchmark import load_results
+from ascat.benchmark.benchmark import measure
+from ascat.benchmark.benchmark import run_benchmarks
+from ascat.benchmark.benchmark import save_results
+from ascat.benchmark.interface import benchmark_main
+
+
+class TestBenchmark(unittest.TestCase):
+    """
+    Test running and comparing benchmarks.
+    """
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.tempdir_path = Path(self.tempdir.name)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_measure(self):
+        """
+        Test measurement of wall time, peak RSS and bytes read.
+        """
+        filename = self.tempdir_path / "data.bin"
+        filename.write_bytes(b"0" * 2**20)
+
+        measurement = measure(filename.read_bytes)
+        self.assertGreater(measurement.wall_time, 0)
+        self.assertGreater(measurement.peak_rss, 2**20)
+        if measurement.bytes_read is not None:
+            self.assertGreaterEqual(measurement.bytes_read, 2**20)
+
+    def test_all_cases(self):
+        """
+        Test that all cases run on tiny synthetic data.
+        """
+        results = run_benchmarks(self.tempdir_path, scale=0.01, repeat=1)
+        self.assertEqual(list(results["cases"]), list(benchmark_cases))
+        for result in results["cases"].values():
+            self.assertGreater(result["wall_time"], 0)
+            self.assertGreater(result["peak_rss"], 0)
+
+    def test_unknown_case(self):
+        """
+        Test that unknown cases are rejected.
+        """
+        with self.assertRaises(ValueError):
+            run_benchmarks(self.tempdir_path, cases=["unknown"])
+
+    def test_compare(self):
+        """
+        Test comparison against a baseline.
+        """
+        baseline = {"scale": 1., "cases": {
+            "a": {"wall_time": 1., "peak_rss": 100, "bytes_read": 10},
+            "b": {"wall_time": 1., "peak_rss": 100, "bytes_read": None},
+            "c": {"wall_time": 1., "peak_rss": 100, "bytes_read": 10},
+            "d": {"wall_time": 1., "peak_rss": 100, "bytes_read": 10},
+        }}
+        results = {"scale": 1., "cases": {
+            "a": {"wall_time": 1.1, "peak_rss": 110, "bytes_read": 10},
+            "b": {"wall_time": 2., "peak_rss": 100, "bytes_read": 10},
+            "c": {"wall_time": 1., "peak_rss": 200, "bytes_read": 10},
+            "d": {"wall_time": 0.5, "peak_rss": 100, "bytes_read": 5},
+            "e": {"wall_time": 1., "peak_rss": 100, "bytes_read": 10},
+        }}
+
+        comparison = compare_results(results, baseline, tolerance=0.25)
+        self.assertEqual(
+            {name: c["status"] for name, c in comparison.items()},
+            {"a": "ok", "b": "regression", "c": "regression",
+             "d": "improvement", "e": "new"})
+        self.assertAlmostEqual(comparison["a"]["wall_time"], 1.1)
+        self.assertIsNone(comparison["b"]["bytes_read"])
+
+        with self.assertRaises(ValueError):
+            compare_results(dict(results, scale=2.), baseline)
+
+    def test_main(self):
+        """
+        Test saving a baseline and comparing against it.
+        """
+        baseline_file = self.tempdir_path / "baseline.json"
+        args = ["--cases", "contiguous_to_point", "--scale", "0.01",
+                "--repeat", "1"]
+
+        benchmark_main(args + ["--workdir", str(self.tempdir_path / "run1"),
+                               "--save_baseline", str(baseline_file)])
+        baseline = load_results(baseline_file)
+        self.assertEqual(list(baseline["cases"]), ["contiguous_to_point"])
+
+        # a regression of the stored baseline is reported
+        baseline["cases"]["contiguous_to_point"]["peak_rss"] = 1
+        save_results(baseline, baseline_file)
+        n_regressions = benchmark_main(
+            args + ["--workdir", str(self.tempdir_path / "run2"),
+                    "--baseline", str(baseline_file)])
+        self.assertEqual(n_regressions, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
+# SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
+
+"""
+Tests for the BUFR reader on a synthetic multi-message file.
+"""
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import numpy.testing as nptest
+import pandas.testing as pdtest
+
+from ascat.read_native.bufr import read_bufr_data
+from ascat.read_native.bufr import scan_bufr_messages
+from ascat.read_native.generate_test_data import write_bufr_file
+
+
+class TestReadBufrData(unittest.TestCase):
+    """
+    Test sequential and parallel BUFR message decoding.
+    """
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.filename = Path(self.tempdir.name) / "test.bufr"
+        self.n_subsets = [40 + i for i in range(10)]
+        write_bufr_file(self.filename, self.n_subsets)
+        self.key_lookup = {"t1": "#1#airTemperature",
+                           "t2": "#2#airTemperature"}
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_scan(self):
+        """
+        Test scanning message offsets.
+        """
+        offsets, lengths, n_subsets = scan_bufr_messages(self.filename)
+        nptest.assert_array_equal(n_subsets, self.n_subsets)
+        nptest.assert_array_equal(offsets[1:], (offsets + lengths)[:-1])
+        self.assertEqual(offsets[-1] + lengths[-1],
+                         self.filename.stat().st_size)
+
+    def test_read_sequential(self):
+        """
+        Test decoding all messages in the calling process.
+        """
+        data = read_bufr_data(self.filename, self.key_lookup)
+
+        self.assertEqual(len(data), sum(self.n_subsets))
+        self.assertEqual(data["lat"].dtype, np.float32)
+        nptest.assert_allclose(data["t1"][:3], [270., 270.1, 270.2])
+        nptest.assert_allclose(
+            data["t2"], np.repeat(250. + np.arange(10), self.n_subsets))
+        self.assertEqual(data["time"][41],
+                         np.datetime64("2020-01-02T01:01:30"))
+
+    def test_read_processes(self):
+        """
+        Test decoding message batches in a process pool.
+        """
+        ref = read_bufr_data(self.filename, self.key_lookup)
+
+        for batch_size in [None, 1, 3, 20]:
+            data = read_bufr_data(self.filename, self.key_lookup,
+                                  processes=2, batch_size=batch_size)
+            pdtest.assert_frame_equal(data, ref)
+
+
+if __name__ == "__main__":
+    unittest.main()
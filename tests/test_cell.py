@@ -170,6 +170,22 @@ class TestRaggedArrayCellFile(unittest.TestCase):
         # self.assertEqual(ds["lon"].data.chunksize, (5,))
         #
 
+    def test_read_max_workers(self):
+        date_range = (np.datetime64("2020-01-01T00:00:01"),
+                      np.datetime64("2020-01-01T00:00:08"))
+        for array_type in ["contiguous", "indexed"]:
+            filenames = sorted((self.tempdir_path / array_type).glob("*.nc"))
+            for kwargs in [{},
+                           {"date_range": date_range},
+                           {"location_id": [1549346, 1493629],
+                            "date_range": date_range}]:
+                ref = RaggedArrayTs(filenames).read(**kwargs).load()
+                ds = RaggedArrayTs(filenames).read(max_workers=2, **kwargs)
+                xr.testing.assert_identical(ds.load(), ref)
+
+        with self.assertRaises(ValueError):
+            RaggedArrayTs(filenames).read(parallel=True, max_workers=2)
+
     def test__ensure_obs(self):
         contiguous_ragged_path = self.tempdir_path / "contiguous" / "2588.nc"
         ra = RaggedArrayTs(contiguous_ragged_path)
@@ -560,5 +576,15 @@ class TestCellGridFiles(unittest.TestCase):
         ds = collection.read(cell=[first_cell, second_cell])
         assert len(ds.time) >= 1
 
+    def test_read_two_cells_contiguous_max_workers(self):
+        cells = [int(f.stem) for f in self.contiguous_cells_path.glob("*.nc")]
+
+        collection = CellGridFiles.from_product_class(self.contiguous_cells_path, RaggedArrayDummyCellProduct)
+        ref = collection.read(cell=cells).load()
+        collection = CellGridFiles.from_product_class(self.contiguous_cells_path, RaggedArrayDummyCellProduct,
+                                                      max_workers=2)
+        ds = collection.read(cell=cells)
+        xr.testing.assert_identical(ds.load(), ref)
+
 if __name__ == "__main__":
     unittest.main()
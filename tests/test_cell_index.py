@@ -0,0 +1,429 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
+# SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
+
+"""
+Tests for the location index of contiguous ragged array cell files.
+"""
+
+import os
+import unittest
+from pathlib import Path
+from unittest import mock
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import numpy.testing as nptest
+import xarray as xr
+from pygeogrids.grids import CellGrid
+
+import ascat.accessors  # noqa: F401
+import ascat.read_native.generate_test_data as gtd
+from ascat.cell import CellGridFiles
+from ascat.cell import RaggedArrayTs
+from ascat.gridded_ragged_array import GriddedContiguousRaggedArray
+from ascat.cell_index import CellManifest
+from ascat.cell_index import LocationIndex
+from ascat.cell_index import index_cell_file
+from ascat.product_info import RaggedArrayCellProduct
+
+CELLS = {2587: gtd.contiguous_ragged_ds_2587,
+         2588: gtd.contiguous_ragged_ds_2588}
+
+
+def cell_grid():
+    """
+    Grid of the locations in the dummy cell files.
+    """
+    return CellGrid(
+        np.concatenate([ds["lon"].values for ds in CELLS.values()]),
+        np.concatenate([ds["lat"].values for ds in CELLS.values()]),
+        np.concatenate([np.full(ds.sizes["locations"], cell)
+                        for cell, ds in CELLS.items()]),
+        gpis=np.concatenate(
+            [ds["location_id"].values for ds in CELLS.values()]))
+
+
+class DummyCellProduct(RaggedArrayCellProduct):
+    sample_dim = "time"
+    grid_name = "dummy"
+
+
+class TestLocationIndex(unittest.TestCase):
+    """
+    Test reading locations through the index against selecting them
+    from the opened cell file.
+    """
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.tempdir_path = Path(self.tempdir.name)
+        for sat_id, sat_name in [(3, "metop_a"), (4, "metop_b")]:
+            path = self.tempdir_path / "contiguous" / sat_name
+            path.mkdir(parents=True)
+            for cell, ds in CELLS.items():
+                ds = ds.assign(sat_id=("time", np.repeat(sat_id,
+                                                         ds.sizes["time"])))
+                ds.to_netcdf(path / f"{cell}.nc")
+        gtd.indexed_ragged_ds_2588.to_netcdf(self.tempdir_path / "indexed.nc")
+
+        self.filename = self.tempdir_path / "contiguous" / "metop_a" / "2588.nc"
+        self.index_file = self.tempdir_path / "contiguous" / "index.npz"
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_index_cell_file(self):
+        """
+        Test the observation ranges and time extents, skipping padding
+        locations.
+        """
+        time = np.datetime64("2020-01-01", "ns") + np.array(
+            [5, 1, 3, 7, 4], dtype="timedelta64[D]")
+        ds = xr.Dataset({
+            "row_size": ("locations", np.array([3, -1, 2, 0], dtype=np.int32),
+                         {"sample_dimension": "obs"}),
+            "location_id": ("locations", np.array([7, 99, 5, 6])),
+            "time": ("obs", time),
+            "sm": ("obs", np.arange(5, dtype=np.float32)),
+        })
+        filename = self.tempdir_path / "padded.nc"
+        ds.to_netcdf(filename)
+
+        index = index_cell_file(filename)
+        self.assertEqual(index["time_min"], time[1])
+        self.assertEqual(index["time_max"], time[3])
+        locations = index["locations"]
+        nptest.assert_array_equal(locations["location_id"], [5, 6, 7])
+        nptest.assert_array_equal(locations["position"], [2, 3, 0])
+        nptest.assert_array_equal(locations["start"], [3, 5, 0])
+        nptest.assert_array_equal(locations["count"], [2, 0, 3])
+        nptest.assert_array_equal(locations["time_min"],
+                                  [time[4], np.datetime64("NaT"), time[1]])
+        nptest.assert_array_equal(locations["time_max"],
+                                  [time[3], np.datetime64("NaT"), time[0]])
+
+        index = index_cell_file(self.tempdir_path / "indexed.nc")
+        self.assertIsNone(index["locations"])
+        self.assertEqual(index["time_min"],
+                         gtd.indexed_ragged_ds_2588["time"].min())
+
+    def test_read(self):
+        """
+        Test that reading through the index equals selecting instances.
+        """
+        index = LocationIndex(self.index_file)
+        with xr.open_dataset(self.filename, engine="h5netcdf") as ds:
+            for location_id in [1549346, 1556056, [1555912, 1549723, 5],
+                                [1555679]]:
+                ref = ds.cf_geom.sel_instances(np.atleast_1d(location_id))
+                xr.testing.assert_identical(
+                    index.read(self.filename, location_id), ref.load())
+
+        self.assertIsNone(index.read(self.filename, [5, 6]))
+        with self.assertRaises(ValueError):
+            index.read(self.tempdir_path / "indexed.nc", 1549346)
+
+    def test_persist_and_refresh(self):
+        """
+        Test that the index is saved and changed files are re-indexed.
+        """
+        index = LocationIndex(self.index_file)
+        index.add(sorted(self.index_file.parent.glob("**/*.nc")))
+        self.assertTrue(self.index_file.exists())
+
+        loaded = LocationIndex(self.index_file)
+        self.assertEqual(len(loaded.files), 4)
+        entry = loaded.files[os.path.abspath(self.filename)]
+        nptest.assert_array_equal(
+            entry["locations"]["location_id"],
+            np.sort(CELLS[2588]["location_id"].values))
+
+        # rewrite the cell file with fewer observations for a location
+        ds = CELLS[2588].isel(time=slice(1, None))
+        ds["row_size"] = ds["row_size"].copy()
+        ds["row_size"].values[0] = 1
+        ds.to_netcdf(self.filename)
+        os.utime(self.filename, ns=(0, 0))
+
+        loaded = LocationIndex(self.index_file)
+        ts = loaded.read(self.filename, 1549346)
+        nptest.assert_array_equal(ts["time"].values,
+                                  CELLS[2588]["time"].values[1:2])
+        self.assertEqual(
+            LocationIndex(self.index_file).files[os.path.abspath(
+                self.filename)]["mtime_ns"], 0)
+
+    def test_read_date_range(self):
+        """
+        Test reading a date range through the index against trimming the
+        selected locations.
+        """
+        ds = CELLS[2588].copy()
+        # unsorted times for the location with the most observations
+        time = ds["time"].values.copy()
+        time[5:9] = time[5:9][::-1]
+        ds = ds.assign_coords(time=time)
+        ds.to_netcdf(self.filename)
+
+        index = LocationIndex(self.index_file)
+        with xr.open_dataset(self.filename, engine="h5netcdf") as ref_ds:
+            ref_ds = ref_ds.load()
+
+        location_id = ref_ds["location_id"].values
+        for start, end in [(1, 8), (0, 2), (6, 8), (20, 30)]:
+            date_range = (np.datetime64("2020-01-01T00:00:00")
+                          + np.timedelta64(start, "s"),
+                          np.datetime64("2020-01-01T00:00:00")
+                          + np.timedelta64(end, "s"))
+            ref = RaggedArrayTs._trim_var_range(
+                RaggedArrayTs._ensure_obs(
+                    ref_ds.cf_geom.sel_instances(location_id)),
+                "time", *date_range)
+            ts = index.read(self.filename, location_id, date_range=date_range)
+            xr.testing.assert_identical(RaggedArrayTs._ensure_obs(ts), ref)
+
+            ts = index.read(self.filename, 1555912, date_range=date_range)
+            ref = ref.cf_geom.sel_instances([1555912])
+            nptest.assert_array_equal(ts["time"].values, ref["time"].values)
+            nptest.assert_array_equal(ts["sm"].values, ref["sm"].values)
+            self.assertEqual(ts["row_size"], ts.sizes["time"])
+
+    def test_overlaps(self):
+        """
+        Test skipping cell files outside of a date range.
+        """
+        index = LocationIndex(self.index_file)
+        day = np.timedelta64(1, "D")
+        start = np.datetime64("2020-01-01T00:00:00")
+        end = np.datetime64("2020-01-01T00:00:24")
+        self.assertTrue(index.overlaps(self.filename, start, start + day))
+        self.assertTrue(index.overlaps(self.filename, end, end + day))
+        self.assertFalse(index.overlaps(self.filename, end + 1, end + day))
+        self.assertFalse(index.overlaps(self.filename, start - day, start))
+
+        filename = self.tempdir_path / "no_time.nc"
+        CELLS[2588].drop_vars("time").to_netcdf(filename)
+        self.assertTrue(index.overlaps(filename, start - day, start))
+
+    def test_cell_grid_files(self):
+        """
+        Test location reads of cell grid files with and without the index.
+        """
+        kwargs = {
+            "file_class": RaggedArrayTs,
+            "grid": cell_grid(),
+            "fn_format": "{:04d}.nc",
+            "preprocessor": DummyCellProduct.preprocessor,
+        }
+        root_path = self.tempdir_path / "contiguous"
+        date_range = (np.datetime64("2020-01-01T00:00:01"),
+                      np.datetime64("2020-01-01T00:00:08"))
+
+        for criteria in [{"location_id": 1549346},
+                         {"location_id": [1549346, 1555912, 1493629]},
+                         {"coords": (175.8, 70.01)},
+                         {"location_id": [1549346, 1555912],
+                          "date_range": date_range}]:
+            ref = CellGridFiles(root_path, **kwargs).read(**criteria)
+            ds = CellGridFiles(root_path, location_index=self.index_file,
+                               **kwargs).read(**criteria)
+            xr.testing.assert_identical(ds.load(), ref.load())
+            ds = CellGridFiles(root_path, location_index=self.index_file,
+                               max_workers=4, **kwargs).read(**criteria)
+            xr.testing.assert_identical(ds.load(), ref.load())
+
+        self.assertEqual(len(LocationIndex(self.index_file).files), 4)
+
+        # files without observations in the date range are skipped
+        root_path = self.tempdir_path / "shifted"
+        for sat_name in ["metop_a", "metop_b"]:
+            (root_path / sat_name).mkdir(parents=True)
+            for cell, ds in CELLS.items():
+                filename = root_path / sat_name / f"{cell}.nc"
+                if sat_name == "metop_b":
+                    ds = ds.assign_coords(
+                        time=ds["time"] + np.timedelta64(1, "D"))
+                ds.assign(sat_id=("time", np.repeat(
+                    int(sat_name == "metop_b"),
+                    ds.sizes["time"]))).to_netcdf(filename)
+
+        date_range = (np.datetime64("2020-01-02"), np.datetime64("2020-01-03"))
+        files = CellGridFiles(root_path, location_index=True, **kwargs)
+        for criteria in [{"cell": 2588}, {"location_id": [1549346, 1555912]}]:
+            ref = CellGridFiles(root_path, **kwargs).read(
+                date_range=date_range, **criteria)
+            ds = files.read(date_range=date_range, **criteria)
+            self.assertEqual(len(files._active_reader.filenames), 1)
+            nptest.assert_array_equal(ds["sat_id"].values, 1)
+            nptest.assert_array_equal(ds["time"].values, ref["time"].values)
+            nptest.assert_array_equal(ds["sm"].values, ref["sm"].values)
+
+        with self.assertWarns(UserWarning):
+            self.assertIsNone(files.read(
+                location_id=1549346,
+                date_range=(np.datetime64("2021-01-01"),
+                            np.datetime64("2021-01-02"))))
+
+    def test_batch_save(self):
+        """
+        Test that a read indexing several cell files saves the index once
+        and that bbox reads open the cells instead of using the index.
+        """
+        kwargs = {
+            "file_class": RaggedArrayTs,
+            "grid": cell_grid(),
+            "fn_format": "{:04d}.nc",
+            "preprocessor": DummyCellProduct.preprocessor,
+        }
+        root_path = self.tempdir_path / "contiguous"
+        files = CellGridFiles(root_path, location_index=self.index_file,
+                              **kwargs)
+        ref = CellGridFiles(root_path, **kwargs)
+
+        with mock.patch.object(LocationIndex, "save",
+                               autospec=True,
+                               side_effect=LocationIndex.save) as save:
+            ds = files.read(location_id=[1549346, 1493629])
+            xr.testing.assert_identical(
+                ds.load(), ref.read(location_id=[1549346, 1493629]).load())
+            self.assertEqual(save.call_count, 1)
+        self.assertEqual(len(LocationIndex(self.index_file).files), 4)
+
+        bbox = (-90, 90, -180, 180)
+        with mock.patch.object(LocationIndex, "read") as index_read:
+            ds = files.read(bbox=bbox)
+            index_read.assert_not_called()
+        xr.testing.assert_identical(ds.load(), ref.read(bbox=bbox).load())
+
+
+class TestCellManifest(unittest.TestCase):
+    """
+    Test finding cell files through the manifest against searching the
+    root path.
+    """
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.root_path = Path(self.tempdir.name) / "cells"
+        for sat_name in ["metop_a", "metop_b"]:
+            (self.root_path / sat_name).mkdir(parents=True)
+            for cell, ds in CELLS.items():
+                ds.to_netcdf(self.root_path / sat_name / f"{cell}.nc")
+        (self.root_path / "notes.txt").write_text("not a cell file")
+        self.manifest_file = Path(self.tempdir.name) / "manifest.json"
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_lookup(self):
+        """
+        Test the files, schema and lookup of cells.
+        """
+        manifest = CellManifest(self.manifest_file, self.root_path,
+                                listing_ttl=0)
+        self.assertEqual(len(manifest.files), 4)
+        self.assertEqual(manifest.cell_files(2588), [
+            self.root_path / "metop_a" / "2588.nc",
+            self.root_path / "metop_b" / "2588.nc",
+        ])
+        self.assertEqual(manifest.cell_files(1), [])
+        self.assertEqual(
+            manifest.lookup("2588.nc", subfolder="metop_b"),
+            [self.root_path / "metop_b" / "2588.nc"])
+        self.assertEqual(manifest.lookup("2588.nc", subfolder="*"),
+                         manifest.cell_files(2588))
+        self.assertEqual(manifest.lookup("2588.nc", subfolder="."), [])
+
+        schema = manifest.schema(self.root_path / "metop_a" / "2587.nc")
+        self.assertEqual(schema["sm"]["dims"], ["beam", "time"])
+        self.assertEqual(schema["row_size"]["dtype"], "int32")
+        self.assertTrue(self.manifest_file.exists())
+
+    def test_refresh(self):
+        """
+        Test picking up added, removed and rewritten cell files.
+        """
+        manifest = CellManifest(self.manifest_file, self.root_path,
+                                listing_ttl=0)
+        self.assertTrue(manifest.refresh())
+        self.assertFalse(manifest.refresh())
+
+        (self.root_path / "metop_c").mkdir()
+        CELLS[2587].to_netcdf(self.root_path / "metop_c" / "2587.nc")
+        os.remove(self.root_path / "metop_a" / "2587.nc")
+        self.assertEqual(manifest.cell_files(2587), [
+            self.root_path / "metop_b" / "2587.nc",
+            self.root_path / "metop_c" / "2587.nc",
+        ])
+
+        # a file rewritten in place keeps its directory modification time
+        filename = self.root_path / "metop_b" / "2587.nc"
+        with open(filename, "ab") as f:
+            f.write(b"\0" * 10)
+        self.assertFalse(manifest.refresh())
+        self.assertTrue(manifest.refresh(stat_files=True))
+        self.assertEqual(manifest.files[str(filename)]["size"],
+                         os.stat(filename).st_size)
+
+        # loaded from the file
+        loaded = CellManifest(self.manifest_file, self.root_path)
+        loaded._load()
+        self.assertEqual(loaded._files, manifest._files)
+        self.assertFalse(loaded.refresh())
+
+        # a manifest of another file name format is rebuilt
+        other = CellManifest(self.manifest_file, self.root_path,
+                             fn_format="{:04d}.h5")
+        self.assertEqual(other.files, {})
+
+    def test_listing_ttl(self):
+        """
+        Test that directories are only checked again after the listing TTL.
+        """
+        manifest = CellManifest(self.manifest_file, self.root_path,
+                                listing_ttl=3600)
+        self.assertEqual(len(manifest.cell_files(2588)), 2)
+        CELLS[2588].to_netcdf(self.root_path / "2588.nc")
+        self.assertEqual(len(manifest.cell_files(2588)), 2)
+        manifest.refresh()
+        self.assertEqual(len(manifest.cell_files(2588)), 3)
+
+        # by default new files are found on the next lookup
+        manifest = CellManifest(self.manifest_file, self.root_path)
+        self.assertEqual(len(manifest.cell_files(2588)), 3)
+        (self.root_path / "new").mkdir()
+        CELLS[2588].to_netcdf(self.root_path / "new" / "2588.nc")
+        self.assertEqual(len(manifest.cell_files(2588)), 4)
+
+    def test_readers(self):
+        """
+        Test reading cells found through the manifest.
+        """
+        kwargs = {
+            "file_class": RaggedArrayTs,
+            "grid": cell_grid(),
+            "fn_format": "{:04d}.nc",
+            "preprocessor": DummyCellProduct.preprocessor,
+        }
+        files = CellGridFiles(self.root_path, manifest=True, **kwargs)
+        for criteria in [{"cell": 2588}, {"location_id": [1549346, 1493629]}]:
+            ref = CellGridFiles(self.root_path, **kwargs).read(**criteria)
+            xr.testing.assert_identical(files.read(**criteria).load(),
+                                        ref.load())
+        self.assertTrue(
+            (self.root_path / CellManifest.default_filename).exists())
+
+        files = CellGridFiles(self.root_path, manifest=self.manifest_file,
+                              sf_format="metop_b", **kwargs)
+        self.assertEqual(files.spatial_search(cell=2587),
+                         [self.root_path / "metop_b" / "2587.nc"])
+
+        gra = GriddedContiguousRaggedArray(self.root_path, cell_grid(),
+                                           manifest=self.manifest_file)
+        self.assertEqual(gra._cell_filename(2588),
+                         self.root_path / "metop_a" / "2588.nc")
+
+
+if __name__ == "__main__":
+    unittest.main()
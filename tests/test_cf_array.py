@@ -156,6 +156,41 @@ def test_conversions_do_not_mutate_input():
 # --------------------------------------------------------------------------- #
 # ragged <-> point
 # --------------------------------------------------------------------------- #
+def test_contiguous_sel_instances():
+    ds = contiguous()
+    # location_id 1549346: obs 0-1, 1555912: obs 5-8
+    sel = RaggedArray(ds).sel_instances([1555912, 1549346, 1])
+    np.testing.assert_array_equal(sel["location_id"].values,
+                                  [1549346, 1555912])
+    np.testing.assert_array_equal(sel["row_size"].values, [2, 4])
+    np.testing.assert_array_equal(sel["sm"].values,
+                                  ds["sm"].values[:, [0, 1, 5, 6, 7, 8]])
+
+    single = RaggedArray(ds).sel_instances([1555912])
+    assert "locations" not in single.dims
+    np.testing.assert_array_equal(single["sm"].values,
+                                  ds["sm"].values[:, 5:9])
+    assert RaggedArray(ds).sel_instances([1]) is None
+
+    # instances without observations
+    ds = contiguous().isel(time=[0, 1, 3, 4, 5, 6, 7, 8, 9])
+    ds["row_size"].values[1] = 0
+    sel = RaggedArray(ds).sel_instances([1549723, 1555679])
+    np.testing.assert_array_equal(sel["row_size"].values, [0, 2])
+    assert sel.sizes["time"] == 2
+    sel = RaggedArray(ds).sel_instances([1549723, 1549723])
+    assert sel.sizes["locations"] == 1 and sel.sizes["time"] == 0
+
+    # a padding location (negative fill count) between the real ones
+    ds["row_size"].values[1] = np.iinfo(np.int32).min
+    sel = RaggedArray(ds).sel_instances([1555912, 1549346])
+    np.testing.assert_array_equal(sel["sm"].values,
+                                  ds["sm"].values[:, [0, 1, 4, 5, 6, 7]])
+    single = RaggedArray(ds).sel_instances([1555679])
+    np.testing.assert_array_equal(single["sm"].values,
+                                  ds["sm"].values[:, 2:4])
+
+
 def test_ragged_to_point():
     ds = RaggedArray(contiguous()).to_point_array()
     assert ds.attrs["featureType"] == "point"
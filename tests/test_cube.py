@@ -0,0 +1,175 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
+# SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
+
+"""
+Tests for appending regridded and resampled swaths to a time cube.
+"""
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import numpy.testing as nptest
+import xarray as xr
+from pygeogrids.grids import genreg_grid
+
+import ascat.read_native.generate_test_data as gtd
+from ascat.regrid.cube import TimeCube
+from ascat.regrid.regrid import RegridOperator
+from ascat.regrid.regrid import read_regridded_swath
+from ascat.regrid.regrid import regrid_swath_files_to_cube
+from ascat.regrid.regrid import retrieve_or_store_grid_lut
+from ascat.resample.resample import InverseDistanceResampler
+from ascat.resample.resample import read_resampled_swath
+from ascat.resample.resample import resample_swath_files_to_cube
+
+
+class TestTimeCube(unittest.TestCase):
+    """
+    Test the time cube against the regridded swaths.
+    """
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.tempdir_path = Path(self.tempdir.name)
+        self.src_grid = gtd.synthetic_grid(1.)
+        self.filenames = gtd.write_synthetic_swath_files(
+            self.tempdir_path, self.src_grid, 4, 5000)
+        self.trg_grid, grid_lut = retrieve_or_store_grid_lut(
+            self.src_grid, "synthetic_1.0", "reg_grid_2.0deg", 2.)
+        self.operator = RegridOperator.from_lut(grid_lut)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def _cube(self, name, processes=None):
+        cube = TimeCube(self.tempdir_path / name,
+                        {"swath_time": 2, "latitude": 30})
+        n_appended = regrid_swath_files_to_cube(self.filenames, cube,
+                                                self.trg_grid, self.operator,
+                                                processes)
+        self.assertEqual(n_appended, len(self.filenames))
+
+        return cube
+
+    def test_append(self):
+        """
+        Test that the cube holds the decoded regridded swaths.
+        """
+        for name, chunk_key in [("cube.zarr", "chunks"),
+                                ("cube.nc", "chunksizes")]:
+            cube = self._cube(name)
+            with cube.read() as ds:
+                self.assertEqual(ds.sizes["swath_time"], len(self.filenames))
+                self.assertEqual(
+                    ds["surface_soil_moisture"].encoding[chunk_key],
+                    (2, 30, 128))
+                for i, filename in enumerate(self.filenames):
+                    swath_time, regrid_ds = read_regridded_swath(
+                        filename, self.trg_grid, self.operator)
+                    regrid_ds = xr.decode_cf(regrid_ds)
+                    self.assertEqual(ds["swath_time"].values[i], swath_time)
+                    for var in regrid_ds.data_vars:
+                        nptest.assert_array_equal(
+                            ds[var].isel(swath_time=i).values,
+                            regrid_ds[var].values)
+
+    def test_append_duplicate(self):
+        """
+        Test that swaths already in the cube are skipped.
+        """
+        cube = self._cube("cube.zarr")
+        n_appended = regrid_swath_files_to_cube(self.filenames[::-1], cube,
+                                                self.trg_grid, self.operator)
+        self.assertEqual(n_appended, 0)
+
+        # times are read again from an existing cube
+        cube = TimeCube(cube.filename)
+        swath_time, regrid_ds = read_regridded_swath(
+            self.filenames[0], self.trg_grid, self.operator)
+        self.assertFalse(cube.append(regrid_ds, swath_time))
+        self.assertEqual(cube.swath_times.size, len(self.filenames))
+
+    def test_processes(self):
+        """
+        Test regridding in worker processes.
+        """
+        for name in ["cube.zarr", "cube.nc"]:
+            cube = self._cube(name)
+            cube_proc = self._cube("proc_" + name, processes=2)
+            with cube.read() as ds, cube_proc.read() as ds_proc:
+                xr.testing.assert_identical(ds, ds_proc)
+
+    def test_buffer(self):
+        """
+        Test that swaths are written a whole swath_time chunk at a time.
+        """
+        cube = TimeCube(self.tempdir_path / "cube.zarr", {"swath_time": 2})
+        for filename in self.filenames[:3]:
+            swath_time, regrid_ds = read_regridded_swath(
+                filename, self.trg_grid, self.operator)
+            cube.append(regrid_ds, swath_time)
+
+        self.assertEqual(cube.swath_times.size, 3)
+        self.assertEqual(TimeCube(cube.filename).swath_times.size, 2)
+
+        with cube.read() as ds:
+            self.assertEqual(ds.sizes["swath_time"], 3)
+
+    def test_invalid(self):
+        """
+        Test that unknown suffixes and different variables are rejected.
+        """
+        with self.assertRaises(ValueError):
+            TimeCube(self.tempdir_path / "cube.h5")
+
+        cube = TimeCube(self.tempdir_path / "cube.zarr")
+        swath_time, regrid_ds = read_regridded_swath(
+            self.filenames[0], self.trg_grid, self.operator)
+        cube.append(regrid_ds, swath_time)
+        with self.assertRaises(ValueError):
+            cube.append(regrid_ds.drop_vars("surface_soil_moisture"),
+                        swath_time + np.timedelta64(1, "h"))
+
+
+class TestResampleTimeCube(unittest.TestCase):
+    """
+    Test the time cube against the resampled swaths.
+    """
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.tempdir_path = Path(self.tempdir.name)
+        self.filenames = gtd.write_synthetic_swath_files(
+            self.tempdir_path, gtd.synthetic_grid(1.), 3, 5000)
+        self.resampler = InverseDistanceResampler(genreg_grid(2., 2.), 4,
+                                                  200000.)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_append(self):
+        """
+        Test that the cube holds the resampled swaths, also if resampled in
+        worker processes.
+        """
+        for name, workers in [("cube.nc", None), ("proc_cube.nc", 2)]:
+            cube = TimeCube(self.tempdir_path / name, {"swath_time": 2})
+            n_appended = resample_swath_files_to_cube(
+                self.filenames, cube, self.resampler, workers)
+            self.assertEqual(n_appended, len(self.filenames))
+
+            with cube.read(decode_cf=False) as ds:
+                for i, filename in enumerate(self.filenames):
+                    _, resampled_ds = read_resampled_swath(
+                        filename, self.resampler)
+                    for var in resampled_ds.data_vars:
+                        nptest.assert_array_equal(
+                            ds[var].isel(swath_time=i).values,
+                            resampled_ds[var].values)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,13 +6,28 @@
 Test download.
 """
 
+import asyncio
+import importlib.util
+import json
 import os
+import socket
+import threading
+import time
 import unittest
-from tempfile import mkdtemp
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from tempfile import mkdtemp, TemporaryDirectory
 from datetime import datetime, timedelta
 
+from ascat.download.connectors import FtpConnectionPool
 from ascat.download.connectors import HsafConnector
+from ascat.download.connectors import HttpConnector
 from ascat.download.connectors import EumConnector
+from ascat.download.connectors import DownloadProgress
+from ascat.download.connectors import ProductCatalog
+from ascat.download.connectors import async_download
+from ascat.download.connectors import concurrent_download
 
 credentials = {
     'EUM': {
@@ -90,5 +105,576 @@ class TestDownload(unittest.TestCase):
         connector.close()
 
 
+class FileRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serve in-memory files with range requests, optionally dropping the
+    connection in the middle of a response.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            self._send_file()
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _send_file(self):
+        server = self.server
+        if self.path.startswith("/data/search-products/os"):
+            self._send_search()
+            return
+
+        name = urllib.parse.unquote(self.path.split("?")[0].lstrip("/"))
+        server.requests.append((name, self.headers.get("Range"),
+                                self.client_address))
+        data = server.files[name]
+        time.sleep(server.delay)
+
+        start = 0
+        if self.headers.get("Range"):
+            start = int(self.headers["Range"][6:].split("-")[0])
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range",
+                             f"bytes {start}-{len(data) - 1}/{len(data)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(data) - start))
+        self.end_headers()
+
+        if server.drop.get(name):
+            server.drop[name] -= 1
+            self.wfile.write(data[start:start + (len(data) - start) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            self.connection.shutdown(2)
+        else:
+            self.wfile.write(data[start:])
+
+    def _send_search(self):
+        """
+        Page of the products overlapping the requested date range.
+        """
+        server = self.server
+        query = dict(
+            urllib.parse.parse_qsl(urllib.parse.urlsplit(self.path).query))
+        server.searches.append(query)
+
+        start = datetime.fromisoformat(query["dtstart"])
+        end = datetime.fromisoformat(query["dtend"])
+        features = []
+        for feature in server.products:
+            sensing_start, sensing_end = [
+                datetime.fromisoformat(date)
+                for date in feature["properties"]["date"].split("/")
+            ]
+            if sensing_start <= end and sensing_end >= start:
+                features.append(feature)
+
+        si, c = int(query["si"]), int(query["c"])
+        body = json.dumps({
+            "totalResults": len(features),
+            "features": features[si:si + c]
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalServerTestCase(unittest.TestCase):
+    """
+    Test case with files served by a local HTTP server.
+    """
+
+    n_files = 3
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.local_path = Path(self.tempdir.name)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0),
+                                          FileRequestHandler)
+        self.server.files = {
+            f"file_{i}.nc": os.urandom(300000 + i)
+            for i in range(self.n_files)
+        }
+        self.server.drop = {}
+        self.server.requests = []
+        self.server.products = []
+        self.server.searches = []
+        self.server.delay = 0
+        self.server.lock = threading.Lock()
+        self.server.active = 0
+        self.server.max_active = 0
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+        host, port = self.server.server_address
+        self.base_url = f"http://{host}:{port}"
+        self.connector = HttpConnector(self.base_url, backoff_factor=0)
+
+    def tearDown(self):
+        self.connector.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.tempdir.cleanup()
+
+    def assert_files_downloaded(self, names=None):
+        for name in names or self.server.files:
+            self.assertEqual((self.local_path / name).read_bytes(),
+                             self.server.files[name])
+
+
+class TestHttpConnector(LocalServerTestCase):
+    """
+    Test HTTP downloads against a local server.
+    """
+
+    def test_download_file(self):
+        """
+        Test that sequential downloads reuse one connection.
+        """
+        for name, data in self.server.files.items():
+            self.connector.download_file(f"{self.base_url}/{name}",
+                                         self.local_path / name)
+            self.assertEqual((self.local_path / name).read_bytes(), data)
+
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(
+            len({client for _, _, client in self.server.requests}), 1)
+
+    def test_resume(self):
+        """
+        Test that interrupted downloads are resumed with range requests.
+        """
+        name = "file_0.nc"
+        data = self.server.files[name]
+        self.server.drop[name] = 2
+        self.connector.download_file(f"{self.base_url}/{name}",
+                                     self.local_path / name)
+
+        self.assertEqual((self.local_path / name).read_bytes(), data)
+        self.assertFalse((self.local_path / f"{name}.part").exists())
+        ranges = [r for _, r, _ in self.server.requests]
+        self.assertEqual(len(ranges), 3)
+        self.assertIsNone(ranges[0])
+        # resumed from the bytes received before the connection dropped
+        offsets = [int(r[6:-1]) for r in ranges[1:]]
+        self.assertTrue(0 < offsets[0] <= len(data) // 2)
+        self.assertTrue(offsets[0] < offsets[1] < len(data))
+
+    def test_resume_partial_file(self):
+        """
+        Test that a partial file of an earlier run is resumed.
+        """
+        name = "file_1.nc"
+        data = self.server.files[name]
+        (self.local_path / f"{name}.part").write_bytes(data[:1000])
+        self.connector.download_file(f"{self.base_url}/{name}",
+                                     self.local_path / name)
+
+        self.assertEqual((self.local_path / name).read_bytes(), data)
+        self.assertEqual(self.server.requests[0][1], "bytes=1000-")
+
+        # a partial file larger than the remote file is discarded
+        (self.local_path / name).unlink()
+        (self.local_path / f"{name}.part").write_bytes(data + b"0")
+        self.connector.download_file(f"{self.base_url}/{name}",
+                                     self.local_path / name)
+        self.assertEqual((self.local_path / name).read_bytes(), data)
+
+    def test_retry_exhausted(self):
+        """
+        Test that the partial file is kept when all attempts fail.
+        """
+        name = "file_2.nc"
+        self.server.drop[name] = 10
+        with self.assertRaises(RuntimeError):
+            self.connector.download_file(f"{self.base_url}/{name}",
+                                         self.local_path / name, n_retry=2)
+
+        self.assertFalse((self.local_path / name).exists())
+        self.assertTrue((self.local_path / f"{name}.part").exists())
+
+    def test_concurrent_download(self):
+        """
+        Test downloads in threads sharing the session.
+        """
+        names = list(self.server.files)
+        self.server.drop[names[0]] = 1
+        concurrent_download(self.connector.download_file,
+                            [f"{self.base_url}/{name}" for name in names],
+                            [self.local_path / name for name in names],
+                            max_workers=3)
+
+        for name in names:
+            self.assertEqual((self.local_path / name).read_bytes(),
+                             self.server.files[name])
+
+
+@unittest.skipIf(importlib.util.find_spec("aiohttp") is None,
+                 "aiohttp not installed")
+class TestAsyncDownload(LocalServerTestCase):
+    """
+    Test asyncio downloads against a local server.
+    """
+
+    n_files = 8
+
+    def _download(self, names=None, **kwargs):
+        names = names or list(self.server.files)
+        async_download([f"{self.base_url}/{name}" for name in names],
+                       [self.local_path / name for name in names],
+                       backoff_factor=0,
+                       **kwargs)
+
+    def test_async_download(self):
+        """
+        Test that the progress counts the bytes of all files once, also
+        for resumed downloads.
+        """
+        names = list(self.server.files)
+        self.server.drop[names[0]] = 2
+        progress = DownloadProgress(len(names), disable=True)
+        self._download(progress=progress)
+
+        self.assert_files_downloaded()
+        nbytes = sum(len(data) for data in self.server.files.values())
+        self.assertEqual(progress.nbytes, nbytes)
+        self.assertEqual(progress.pbar.total, nbytes)
+        self.assertEqual(progress.n_done, len(names))
+        self.assertEqual(progress.n_failed, 0)
+        ranges = [r for name, r, _ in self.server.requests
+                  if name == names[0]]
+        self.assertEqual(len(ranges), 3)
+        self.assertIsNotNone(ranges[-1])
+
+    def test_limits(self):
+        """
+        Test the global and the per host limit of concurrent downloads.
+        """
+        self.server.delay = 0.1
+        self._download(max_workers=4)
+        self.assert_files_downloaded()
+        self.assertEqual(self.server.max_active, 4)
+
+        for name in self.server.files:
+            (self.local_path / name).unlink()
+        self.server.max_active = 0
+        self._download(max_workers=4, max_per_host=2)
+        self.assert_files_downloaded()
+        self.assertEqual(self.server.max_active, 2)
+
+    def test_running_loop(self):
+        """
+        Test downloading from within a running event loop.
+        """
+        async def download():
+            self._download(max_workers=4)
+
+        asyncio.run(download())
+        self.assert_files_downloaded()
+
+    def test_failed(self):
+        """
+        Test that failed downloads are reported after the others finished.
+        """
+        names = list(self.server.files)
+        self.server.drop[names[1]] = 10
+        with self.assertRaises(RuntimeError):
+            self._download(n_retry=2)
+
+        self.assert_files_downloaded(names[:1] + names[2:])
+        self.assertFalse((self.local_path / names[1]).exists())
+
+    def test_download_files(self):
+        """
+        Test both download engines of the connector.
+        """
+        names = list(self.server.files)
+        urls = [f"{self.base_url}/{name}" for name in names]
+        for engine in ["asyncio", "thread"]:
+            self.connector.download_files(
+                urls, [self.local_path / f"{engine}_{name}" for name in names],
+                max_workers=3,
+                engine=engine)
+            for name in names:
+                self.assertEqual(
+                    (self.local_path / f"{engine}_{name}").read_bytes(),
+                    self.server.files[name])
+
+        with self.assertRaises(ValueError):
+            self.connector.download_files(urls, names, engine="process")
+
+
+class TestEumConnectorSearch(LocalServerTestCase):
+    """
+    Test the search pagination and the product catalog against a local
+    server.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.collection = "EO:EUM:DAT:METOP:SOMO12"
+        # one product every 100 minutes in January 2021
+        self.product_ids = []
+        for i in range(400):
+            sensing_start = datetime(2021, 1, 1) + timedelta(minutes=100 * i)
+            sensing_end = sensing_start + timedelta(minutes=99)
+            product_id = f"product_{sensing_start:%Y%m%d%H%M%S}"
+            self.product_ids.append(product_id)
+            self.server.products.append({
+                "properties": {
+                    "identifier": product_id,
+                    "parentIdentifier": self.collection,
+                    "date": f"{sensing_start:%Y-%m-%dT%H:%M:%S}.000Z/"
+                            f"{sensing_end:%Y-%m-%dT%H:%M:%S}.000Z"
+                }
+            })
+        self.connector = EumConnector(self.base_url, page_size=30,
+                                      backoff_factor=0)
+
+    def _reference(self, start_date, end_date):
+        """
+        Products sensed between start and end date.
+        """
+        return [
+            product_id for i, product_id in enumerate(self.product_ids)
+            if start_date - timedelta(minutes=99) <= datetime(2021, 1, 1) +
+            timedelta(minutes=100 * i) <= end_date
+        ]
+
+    def _search(self, start_date, end_date, catalog=None):
+        found_products = self.connector.search(self.collection, start_date,
+                                               end_date, catalog=catalog)
+        return [found_product["id"] for found_product in found_products]
+
+    def test_search(self):
+        """
+        Test that all pages are requested.
+        """
+        product_ids = self._search(datetime(2021, 1, 2), datetime(2021, 1, 20))
+        ref_ids = self._reference(datetime(2021, 1, 2), datetime(2021, 1, 20))
+        self.assertEqual(product_ids, ref_ids)
+        self.assertEqual(len(self.server.searches),
+                         -(-len(ref_ids) // 30))
+
+    def test_catalog(self):
+        """
+        Test that repeated searches only request the missing date ranges.
+        """
+        catalog_file = self.local_path / "catalog.json"
+        product_ids = self._search(datetime(2021, 1, 2), datetime(2021, 1, 10),
+                                   ProductCatalog(catalog_file))
+        self.assertEqual(
+            product_ids,
+            self._reference(datetime(2021, 1, 2), datetime(2021, 1, 10)))
+
+        # a contained date range needs no request
+        n_searches = len(self.server.searches)
+        product_ids = self._search(datetime(2021, 1, 3), datetime(2021, 1, 4),
+                                   ProductCatalog(catalog_file))
+        self.assertEqual(len(self.server.searches), n_searches)
+        self.assertEqual(
+            product_ids,
+            self._reference(datetime(2021, 1, 3), datetime(2021, 1, 4)))
+
+        # an overlapping date range only requests the missing parts
+        product_ids = self._search(datetime(2021, 1, 1), datetime(2021, 1, 15),
+                                   ProductCatalog(catalog_file))
+        searched = {(query["dtstart"], query["dtend"])
+                    for query in self.server.searches[n_searches:]}
+        self.assertEqual(searched, {
+            ("2021-01-01T00:00:00.000000Z", "2021-01-02T00:00:00.000000Z"),
+            ("2021-01-10T00:00:00.000000Z", "2021-01-15T00:00:00.000000Z")
+        })
+        self.assertEqual(
+            product_ids,
+            self._reference(datetime(2021, 1, 1), datetime(2021, 1, 15)))
+
+    def test_catalog_publication_delay(self):
+        """
+        Test that recent date ranges are searched again.
+        """
+        catalog = ProductCatalog(self.local_path / "catalog.json")
+        now = datetime.now()
+        catalog.add(self.collection, None, now - timedelta(days=3), now, [])
+        self.assertEqual(
+            len(catalog.missing_intervals(self.collection, None,
+                                          now - timedelta(days=3), now)), 1)
+        self.assertEqual(
+            catalog.missing_intervals(self.collection, None,
+                                      now - timedelta(days=3),
+                                      now - timedelta(days=2)), [])
+
+    def test_download(self):
+        """
+        Test downloading the products found.
+        """
+        for product_id in self.product_ids[:50]:
+            self.server.files[f"data/download/collections/{self.collection}/"
+                              f"products/{product_id}"] = os.urandom(1000)
+
+        self.connector.download(self.collection, self.local_path,
+                                datetime(2021, 1, 1), datetime(2021, 1, 10),
+                                max_workers=4, limit=50, engine="thread",
+                                catalog=self.local_path / "catalog.json")
+
+        for product_id in self.product_ids[:50]:
+            self.assertEqual(
+                (self.local_path / product_id).read_bytes(),
+                self.server.files[f"data/download/collections/"
+                                  f"{self.collection}/products/{product_id}"])
+        self.assertFalse((self.local_path / self.product_ids[50]).exists())
+
+
+@unittest.skipIf(importlib.util.find_spec("pyftpdlib") is None,
+                 "pyftpdlib not installed")
+class TestHsafConnector(unittest.TestCase):
+    """
+    Test pooled FTP downloads against a local FTP server.
+    """
+
+    def setUp(self):
+        from pyftpdlib.authorizers import DummyAuthorizer
+        from pyftpdlib.handlers import FTPHandler
+        from pyftpdlib.servers import FTPServer
+
+        self.tempdir = TemporaryDirectory()
+        self.local_path = Path(self.tempdir.name) / "local"
+        self.local_path.mkdir()
+        remote_path = Path(self.tempdir.name) / "remote" / "products" / "h08"
+        remote_path.mkdir(parents=True)
+
+        self.files = {}
+        for day in range(1, 5):
+            for hour in range(3):
+                name = f"h08_202101{day:02d}_{hour:02d}0000_metopc.nc"
+                self.files[name] = os.urandom(200000 + day)
+                (remote_path / name).write_bytes(self.files[name])
+
+        commands = self.commands = []
+        connections = self.connections = [0, 0]
+
+        class Handler(FTPHandler):
+
+            def on_connect(self):
+                connections[0] += 1
+                connections[1] = max(connections[1], connections[0])
+
+            def on_disconnect(self):
+                connections[0] -= 1
+
+            def pre_process_command(self, line, cmd, arg):
+                commands.append(cmd)
+                super().pre_process_command(line, cmd, arg)
+
+        authorizer = DummyAuthorizer()
+        authorizer.add_user("user", "password",
+                            str(Path(self.tempdir.name) / "remote"),
+                            perm="elr")
+        Handler.authorizer = authorizer
+
+        self.server = FTPServer(("127.0.0.1", 0), Handler)
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._serve)
+        self.thread.start()
+
+        host, port = self.server.address
+        self.credentials = {"user": "user", "password": "password"}
+        self.connector = HsafConnector(f"{host}:{port}", n_connections=3,
+                                       backoff_factor=0)
+        self.connector.connect(self.credentials)
+
+    def _serve(self):
+        while not self.stop.is_set():
+            self.server.serve_forever(timeout=0.01, blocking=False)
+        self.server.close_all()
+
+    def tearDown(self):
+        self.connector.close()
+        self.stop.set()
+        self.thread.join()
+        self.tempdir.cleanup()
+
+    def test_download(self):
+        """
+        Test parallel downloads sharing the pooled connections.
+        """
+        self.connector.download("/products/h08", self.local_path,
+                                datetime(2021, 1, 2), datetime(2021, 1, 3))
+
+        names = sorted(self.local_path.iterdir())
+        self.assertEqual(len(names), 6)
+        for name in names:
+            self.assertEqual(name.read_bytes(), self.files[name.name])
+
+        # connections are only opened up to the pool size and reused
+        self.assertLessEqual(self.connections[1], 3)
+        self.assertEqual(self.commands.count("PASS"), self.connections[1])
+        # the listing is requested once and reused for every file
+        self.assertEqual(self.commands.count("NLST"), 1)
+
+    def test_listing_cache(self):
+        """
+        Test that listings are cached until they expire.
+        """
+        for _ in range(2):
+            list(self.connector.files("/products/h08", datetime(2021, 1, 1),
+                                      datetime(2021, 1, 4)))
+        self.assertEqual(self.commands.count("NLST"), 1)
+
+        self.connector.listing_ttl = 0
+        list(self.connector.files("/products/h08", datetime(2021, 1, 1),
+                                  datetime(2021, 1, 4)))
+        self.assertEqual(self.commands.count("NLST"), 2)
+
+    def test_reconnect(self):
+        """
+        Test that a connection closed while idle is replaced.
+        """
+        pool = FtpConnectionPool(self.connector.base_url, "user", "password",
+                                 keepalive=0)
+        with pool.connection() as ftp:
+            ftp.sock.shutdown(socket.SHUT_RDWR)
+
+        with pool.connection() as ftp:
+            self.assertEqual(ftp.nlst("/products/h08"), ftp.nlst(
+                "/products/h08"))
+        self.assertEqual(self.commands.count("PASS"), 3)
+        pool.close()
+
+    def test_resume(self):
+        """
+        Test that a partial file is resumed.
+        """
+        name = "h08_20210101_000000_metopc.nc"
+        (self.local_path / f"{name}.part").write_bytes(self.files[name][:1000])
+        self.connector.download_file(f"/products/h08/{name}",
+                                     self.local_path / name)
+
+        self.assertEqual((self.local_path / name).read_bytes(),
+                         self.files[name])
+        self.assertFalse((self.local_path / f"{name}.part").exists())
+        self.assertIn("REST", self.commands)
+
+
 if __name__ == '__main__':
     unittest.main()
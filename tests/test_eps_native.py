@@ -0,0 +1,223 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
+# SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
+
+"""
+Tests for the EPS Native reader on a synthetic SZF file.
+"""
+
+import shutil
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import numpy.testing as nptest
+
+from ascat.read_native.eps_native import EPSProduct
+from ascat.read_native.eps_native import EPSTemplateRegistry
+from ascat.read_native.eps_native import eps_format_path
+from ascat.read_native.eps_native import eps_templates
+from ascat.read_native.eps_native import ScaledRecords
+from ascat.read_native.eps_native import read_eps
+from ascat.read_native.eps_native import read_eps_l1b
+from ascat.read_native.eps_native import set_flags
+from ascat.read_native.generate_test_data import szf_mphr as MPHR
+from ascat.read_native.generate_test_data import write_szf_file
+
+class TestEPSProductMmap(unittest.TestCase):
+    """
+    Tests for memory-mapped reading of EPS products.
+    """
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.filename = Path(self.tempdir.name) / "ASCA_SZF_1B_M01.nat"
+        write_szf_file(self.filename)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_mdr_view(self):
+        """
+        Test that the memory-mapped MDR matches the copied MDR.
+        """
+        for full in [False, True]:
+            eager = read_eps(str(self.filename), full=full)
+            lazy = read_eps(str(self.filename), full=full, mmap=True)
+
+            self.assertEqual(lazy.mdr_counter, 12)
+            self.assertFalse(lazy.mdr.flags.writeable)
+            self.assertIsInstance(lazy.mdr.base, np.memmap)
+            self.assertEqual(lazy.mdr.tobytes(), eager.mdr.tobytes())
+
+            self.assertIsInstance(lazy.scaled_mdr, ScaledRecords)
+            self.assertEqual(lazy.scaled_mdr.shape, eager.scaled_mdr.shape)
+            for name in ["LONGITUDE_FULL", "SIGMA0_FULL", "BEAM_NUMBER",
+                         "UTC_LOCALISATION"]:
+                self.assertEqual(lazy.scaled_mdr[name].dtype,
+                                 eager.scaled_mdr[name].dtype)
+                nptest.assert_array_equal(lazy.scaled_mdr[name],
+                                          eager.scaled_mdr[name])
+            nptest.assert_array_equal(lazy.scaled_mdr[2:5],
+                                      eager.scaled_mdr[2:5])
+
+    def test_lazy_scaling(self):
+        """
+        Test that fields are only scaled on access.
+        """
+        lazy = read_eps(str(self.filename), mmap=True)
+        self.assertEqual(lazy.scaled_mdr._fields, {})
+        lon = lazy.scaled_mdr["LONGITUDE_FULL"]
+        self.assertEqual(list(lazy.scaled_mdr._fields), ["LONGITUDE_FULL"])
+        self.assertIs(lazy.scaled_mdr["LONGITUDE_FULL"], lon)
+
+    def test_read_eps_l1b(self):
+        """
+        Test that the SZF data are the same with and without mmap.
+        """
+        eager, _ = read_eps_l1b(str(self.filename), generic=True)
+        lazy, _ = read_eps_l1b(str(self.filename), generic=True, mmap=True)
+
+        for beam in eager:
+            self.assertGreater(eager[beam].size, 0)
+            for name in eager[beam].dtype.names:
+                nptest.assert_array_equal(lazy[beam][name],
+                                          eager[beam][name])
+
+
+class TestEPSTemplateRegistry(unittest.TestCase):
+    """
+    Tests for the EPS format template registry.
+    """
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.grh_dtype = EPSProduct(__file__).grh_dtype
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_get(self):
+        """
+        Test that templates are compiled once per format version.
+        """
+        registry = EPSTemplateRegistry()
+        templates = registry.get(MPHR, self.grh_dtype)
+        self.assertIs(registry.get(dict(MPHR), self.grh_dtype), templates)
+        self.assertTrue(templates.xml_file.endswith("eps_ascatl1bszf_13.1.xml"))
+
+        mdr_template, scaled_template, sfactor = templates.mdr
+        self.assertIs(templates.mdr[0], mdr_template)
+        self.assertEqual(mdr_template.names[0], "grh")
+        self.assertEqual(scaled_template["LONGITUDE_FULL"].base, np.float32)
+        self.assertEqual(sfactor["LONGITUDE_FULL"], 10**6)
+
+        other = registry.get(dict(MPHR, FORMAT_MAJOR_VERSION="12",
+                                  FORMAT_MINOR_VERSION="0"), self.grh_dtype)
+        self.assertIsNot(other, templates)
+
+        with self.assertRaises(RuntimeError):
+            registry.get(dict(MPHR, FORMAT_MAJOR_VERSION="99"),
+                         self.grh_dtype)
+
+    def test_save_load(self):
+        """
+        Test that compiled templates are restored without parsing the xml.
+        """
+        registry = EPSTemplateRegistry()
+        expected = registry.get(MPHR, self.grh_dtype).mdr
+
+        cache_file = Path(self.tempdir.name) / "templates.pkl"
+        registry.save(cache_file)
+
+        registry = EPSTemplateRegistry()
+        registry.load(cache_file)
+        templates = registry.get(MPHR, self.grh_dtype)
+        self.assertEqual(templates.mdr[0], expected[0])
+        self.assertEqual(templates.mdr[2], expected[2])
+        self.assertIsNone(templates._xml_doc)
+
+        # templates built after loading use the xml of the loading registry
+        format_path = Path(self.tempdir.name) / "formats"
+        shutil.copytree(eps_format_path, format_path)
+        registry = EPSTemplateRegistry(str(format_path))
+        registry.load(cache_file)
+        templates = registry.get(MPHR, self.grh_dtype)
+        self.assertEqual(Path(templates.xml_file).parent, format_path)
+        self.assertEqual(templates.viadr(8)[0].names[0], "UTC_LINE_NODES")
+
+    def test_shared_by_products(self):
+        """
+        Test that products of the same format share their templates.
+        """
+        filename = Path(self.tempdir.name) / "ASCA_SZF_1B_M01.nat"
+        write_szf_file(filename)
+        prod1 = read_eps(str(filename))
+        prod2 = read_eps(str(filename))
+        self.assertIs(prod1.templates, prod2.templates)
+        self.assertIs(prod1.templates, eps_templates.get(MPHR, self.grh_dtype))
+        self.assertIs(prod1.mdr_template, prod2.mdr_template)
+        self.assertIs(prod1.xml_doc, prod1.templates.xml_doc)
+        self.assertIs(prod1._read_xml_mdr(), prod1.templates.mdr)
+        self.assertIs(prod1._read_xml_viadr(8), prod1.templates.viadr(8))
+
+
+class TestSetFlags(unittest.TestCase):
+    """
+    Test the look-up table based summary flag for FMV 11/12.
+    """
+
+    flagfields = ["flagfield_rf1", "flagfield_rf2", "flagfield_pl",
+                  "flagfield_gen1", "flagfield_gen2"]
+
+    @staticmethod
+    def reference_flags(data, bitmasks):
+        """
+        Bit-by-bit evaluation of the summary flag.
+        """
+        f_usable = np.zeros(data["flagfield_rf1"].size, dtype=np.uint8)
+        for flagfield, bitmask in bitmasks.items():
+            for bit, category in enumerate(bitmask):
+                is_set = (data[flagfield] >> bit) & 1 == 1
+                f_usable[is_set] = np.maximum(f_usable[is_set], category)
+        return f_usable
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.data = {name: rng.integers(0, 256, 10000, dtype=np.uint8)
+                     for name in self.flagfields}
+        # make sure some measurements are nominal
+        for name in self.flagfields:
+            self.data[name][:100] = 0
+
+        self.bitmasks = {
+            "flagfield_rf1": [1, 1, 2, 1, 2, 0, 0, 0],
+            "flagfield_rf2": [2, 2, 0, 0, 0, 0, 0, 0],
+            "flagfield_pl": [2, 2, 2, 2, 0, 0, 0, 0],
+            "flagfield_gen1": [0, 2, 0, 0, 0, 0, 0, 0],
+            "flagfield_gen2": [1, 0, 2, 0, 0, 0, 0, 0]
+        }
+
+    def test_set_flags(self):
+        """
+        Test summary flag against bit-by-bit evaluation.
+        """
+        f_usable = set_flags(self.data)
+        self.assertEqual(f_usable.dtype, np.uint8)
+        nptest.assert_array_equal(
+            f_usable, self.reference_flags(self.data, self.bitmasks))
+        nptest.assert_array_equal(f_usable[:100], 0)
+
+    def test_set_flags_ignore_noise_ool(self):
+        """
+        Test summary flag ignoring noise out of limits.
+        """
+        self.bitmasks["flagfield_rf2"] = [2, 0, 0, 0, 0, 0, 0, 0]
+        f_usable = set_flags(self.data, ignore_noise_ool=True)
+        nptest.assert_array_equal(
+            f_usable, self.reference_flags(self.data, self.bitmasks))
+
+
+if __name__ == "__main__":
+    unittest.main()
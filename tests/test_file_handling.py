@@ -18,6 +18,7 @@ import numpy as np
 from ascat.file_handling import FilenameTemplate
 from ascat.file_handling import FileSearch
 from ascat.file_handling import ChronFiles
+from ascat.file_handling import FileDateIndex
 from ascat.file_handling import CsvFile
 from ascat.file_handling import CsvFiles
 
@@ -474,6 +475,31 @@ class TestChronFiles(CustomTestCase):
         self.assertTrue(filenames)
         self.assertEqual(filenames, expected_filenames)
 
+    def test_search_period_date_index(self):
+        """
+        Test search period with a date index.
+        """
+        chron_files = ChronFiles(self.tmpdir, CsvFile, "{date}_ascat.csv",
+                                 self.chron_files.ft.sf_templ,
+                                 fn_read_fmt=self.chron_files.fn_read_fmt,
+                                 sf_read_fmt=self.chron_files.sf_read_fmt,
+                                 date_index=True)
+        dt_start = datetime(2022, 1, 1)
+        dt_end = datetime(2022, 1, 3)
+        for end_inclusive in [True, False]:
+            filenames = chron_files.search_period(
+                dt_start, dt_end, dt_delta=timedelta(days=1),
+                end_inclusive=end_inclusive)
+            expected_filenames = self.chron_files.search_period(
+                dt_start, dt_end, dt_delta=timedelta(days=1),
+                end_inclusive=end_inclusive)
+            self.assertTrue(filenames)
+            self.assertEqual(filenames, expected_filenames)
+
+        self.assertEqual(
+            chron_files.search_period(dt_end, dt_start, end_inclusive=False),
+            [])
+
     def test_read_period(self):
         """
         Test read period.
@@ -487,6 +513,96 @@ class TestChronFiles(CustomTestCase):
         self.assertTrue(data["date"].max() <= dt_end)
 
 
+class TestFileDateIndex(unittest.TestCase):
+    """
+    Tests for FileDateIndex class.
+    """
+
+    def setUp(self):
+        """
+        Setup test.
+        """
+        self.tmpdir = Path(tempfile.mkdtemp())
+        for date in ["20220101", "20220102", "20220201"]:
+            self._touch(date)
+        self.pattern = str(self.tmpdir / "*" / "*_ascat.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _touch(self, date):
+        folder = self.tmpdir / date[:6]
+        folder.mkdir(exist_ok=True)
+        (folder / f"{date}_ascat.csv").touch()
+
+    @staticmethod
+    def _parse_date(filename, date_field_fmt):
+        return datetime.strptime(Path(filename).name[:8], date_field_fmt)
+
+    def _search(self, index, dt_start, dt_end):
+        return [
+            Path(f).name for f in index.search(self.tmpdir, self.pattern,
+                                               self._parse_date, dt_start,
+                                               dt_end, "%Y%m%d")
+        ]
+
+    def test_search(self):
+        """
+        Test binary search of the sorted listing.
+        """
+        index = FileDateIndex()
+        self.assertEqual(
+            self._search(index, datetime(2022, 1, 2), datetime(2022, 2, 1)),
+            ["20220102_ascat.csv"])
+        self.assertEqual(
+            self._search(index, datetime(2021, 1, 1), datetime(2023, 1, 1)),
+            ["20220101_ascat.csv", "20220102_ascat.csv", "20220201_ascat.csv"])
+
+    def test_invalidation(self):
+        """
+        Test that new files and folders are picked up.
+        """
+        index = FileDateIndex()
+        dt_start, dt_end = datetime(2022, 1, 1), datetime(2022, 4, 1)
+        self.assertEqual(len(self._search(index, dt_start, dt_end)), 3)
+
+        self._touch("20220103")
+        self.assertEqual(len(self._search(index, dt_start, dt_end)), 4)
+
+        self._touch("20220301")
+        self.assertEqual(self._search(index, dt_start, dt_end)[-1],
+                         "20220301_ascat.csv")
+
+        # files added to a folder that was empty when the index was built
+        empty = self.tmpdir / "202204"
+        empty.mkdir()
+        dt_end = datetime(2022, 5, 1)
+        self.assertEqual(len(self._search(index, dt_start, dt_end)), 5)
+        (empty / "20220402_ascat.csv").touch()
+        self.assertEqual(self._search(index, dt_start, dt_end)[-1],
+                         "20220402_ascat.csv")
+
+    def test_persistence(self):
+        """
+        Test that the index is stored on disk.
+        """
+        index_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, index_dir)
+        index_file = index_dir / "index.json"
+        index = FileDateIndex(index_file)
+        expected = self._search(index, datetime(2022, 1, 1),
+                                datetime(2022, 3, 1))
+        self.assertTrue(index_file.exists())
+
+        index = FileDateIndex(index_file)
+        self.assertEqual(len(index._listings), 1)
+        listing, = index._listings.values()
+        self.assertTrue(index._is_current(listing["stamps"]))
+        self.assertEqual(
+            self._search(index, datetime(2022, 1, 1), datetime(2022, 3, 1)),
+            expected)
+
+
 class TestCsvFiles(unittest.TestCase):
     """
     Tests for CsvFiles class.
@@ -2,6 +2,8 @@
 # SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
 # SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
 
+from unittest import mock
+
 import numpy as np
 import pytest
 import xarray as xr
@@ -127,6 +129,40 @@ def test_contiguous_fn_format_and_trim(tmp_path):
     np.testing.assert_array_equal(gra.read(gpi=11)["sm"].values, [2., 3., 4.])
 
 
+def test_contiguous_location_index(tmp_path):
+    # padding location between real ones, skipped by the index as by trim
+    ds = _contiguous_cell_ds([10, np.iinfo(np.int64).min, 11],
+                             [2, np.iinfo(np.int64).min, 3])
+    ds.to_netcdf(tmp_path / "0000.nc")
+    _contiguous_cell_ds([20, 21], [1, 2]).to_netcdf(tmp_path / "0005.nc")
+
+    gra = GriddedContiguousRaggedArray(tmp_path, _grid())
+    gra_idx = GriddedContiguousRaggedArray(tmp_path, _grid(),
+                                           location_index=True)
+    for gpi in [10, 11, 20, 21]:
+        xr.testing.assert_identical(gra_idx.read(gpi=gpi), gra.read(gpi=gpi))
+    assert gra_idx.read(gpi=12) is None
+    assert gra_idx.cache_info().misses == 0  # no cell was opened
+    assert (tmp_path / "location_index.npz").exists()
+
+    many = gra_idx.read(gpi=[21, 12, 10])
+    assert list(many) == [21, 12, 10] and many[12] is None
+    np.testing.assert_array_equal(many[21]["sm"].values, [1., 2.])
+
+
+def test_contiguous_manifest(tmp_path):
+    (tmp_path / "a").mkdir()
+    _contiguous_cell_ds([10, 11], [2, 3]).to_netcdf(tmp_path / "a" / "0000.nc")
+    _contiguous_cell_ds([20, 21], [1, 2]).to_netcdf(tmp_path / "0005.nc")
+
+    gra = GriddedContiguousRaggedArray(tmp_path, _grid(), manifest=True)
+    np.testing.assert_array_equal(gra.read(gpi=21)["sm"].values, [1., 2.])
+    assert gra._cell_filename(0) == tmp_path / "a" / "0000.nc"
+    assert (tmp_path / "cell_manifest.json").exists()
+    with pytest.raises(FileNotFoundError):
+        gra._cell_filename(7)
+
+
 # --------------------------------------------------------------------------- #
 # indexed
 # --------------------------------------------------------------------------- #
@@ -289,6 +325,11 @@ def test_caching_modes(cls, fixture, request):
     gra.read(gpi=20)
     assert gra._active_cell == 5
     assert gra._cells == {}
+    # the previous cell file is closed when switching cells
+    reader = gra._active_reader
+    with mock.patch.object(cls, "_close_reader") as close_reader:
+        gra.read(gpi=10)
+    close_reader.assert_called_once_with(reader)
 
     # caching keeps every cell that was read
     gra_c = cls(root, _grid(), cache=True)
@@ -297,3 +338,41 @@ def test_caching_modes(cls, fixture, request):
     assert sorted(gra_c._cells) == [0, 5]
     gra_c.clear_cache()
     assert gra_c._cells == {}
+
+
+@pytest.mark.parametrize("cls,fixture", ALL_READERS)
+def test_lru_cache_budget(cls, fixture, request):
+    root = request.getfixturevalue(fixture)
+    nbytes = max(cls(root, _grid()).read_cell(c).ds.nbytes for c in [0, 5])
+
+    # budget for a single cell: alternating cells evict each other
+    gra = cls(root, _grid(), cache=True, max_cache_nbytes=nbytes)
+    gra.read(gpi=10)
+    gra.read(gpi=11)
+    gra.read(gpi=20)
+    assert list(gra._cells) == [5]
+    assert gra.read(gpi=10)["sm"].values.size > 0
+    info = gra.cache_info()
+    assert (info.hits, info.misses, info.evictions) == (1, 3, 2)
+    assert info.cells == 1 and 0 < info.nbytes <= nbytes
+
+    # budget for both cells: the least recently used cell is evicted first
+    gra = cls(root, _grid(), cache=True, max_cache_nbytes=2 * nbytes)
+    gra.read(gpi=[10, 20, 11])
+    assert gra.cache_info().evictions == 0
+    gra.read_cell(0)
+    assert list(gra._cells) == [5, 0]
+
+    gra.close()
+    assert gra.cache_info().cells == 0 and gra.cache_info().nbytes == 0
+
+
+@pytest.mark.parametrize("cls,fixture", ALL_READERS)
+def test_cache_info_without_cache(cls, fixture, request):
+    gra = cls(request.getfixturevalue(fixture), _grid(), cache=False)
+    assert gra.cache_info() == (0, 0, 0, 0, 0)
+    gra.read(gpi=10)
+    gra.read(gpi=11)
+    gra.read(gpi=20)
+    info = gra.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.cells) == (1, 2, 1, 1)
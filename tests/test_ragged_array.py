@@ -320,6 +320,44 @@ def test_trim_fill_locations():
         contiguous_ds(), COUNT_VAR, INSTANCE_DIM).trim().size == 3
 
 
+def test_sel_instances_zero_counts_and_repeats():
+    # instance 20 has no observations, a padding location sits between the
+    # real ones
+    rs = np.array([2, 0, np.iinfo(np.int64).min, 3], dtype=np.int64)
+    ds = xr.Dataset(
+        {
+            "row_size": ((INSTANCE_DIM,), rs, {"sample_dimension": SAMPLE_DIM}),
+            "location_id": ((INSTANCE_DIM,),
+                            np.array([10, 20, np.iinfo(np.int64).min, 30])),
+            "v": ((SAMPLE_DIM,), np.arange(5, dtype="float32")),
+        },
+    )
+    cra = ContiguousRaggedArray(ds, "row_size", INSTANCE_DIM,
+                                instance_id_var="location_id").trim()
+    np.testing.assert_array_equal(cra.instance_ids, [10, 20, 30])
+    np.testing.assert_array_equal(cra.ds["v"].values, np.arange(5))
+
+    sel = cra.sel_instances(np.array([30, 20, 10]))
+    np.testing.assert_array_equal(sel.ds["v"].values, [2., 3., 4., 0., 1.])
+    assert cra.sel_instances(np.array([20])).ds.sizes[SAMPLE_DIM] == 0
+
+    # untrimmed: the padding location selects no samples
+    padded = ContiguousRaggedArray(ds, "row_size", INSTANCE_DIM,
+                                   instance_id_var="location_id")
+    sel = padded.sel_instances(np.array([30, np.iinfo(np.int64).min, 10]))
+    np.testing.assert_array_equal(sel.ds["v"].values, [2., 3., 4., 0., 1.])
+    np.testing.assert_array_equal(padded.sel_instance(30)["v"].values,
+                                  [2., 3., 4.])
+
+    # repeated ids in the request select the samples once
+    ira = cra.to_indexed()
+    sel = ira.sel_instances(np.array([30, 10, 30]))
+    np.testing.assert_array_equal(sel.instance_ids, [30, 10, 30])
+    np.testing.assert_array_equal(sel.ds["v"].values, [0., 1., 2., 3., 4.])
+    np.testing.assert_array_equal(sel.ds[ira.index_var].values,
+                                  [1, 1, 0, 0, 0])
+
+
 def test_instance_id_vs_positional_index_modes():
     # MODE 1: the instance dimension carries real location_ids
     cra_id = ContiguousRaggedArray(big_sparse_contiguous_ds(), COUNT_VAR,
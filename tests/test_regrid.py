@@ -0,0 +1,154 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
+# SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
+
+"""
+Tests for regridding swath data with a sparse operator.
+"""
+
+import pickle
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import numpy.testing as nptest
+import xarray as xr
+
+import ascat.read_native.generate_test_data as gtd
+from ascat.regrid.regrid import RegridOperator
+from ascat.regrid.regrid import picklable_grid
+from ascat.regrid.regrid import regrid_swath_ds
+from ascat.regrid.regrid import regrid_swath_files
+from ascat.regrid.regrid import retrieve_or_store_grid_lut
+from ascat.regrid.regrid import retrieve_or_store_regrid_operator
+from ascat.utils import dtype_to_nan
+
+
+def regrid_reference(ds, src_grid, grid_lut):
+    """
+    Regrid with a look-up table of the full source grid.
+    """
+    index_lut = np.zeros(src_grid.n_gpi, dtype=np.int32) - 1
+    index_lut[ds["location_id"].data] = np.arange(ds["location_id"].size)
+    idx = index_lut[grid_lut]
+    nan_pos = idx == -1
+
+    data = {}
+    for var in ds.variables:
+        if var in ["latitude", "longitude"] or ds[var].size == 1:
+            continue
+        data[var] = ds[var].data[idx]
+        if hasattr(ds[var], "_FillValue"):
+            data[var][nan_pos] = ds[var]._FillValue
+        elif var == "time":
+            data[var][nan_pos] = 0
+        else:
+            data[var][nan_pos] = dtype_to_nan[ds[var].dtype]
+
+    return data
+
+
+class TestRegrid(unittest.TestCase):
+    """
+    Test the sparse regridding operator against a full look-up table.
+    """
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.tempdir_path = Path(self.tempdir.name)
+        self.src_grid = gtd.synthetic_grid(1.)
+        self.filenames = gtd.write_synthetic_swath_files(
+            self.tempdir_path, self.src_grid, 3, 5000)
+        self.trg_grid, self.grid_lut = retrieve_or_store_grid_lut(
+            self.src_grid, "synthetic_1.0", "reg_grid_2.0deg", 2.)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_target_index(self):
+        """
+        Test that the last observation of a location is used.
+        """
+        operator = RegridOperator.from_lut(self.grid_lut)
+        location_id = np.array([5, self.grid_lut[0, 0], 7,
+                                self.grid_lut[0, 0]])
+        trg_idx, obs_idx = operator.target_index(location_id)
+
+        self.assertIn(0, trg_idx)
+        self.assertEqual(obs_idx[trg_idx == 0][0], 3)
+        nptest.assert_array_equal(
+            self.grid_lut.ravel()[trg_idx], location_id[obs_idx])
+
+    def test_regrid_swath_ds(self):
+        """
+        Test regridding against the full look-up table.
+        """
+        operator = RegridOperator.from_lut(self.grid_lut)
+
+        with xr.open_dataset(self.filenames[0], decode_cf=False,
+                             mask_and_scale=False) as ds:
+            ref = regrid_reference(ds, self.src_grid, self.grid_lut)
+            regrid_ds = regrid_swath_ds(ds, self.src_grid, self.trg_grid,
+                                        operator)
+            lut_regrid_ds = regrid_swath_ds(ds, self.src_grid, self.trg_grid,
+                                            self.grid_lut)
+
+        self.assertEqual(set(regrid_ds.data_vars), set(ref))
+        for var, data in ref.items():
+            self.assertEqual(regrid_ds[var].dtype, data.dtype)
+            nptest.assert_array_equal(regrid_ds[var].values, data)
+            nptest.assert_array_equal(lut_regrid_ds[var].values, data)
+
+    def test_store(self):
+        """
+        Test storing and loading the operator.
+        """
+        store_path = self.tempdir_path / "store"
+        trg_grid, operator = retrieve_or_store_regrid_operator(
+            self.src_grid, "synthetic_1.0", "reg_grid_2.0deg", 2., store_path)
+        self.assertTrue(
+            (store_path / "operator_synthetic_1.0_reg_grid_2.0deg.npz")
+            .exists())
+
+        trg_grid, loaded = retrieve_or_store_regrid_operator(
+            self.src_grid, "synthetic_1.0", "reg_grid_2.0deg", 2., store_path)
+        self.assertEqual(loaded.shape, operator.shape)
+        nptest.assert_array_equal(loaded.src_gpis, operator.src_gpis)
+        nptest.assert_array_equal(loaded.indptr, operator.indptr)
+        nptest.assert_array_equal(loaded.trg_idx, operator.trg_idx)
+        nptest.assert_array_equal(trg_grid.activegpis,
+                                  self.trg_grid.activegpis)
+
+    def test_picklable_grid(self):
+        """
+        Test sending the target grid to worker processes.
+        """
+        grid = pickle.loads(pickle.dumps(picklable_grid(self.trg_grid)))
+        nptest.assert_array_equal(grid.lat2d, self.trg_grid.lat2d)
+        nptest.assert_array_equal(grid.lon2d, self.trg_grid.lon2d)
+
+    def test_regrid_swath_files(self):
+        """
+        Test regridding files in worker processes.
+        """
+        operator = RegridOperator.from_lut(self.grid_lut)
+        out_path = self.tempdir_path / "out"
+        out_path.mkdir()
+
+        outfiles = {}
+        for processes in [None, 2]:
+            outfiles[processes] = [
+                out_path / f"{f.stem}_{processes}.nc" for f in self.filenames
+            ]
+            regrid_swath_files(self.filenames, outfiles[processes],
+                               self.trg_grid, operator, processes)
+
+        for f_seq, f_proc in zip(outfiles[None], outfiles[2]):
+            with xr.open_dataset(f_seq) as ds, \
+                    xr.open_dataset(f_proc) as ds_proc:
+                xr.testing.assert_identical(ds, ds_proc)
+
+
+if __name__ == "__main__":
+    unittest.main()
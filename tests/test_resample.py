@@ -0,0 +1,160 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
+# SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
+
+"""
+Tests for the inverse distance resampling of swath data.
+"""
+
+import pickle
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import numpy.testing as nptest
+import xarray as xr
+from pygeogrids.grids import genreg_grid
+from pyresample import kd_tree, SwathDefinition
+
+import ascat.read_native.generate_test_data as gtd
+from ascat.resample.resample import InverseDistanceResampler
+from ascat.resample.resample import resample_swath_files
+from ascat.resample.resample import resample_vars
+
+
+def resample_reference(ds, trg_grid, k, radius):
+    """
+    Resample with a pyresample neighbour search per swath and variable.
+    """
+    lons = ds["longitude"] * ds["longitude"].scale_factor
+    lats = ds["latitude"] * ds["latitude"].scale_factor
+    target_def = SwathDefinition(lons=trg_grid.arrlon, lats=trg_grid.arrlat)
+    swath_def = SwathDefinition(lons=lons, lats=lats)
+    valid_input_index, _, index_array, distance_array = \
+        kd_tree.get_neighbour_info(swath_def, target_def, radius,
+                                   neighbours=k)
+
+    invalid_pos = index_array == lons.size
+    index_array = index_array.astype(np.int32)
+    index_array[invalid_pos] = -1
+
+    resampled = {}
+    for var, method in resample_vars:
+        if var not in ds or len(ds[var].dims) == 0:
+            continue
+
+        data = ds[var].data[valid_input_index][index_array]
+        data[invalid_pos] = ds[var]._FillValue
+        resam_data = np.zeros(
+            data.shape[0], dtype=ds[var].dtype) + ds[var]._FillValue
+
+        if method == "idw":
+            weights = 1 / (distance_array**2)
+            invalid = invalid_pos | (data == ds[var]._FillValue)
+            weights[invalid] = 0
+            total_weights = weights.sum(axis=1)
+            idx = total_weights != 0
+            resam_data[idx] = np.sum(
+                weights * data, axis=1)[idx] / total_weights[idx]
+        elif method == "nn":
+            valid = index_array != -1
+            first_idx = np.where(valid.any(axis=1), valid.argmax(axis=1), -1)
+            valid_rows = np.arange(index_array.shape[0])[first_idx != -1]
+            resam_data[valid_rows] = data[valid_rows, first_idx[valid_rows]]
+        elif method == "bitwise_or":
+            data[index_array == -1] = 0
+            resam_data = np.bitwise_or.reduce(data, axis=1)
+
+        resampled[var] = resam_data.reshape(trg_grid.shape)
+
+    return resampled
+
+
+class TestInverseDistanceResampler(unittest.TestCase):
+    """
+    Test the resampler against a pyresample neighbour search.
+    """
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.tempdir_path = Path(self.tempdir.name)
+        self.src_grid = gtd.synthetic_grid(0.5)
+        self.trg_grid = genreg_grid(1., 1.)
+        self.filenames = gtd.write_synthetic_swath_files(
+            self.tempdir_path, self.src_grid, 2, 20000)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def _swath_ds(self):
+        """
+        Swath with locations off the grid points, fill values and flags.
+        """
+        rng = np.random.default_rng(3)
+        with xr.open_dataset(self.filenames[0], decode_cf=False,
+                             mask_and_scale=False) as ds:
+            ds = ds.load()
+
+        n_obs = ds.sizes["obs"]
+        for coord in ["longitude", "latitude"]:
+            ds[coord].values += rng.integers(-100000, 100000, n_obs,
+                                             dtype=np.int32)
+        ssm = ds["surface_soil_moisture"].values
+        ssm[rng.random(n_obs) < 0.2] = ds["surface_soil_moisture"]._FillValue
+        ds["correction_flag"] = ("obs",
+                                 rng.integers(0, 8, n_obs, dtype=np.uint8),
+                                 {"_FillValue": np.uint8(255)})
+
+        return ds
+
+    def test_resample(self):
+        """
+        Test resampling against pyresample neighbours.
+        """
+        ds = self._swath_ds()
+        for k, radius in [(2, 40000.), (4, 100000.)]:
+            ref = resample_reference(ds, self.trg_grid, k, radius)
+            resampler = InverseDistanceResampler(self.trg_grid, k, radius)
+            resampled_ds = resampler.resample(ds)
+
+            self.assertEqual(list(resampled_ds.data_vars), list(ref))
+            for var, data in ref.items():
+                self.assertEqual(resampled_ds[var].dtype, data.dtype)
+                nptest.assert_array_equal(resampled_ds[var].values, data)
+
+    def test_pickle(self):
+        """
+        Test that the resampler can be sent to worker processes.
+        """
+        ds = self._swath_ds()
+        resampler = InverseDistanceResampler(self.trg_grid, 4, 100000.)
+        loaded = pickle.loads(pickle.dumps(resampler))
+
+        xr.testing.assert_identical(loaded.resample(ds),
+                                    resampler.resample(ds))
+
+    def test_resample_swath_files(self):
+        """
+        Test resampling files in worker processes.
+        """
+        resampler = InverseDistanceResampler(self.trg_grid, 4, 100000.)
+        out_path = self.tempdir_path / "out"
+        out_path.mkdir()
+
+        outfiles = {}
+        for workers in [None, 2]:
+            outfiles[workers] = [
+                out_path / f"{f.stem}_{workers}.nc" for f in self.filenames
+            ]
+            resample_swath_files(self.filenames, outfiles[workers],
+                                 resampler, workers)
+
+        for f_seq, f_proc in zip(outfiles[None], outfiles[2]):
+            with xr.open_dataset(f_seq) as ds, \
+                    xr.open_dataset(f_proc) as ds_proc:
+                xr.testing.assert_identical(ds, ds_proc)
+
+
+if __name__ == "__main__":
+    unittest.main()
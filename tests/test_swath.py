@@ -3,6 +3,7 @@
 # SPDX-FileCopyrightText: Copyright (c) 2026 TU Wien
 # SPDX-FileContributor: For a full list of authors, see the AUTHORS file.
 
+import os
 import unittest
 from pathlib import Path
 from datetime import datetime
@@ -14,8 +15,12 @@ import numpy as np
 
 import ascat.read_native.generate_test_data as gtd
 
+from ascat.cell_index import LocationIndex
+from ascat.grids import GridRegistry
 from ascat.swath import Swath
+from ascat.swath import CellBuffers
 from ascat.swath import SwathGridFiles
+from ascat.swath import SwathFootprintIndex
 from ascat.product_info import AscatH129Swath
 from get_path import get_testdata_path
 
@@ -29,6 +34,35 @@ def gen_dummy_swathfiles(directory, sat_name=None):
     gtd.swath_ds_2.to_netcdf(directory / "swath_2.nc")
 
 
+def _stack_test_grid(*args):
+    from pygeogrids.grids import CellGrid
+    gpis = np.arange(6)
+    return CellGrid(gpis * 1.0, gpis * 1.0, np.array([0, 0, 0, 1, 1, 1]),
+                    gpis=gpis)
+
+
+def gen_stackable_swathfiles(directory, n_files=4, n_obs=12):
+    """Swath files on the 6-point grid "stacktest_1" (cells 0 and 1)."""
+    GridRegistry().register("stacktest", _stack_test_grid)
+    rng = np.random.default_rng(42)
+    t0 = np.datetime64("2021-01-01T00:00:00", "ns")
+    for i in range(n_files):
+        location_id = rng.integers(0, 6, n_obs).astype(np.int32)
+        xr.Dataset(
+            {
+                "longitude": ("obs", location_id * 1.0),
+                "latitude": ("obs", location_id * 1.0),
+                "location_id": ("obs", location_id,
+                                {"cf_role": "timeseries_id"}),
+                "time": ("obs", t0 + np.arange(i * n_obs, (i + 1) * n_obs)
+                         * np.timedelta64(1, "s")),
+                "surface_soil_moisture": (
+                    "obs", rng.random(n_obs).astype(np.float32)),
+            },
+            attrs={"featureType": "point"},
+        ).to_netcdf(directory / f"swath_{i}.nc")
+
+
 class TestSwath(unittest.TestCase):
     def setUp(self):
         self.tempdir = TemporaryDirectory()
@@ -134,6 +168,28 @@ class TestSwath(unittest.TestCase):
         iterations = list(ra.iter_read_nbytes(max_nbytes=total_size - 1))
         assert len(iterations) == 2
 
+    def test_iter_read_prefetch(self):
+        fname1 = self.tempdir_path / "swath.nc"
+        fname2 = self.tempdir_path / "swath_2.nc"
+        ra = Swath([fname1, fname2, fname1])
+
+        expected = list(ra.iter_read())
+        for scheduler in ["threads", "processes"]:
+            prefetched = list(ra.iter_read(prefetch=2,
+                                           prefetch_scheduler=scheduler))
+            self.assertEqual(len(prefetched), 3)
+            for ds1, ds2 in zip(expected, prefetched):
+                xr.testing.assert_identical(ds1.load(), ds2)
+
+        # same chunking as without prefetching
+        total_size = ra._nbytes(expected[0]) + ra._nbytes(expected[1])
+        iterations = list(ra.iter_read_nbytes(max_nbytes=total_size,
+                                              prefetch=1))
+        assert len(iterations) == 2
+
+        with self.assertRaises(ValueError):
+            list(ra.iter_read(prefetch=1, prefetch_scheduler="unknown"))
+
 
 class TestSwathGridFiles(unittest.TestCase):
     def setUp(self):
@@ -383,3 +439,277 @@ class TestSwathGridFiles(unittest.TestCase):
 
             for var in idx_ds.variables:
                 xr.testing.assert_identical(idx_ds[var], round_trip_ds[var])
+
+
+class TestStackStrategies(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.tempdir_path = Path(self.tempdir.name)
+        self.swath_path = self.tempdir_path / "swaths"
+        self.swath_path.mkdir()
+        gen_stackable_swathfiles(self.swath_path)
+        self.sf = SwathGridFiles(
+            self.swath_path,
+            fn_templ="swath_{date}.nc",
+            sf_templ=None,
+            grid_name="stacktest_1",
+            date_field_fmt="%Y%m%d",
+            cell_fn_format="{:04d}.nc",
+        )
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def _stack(self, strategy, max_nbytes, **kwargs):
+        out_dir = self.tempdir_path / strategy
+        out_dir.mkdir()
+        self.sf.stack_to_cell_files(out_dir, max_nbytes, print_progress=False,
+                                    parallel=False, strategy=strategy,
+                                    **kwargs)
+        return out_dir
+
+    def test_buffered_matches_chunked(self):
+        chunked_dir = self._stack("chunked", 0)
+        buffered_dir = self._stack("buffered", 1_000)
+
+        chunked_files = sorted(f.name for f in chunked_dir.glob("*.nc"))
+        buffered_files = sorted(f.name for f in buffered_dir.glob("*.nc"))
+        self.assertEqual(chunked_files, ["0000.nc", "0001.nc"])
+        self.assertEqual(chunked_files, buffered_files)
+
+        for fname in chunked_files:
+            with xr.open_dataset(chunked_dir / fname) as ds1, \
+                    xr.open_dataset(buffered_dir / fname) as ds2:
+                ds1 = ds1.sortby("time")
+                ds2 = ds2.sortby("time")
+                np.testing.assert_array_equal(ds1["time"], ds2["time"])
+                np.testing.assert_array_equal(ds1["location_id"],
+                                              ds2["location_id"])
+                np.testing.assert_array_equal(
+                    ds1["surface_soil_moisture"],
+                    ds2["surface_soil_moisture"])
+
+    def test_buffered_cells_subset(self):
+        out_dir = self._stack("buffered", 1_000_000, cells=[1])
+        self.assertEqual([f.name for f in out_dir.glob("*.nc")], ["0001.nc"])
+        with xr.open_dataset(out_dir / "0001.nc") as ds:
+            self.assertTrue(np.all(ds["location_id"].values >= 3))
+
+    def test_external_sort_writes_contiguous(self):
+        chunked_dir = self._stack("chunked", 0)
+        # a small budget forces several sorted runs per cell to be merged
+        sorted_dir = self._stack("external_sort", 500)
+
+        self.assertEqual(sorted(f.name for f in sorted_dir.glob("*.nc")),
+                         ["0000.nc", "0001.nc"])
+        # temporary runs are removed
+        self.assertEqual(list(sorted_dir.glob(".runs_*")), [])
+
+        for fname in ["0000.nc", "0001.nc"]:
+            with xr.open_dataset(chunked_dir / fname) as point_ds, \
+                    xr.open_dataset(sorted_dir / fname) as ctg_ds:
+                self.assertEqual(ctg_ds.cf_geom.array_type, "contiguous")
+                expected = point_ds.load().sortby(["location_id", "time"])
+                actual = ctg_ds.load().cf_geom.to_point_array()
+                np.testing.assert_array_equal(
+                    np.repeat(ctg_ds["location_id"].values,
+                              ctg_ds["row_size"].values),
+                    expected["location_id"].values)
+                np.testing.assert_array_equal(actual["time"].values,
+                                              expected["time"].values)
+                np.testing.assert_array_equal(
+                    actual["surface_soil_moisture"].values,
+                    expected["surface_soil_moisture"].values)
+
+    def test_external_sort_parallel(self):
+        out_dir = self.tempdir_path / "sorted_parallel"
+        self.sf.stack_to_cell_files(out_dir, 500, print_progress=False,
+                                    parallel=True, strategy="external_sort")
+        for fname in ["0000.nc", "0001.nc"]:
+            with xr.open_dataset(out_dir / fname) as ds:
+                self.assertEqual(ds.cf_geom.array_type, "contiguous")
+                self.assertGreater(ds.sizes["obs"], 0)
+
+    def test_external_sort_cell_groups(self):
+        run_dir = self.tempdir_path / "runs"
+        run_dir.mkdir()
+        run_files = {}
+        for c, size in [(0, 400), (0, 200), (2, 300)]:
+            run_file = run_dir / f"{c}_{size}.nc"
+            run_file.write_bytes(bytes(size))
+            run_files.setdefault(c, []).append(run_file)
+        remaining = {1: xr.Dataset({"x": ("obs", np.zeros(50))}),
+                     3: xr.Dataset({"x": ("obs", np.zeros(200))})}
+
+        groups = SwathGridFiles._cell_groups([0, 1, 2, 3], run_files,
+                                             remaining, 1_000)
+        self.assertEqual(groups, [[0, 1], [2], [3]])
+        groups = SwathGridFiles._cell_groups([0, 1, 2, 3], run_files,
+                                             remaining, 10_000)
+        self.assertEqual(groups, [[0, 1, 2, 3]])
+
+    def test_prefetch(self):
+        chunked_dir = self._stack("chunked", 0)
+        for strategy in ["chunked", "buffered"]:
+            out_dir = self.tempdir_path / f"{strategy}_prefetch"
+            out_dir.mkdir()
+            self.sf.stack_to_cell_files(out_dir, 1_000, print_progress=False,
+                                        parallel=False, strategy=strategy,
+                                        prefetch=2)
+            for fname in ["0000.nc", "0001.nc"]:
+                with xr.open_dataset(chunked_dir / fname) as ds1, \
+                        xr.open_dataset(out_dir / fname) as ds2:
+                    np.testing.assert_array_equal(
+                        ds1.sortby("time")["surface_soil_moisture"],
+                        ds2.sortby("time")["surface_soil_moisture"])
+
+    def test_location_index(self):
+        for strategy in ["chunked", "external_sort"]:
+            out_dir = self._stack(strategy, 500, location_index=True)
+            index = LocationIndex(out_dir / "location_index.npz")
+            self.assertEqual(len(index.files), 2)
+            for fname in ["0000.nc", "0001.nc"]:
+                entry = index.files[str(out_dir / fname)]
+                with xr.open_dataset(out_dir / fname) as ds:
+                    self.assertEqual(entry["time_min"], ds["time"].min())
+                    self.assertEqual(entry["time_max"], ds["time"].max())
+                    self.assertEqual(
+                        entry["locations"] is not None,
+                        strategy == "external_sort")
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            self._stack("unknown", 0)
+
+
+class TestCellBuffers(unittest.TestCase):
+    @staticmethod
+    def _ds(n):
+        return xr.Dataset({"x": ("obs", np.zeros(n, dtype=np.float64))})
+
+    @staticmethod
+    def _merge(data):
+        return xr.concat(data, dim="obs")
+
+    def test_pop_largest(self):
+        buffers = CellBuffers(max_nbytes=800)
+        buffers.add(1, self._ds(10))
+        buffers.add(2, self._ds(60))
+        buffers.add(3, self._ds(5))
+        self.assertFalse(buffers.full)
+
+        buffers.add(2, self._ds(30))
+        self.assertTrue(buffers.full)
+
+        flushed = buffers.pop_largest(self._merge)
+        self.assertEqual(list(flushed), [2])
+        self.assertEqual(flushed[2].sizes["obs"], 90)
+        self.assertEqual(buffers.nbytes, 15 * 8)
+        self.assertFalse(buffers.full)
+
+        rest = buffers.pop_all(self._merge)
+        self.assertEqual(sorted(rest), [1, 3])
+        self.assertEqual(len(buffers), 0)
+        self.assertEqual(buffers.nbytes, 0)
+        self.assertEqual(buffers.n_flushes, 3)
+
+    def test_max_cell_nbytes(self):
+        buffers = CellBuffers(max_nbytes=10_000, max_cell_nbytes=100)
+        buffers.add(1, self._ds(5))
+        buffers.add(2, self._ds(20))
+        self.assertTrue(buffers.full)
+        self.assertEqual(list(buffers.pop_largest(self._merge)), [2])
+        self.assertEqual(len(buffers), 1)
+
+
+class TestSwathFootprintIndex(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.tempdir_path = Path(self.tempdir.name)
+        GridRegistry().register("stacktest", _stack_test_grid)
+        self.files = [
+            self._write_swath("20210101", [0, 1, 2]),
+            self._write_swath("20210102", [3, 4]),
+            self._write_swath("20210103", [2, 5]),
+        ]
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def _write_swath(self, date, location_id):
+        location_id = np.array(location_id, dtype=np.int32)
+        fname = self.tempdir_path / f"swath_{date}.nc"
+        xr.Dataset(
+            {
+                "longitude": ("obs", location_id * 1.0),
+                "latitude": ("obs", location_id * 1.0),
+                "location_id": ("obs", location_id),
+                "time": ("obs", np.full(len(location_id),
+                                        np.datetime64(f"{date[:4]}-{date[4:6]}"
+                                                      f"-{date[6:]}", "ns"))),
+            },
+        ).to_netcdf(fname)
+        return fname
+
+    def _swath_files(self, footprint_index):
+        return SwathGridFiles(
+            self.tempdir_path,
+            fn_templ="swath_{date}.nc",
+            sf_templ=None,
+            grid_name="stacktest_1",
+            date_field_fmt="%Y%m%d",
+            fn_read_fmt=lambda timestamp: {"date": "*"},
+            footprint_index=footprint_index,
+        )
+
+    def test_spatial_filter(self):
+        sf = self._swath_files(True)
+        self.assertEqual(sf._spatial_filter(self.files, cell=0),
+                         [self.files[0], self.files[2]])
+        self.assertEqual(sf._spatial_filter(self.files, cell=[1]),
+                         [self.files[1], self.files[2]])
+        self.assertEqual(sf._spatial_filter(self.files, location_id=4),
+                         [self.files[1], self.files[2]])
+        self.assertEqual(
+            sf._spatial_filter(self.files, bbox=(3.5, 5.5, 3.5, 5.5)),
+            [self.files[1], self.files[2]])
+        # no grid points in the search area
+        self.assertEqual(
+            sf._spatial_filter(self.files, bbox=(50., 60., 50., 60.)), [])
+        self.assertEqual(sf._spatial_filter(self.files), self.files)
+
+    def test_swath_search(self):
+        date_range = (datetime(2021, 1, 1), datetime(2021, 1, 3))
+        for cell, expected in [(0, [0, 2]), (1, [1, 2])]:
+            intersected = self._swath_files(None).swath_search(*date_range,
+                                                               cell=cell)
+            indexed = self._swath_files(True).swath_search(*date_range,
+                                                           cell=cell)
+            self.assertEqual(sorted(indexed),
+                             [str(self.files[i]) for i in expected])
+            # the index is at least as selective as the intersection test
+            self.assertTrue(set(indexed).issubset(intersected))
+
+    def test_persistence_and_update(self):
+        index_path = self.tempdir_path / "index" / "footprints.json"
+        sf = self._swath_files(index_path)
+        sf._spatial_filter(self.files, cell=0)
+        self.assertTrue(index_path.exists())
+
+        grid = sf.grid
+        index = SwathFootprintIndex(index_path, grid, "stacktest_1",
+                                    self.tempdir_path)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.cells(self.files[0]), [0])
+
+        # a modified file is indexed again
+        self._write_swath("20210101", [4, 5])
+        stat = os.stat(self.files[0])
+        os.utime(self.files[0], ns=(stat.st_atime_ns,
+                                    stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(index.cells(self.files[0]), [1])
+
+        # an index built for another grid is discarded
+        index = SwathFootprintIndex(index_path, grid, "othergrid",
+                                    self.tempdir_path)
+        self.assertEqual(len(index), 0)